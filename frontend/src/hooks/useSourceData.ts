@@ -3,7 +3,11 @@ import { useMemo } from 'react';
 import { useQuery } from 'react-query';
 import { getContent } from '../api';
 import type { ContentItem } from '../types';
-import { getParserForSource } from '../utils/parsers';
+import {
+  getParserForSource,
+  isLegacyMarkdownResponse,
+  parseStructuredItems,
+} from '../utils/parsers';
 
 export function useSourceData(selectedSource: string, selectedDate: Date, enabled: boolean = true) {
   const { data, isLoading, isError, error, refetch } = useQuery(
@@ -40,7 +44,11 @@ export function useSourceData(selectedSource: string, selectedDate: Date, enable
         if (selectedSource === 'trendradar-ithome') {
           return parser(data.items);
         }
-        // 他のソースはMarkdownをパース
+        // 他のソースは日次JSONから記事ごとに返される
+        if (!isLegacyMarkdownResponse(data.items)) {
+          return parseStructuredItems(data.items, selectedSource);
+        }
+        // JSONに変換されていない過去日のみMarkdownをパース
         if (data.items[0]?.content) {
           return parser(data.items[0].content);
         }
@@ -13,6 +13,7 @@ import { parseZennArticlesMarkdown } from './zennParser';
 import { parseTrendradarJuejinData } from './trendradarJuejinParser';
 import { parseTrendradarZhihuData } from './trendradarZhihuParser';
 import { parseTrendradarIthomeData } from './trendradarIthomeParser';
+import { isLegacyMarkdownResponse, parseStructuredItems } from './structuredItemsParser';
 
 export {
   parseGitHubTrendingMarkdown,
@@ -29,6 +30,8 @@ export {
   parseTrendradarJuejinData,
   parseTrendradarZhihuData,
   parseTrendradarIthomeData,
+  parseStructuredItems,
+  isLegacyMarkdownResponse,
 };
 
 // パーサー選択ロジックを統一
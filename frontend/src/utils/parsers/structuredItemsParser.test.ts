@@ -0,0 +1,48 @@
+import { describe, it, expect } from 'vitest';
+import { isLegacyMarkdownResponse, parseStructuredItems } from './structuredItemsParser';
+import type { ContentItem } from '../../types';
+
+describe('parseStructuredItems', () => {
+  it('should insert a header per category and number articles within it', () => {
+    const input: ContentItem[] = [
+      { title: 'A', content: '要約A', source: 'tech-news', url: 'https://a', category: 'blogs' },
+      { title: 'B', content: '要約B', source: 'tech-news', url: 'https://b', category: 'hatena' },
+      { title: 'C', content: '要約C', source: 'tech-news', url: 'https://c', category: 'blogs' },
+    ];
+
+    const result = parseStructuredItems(input, 'tech-news');
+
+    expect(result.map((item) => item.title)).toEqual(['blogs', 'A', 'C', 'hatena', 'B']);
+    expect(result[0].isCategoryHeader).toBe(true);
+    expect(result[2].isArticle).toBe(true);
+    expect(result[2].metadata?.articleNumber).toBe(2);
+    expect(result[4].metadata?.articleNumber).toBe(1);
+  });
+
+  it('should mark GitHub repositories under language headers', () => {
+    const input: ContentItem[] = [
+      {
+        title: 'repo',
+        content: 'desc',
+        source: 'github',
+        url: 'https://github.com/o/repo',
+        category: 'Python',
+      },
+    ];
+
+    const result = parseStructuredItems(input, 'github');
+
+    expect(result[0].isLanguageHeader).toBe(true);
+    expect(result[1].isRepository).toBe(true);
+    expect(result[1].language).toBe('Python');
+  });
+});
+
+describe('isLegacyMarkdownResponse', () => {
+  it('should detect a single markdown item without url', () => {
+    expect(isLegacyMarkdownResponse([{ title: '', content: '# md', source: 'github' }])).toBe(true);
+    expect(
+      isLegacyMarkdownResponse([{ title: 'A', content: '', source: 'github', url: 'https://a' }])
+    ).toBe(false);
+  });
+});
@@ -0,0 +1,57 @@
+import type { ContentItem } from '../../types';
+
+/**
+ * APIが日次JSONから返す記事ごとのContentItemを表示用に整形する。
+ * Markdownを解析せず、カテゴリ（フィード・言語・サブレディットなど）ごとに
+ * ヘッダーを挿入し、カテゴリ内で記事番号を振る。
+ */
+export function parseStructuredItems(items: ContentItem[], source: string): ContentItem[] {
+  if (!items || items.length === 0) {
+    return [];
+  }
+
+  const isGithub = source === 'github';
+  const groups = new Map<string, ContentItem[]>();
+  items.forEach((item) => {
+    const category = item.category || '';
+    if (!groups.has(category)) {
+      groups.set(category, []);
+    }
+    groups.get(category)!.push(item);
+  });
+
+  const processedItems: ContentItem[] = [];
+  for (const [category, groupItems] of groups) {
+    if (category) {
+      processedItems.push({
+        title: category,
+        content: '',
+        source,
+        isLanguageHeader: isGithub,
+        isCategoryHeader: !isGithub,
+      });
+    }
+
+    let articleNumber = 1; // カテゴリごとにリセット
+    groupItems.forEach((item) => {
+      processedItems.push({
+        ...item,
+        ...(isGithub ? { isRepository: true, language: category } : { isArticle: true }),
+        metadata: {
+          ...item.metadata,
+          articleNumber: articleNumber++,
+        },
+      });
+    });
+  }
+
+  return processedItems;
+}
+
+/**
+ * Markdownで返していたソースのレスポンスが、JSONに変換されていない過去日の
+ * Markdown全文（URLのない1件の項目）かどうかを判定する。
+ */
+export function isLegacyMarkdownResponse(items: ContentItem[]): boolean {
+  return items.length === 1 && !items[0].url;
+}
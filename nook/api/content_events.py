@@ -0,0 +1,242 @@
+"""新着コンテンツの通知。
+
+データディレクトリの日次ファイルの変更を StorageWatcher で検知し、関連する
+レスポンスキャッシュを破棄した上で「ソースXの日付Yが更新された」イベントを
+購読中のクライアント（SSE）に配信する。クライアントはポーリングせずに、
+変更があったソース・日付だけを取得し直せる。
+
+API を複数のワーカーで動かす場合、ディレクトリの監視と総合ランキングの更新は
+ロックを取得した1つのワーカーだけが行う。他のワーカーは各サービスの
+チェンジログを読む ChangeLogFollower で同じ変更を受け取り、自身のキャッシュの
+破棄と購読者への配信だけを行う。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from nook.api.routers import content
+from nook.core.config import BaseConfig
+from nook.core.content.builder import run_io
+from nook.core.content.publishing import publish_ranking
+from nook.core.content.sources import RANKED_DIR_NAME, RANKED_SOURCE, source_for_directory
+from nook.core.storage.watcher import ChangeLogFollower, StorageChange, StorageWatcher
+
+logger = logging.getLogger(__name__)
+
+# 購読者ごとに溜める最大イベント数（超えた場合は再同期を促す）
+SUBSCRIBER_QUEUE_SIZE = 256
+# 停止時に監視の終了を待つ秒数
+STOP_TIMEOUT = 5.0
+
+
+@dataclass(frozen=True)
+class ContentUpdate:
+    """
+    ソース・日付のデータの更新。
+
+    Parameters
+    ----------
+    source : str
+        更新されたソース（総合ランキングは "top"）。
+    date : str
+        更新された日付（YYYY-MM-DD形式）。
+    revision : int
+        ソースのチェンジログの最新リビジョン（/api/changes の since に使える）。
+    """
+
+    source: str
+    date: str
+    revision: int
+
+    def to_dict(self) -> dict:
+        """イベントのデータに変換する。"""
+        return asdict(self)
+
+
+class ContentEventBroker:
+    """
+    更新イベントを購読者ごとのキューに配る。
+
+    Parameters
+    ----------
+    queue_size : int, default=SUBSCRIBER_QUEUE_SIZE
+        購読者ごとに溜める最大イベント数。
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: set[asyncio.Queue[ContentUpdate | None]] = set()
+
+    def subscribe(self) -> asyncio.Queue[ContentUpdate | None]:
+        """
+        購読を開始する。
+
+        Returns
+        -------
+        asyncio.Queue[ContentUpdate | None]
+            イベントが届くキュー。None は取りこぼしが発生したため再同期が必要なことを示す。
+        """
+        queue: asyncio.Queue[ContentUpdate | None] = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[ContentUpdate | None]) -> None:
+        """購読を終了する。"""
+        self._subscribers.discard(queue)
+
+    @property
+    def subscriber_count(self) -> int:
+        """購読者の数。"""
+        return len(self._subscribers)
+
+    def publish(self, update: ContentUpdate) -> None:
+        """
+        イベントをすべての購読者に配る。
+
+        受信が追いつかずキューが一杯の購読者は、溜まったイベントを捨てて
+        再同期の通知（None）だけを残す。
+        """
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(update)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+
+# アプリケーションで共有するブローカー
+broker = ContentEventBroker()
+
+
+def _ranking_exists(date_str: str) -> bool:
+    """日付の総合ランキングが保存済みか判定する（未保存の日付は読み込み時に計算される）。"""
+    return (content.storage.base_dir / RANKED_DIR_NAME / f"{date_str}.json").exists()
+
+
+async def apply_changes(changes: set[StorageChange], *, refresh_ranking: bool = True) -> list[ContentUpdate]:
+    """
+    検知した変更をキャッシュに反映し、配信する更新イベントを返す。
+
+    ソースのデータが変わった日付は、保存済みの総合ランキングも計算し直す
+    （内容が変わって保存された場合は、その保存が "top" の更新として検知される）。
+
+    Parameters
+    ----------
+    changes : set[StorageChange]
+        検知した日次ファイルの変更。
+    refresh_ranking : bool, default=True
+        総合ランキングを計算し直すかどうか（監視を担当するワーカーだけが True）。
+
+    Returns
+    -------
+    list[ContentUpdate]
+        API のソースに対応する変更の更新イベント。
+    """
+    updates: list[ContentUpdate] = []
+    ranking_dates: set[str] = set()
+    for change in sorted(changes):
+        source = source_for_directory(change.directory)
+        if source is None:
+            continue
+        await run_io(content.invalidate_content, source, change.date)
+        revision = await run_io(content._source_head, source)
+        updates.append(ContentUpdate(source=source, date=change.date, revision=revision))
+        if refresh_ranking and source != RANKED_SOURCE:
+            ranking_dates.add(change.date)
+
+    for date_str in sorted(ranking_dates):
+        if await run_io(_ranking_exists, date_str):
+            try:
+                await publish_ranking(content.storage, datetime.strptime(date_str, "%Y-%m-%d"))
+            except Exception as e:
+                logger.warning(f"Failed to refresh ranking for {date_str}: {e}")
+    return updates
+
+
+class ContentWatch:
+    """
+    データディレクトリの変更を broker に配信するバックグラウンドタスク。
+
+    Parameters
+    ----------
+    watcher : StorageWatcher | ChangeLogFollower
+        変更の検知（監視を担当するワーカーはディレクトリの監視、他のワーカーはチェンジログの読み取り）。
+    event_broker : ContentEventBroker | None
+        配信先。None の場合は共有の broker。
+    refresh_ranking : bool, default=True
+        変更に合わせて総合ランキングを計算し直すかどうか。
+    """
+
+    def __init__(
+        self,
+        watcher: StorageWatcher | ChangeLogFollower,
+        event_broker: ContentEventBroker | None = None,
+        *,
+        refresh_ranking: bool = True,
+    ):
+        self.watcher = watcher
+        self.broker = event_broker or broker
+        self.refresh_ranking = refresh_ranking
+        self._stop_event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_config(cls, config: BaseConfig, *, lead: bool = True) -> ContentWatch | None:
+        """
+        設定から作成する。監視が無効な場合は None。
+
+        ``lead`` が False のワーカーはディレクトリを監視せず、総合ランキングも
+        計算し直さずに、監視を担当するワーカーの保存をチェンジログから受け取る。
+        """
+        if not config.CONTENT_WATCH_ENABLED:
+            return None
+        base_dir = Path(content.storage.base_dir)
+        if not lead:
+            return cls(
+                ChangeLogFollower(base_dir, poll_interval=config.CONTENT_WATCH_POLL_INTERVAL), refresh_ranking=False
+            )
+        watcher = StorageWatcher(
+            base_dir,
+            poll_interval=config.CONTENT_WATCH_POLL_INTERVAL,
+            force_polling=config.CONTENT_WATCH_FORCE_POLLING,
+        )
+        return cls(watcher)
+
+    async def _run(self) -> None:
+        async for changes in self.watcher.watch(self._stop_event):
+            try:
+                updates = await apply_changes(changes, refresh_ranking=self.refresh_ranking)
+            except Exception as e:
+                logger.warning(f"Failed to apply storage changes: {e}")
+                continue
+            for update in updates:
+                logger.info(f"Content updated: source={update.source}, date={update.date}")
+                self.broker.publish(update)
+
+    def start(self) -> None:
+        """監視を開始する。"""
+        if self._task is None:
+            self._stop_event.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """監視を停止し、終了を待つ。"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        self._stop_event.set()
+        try:
+            await asyncio.wait_for(task, timeout=STOP_TIMEOUT)
+        except TimeoutError:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        except Exception as e:
+            logger.warning(f"Content watch stopped with an error: {e}")
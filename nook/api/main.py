@@ -3,34 +3,111 @@ Nook APIのメインアプリケーション。
 FastAPIを使用してAPIエンドポイントを提供します。
 """
 
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from nook.api.content_events import ContentWatch
 from nook.api.exceptions import NookHTTPException
 from nook.api.middleware.bot_protection import bot_protection_middleware
+from nook.api.middleware.compression import CompressionMiddleware
 from nook.api.middleware.error_handler import error_handler_middleware, handle_exception
+from nook.api.middleware.metrics import metrics_middleware
+from nook.api.middleware.rate_limit import rate_limit_middleware
+from nook.api.middleware.server_timing import server_timing_middleware
 from nook.api.models.errors import ErrorResponse
-from nook.api.routers import chat, content, weather
-from nook.core.errors.error_metrics import error_metrics
+from nook.api.responses import FastJSONResponse
+from nook.api.routers import chat, content, events, metrics, search, weather
+from nook.core.config import BaseConfig
+from nook.core.errors.error_metrics import AlertThreshold, error_metrics
+from nook.core.storage import WorkerLock
 
 # 環境変数の読み込み
 load_dotenv(".env.production")
 
+# 監視・総合ランキングの更新・検索インデックスの突き合わせを担当するワーカーを決めるロック（DATA_DIR 配下）
+BACKGROUND_LOCK_NAME = "_api-background.lock"
+
+
+def _acquire_background_lock(app: FastAPI, config: BaseConfig) -> bool:
+    """
+    バックグラウンド処理の担当ワーカーのロックを取得します。
+
+    複数ワーカーで起動した場合も、ロックを取得した1つのワーカーだけが True になります。
+    バックグラウンド処理がすべて無効な場合はロックファイルを作成せずに False を返します。
+    """
+    app.state.background_lock = None
+    if not (config.CONTENT_WATCH_ENABLED or config.SEARCH_SYNC_ENABLED):
+        return False
+    app.state.background_lock = WorkerLock(content.storage.base_dir / BACKGROUND_LOCK_NAME)
+    return app.state.background_lock.acquire()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    アプリケーションの起動・終了時の処理。
+
+    チャット用のGPTClientを起動時に1つだけ作成して共有し（tiktoken のエンコーダーや
+    HTTP接続をリクエストごとに作り直さない）、終了時に接続を閉じます。
+    データディレクトリの監視を開始し、新着コンテンツを /api/events に配信します。
+    検索インデックスとデータディレクトリの突き合わせもバックグラウンドで行い、
+    検索リクエストが同期を待たないようにします。
+
+    複数ワーカーで起動した場合、ディレクトリの監視（総合ランキングの更新を含む）と
+    検索インデックスの突き合わせはロックを取得した1つのワーカーだけが行い、
+    他のワーカーはチェンジログから変更を受け取って配信だけを行います。
+    """
+    config = BaseConfig()
+    app.state.chat_client = chat.create_chat_client()
+    lead = _acquire_background_lock(app, config)
+    app.state.content_watch = ContentWatch.from_config(config, lead=lead)
+    if app.state.content_watch is not None:
+        app.state.content_watch.start()
+    app.state.search_sync = search.SearchIndexSync.from_config(config) if lead else None
+    if app.state.search_sync is not None:
+        app.state.search_sync.start()
+    try:
+        yield
+    finally:
+        if app.state.search_sync is not None:
+            await app.state.search_sync.stop()
+        if app.state.content_watch is not None:
+            await app.state.content_watch.stop()
+        if app.state.background_lock is not None:
+            app.state.background_lock.release()
+        await chat.close_chat_client(app)
+
+
 # FastAPIアプリケーションの作成
 app = FastAPI(
     title="Nook API",
     description="パーソナル情報ハブのAPI",
     version="0.1.0",
+    lifespan=lifespan,
     responses={422: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
 )
 
-# Bot保護ミドルウェアの追加（最初に実行）
+# レート制限ミドルウェアの追加（Bot保護の内側で実行）
+app.middleware("http")(rate_limit_middleware)
+
+# Bot保護ミドルウェアの追加（メトリクスの記録を除いて最初に実行）
 app.middleware("http")(bot_protection_middleware)
 
 # エラーハンドリングミドルウェアの追加
 app.middleware("http")(error_handler_middleware)
 
+# Server-Timing ミドルウェアの追加（段階ごとの所要時間をヘッダーで返す）
+app.middleware("http")(server_timing_middleware)
+
+# メトリクスミドルウェアの追加（Bot保護・レート制限で拒否したリクエストも記録する）
+app.middleware("http")(metrics_middleware)
+
+# レスポンス圧縮ミドルウェアの追加（gzip / brotli。SSEなどのストリーミングは圧縮しない）
+app.add_middleware(CompressionMiddleware)
+
 # CORSミドルウェアの設定
 app.add_middleware(
     CORSMiddleware,
@@ -44,7 +121,7 @@ app.add_middleware(
 # エラーハンドラーの登録
 @app.exception_handler(NookHTTPException)
 async def nook_exception_handler(request: Request, exc: NookHTTPException):
-    error_metrics.record_error(exc.error_type, {"status_code": exc.status_code, "detail": exc.detail})
+    error_metrics.record_error(exc.error_type, {"status_code": exc.status_code, "detail": exc.detail}, service="api")
 
     return handle_exception(exc, request)
 
@@ -53,9 +130,12 @@ async def nook_exception_handler(request: Request, exc: NookHTTPException):
 app.include_router(content.router, prefix="/api")
 app.include_router(weather.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
+app.include_router(events.router, prefix="/api")
+app.include_router(metrics.router)
 
 
-@app.get("/")
+@app.get("/", response_class=FastJSONResponse)
 async def root():
     """
     ルートエンドポイント。
@@ -72,7 +152,7 @@ async def root():
     }
 
 
-@app.get("/health")
+@app.get("/health", response_class=FastJSONResponse)
 async def health():
     """
     ヘルスチェックエンドポイント。
@@ -85,7 +165,7 @@ async def health():
     return {"status": "healthy"}
 
 
-@app.get("/api/health/errors", include_in_schema=False)
+@app.get("/api/health/errors", include_in_schema=False, response_class=FastJSONResponse)
 async def get_error_stats():
     """
     エラー統計を取得するエンドポイント。
@@ -96,3 +176,25 @@ async def get_error_stats():
         過去60分間のエラー統計。
     """
     return error_metrics.get_error_stats()
+
+
+@app.get("/api/health/alerts", include_in_schema=False, response_class=FastJSONResponse)
+async def get_error_alerts():
+    """
+    エラー率のしきい値を超えたエラーを取得するエンドポイント。
+
+    しきい値は ERROR_ALERT_THRESHOLDS（エラーの種類ごとの1分あたりの件数の上限）で設定します。
+    エラーの件数はワーカープロセスごとに数えるため、複数ワーカーで起動した場合は
+    応答したワーカーが記録したエラーだけが対象になります（しきい値もワーカーごとの件数と比較します）。
+
+    Returns
+    -------
+    dict
+        status（"ok" または "alert"）と、しきい値を超えたエラーの一覧。
+    """
+    thresholds = [
+        AlertThreshold(error_type=error_type, limit=limit)
+        for error_type, limit in BaseConfig().ERROR_ALERT_THRESHOLDS.items()
+    ]
+    alerts = error_metrics.check_alerts(thresholds)
+    return {"status": "alert" if alerts else "ok", "alerts": alerts}
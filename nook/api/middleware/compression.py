@@ -0,0 +1,259 @@
+"""
+レスポンス圧縮ミドルウェア。
+
+Accept-Encoding に応じて、一定以上の大きさのレスポンスを brotli
+（インストールされている場合）または gzip で圧縮する。日本語の要約が多い
+コンテンツのJSONはよく縮むため、転送量を大きく減らせる。
+
+以下のレスポンスは圧縮せずにそのまま流す。
+
+- 既に Content-Encoding が付いたもの（事前圧縮したファイルなど）
+- ``text/event-stream`` など圧縮対象外の Content-Type（逐次送信を妨げない）
+- しきい値未満のレスポンス
+
+複数回に分けて送るレスポンスは、しきい値に達した時点から分割ごとに圧縮して
+フラッシュするため、全体を溜め込まない。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli が入っていない環境では gzip のみ
+    brotli = None
+
+# 圧縮するレスポンスの最小バイト数（小さいものは圧縮しても得にならない）
+DEFAULT_MINIMUM_SIZE = 1024
+# この大きさ以上はスレッドで圧縮し、イベントループを止めない
+THREAD_MINIMUM_SIZE = 256 * 1024
+# 動的なレスポンス向けの圧縮レベル（速度と圧縮率の釣り合い）
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# 圧縮する Content-Type（text/event-stream は逐次送信のため除く）
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/problem+json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+def accepted_encodings(accept_encoding: str | None) -> set[str]:
+    """
+    Accept-Encoding ヘッダーから受け入れ可能（q > 0）なエンコーディングを取り出す。
+
+    Parameters
+    ----------
+    accept_encoding : str | None
+        Accept-Encoding ヘッダー。
+
+    Returns
+    -------
+    set[str]
+        小文字のエンコーディング名の集合。
+    """
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        name, *params = (token.strip() for token in part.split(";"))
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            accepted.add(name.lower())
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """
+    クライアントが受け入れる圧縮方式を選ぶ（brotli を優先）。
+
+    Parameters
+    ----------
+    accept_encoding : str | None
+        Accept-Encoding ヘッダー。
+
+    Returns
+    -------
+    str | None
+        "br" または "gzip"。どちらも使えない場合は None。
+    """
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class StreamEncoder:
+    """
+    ボディを分割して受け取りながら圧縮するエンコーダー。
+
+    分割ごとにフラッシュするため、ストリーミングレスポンスを溜め込まずに送れる。
+
+    Parameters
+    ----------
+    encoding : str
+        "br" または "gzip"。
+    """
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        """
+        データを圧縮し、ここまでの出力をフラッシュして返す。
+
+        Parameters
+        ----------
+        data : bytes
+            追加のデータ。
+        final : bool
+            最後のデータの場合は True（圧縮ストリームを終端する）。
+
+        Returns
+        -------
+        bytes
+            送信する圧縮済みのバイト列。
+        """
+        if self.encoding == "br":
+            output = self._compressor.process(data)
+            return output + (self._compressor.finish() if final else self._compressor.flush())
+        output = self._compressor.compress(data)
+        return output + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """ボディ全体を指定の方式で圧縮する。"""
+    return StreamEncoder(encoding).compress(body, final=True)
+
+
+def _is_compressible(status: int, headers: Headers) -> bool:
+    """レスポンスが圧縮の対象か判定する。"""
+    if status < 200 or status >= 300 or status in (204, 206):
+        return False
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    if content_type.startswith(EXCLUDED_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    gzip / brotli のレスポンス圧縮ミドルウェア。
+
+    Parameters
+    ----------
+    app : ASGIApp
+        ラップするアプリケーション。
+    minimum_size : int, default=DEFAULT_MINIMUM_SIZE
+        圧縮するレスポンスの最小バイト数。
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = DEFAULT_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        pending: list[bytes] = []
+        encoder: StreamEncoder | None = None
+        passthrough = False
+
+        async def encode(data: bytes, final: bool) -> bytes:
+            if len(data) >= THREAD_MINIMUM_SIZE:
+                return await asyncio.to_thread(encoder.compress, data, final=final)
+            return encoder.compress(data, final=final)
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                if not _is_compressible(message["status"], Headers(raw=message["headers"])):
+                    passthrough = True
+                    await send(message)
+                    return
+                # ボディがしきい値に達するか終わるまでヘッダーの送信を保留する
+                start = message
+                MutableHeaders(scope=start).add_vary_header("Accept-Encoding")
+                return
+
+            if start is None or message["type"] != "http.response.body":
+                passthrough = True
+                if start is not None:
+                    await send(start)
+                    if pending:
+                        await send({"type": "http.response.body", "body": b"".join(pending), "more_body": True})
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is not None:
+                await send(
+                    {"type": "http.response.body", "body": await encode(body, not more_body), "more_body": more_body}
+                )
+                return
+
+            pending.append(body)
+            size = sum(len(chunk) for chunk in pending)
+            if size < self.minimum_size:
+                if more_body:
+                    return
+                # 小さいレスポンスは圧縮しない
+                passthrough = True
+                await send(start)
+                await send({"type": "http.response.body", "body": b"".join(pending)})
+                return
+
+            encoder = StreamEncoder(encoding)
+            data = await encode(b"".join(pending), not more_body)
+            pending.clear()
+            headers = MutableHeaders(scope=start)
+            headers["Content-Encoding"] = encoding
+            if more_body:
+                # 分割して送る場合は全体の長さが分からないため chunked にする
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(data))
+            # 圧縮したボディは元のバイト列と異なるため、強いETagは弱いETagにする
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            await send(start)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
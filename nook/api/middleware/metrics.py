@@ -0,0 +1,72 @@
+"""
+リクエストのメトリクスを記録するミドルウェア。
+
+ルートのパステンプレート（例: ``/api/content/{source}``）ごとにリクエスト数と
+レイテンシを記録する。どのルートにも一致しないリクエスト（存在しないパスへの
+スキャンなど）は "unmatched" にまとめ、ラベルの種類が増え続けないようにする。
+"""
+
+import time
+from typing import Callable
+
+from fastapi import Request
+
+from nook.core.metrics import metrics
+
+REQUESTS = metrics.counter(
+    "nook_api_requests_total", "API requests by method, route and status.", ("method", "route", "status")
+)
+REQUEST_DURATION = metrics.histogram(
+    "nook_api_request_duration_seconds",
+    "API latency until the response headers are sent, by method and route.",
+    ("method", "route"),
+)
+
+
+def route_label(request: Request) -> str:
+    """
+    リクエストに一致したルートのパステンプレートを返す。
+
+    include_router の prefix を含まないパスを持つルートもあるため、実際のパスから
+    ルートの部分を取り除いた残りを prefix として補う。
+    """
+    route = request.scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    path = request.scope.get("path", "")
+    try:
+        rendered = getattr(route, "path_format", template).format(**request.scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    if rendered != path and path.endswith(rendered):
+        return path[: -len(rendered)] + template
+    return template
+
+
+async def metrics_middleware(request: Request, call_next: Callable):
+    """
+    リクエスト数とレイテンシを記録するミドルウェア。
+
+    Parameters
+    ----------
+    request : Request
+        FastAPIリクエスト
+    call_next : Callable
+        次のミドルウェア/ハンドラー
+
+    Returns
+    -------
+    Response
+        レスポンス
+    """
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = route_label(request)
+        REQUEST_DURATION.observe(time.perf_counter() - started, method=request.method, route=route)
+        REQUESTS.inc(method=request.method, route=route, status=status_code)
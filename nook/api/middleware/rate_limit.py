@@ -0,0 +1,394 @@
+"""
+レート制限ミドルウェア。
+
+クライアントIPごとに、全体のトークンバケットとルートごとのトークンバケットで
+リクエスト数を制限する。チャットはさらにOpenAIの利用量を抑えるため、
+クライアントごと・全体の1日あたりのトークン数の上限（クォータ）を設ける。
+上限を超えた場合は ``429 Too Many Requests`` と ``Retry-After`` を返す。
+
+クライアントIPは、信頼できるプロキシが X-Forwarded-For の右端に追加した
+アドレスから取り出す（RATE_LIMIT_TRUSTED_PROXIES 段）。クライアントが送った
+値では制限を回避できない。
+
+バケットと利用量は RateLimitStore に保存する。既定はプロセス内のメモリだが、
+複数ワーカーで動かす場合は同じインターフェースで共有のストアに差し替えられる。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from nook.core.config import BaseConfig
+from nook.core.errors.error_metrics import error_metrics
+
+logger = logging.getLogger(__name__)
+
+# メモリ上に保持するキーの上限（古いものから捨てる）
+MAX_TRACKED_KEYS = 10000
+# チャットのクォータを適用するパス
+CHAT_PATH_PREFIX = "/api/chat"
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    トークンバケットによる制限の設定。
+
+    Parameters
+    ----------
+    name : str
+        バケットのキーに使う名前。
+    capacity : int
+        バケットの容量（連続して受け付けるリクエスト数）。
+    per_minute : float
+        1分あたりに回復するトークン数。
+    path_prefix : str, default="/api"
+        適用するパスの接頭辞。
+    """
+
+    name: str
+    capacity: int
+    per_minute: float
+    path_prefix: str = "/api"
+
+    @property
+    def refill_per_second(self) -> float:
+        """1秒あたりに回復するトークン数。"""
+        return self.per_minute / 60
+
+    def matches(self, path: str) -> bool:
+        """パスがこの制限の対象か判定する。"""
+        return path == self.path_prefix or path.startswith(self.path_prefix.rstrip("/") + "/")
+
+
+class RateLimitStore(ABC):
+    """
+    トークンバケットと利用量の保存先。
+
+    複数ワーカーで制限を共有する場合は、このクラスを継承して
+    共有のバックエンド（SQLite、Redisなど）で実装する。
+    """
+
+    @abstractmethod
+    async def take(self, key: str, capacity: int, refill_per_second: float, cost: float = 1.0) -> float:
+        """
+        バケットからトークンを取り出す。
+
+        Parameters
+        ----------
+        key : str
+            バケットのキー。
+        capacity : int
+            バケットの容量。
+        refill_per_second : float
+            1秒あたりに回復するトークン数。
+        cost : float, default=1.0
+            取り出すトークン数。
+
+        Returns
+        -------
+        float
+            受け付けた場合は0.0。足りない場合は取り出さず、回復するまでの秒数。
+        """
+
+    @abstractmethod
+    async def get_usage(self, key: str) -> float:
+        """期限内の利用量を返す（記録がない場合は0.0）。"""
+
+    @abstractmethod
+    async def add_usage(self, key: str, amount: float, expires_at: float) -> float:
+        """
+        利用量を加算する。
+
+        Parameters
+        ----------
+        key : str
+            利用量のキー。
+        amount : float
+            加算する量。
+        expires_at : float
+            利用量をリセットする時刻（UNIX時間）。
+
+        Returns
+        -------
+        float
+            加算後の利用量。
+        """
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    プロセス内のメモリに保存するストア。
+
+    Parameters
+    ----------
+    max_keys : int, default=MAX_TRACKED_KEYS
+        保持するキーの上限。超えた場合は最も古く使われたキーから捨てる。
+    clock : Callable[[], float], default=time.monotonic
+        バケットの回復に使う時計。
+    """
+
+    def __init__(self, max_keys: int = MAX_TRACKED_KEYS, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._usage: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def _remember(self, table: OrderedDict, key: str, value: tuple[float, float]) -> None:
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.max_keys:
+            table.popitem(last=False)
+
+    async def take(self, key: str, capacity: int, refill_per_second: float, cost: float = 1.0) -> float:
+        async with self._lock:
+            now = self._clock()
+            tokens, updated = self._buckets.get(key, (float(capacity), now))
+            tokens = min(float(capacity), tokens + (now - updated) * refill_per_second)
+            if tokens >= cost:
+                self._remember(self._buckets, key, (tokens - cost, now))
+                return 0.0
+            self._remember(self._buckets, key, (tokens, now))
+            if refill_per_second <= 0:
+                return math.inf
+            return (cost - tokens) / refill_per_second
+
+    async def get_usage(self, key: str) -> float:
+        async with self._lock:
+            amount, expires_at = self._usage.get(key, (0.0, 0.0))
+            return amount if expires_at > time.time() else 0.0
+
+    async def add_usage(self, key: str, amount: float, expires_at: float) -> float:
+        async with self._lock:
+            current, current_expires_at = self._usage.get(key, (0.0, 0.0))
+            if current_expires_at <= time.time():
+                current = 0.0
+            self._remember(self._usage, key, (current + amount, expires_at))
+            return current + amount
+
+
+def _next_reset(now: datetime | None = None) -> datetime:
+    """日次クォータがリセットされる時刻（翌日0時UTC）を返す。"""
+    now = now or datetime.now(UTC)
+    return datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=UTC)
+
+
+class RequestRateLimiter:
+    """
+    リクエストのレート制限とチャットのクォータ。
+
+    Parameters
+    ----------
+    rules : list[RateLimitRule]
+        ルートごとの制限。パスに一致する最初のものを適用する。
+    client_rule : RateLimitRule | None
+        ルートによらないクライアントIPごとの制限。
+    chat_daily_tokens : int, default=0
+        クライアントごとのチャットの1日あたりのトークン数の上限（0は無制限）。
+    chat_daily_total_tokens : int, default=0
+        全クライアント合計のチャットの1日あたりのトークン数の上限（0は無制限）。
+    store : RateLimitStore | None
+        バケットと利用量の保存先。None の場合はメモリ。
+    enabled : bool, default=True
+        False の場合は制限しない。
+    trusted_proxies : int, default=1
+        API の手前にある信頼できるリバースプロキシの数（0 は直接公開）。
+    """
+
+    def __init__(
+        self,
+        rules: list[RateLimitRule],
+        client_rule: RateLimitRule | None = None,
+        *,
+        chat_daily_tokens: int = 0,
+        chat_daily_total_tokens: int = 0,
+        store: RateLimitStore | None = None,
+        enabled: bool = True,
+        trusted_proxies: int = 1,
+    ):
+        self.rules = rules
+        self.client_rule = client_rule
+        self.chat_daily_tokens = chat_daily_tokens
+        self.chat_daily_total_tokens = chat_daily_total_tokens
+        self.store = store or MemoryRateLimitStore()
+        self.enabled = enabled
+        self.trusted_proxies = trusted_proxies
+
+    @classmethod
+    def from_config(cls, config: BaseConfig, store: RateLimitStore | None = None) -> RequestRateLimiter:
+        """設定から作成する。"""
+        return cls(
+            rules=[
+                RateLimitRule(
+                    "chat", config.CHAT_RATE_LIMIT_BURST, config.CHAT_RATE_LIMIT_PER_MINUTE, CHAT_PATH_PREFIX
+                ),
+                RateLimitRule(
+                    "content", config.CONTENT_RATE_LIMIT_BURST, config.CONTENT_RATE_LIMIT_PER_MINUTE, "/api/content"
+                ),
+            ],
+            client_rule=RateLimitRule("client", config.RATE_LIMIT_BURST, config.RATE_LIMIT_PER_MINUTE),
+            chat_daily_tokens=config.CHAT_DAILY_TOKEN_QUOTA,
+            chat_daily_total_tokens=config.CHAT_DAILY_TOTAL_TOKEN_QUOTA,
+            store=store,
+            enabled=config.RATE_LIMIT_ENABLED,
+            trusted_proxies=config.RATE_LIMIT_TRUSTED_PROXIES,
+        )
+
+    def client_key(self, request: Request) -> str:
+        """
+        制限・クォータのキーにするクライアントIPを返す。
+
+        X-Forwarded-For の左側はクライアントが任意の値を送れるため使わない。
+        各プロキシは接続元のアドレスを右端に追加するため、右から
+        ``trusted_proxies`` 番目が最も外側のプロキシに接続したアドレスになる。
+        ヘッダーの段数が足りない（プロキシを経由していない）場合は接続元を使う。
+
+        Parameters
+        ----------
+        request : Request
+            FastAPIリクエスト
+
+        Returns
+        -------
+        str
+            クライアントIPアドレス
+        """
+        if self.trusted_proxies > 0:
+            forwarded_for = request.headers.get("X-Forwarded-For", "")
+            hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+            if len(hops) >= self.trusted_proxies:
+                return hops[-self.trusted_proxies]
+        return request.client.host if request.client else "unknown"
+
+    def _quota_keys(self, client_ip: str, now: datetime) -> list[tuple[str, int]]:
+        day = now.strftime("%Y-%m-%d")
+        keys = []
+        if self.chat_daily_tokens > 0:
+            keys.append((f"chat-tokens:{day}:{client_ip}", self.chat_daily_tokens))
+        if self.chat_daily_total_tokens > 0:
+            keys.append((f"chat-tokens:{day}:*", self.chat_daily_total_tokens))
+        return keys
+
+    async def check(self, path: str, client_ip: str) -> tuple[str, float] | None:
+        """
+        リクエストを受け付けるか判定する。
+
+        Parameters
+        ----------
+        path : str
+            リクエストのパス。
+        client_ip : str
+            クライアントIPアドレス。
+
+        Returns
+        -------
+        tuple[str, float] | None
+            受け付ける場合は None。制限する場合は理由（"rate_limited" または
+            "quota_exceeded"）と、再試行できるまでの秒数。
+        """
+        if not self.enabled:
+            return None
+
+        if path.startswith(CHAT_PATH_PREFIX):
+            now = datetime.now(UTC)
+            for key, limit in self._quota_keys(client_ip, now):
+                if await self.store.get_usage(key) >= limit:
+                    return "quota_exceeded", (_next_reset(now) - now).total_seconds()
+
+        # ルートの制限を先に確認し、拒否したリクエストでクライアント全体の枠を消費しない
+        rules = [rule for rule in self.rules if rule.matches(path)][:1]
+        if self.client_rule is not None and self.client_rule.matches(path):
+            rules.append(self.client_rule)
+        for rule in rules:
+            wait = await self.store.take(f"{rule.name}:{client_ip}", rule.capacity, rule.refill_per_second)
+            if wait > 0:
+                return "rate_limited", wait
+        return None
+
+    async def record_chat_usage(self, client_ip: str, tokens: int) -> None:
+        """
+        チャットで消費したトークン数をクォータに加算する。
+
+        Parameters
+        ----------
+        client_ip : str
+            クライアントIPアドレス。
+        tokens : int
+            消費したトークン数（プロンプトと応答の合計）。
+        """
+        if not self.enabled or tokens <= 0:
+            return
+        now = datetime.now(UTC)
+        expires_at = _next_reset(now).timestamp()
+        for key, _ in self._quota_keys(client_ip, now):
+            await self.store.add_usage(key, tokens, expires_at)
+
+
+# アプリケーションで共有するレート制限
+rate_limiter = RequestRateLimiter.from_config(BaseConfig())
+
+
+def rate_limit_response(reason: str, retry_after: float) -> JSONResponse:
+    """
+    429 レスポンスを作成する。
+
+    Parameters
+    ----------
+    reason : str
+        "rate_limited" または "quota_exceeded"。
+    retry_after : float
+        再試行できるまでの秒数。
+
+    Returns
+    -------
+    JSONResponse
+        ``Retry-After`` ヘッダー付きのレスポンス。
+    """
+    if reason == "quota_exceeded":
+        message = "Daily chat quota exceeded"
+    else:
+        message = "Too many requests"
+    seconds = max(1, math.ceil(retry_after)) if math.isfinite(retry_after) else 86400
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"error": {"type": reason, "message": message, "status_code": 429}},
+        headers={"Retry-After": str(seconds)},
+    )
+
+
+async def rate_limit_middleware(request: Request, call_next: Callable):
+    """
+    レート制限ミドルウェア。
+
+    Parameters
+    ----------
+    request : Request
+        FastAPIリクエスト
+    call_next : Callable
+        次のミドルウェア/ハンドラー
+
+    Returns
+    -------
+    Response
+        レスポンス（制限した場合は 429）
+    """
+    client_ip = rate_limiter.client_key(request)
+    limited = await rate_limiter.check(request.url.path, client_ip)
+    if limited is not None:
+        reason, retry_after = limited
+        logger.warning(f"Rate limit exceeded: IP={client_ip}, Path={request.url.path}, Reason={reason}")
+        error_metrics.record_error(reason, {"status_code": 429, "path": request.url.path}, service="api")
+        return rate_limit_response(reason, retry_after)
+    return await call_next(request)
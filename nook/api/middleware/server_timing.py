@@ -0,0 +1,188 @@
+"""
+Server-Timing ミドルウェア。
+
+リクエストごとにスパン（:func:`nook.core.metrics.span`）の記録を開始し、
+段階ごとの所要時間（ファイルの読み込み・JSONの解析・ソート・直列化など）を
+``Server-Timing`` ヘッダーで返す。ブラウザの開発者ツールでそのまま確認できる。
+
+しきい値より遅いリクエストはログに出力し、サンプリングしたリクエストは
+個々のスパンを Chrome のトレースイベント形式（chrome://tracing や Perfetto で
+開ける JSON）で保存する。コンテンツの読み込みはスレッドプールで並行に実行する
+ため、スレッドごとの cProfile ではなくスパンのタイムラインを保存する。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from fastapi import Request
+
+from nook.core.config import BaseConfig
+from nook.core.metrics.spans import RequestTimings, start_timings, stop_timings
+
+logger = logging.getLogger(__name__)
+
+# 保存するプロファイルの最大数（古いものから削除する）
+MAX_PROFILE_FILES = 100
+
+
+@dataclass(frozen=True)
+class ProfilingSettings:
+    """
+    Server-Timing とプロファイルの設定。
+
+    Parameters
+    ----------
+    enabled : bool
+        Server-Timing ヘッダーを返すかどうか。
+    slow_request_ms : float
+        遅いリクエストとしてログ・プロファイルの対象にする所要時間（ミリ秒）。
+    sample_rate : float
+        プロファイルを保存するリクエストの割合（0 は保存しない）。
+    profile_dir : Path
+        プロファイルの保存先。
+    max_profiles : int, default=MAX_PROFILE_FILES
+        保存するプロファイルの最大数。
+    """
+
+    enabled: bool
+    slow_request_ms: float
+    sample_rate: float
+    profile_dir: Path
+    max_profiles: int = MAX_PROFILE_FILES
+
+    @classmethod
+    def from_config(cls, config: BaseConfig) -> ProfilingSettings:
+        """設定から作成する。"""
+        return cls(
+            enabled=config.SERVER_TIMING_ENABLED,
+            slow_request_ms=config.PROFILE_SLOW_REQUEST_MS,
+            sample_rate=config.PROFILE_SAMPLE_RATE,
+            profile_dir=Path(config.PROFILE_DIR),
+        )
+
+
+settings = ProfilingSettings.from_config(BaseConfig())
+
+
+def _profile_name(request: Request) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", request.url.path).strip("_") or "root"
+    timestamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")
+    return f"{timestamp}-{request.method}-{slug[:80]}.json"
+
+
+def write_profile(
+    profile_dir: Path,
+    name: str,
+    timings: RequestTimings,
+    *,
+    metadata: dict,
+    max_profiles: int = MAX_PROFILE_FILES,
+) -> Path:
+    """
+    スパンのタイムラインを Chrome のトレースイベント形式で保存する。
+
+    Parameters
+    ----------
+    profile_dir : Path
+        保存先のディレクトリ。
+    name : str
+        ファイル名。
+    timings : RequestTimings
+        個々のスパンを保持した記録。
+    metadata : dict
+        トレースに添える情報（メソッド・パス・ステータス・所要時間）。
+    max_profiles : int, default=MAX_PROFILE_FILES
+        ディレクトリに残す最大数。
+
+    Returns
+    -------
+    Path
+        保存したファイルのパス。
+    """
+    events = [
+        {
+            "name": event.name,
+            "ph": "X",
+            "ts": round(event.start * 1_000_000, 1),
+            "dur": round(event.duration * 1_000_000, 1),
+            "pid": 0,
+            "tid": event.thread_id,
+        }
+        for event in timings.events
+    ]
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    path = profile_dir / name
+    path.write_text(json.dumps({"traceEvents": events, "metadata": metadata}), encoding="utf-8")
+
+    profiles = sorted(profile_dir.glob("*.json"))
+    for old in profiles[: max(0, len(profiles) - max_profiles)]:
+        old.unlink(missing_ok=True)
+    return path
+
+
+async def server_timing_middleware(request: Request, call_next: Callable):
+    """
+    段階ごとの所要時間を Server-Timing ヘッダーで返すミドルウェア。
+
+    所要時間はレスポンスヘッダーを返すまでの時間（ストリーミングの本文の
+    送信は含まない）。
+
+    Parameters
+    ----------
+    request : Request
+        FastAPIリクエスト
+    call_next : Callable
+        次のミドルウェア/ハンドラー
+
+    Returns
+    -------
+    Response
+        レスポンス
+    """
+    if not settings.enabled:
+        return await call_next(request)
+
+    sampled = settings.sample_rate > 0 and random.random() < settings.sample_rate  # noqa: S311  サンプリング用
+    timings, token = start_timings(keep_events=sampled)
+    try:
+        response = await call_next(request)
+    finally:
+        stop_timings(token)
+
+    total_ms = (time.perf_counter() - timings.started) * 1000
+    response.headers.append("Server-Timing", timings.server_timing(total_ms))
+
+    if total_ms >= settings.slow_request_ms:
+        logger.info(
+            f"Slow request: {request.method} {request.url.path} {response.status_code} "
+            f"{total_ms:.1f}ms ({timings.server_timing()})"
+        )
+        if sampled:
+            metadata = {
+                "method": request.method,
+                "path": request.url.path,
+                "status": response.status_code,
+                "total_ms": round(total_ms, 3),
+            }
+            try:
+                await asyncio.to_thread(
+                    write_profile,
+                    settings.profile_dir,
+                    _profile_name(request),
+                    timings,
+                    metadata=metadata,
+                    max_profiles=settings.max_profiles,
+                )
+            except OSError as e:
+                logger.warning(f"Failed to write request profile: {e}")
+    return response
@@ -5,6 +5,8 @@ APIリクエストとレスポンスのデータモデルを定義します。
 
 from pydantic import BaseModel, Field
 
+from nook.core.content.models import ContentItem, ContentResponse
+
 
 class ContentRequest(BaseModel):
     """
@@ -19,39 +21,262 @@ class ContentRequest(BaseModel):
     date: str | None = Field(None, description="取得する日付（YYYY-MM-DD形式）")
 
 
-class ContentItem(BaseModel):
+class BatchContentEntry(BaseModel):
+    """
+    一括取得の1件分の指定。
+
+    Parameters
+    ----------
+    source : str
+        データソース。
+    date : str, optional
+        取得する日付（YYYY-MM-DD形式）。省略時は単体取得と同様に最新日へフォールバック。
+    """
+
+    source: str = Field(..., description="データソース")
+    date: str | None = Field(None, description="取得する日付（YYYY-MM-DD形式）")
+
+
+class BatchContentRequest(BaseModel):
+    """
+    コンテンツ一括取得リクエスト。
+
+    Parameters
+    ----------
+    entries : List[BatchContentEntry]
+        取得する (source, date) の組のリスト。
+    """
+
+    entries: list[BatchContentEntry] = Field(
+        ..., min_length=1, max_length=50, description="取得する (source, date) の組のリスト"
+    )
+
+
+class BatchContentResult(BaseModel):
+    """
+    一括取得の1件分の結果。
+
+    Parameters
+    ----------
+    source : str
+        データソース。
+    date : str, optional
+        実際に返した日付（YYYY-MM-DD形式）。
+    status : int
+        単体取得した場合のHTTPステータスコード。
+    detail : str, optional
+        失敗時のエラー内容。
+    data : ContentResponse, optional
+        成功時のコンテンツレスポンス。
+    """
+
+    source: str = Field(..., description="データソース")
+    date: str | None = Field(None, description="実際に返した日付（YYYY-MM-DD形式）")
+    status: int = Field(..., description="単体取得した場合のHTTPステータスコード")
+    detail: str | None = Field(None, description="失敗時のエラー内容")
+    data: ContentResponse | None = Field(None, description="成功時のコンテンツレスポンス")
+
+
+class BatchContentResponse(BaseModel):
+    """
+    コンテンツ一括取得レスポンス。
+
+    Parameters
+    ----------
+    results : Dict[str, BatchContentResult]
+        ``"{source}:{date}"``（日付省略時は ``source``）をキーとする結果。
+    """
+
+    results: dict[str, BatchContentResult] = Field(..., description="エントリごとの結果")
+
+
+class SourceChanges(BaseModel):
+    """
+    1ソース・1日分の差分。
+
+    Parameters
+    ----------
+    source : str
+        データソース。
+    date : str
+        日付（YYYY-MM-DD形式）。
+    revision : int
+        この日付の最新の変更リビジョン。
+    items : List[ContentItem]
+        追加・更新された項目。
+    """
+
+    source: str = Field(..., description="データソース")
+    date: str = Field(..., description="日付（YYYY-MM-DD形式）")
+    revision: int = Field(..., description="この日付の最新の変更リビジョン")
+    items: list[ContentItem] = Field(..., description="追加・更新された項目")
+
+
+class ChangesResponse(BaseModel):
+    """
+    差分同期レスポンス。
+
+    Parameters
+    ----------
+    revision : int
+        次回の ``since`` に指定するリビジョン。
+    reset : bool
+        履歴が切り詰められていて差分を返せないため、全件の再取得が必要な場合にTrue。
+    changes : List[SourceChanges]
+        ``since`` より後に追加・更新された項目。
+    """
+
+    revision: int = Field(..., description="次回の since に指定するリビジョン")
+    reset: bool = Field(False, description="全件の再取得が必要な場合にTrue")
+    changes: list[SourceChanges] = Field(default_factory=list, description="since より後に追加・更新された項目")
+
+
+class AvailableDate(BaseModel):
+    """
+    利用可能な日付。
+
+    Parameters
+    ----------
+    date : str
+        日付（YYYY-MM-DD形式）。
+    item_count : int, optional
+        日次JSONのレコード数。Markdownのみの日付の場合はNone。
+    """
+
+    date: str = Field(..., description="日付（YYYY-MM-DD形式）")
+    item_count: int | None = Field(None, description="日次JSONのレコード数")
+
+
+class SourceDates(BaseModel):
+    """
+    1ソースの利用可能な日付。
+
+    Parameters
+    ----------
+    source : str
+        データソース。
+    dates : List[AvailableDate]
+        利用可能な日付（新しい順）。
+    """
+
+    source: str = Field(..., description="データソース")
+    dates: list[AvailableDate] = Field(default_factory=list, description="利用可能な日付（新しい順）")
+
+
+class AvailableDatesResponse(BaseModel):
     """
-    コンテンツ項目。
+    ソースごとの利用可能な日付のレスポンス。
 
     Parameters
     ----------
+    sources : List[SourceDates]
+        ソースごとの利用可能な日付。
+    """
+
+    sources: list[SourceDates] = Field(..., description="ソースごとの利用可能な日付")
+
+
+class SearchResult(BaseModel):
+    """
+    検索結果の1件。
+
+    Parameters
+    ----------
+    source : str
+        データソース。
+    date : str
+        日付（YYYY-MM-DD形式）。
+    id : str
+        項目ID（コンテンツAPIの ``id`` と同じ値）。
     title : str
         タイトル。
-    content : str
-        コンテンツ本文。
     url : str, optional
-        関連URL。
+        URL。
+    title_highlight : str
+        一致箇所を ``<mark>`` で囲んだタイトル（HTMLエスケープ済み）。
+    snippet : str
+        一致箇所を含む要約の抜粋（HTMLエスケープ済み）。
+    score : float
+        関連度（大きいほど関連が高い）。
+    """
+
+    source: str = Field(..., description="データソース")
+    date: str = Field(..., description="日付（YYYY-MM-DD形式）")
+    id: str = Field(..., description="項目ID")
+    title: str = Field(..., description="タイトル")
+    url: str | None = Field(None, description="URL")
+    title_highlight: str = Field(..., description="一致箇所を <mark> で囲んだタイトル（HTMLエスケープ済み）")
+    snippet: str = Field(..., description="一致箇所を含む要約の抜粋（HTMLエスケープ済み）")
+    score: float = Field(..., description="関連度（大きいほど関連が高い）")
+
+
+class SearchResponse(BaseModel):
+    """
+    検索レスポンス。
+
+    Parameters
+    ----------
+    query : str
+        検索語。
+    total : int
+        条件に一致する総件数。
+    items : List[SearchResult]
+        検索結果。
+    """
+
+    query: str = Field(..., description="検索語")
+    total: int = Field(..., description="条件に一致する総件数")
+    items: list[SearchResult] = Field(..., description="検索結果")
+
+
+class RelatedItem(BaseModel):
+    """
+    関連記事の1件。
+
+    Parameters
+    ----------
     source : str
-        ソース（reddit, hackernews, github, techfeed, paper）。
+        データソース。
+    date : str
+        日付（YYYY-MM-DD形式）。
+    id : str
+        項目ID。
+    title : str
+        タイトル。
+    url : str, optional
+        URL。
+    similarity : float
+        タイトル＋要約の推定類似度（0〜1）。
+    duplicate : bool
+        近似重複（同じ話題の別ソースの記事）と判定された場合はTrue。
     """
 
+    source: str = Field(..., description="データソース")
+    date: str = Field(..., description="日付（YYYY-MM-DD形式）")
+    id: str = Field(..., description="項目ID")
     title: str = Field(..., description="タイトル")
-    content: str = Field(..., description="コンテンツ本文")
-    url: str | None = Field(None, description="関連URL")
-    source: str = Field(..., description="ソース（reddit, hackernews, github, techfeed, paper）")
+    url: str | None = Field(None, description="URL")
+    similarity: float = Field(..., description="タイトル＋要約の推定類似度（0〜1）")
+    duplicate: bool = Field(False, description="近似重複と判定された場合はTrue")
 
 
-class ContentResponse(BaseModel):
+class RelatedResponse(BaseModel):
     """
-    コンテンツレスポンス。
+    関連記事レスポンス。
 
     Parameters
     ----------
-    items : List[ContentItem]
-        コンテンツ項目のリスト。
+    source : str
+        基準の項目のデータソース。
+    id : str
+        基準の項目ID。
+    items : List[RelatedItem]
+        類似度の高い順の関連記事。
     """
 
-    items: list[ContentItem] = Field(..., description="コンテンツ項目のリスト")
+    source: str = Field(..., description="基準の項目のデータソース")
+    id: str = Field(..., description="基準の項目ID")
+    items: list[RelatedItem] = Field(..., description="類似度の高い順の関連記事")
 
 
 class WeatherResponse(BaseModel):
@@ -100,12 +325,44 @@ class ChatRequest(BaseModel):
         チャット履歴。
     markdown : str, optional
         関連するマークダウンコンテキスト。
+    use_archive : bool, default=False
+        保存済みの記事アーカイブを検索して文脈に加えるかどうか（検索と入力トークンが
+        増えるため、必要なリクエストだけが明示的に有効にする）。
     """
 
     topic_id: str = Field(..., description="トピックID")
     message: str = Field(..., description="ユーザーメッセージ")
     chat_history: list[dict[str, str]] = Field(default_factory=list, description="チャット履歴")
     markdown: str | None = Field("", description="関連するマークダウンコンテキスト")
+    use_archive: bool = Field(False, description="保存済みの記事アーカイブを検索して文脈に加えるかどうか")
+
+
+class Citation(BaseModel):
+    """
+    チャットの回答が参照できる出典（アーカイブの記事）。
+
+    Parameters
+    ----------
+    index : int
+        回答中で ``[番号]`` として参照される番号。
+    source : str
+        データソース。
+    date : str
+        日付（YYYY-MM-DD形式）。
+    id : str
+        項目ID（コンテンツAPIの ``id``）。
+    title : str
+        タイトル。
+    url : str | None
+        URL。
+    """
+
+    index: int
+    source: str
+    date: str
+    id: str
+    title: str
+    url: str | None = None
 
 
 class ChatResponse(BaseModel):
@@ -116,6 +373,9 @@ class ChatResponse(BaseModel):
     ----------
     response : str
         アシスタントからのレスポンス。
+    citations : list[Citation]
+        文脈として渡したアーカイブの記事。
     """
 
     response: str = Field(..., description="アシスタントからのレスポンス")
+    citations: list[Citation] = Field(default_factory=list, description="文脈として渡したアーカイブの記事")
@@ -0,0 +1,87 @@
+"""保存済みアーカイブを検索してチャットの文脈を組み立てる（RAG）。
+
+全文検索インデックス（SQLite FTS5）の BM25 で質問に関連する項目を選び、
+tiktoken で数えたトークン予算に収まる分だけ番号付きの出典として並べる。
+モデルには回答で使った出典を ``[番号]`` で示すよう指示する。
+"""
+
+from __future__ import annotations
+
+from nook.api.models.schemas import Citation
+from nook.core.search import Passage
+from nook.core.utils.tokens import count_tokens, truncate_to_tokens
+
+# 文脈に使うトークン数の上限
+RAG_TOKEN_BUDGET = 1500
+# BM25 で取り出す候補数
+RAG_CANDIDATES = 20
+# 検索対象とする直近の日数
+RAG_LOOKBACK_DAYS = 30
+# 残り予算がこれ未満なら、要約を切り詰めて入れずに打ち切る
+MIN_PASSAGE_TOKENS = 48
+
+ARCHIVE_INSTRUCTION = (
+    "以下は保存済みの記事アーカイブから質問に関連しそうなものを検索した結果です。"
+    "回答に利用した場合は、該当する記事を [1] のように番号で示してください。"
+    "関係のない記事は無視してください。"
+)
+
+
+def _format_passage(index: int, passage: Passage, text: str) -> str:
+    header = f"[{index}] {passage.title}（{passage.source}, {passage.date}）"
+    lines = [header]
+    if passage.url:
+        lines.append(passage.url)
+    if text:
+        lines.append(text)
+    return "\n".join(lines)
+
+
+def build_archive_context(passages: list[Passage], token_budget: int = RAG_TOKEN_BUDGET) -> tuple[str, list[Citation]]:
+    """
+    関連度順の項目から、トークン予算に収まる文脈と出典を組み立てる。
+
+    関連度の高い順に詰め、入りきらない要約は残りの予算に合わせて切り詰める。
+
+    Parameters
+    ----------
+    passages : list[Passage]
+        関連度の高い順の項目。
+    token_budget : int, default=RAG_TOKEN_BUDGET
+        文脈（指示文を含む）に使うトークン数の上限。
+
+    Returns
+    -------
+    tuple[str, list[Citation]]
+        システムプロンプトに追加する文脈と、その番号に対応する出典。
+        項目がない場合は空文字列と空リスト。
+    """
+    remaining = token_budget - count_tokens(ARCHIVE_INSTRUCTION)
+    blocks: list[str] = []
+    citations: list[Citation] = []
+    for passage in passages:
+        index = len(citations) + 1
+        block = _format_passage(index, passage, passage.text)
+        tokens = count_tokens(block) + 1
+        if tokens > remaining:
+            header_tokens = count_tokens(_format_passage(index, passage, "")) + 1
+            if remaining - header_tokens < MIN_PASSAGE_TOKENS:
+                break
+            block = _format_passage(index, passage, truncate_to_tokens(passage.text, remaining - header_tokens - 1))
+            tokens = count_tokens(block) + 1
+        blocks.append(block)
+        remaining -= tokens
+        citations.append(
+            Citation(
+                index=index,
+                source=passage.source,
+                date=passage.date,
+                id=passage.item_id,
+                title=passage.title,
+                url=passage.url or None,
+            )
+        )
+
+    if not blocks:
+        return "", []
+    return ARCHIVE_INSTRUCTION + "\n\n" + "\n\n".join(blocks), citations
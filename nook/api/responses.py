@@ -0,0 +1,48 @@
+"""JSONレスポンスの高速な直列化。
+
+orjson がインストールされている場合は orjson で、ない場合は標準の json で
+（非ASCII文字をエスケープせず、区切りの空白なしで）直列化する。
+
+response_model を指定したエンドポイントは FastAPI が Pydantic のコア（Rust）で
+直接JSONに直列化するため、ここでは辞書などを手で組み立てて返す経路に使う。
+FastJSONResponse を default_response_class に指定すると、その高速経路が
+使われなくなる点に注意する。
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson が入っていない環境では標準の json を使う
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    値をUTF-8のJSONバイト列に直列化する。
+
+    Parameters
+    ----------
+    content : Any
+        直列化する値（辞書・リスト・文字列・数値など）。
+
+    Returns
+    -------
+    bytes
+        区切りの空白を含まないJSON。
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """dumps で直列化するJSONレスポンス。"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -3,32 +3,198 @@
 チャット機能のエンドポイントを提供します。
 """
 
+import json
+import logging
 import os
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from typing import Annotated
 
 from dotenv import load_dotenv
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
-from nook.api.models.schemas import ChatRequest, ChatResponse
+from nook.api.middleware.rate_limit import rate_limiter
+from nook.api.models.schemas import ChatRequest, ChatResponse, Citation
+from nook.api.rag import RAG_CANDIDATES, RAG_LOOKBACK_DAYS, RAG_TOKEN_BUDGET, build_archive_context
+from nook.api.routers import search
+from nook.core.clients.context_window import ContextBudget, build_chat_context, message_tokens
 from nook.core.clients.gpt_client import GPTClient
+from nook.core.config import BaseConfig
+from nook.core.content.builder import run_io
+from nook.core.utils.tokens import count_tokens
 
 # 環境変数の読み込み
 load_dotenv(".env.production")
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/chat",
     tags=["chat"],
 )
 
+DEMO_RESPONSE = (
+    "申し訳ありませんが、OPENAI_API_KEYが設定されていないため、実際の応答ができません。環境変数を設定してください。"
+)
+SYSTEM_PROMPT = "あなたは親切なアシスタントです。ユーザーが提供したコンテンツについて質問に答えてください。"
+CHAT_TEMPERATURE = 0.7
+CHAT_MAX_TOKENS = 1000
+# GPT呼び出しのメトリクスに記録するサービス名（収集処理のサービスと区別する）
+GPT_SERVICE_NAME = "api"
+
+_config = BaseConfig()
+# チャット履歴と添付Markdownに使うトークン予算
+context_budget = ContextBudget(
+    history_tokens=_config.CHAT_HISTORY_TOKENS,
+    markdown_tokens=_config.CHAT_MARKDOWN_TOKENS,
+)
+
+
+def create_chat_client() -> GPTClient | None:
+    """
+    アプリケーションで共有するチャット用のGPTClientを作成します。
+
+    Returns
+    -------
+    GPTClient | None
+        作成したクライアント。APIキーが未設定か、作成に失敗した場合は None
+        （最初のリクエストで改めて作成を試みる）。
+    """
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    try:
+        return GPTClient(api_key=api_key)
+    except Exception as e:
+        logger.warning(f"Failed to create chat client at startup: {e}")
+        return None
+
+
+async def close_chat_client(app: FastAPI) -> None:
+    """共有しているチャット用クライアントの接続を閉じます。"""
+    client = getattr(app.state, "chat_client", None)
+    app.state.chat_client = None
+    if client is not None:
+        await client.aclose()
+
+
+def get_chat_client(request: Request) -> GPTClient | None:
+    """
+    共有のチャット用クライアントを返します（FastAPIの依存関係）。
+
+    クライアントは lifespan で作成したものを再利用し、まだない場合のみ作成して保持します。
+    APIキーが未設定の場合は None を返します。
+    """
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    client = getattr(request.app.state, "chat_client", None)
+    if client is None or client.api_key != api_key:
+        try:
+            client = GPTClient(api_key=api_key)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"チャットリクエストの処理中にエラーが発生しました: {str(e)}",
+            ) from e
+        request.app.state.chat_client = client
+    return client
+
+
+# 共有のチャット用クライアント（APIキーが未設定の場合は None）
+ChatClient = Annotated[GPTClient | None, Depends(get_chat_client)]
+
+
+async def _archive_context(query: str) -> tuple[str, list[Citation]]:
+    """
+    直近の保存済みアーカイブから質問に関連する記事を検索し、文脈と出典を返します。
+
+    検索インデックスは収集処理が保存時に更新し、それ以外のファイルもバックグラウンドで
+    一定間隔ごとにストレージと突き合わせます（リクエスト時には同期しません）。検索に失敗した場合は
+    文脈なしで回答できるよう空の結果を返します。
+    """
+    today = datetime.now()
+    start = (today - timedelta(days=RAG_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+    try:
+        passages = await run_io(
+            search._search_index().retrieve, query, start=start, end=today.strftime("%Y-%m-%d"), limit=RAG_CANDIDATES
+        )
+    except Exception as e:
+        logger.warning(f"Failed to retrieve archive context for chat: {e}")
+        return "", []
+    return build_archive_context(passages, RAG_TOKEN_BUDGET)
+
+
+async def _build_prompt(request: ChatRequest) -> tuple[list[dict[str, str]], str, list[Citation]]:
+    """
+    チャットリクエストから、モデルに渡す履歴・システムプロンプト・出典を組み立てます。
+
+    履歴と添付のMarkdownはトークン予算に収めます。予算を超えた古い発言は要約に
+    畳み込み、長いMarkdownは質問に関連する部分だけを残します。
+
+    Returns
+    -------
+    tuple[list[dict[str, str]], str, list[Citation]]
+        整形済みのチャット履歴、システムプロンプト、文脈に加えたアーカイブの記事。
+    """
+    # チャット履歴の整形
+    formatted_history = []
+    for msg in request.chat_history:
+        formatted_history.append({"role": msg.get("role", "user"), "content": msg.get("content", "")})
+    context = build_chat_context(formatted_history, request.markdown, request.message, context_budget)
+
+    # システムプロンプトの作成
+    system_prompt = SYSTEM_PROMPT
+    if context.markdown:
+        note = "（長いため質問に関連する部分のみを抜粋しています）" if context.markdown_truncated else ""
+        system_prompt += f"\n\n以下のコンテンツに基づいて回答してください{note}:\n\n{context.markdown}"
+
+    # 保存済みアーカイブから関連記事を検索して文脈に加える
+    citations: list[Citation] = []
+    if request.use_archive:
+        archive_context, citations = await _archive_context(request.message)
+        if archive_context:
+            system_prompt += f"\n\n{archive_context}"
+    return context.messages, system_prompt, citations
+
+
+async def _record_usage(
+    http_request: Request, messages: list[dict[str, str]], system_prompt: str, response: str
+) -> None:
+    """
+    プロンプトと応答のトークン数を、クライアントのチャットのクォータに加算します。
+
+    記録に失敗しても応答は返せるよう、例外はログに残すだけにします。
+    """
+    tokens = count_tokens(system_prompt) + sum(message_tokens(message) for message in messages) + count_tokens(response)
+    try:
+        await rate_limiter.record_chat_usage(rate_limiter.client_key(http_request), tokens)
+    except Exception as e:
+        logger.warning(f"Failed to record chat usage: {e}")
+
+
+def _sse(event: str, data: object) -> bytes:
+    """Server-Sent Events の1イベントを直列化します。"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode()
+
 
 @router.post("", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
+async def chat(request: ChatRequest, http_request: Request, client: ChatClient) -> ChatResponse:
     """
     チャットメッセージを処理し、レスポンスを返します。
 
+    共有の非同期クライアントで呼び出すため、応答の生成中も他のリクエストを処理できます。
+    消費したトークン数はクライアントの1日あたりのクォータに加算します。
+
     Parameters
     ----------
     request : ChatRequest
         チャットリクエスト
+    http_request : Request
+        HTTPリクエスト（クォータのクライアントの判定に使用）
+    client : GPTClient | None
+        共有のチャット用クライアント（APIキーが未設定の場合は None）
 
     Returns
     -------
@@ -40,40 +206,97 @@ async def chat(request: ChatRequest) -> ChatResponse:
     HTTPException
         APIキーが設定されていない場合や、APIリクエストに失敗した場合
     """
-    # APIキーの確認
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+    if client is None:
         # デモモード: APIキーがない場合はダミーレスポンスを返す
-        return ChatResponse(
-            response="申し訳ありませんが、OPENAI_API_KEYが設定されていないため、実際の応答ができません。環境変数を設定してください。"
-        )
+        return ChatResponse(response=DEMO_RESPONSE)
 
     try:
-        # GPTクライアントの初期化
-        client = GPTClient(api_key=api_key)
-
-        # チャット履歴の整形
-        formatted_history = []
-        for msg in request.chat_history:
-            formatted_history.append({"role": msg.get("role", "user"), "content": msg.get("content", "")})
-
-        # システムプロンプトの作成
-        system_prompt = "あなたは親切なアシスタントです。ユーザーが提供したコンテンツについて質問に答えてください。"
-        if request.markdown:
-            system_prompt += f"\n\n以下のコンテンツに基づいて回答してください:\n\n{request.markdown}"
+        formatted_history, system_prompt, citations = await _build_prompt(request)
 
         # GPT APIを呼び出し
-        response = client.chat(
+        response = await client.chat_async(
             messages=formatted_history,
             system=system_prompt,
-            temperature=0.7,
-            max_tokens=1000,
+            temperature=CHAT_TEMPERATURE,
+            max_tokens=CHAT_MAX_TOKENS,
+            service_name=GPT_SERVICE_NAME,
         )
+        await _record_usage(http_request, formatted_history, system_prompt, response)
 
-        return ChatResponse(response=response)
+        return ChatResponse(response=response, citations=citations)
 
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"チャットリクエストの処理中にエラーが発生しました: {str(e)}",
         ) from e
+
+
+async def _stream_events(request: ChatRequest, client: GPTClient | None, http_request: Request) -> AsyncIterator[bytes]:
+    """ストリーミング応答のイベント列を生成します。"""
+    if client is None:
+        yield _sse("citations", [])
+        yield _sse("delta", {"text": DEMO_RESPONSE})
+        yield _sse("done", {})
+        return
+
+    try:
+        formatted_history, system_prompt, citations = await _build_prompt(request)
+        yield _sse("citations", [citation.model_dump() for citation in citations])
+
+        tokens = client.stream_chat(
+            messages=formatted_history,
+            system=system_prompt,
+            temperature=CHAT_TEMPERATURE,
+            max_tokens=CHAT_MAX_TOKENS,
+            service_name=GPT_SERVICE_NAME,
+        )
+        generated: list[str] = []
+        try:
+            async for text in tokens:
+                # 切断されたクライアントのために生成を続けない
+                if await http_request.is_disconnected():
+                    logger.info("Chat stream client disconnected; cancelling generation")
+                    return
+                generated.append(text)
+                yield _sse("delta", {"text": text})
+        finally:
+            await tokens.aclose()
+            # 途中で切断した場合も、生成済みの分はクォータに加算する
+            await _record_usage(http_request, formatted_history, system_prompt, "".join(generated))
+    except Exception as e:
+        logger.warning(f"Chat stream failed: {e}")
+        yield _sse("error", {"detail": f"チャットリクエストの処理中にエラーが発生しました: {str(e)}"})
+        return
+    yield _sse("done", {})
+
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest, http_request: Request, client: ChatClient) -> StreamingResponse:
+    """
+    チャットの応答を Server-Sent Events で生成されたそばから返します。
+
+    最初に ``citations`` イベントで文脈に加えたアーカイブの記事を送り、続いて
+    応答の断片ごとに ``delta`` イベント（``{"text": ...}``）、最後に ``done`` イベントを
+    送ります。失敗した場合は ``error`` イベントで終了します。クライアントが切断した
+    場合は上流の生成を打ち切ります。
+
+    Parameters
+    ----------
+    request : ChatRequest
+        チャットリクエスト
+    http_request : Request
+        HTTPリクエスト（切断の検知に使用）
+    client : GPTClient | None
+        共有のチャット用クライアント（APIキーが未設定の場合は None）
+
+    Returns
+    -------
+    StreamingResponse
+        text/event-stream のストリーミングレスポンス。
+    """
+    return StreamingResponse(
+        _stream_events(request, client, http_request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,369 +1,764 @@
 """コンテンツAPIルーター。"""
 
-from datetime import datetime
-
-from fastapi import APIRouter, HTTPException, Response
-
-from nook.api.models.schemas import ContentItem, ContentResponse
+import asyncio
+import base64
+import binascii
+import json
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+
+from nook.api.middleware.compression import accepted_encodings
+from nook.api.models.schemas import (
+    AvailableDate,
+    AvailableDatesResponse,
+    BatchContentEntry,
+    BatchContentRequest,
+    BatchContentResponse,
+    ChangesResponse,
+    SourceChanges,
+    SourceDates,
+)
+from nook.api.responses import dumps
 from nook.core.config import BaseConfig
-from nook.core.storage import LocalStorage
-from nook.services.explorers.trendradar.utils import parse_popularity_score
+from nook.core.content import builder
+from nook.core.content.builder import run_io
+from nook.core.content.cache import CachedPayload, ContentCache, build_payload, etag_matches, file_signature
+from nook.core.content.models import ContentItem, ContentResponse, StructuredResponse
+from nook.core.content.publishing import publish_ranking, published_store
+from nook.core.content.sources import (
+    RANKED_SOURCE,
+    SOURCE_MAPPING,
+    service_dir_name,
+    source_file_path,
+    uses_json,
+)
+from nook.core.metrics.spans import span
+from nook.core.storage import ChangeLog, DateManifest, LocalStorage, SharedCache
+from nook.core.storage.change_log import record_key
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 storage = LocalStorage(BaseConfig().DATA_DIR)
 
-# 論文要約の質問文を読みやすいタイトルに変換するマッピング
-PAPER_SUMMARY_TITLE_MAPPING = {
-    "1. 既存研究では何ができなかったのか": "🔍 研究背景と課題",
-    "2. どのようなアプローチでそれを解決しようとしたか": "💡 提案手法",
-    "3. 結果、何が達成できたのか": "🎯 主要な成果",
-    "4. 制限や問題点は何ですか。本文で言及されているやあなたが考えるものも含めて教えてください": "⚠️ 限界と今後の課題",
-    "5. 技術的な詳細について。技術者が読むことを想定したトーンで教えてください": "🔧 技術詳細",
-    "6. コストや物理的な詳細について教えてください。例えばトレーニングに使用したGPUの数や時間、データセット、モデルのサイズなど": "💻 計算リソースと規模",
-    "7. 参考文献のうち、特に参照すべきものを教えてください": "📚 重要な関連研究",
-    "8. この論文を140字以内で要約するとどうなりますか？": "📝 140字要約",
-}
-
-
-def convert_paper_summary_titles(content: str) -> str:
-    """論文要約の質問文を読みやすいタイトルに変換"""
-    result = content
-
-    # 各質問文を対応するタイトルに置換
-    for original_title in PAPER_SUMMARY_TITLE_MAPPING:
-        # 質問文の全体または一部にマッチするよう調整
-        # "4. 制限や問題点は何ですか。"のような質問文に対応
-        if original_title in result:
-            result = result.replace(original_title, PAPER_SUMMARY_TITLE_MAPPING[original_title])
-
-    return result
-
-
-SOURCE_MAPPING = {
-    "arxiv": "arxiv_summarizer",
-    "github": "github_trending",
-    "hacker-news": "hacker_news",
-    "tech-news": "tech_feed",
-    "business-news": "business_feed",
-    "zenn": "zenn_explorer",
-    "qiita": "qiita_explorer",
-    "note": "note_explorer",
-    "reddit": "reddit_explorer",
-    "4chan": "fourchan_explorer",
-    "5chan": "fivechan_explorer",
-    "trendradar-zhihu": "trendradar-zhihu",
-    "trendradar-juejin": "trendradar-juejin",
-    "trendradar-ithome": "trendradar-ithome",
-    "trendradar-36kr": "trendradar-36kr",
-    "trendradar-weibo": "trendradar-weibo",
-    "trendradar-toutiao": "trendradar-toutiao",
-    "trendradar-sspai": "trendradar-sspai",
-    "trendradar-producthunt": "trendradar-producthunt",
-    "trendradar-freebuf": "trendradar-freebuf",
-    "trendradar-wallstreetcn": "trendradar-wallstreetcn",
-    "trendradar-tencent": "trendradar-tencent",
-    "trendradar-v2ex": "trendradar-v2ex",
-}
-
-
-def _create_content_item(title: str, content: str, source: str, url: str | None = None) -> ContentItem:
-    """ContentItemを作成するヘルパー関数"""
-    return ContentItem(
-        title=title,
-        content=content,
-        url=url,
-        source=source,
-    )
 
+# 過去日のデータは確定済みのため長めにキャッシュさせ、当日分は短い間隔で再検証させる
+PAST_DATE_CACHE_CONTROL = "public, max-age=86400"
+RECENT_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
+# プロセス内のキャッシュはワーカーごとに作られるため、小さく保つ（CONTENT_CACHE_MAX_ENTRIES を参照）
+content_cache = ContentCache(max_entries=BaseConfig().CONTENT_CACHE_MAX_ENTRIES)
+# 複数ワーカーで動かす場合に、他のワーカーが生成したレスポンスを再利用するキャッシュ
+shared_cache = SharedCache.from_config(BaseConfig())
+SHARED_CACHE_NAMESPACE = "content"
+
+# ページ分割・フィールド射影
+MAX_PAGE_SIZE = 200
+ITEM_FIELDS = tuple(ContentItem.model_fields)
+# 一覧表示用の軽量ビューで返すフィールド（本文を含まない）
+LIST_VIEW_FIELDS = ("id", "title", "url", "source", "category")
+
+# NDJSONエクスポートで一度に指定できる最大日数
+MAX_EXPORT_DAYS = 93
+
+
+def _shared_key(key: tuple) -> str:
+    return json.dumps(key, ensure_ascii=False)
+
+
+def _read_shared(key: tuple, fingerprint: tuple) -> CachedPayload | None:
+    """他のワーカーが生成した、フィンガープリントが一致するレスポンスを読み込みます。"""
+    if shared_cache is None:
+        return None
+    entry = shared_cache.get(SHARED_CACHE_NAMESPACE, _shared_key(key), validator=json.dumps(fingerprint))
+    if entry is None:
+        return None
+    return build_payload(entry.value, fingerprint, item_count=entry.meta.get("item_count", 0))
+
+
+def _write_shared(key: tuple, payload: CachedPayload) -> None:
+    """生成したレスポンスを他のワーカーと共有します。"""
+    if shared_cache is not None:
+        shared_cache.put(
+            SHARED_CACHE_NAMESPACE,
+            _shared_key(key),
+            payload.body,
+            validator=json.dumps(payload.fingerprint),
+            meta={"item_count": payload.item_count},
+        )
 
-def _process_trendradar_articles(articles_data: list[dict], source: str) -> list[ContentItem]:
-    """TrendRadar系記事をContentItemリストに変換する共通関数.
+
+async def _load_payload(source: str, target_date: datetime, *, structured: bool = False) -> CachedPayload:
+    """
+    ソース・日付のレスポンスを、キャッシュが有効ならキャッシュから返します。
+
+    元ファイルの (mtime, size) をフィンガープリントとしてキャッシュを検証し、
+    インプロセスキャッシュ、ワーカー間の共有キャッシュ（SHARED_CACHE_PATH を
+    設定した場合）、収集時に事前生成されたレスポンスの順に探します。
+    いずれも無効な場合のみファイルを読み直して直列化します
+    （部分的な結果はキャッシュしない）。
 
     Parameters
     ----------
-    articles_data : list[dict]
-        TrendRadar系サービスから取得した記事データのリスト。
     source : str
-        ソース名（例: "trendradar-zhihu", "trendradar-juejin"）。
+        データソース（"all" を含む）。
+    target_date : datetime
+        対象日付。
+    structured : bool, default=False
+        True の場合は構造化レスポンス（StructuredResponse）を返す。
 
     Returns
     -------
-    list[ContentItem]
-        変換されたContentItemのリスト。
-    """
-    items = []
-    # 人気度（popularity_score）の降順でソート
-    # 変換不可能な値（None, "N/A"等）は0として扱う
-    # Note: sorted()を使用して元のリストを変更しない（副作用防止）
-    sorted_articles = sorted(
-        articles_data,
-        key=lambda x: parse_popularity_score(x.get("popularity_score")),
-        reverse=True,
+    CachedPayload
+        直列化済みのレスポンス。
+    """
+    sources = list(SOURCE_MAPPING) if source == "all" else [source]
+    date_str = target_date.strftime("%Y-%m-%d")
+    # ファイルを読む前にフィンガープリントを取得し、読み込み中の更新は次回のミスで拾う
+    fingerprint = await run_io(builder.fingerprint, storage, sources, target_date, structured=structured)
+    key = (str(storage.base_dir), "structured" if structured else "content", source, date_str)
+
+    cached = content_cache.get(key, fingerprint)
+    if cached is not None:
+        return cached
+
+    if source == RANKED_SOURCE and fingerprint == (None,):
+        # 収集処理で事前計算されていない日付（導入前の過去日など）はここで計算して保存する
+        if await publish_ranking(storage, target_date) is not None:
+            fingerprint = await run_io(builder.fingerprint, storage, sources, target_date, structured=structured)
+
+    if shared_cache is not None:
+        with span("shared_cache"):
+            payload = await run_io(_read_shared, key, fingerprint)
+        if payload is not None:
+            content_cache.put(key, payload)
+            return payload
+
+    with span("published"):
+        payload = await run_io(published_store(storage, structured=structured).read, source, date_str, fingerprint)
+    if payload is not None:
+        content_cache.put(key, payload)
+        return payload
+
+    payload, errors = await builder.build_content_payload(
+        storage, source, target_date, fingerprint, structured=structured
     )
-
-    for article in sorted_articles:
-        content = ""
-        if article.get("summary"):
-            # 要約は既にMarkdown形式で構造化されているため、そのまま使用
-            content = f"{article['summary']}\n\n"
-
-        items.append(
-            _create_content_item(
-                title=article.get("title", ""),
-                content=content,
-                url=article.get("url"),
-                source=source,
-            )
-        )
-    return items
+    if not errors:
+        content_cache.put(key, payload)
+        if shared_cache is not None:
+            await run_io(_write_shared, key, payload)
+    return payload
 
 
-@router.get("/content/{source}", response_model=ContentResponse)
-async def get_content(source: str, date: str | None = None, response: Response = None) -> ContentResponse:
+def invalidate_content(source: str, date_str: str) -> int:
     """
-    特定のソースのコンテンツを取得します。
+    ソース・日付のデータが変更されたときに、関連するキャッシュを破棄します（スレッドプールで実行）。
+
+    ソース自身に加え、同じ日付の "all" と総合ランキングのレスポンスも破棄します。
+    LocalStorage を経由せずに書き込まれたファイルは日付マニフェストに記録されて
+    いないため、その場合はマニフェストを作り直します。
 
     Parameters
     ----------
     source : str
-        データソース（reddit, hackernews, github, techfeed, paper）。
-    date : str, optional
-        表示する日付（YYYY-MM-DD形式）。
+        変更されたソース（"top" を含む）。
+    date_str : str
+        変更された日付（YYYY-MM-DD形式）。
 
     Returns
     -------
-    ContentResponse
-        コンテンツレスポンス。
+    int
+        破棄したキャッシュのエントリ数。
+    """
+    affected = {source, "all", RANKED_SOURCE}
+    removed = content_cache.invalidate(
+        lambda key: key[0] == str(storage.base_dir) and key[2] in affected and key[3] == date_str
+    )
+    if shared_cache is not None:
+        shared_cache.delete(
+            SHARED_CACHE_NAMESPACE,
+            (
+                _shared_key((str(storage.base_dir), kind, src, date_str))
+                for kind in ("content", "structured")
+                for src in affected
+            ),
+        )
+    manifest = _date_manifest(source)
+    if (
+        date_str not in manifest.entries()
+        and source_file_path(storage.base_dir, source, datetime.strptime(date_str, "%Y-%m-%d")).exists()
+    ):
+        manifest.rebuild()
+    return removed
+
+
+_date_manifests: dict[Path, DateManifest] = {}
+
+
+def _date_manifest(source: str) -> DateManifest:
+    """ソースの日付マニフェストを返します（読み込み結果を再利用するためインスタンスを保持）。"""
+    directory = storage.base_dir / service_dir_name(source)
+    manifest = _date_manifests.get(directory)
+    if manifest is None:
+        manifest = _date_manifests.setdefault(directory, DateManifest(directory))
+    return manifest
+
+
+def _source_dates(source: str, *, structured: bool = False) -> list[datetime]:
+    """ソースの日付マニフェストから、APIが読む形式のファイルがある日付を返します。"""
+    extension = "json" if structured or uses_json(source) else "md"
+    return [
+        datetime.strptime(date_str, "%Y-%m-%d")
+        for date_str, entry in _date_manifest(source).entries().items()
+        if extension in entry.formats
+    ]
+
+
+async def _list_available_dates(source: str, *, structured: bool = False) -> list[datetime]:
+    """
+    ソースの利用可能な日付を日付マニフェストから並行に取得します。
+
+    "all" と総合ランキングは全ソースの日付を返します（ランキングは未計算でも読み込み時に計算されるため）。
+    """
+    sources = list(SOURCE_MAPPING) if source in ("all", RANKED_SOURCE) else [source]
+    results = await asyncio.gather(*(run_io(_source_dates, src, structured=structured) for src in sources))
+    return [available for dates in results for available in dates]
+
+
+def _cached_response(request: Request, payload: CachedPayload, cache_control: str) -> Response:
+    """
+    キャッシュ検証ヘッダーを付与し、If-None-Match が一致すれば304を返します。
+
+    事前圧縮版があり、クライアントが受け入れる場合はそのファイルをそのまま返します。
+    圧縮版のボディは元のバイト列と異なるため、CompressionMiddleware と同じく弱いETagを付けます。
+    """
+    headers = {"ETag": payload.etag, "Cache-Control": cache_control}
+    if payload.last_modified_header:
+        headers["Last-Modified"] = payload.last_modified_header
+    if payload.encoded_paths:
+        headers["Vary"] = "Accept-Encoding"
+
+    if etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    accepted = accepted_encodings(request.headers.get("accept-encoding"))
+    for encoding in ("br", "gzip"):
+        path = payload.encoded_paths.get(encoding)
+        if path is not None and encoding in accepted and path.exists():
+            return FileResponse(
+                path,
+                media_type="application/json",
+                headers={**headers, "ETag": f"W/{payload.etag}", "Content-Encoding": encoding},
+            )
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+
+def _encode_cursor(etag: str, position: int, item_id: str | None) -> str:
+    """
+    ページ分割の位置を不透明なカーソル文字列に変換する。
+
+    カーソルはページ末尾の項目の並び順上の位置とIDを持ち（キーセット方式）、
+    発行時のレスポンスのETagに結び付ける。
+    """
+    key = {"e": etag.strip('"'), "p": position, "id": item_id}
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, items: list[dict[str, Any]], etag: str) -> int:
+    """
+    カーソル文字列から次のページの開始位置を求める。
 
     Raises
     ------
     HTTPException
-        ソースが無効な場合や、コンテンツが見つからない場合。
+        カーソルが不正な場合（400）や、発行後にデータが更新されてETagが変わった場合（409）。
     """
-    if source not in SOURCE_MAPPING and source != "all":
-        raise HTTPException(status_code=404, detail=f"Source '{source}' not found")
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor_etag, position, item_id = key["e"], key["p"], key["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}") from None
+    if cursor_etag != etag.strip('"'):
+        raise HTTPException(status_code=409, detail="Cursor is stale: the content has changed, restart pagination")
+    if not isinstance(position, int) or not 0 <= position < len(items) or items[position].get("id") != item_id:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+    return position + 1
+
+
+def _parse_fields(fields: str | None, view: str) -> tuple[str, ...] | None:
+    """fields / view パラメータから返すフィールドを決定する（None は全フィールド）"""
+    if fields:
+        selected = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in selected if name not in ITEM_FIELDS]
+        if unknown or not selected:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid fields: {', '.join(unknown) or fields}. Available: {', '.join(ITEM_FIELDS)}",
+            )
+        return selected
+    if view == "list":
+        return LIST_VIEW_FIELDS
+    return None
+
+
+async def _resolve_payload(
+    source: str, date: str | None, *, structured: bool = False
+) -> tuple[CachedPayload, str, datetime]:
+    """
+    ソース・日付に対応するペイロードとCache-Controlを決定します。
 
-    # キャッシュ制御ヘッダーを設定（キャッシュを無効化）
-    if response:
-        response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
+    日付未指定で当日のデータがない場合は、最新の利用可能な日付にフォールバックします。
+
+    Returns
+    -------
+    tuple[CachedPayload, str, datetime]
+        ペイロード、Cache-Controlヘッダー値、実際に返す日付。
+    """
+    if source not in SOURCE_MAPPING and source not in ("all", RANKED_SOURCE):
+        raise HTTPException(status_code=404, detail=f"Source '{source}' not found")
 
     # 日付の処理
-    target_date = None
-    explicit_date_requested = date is not None
+    today = datetime.now()
     if date:
         try:
             target_date = datetime.strptime(date, "%Y-%m-%d")
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid date format: {date}") from None
-    else:
-        target_date = datetime.now()
-
-    items = []
-
-    # 特定のソースからコンテンツを取得
-    if source != "all":
-        service_name = SOURCE_MAPPING[source]
-
-        # Hacker Newsの場合はJSONから個別記事を取得
-        if source == "hacker-news":
-            stories_data = storage.load_json(service_name, target_date)
-            if stories_data:
-                # スコアで降順ソート
-                sorted_stories = sorted(stories_data, key=lambda x: x.get("score", 0), reverse=True)
-                for story in sorted_stories:
-                    # 要約があれば要約を、なければ本文を使用
-                    content = ""
-                    if story.get("summary"):
-                        content = f"**要約**:\n{story['summary']}\n\n"
-                    elif story.get("text"):
-                        text_preview = story["text"][:1000]
-                        if len(story["text"]) > 1000:
-                            text_preview += "..."
-                        content = f"{text_preview}\n\n"
-
-                    content += f"スコア: {story['score']}"
-
-                    items.append(
-                        _create_content_item(
-                            title=story["title"],
-                            content=content,
-                            url=story.get("url"),
-                            source=source,
-                        )
-                    )
-        # TrendRadar (Zhihu/Juejin/ITHome/36Kr) の場合はJSONから個別記事を取得
-        elif source in (
-            "trendradar-zhihu",
-            "trendradar-juejin",
-            "trendradar-ithome",
-            "trendradar-36kr",
-            "trendradar-weibo",
-            "trendradar-toutiao",
-            "trendradar-sspai",
-            "trendradar-producthunt",
-            "trendradar-freebuf",
-            "trendradar-wallstreetcn",
-            "trendradar-tencent",
-            "trendradar-v2ex",
-        ):
-            articles_data = storage.load_json(service_name, target_date)
-            if articles_data:
-                items.extend(_process_trendradar_articles(articles_data, source))
-        else:
-            # 他のソースは従来通りMarkdownから取得
-            content = storage.load_markdown(service_name, target_date)
-
-            if content:
-                # 論文要約の場合はタイトルを変換
-                if source == "arxiv":
-                    content = convert_paper_summary_titles(content)
-
-                # マークダウンからContentItemを作成
-                items.append(
-                    _create_content_item(
-                        title=(
-                            ""
-                            if source == "github"
-                            else f"{_get_source_display_name(source)} - {target_date.strftime('%Y-%m-%d')}"
-                        ),
-                        content=content,
-                        source=source,
-                    )
-                )
-    else:
-        # すべてのソースからコンテンツを取得
-        for src, service_name in SOURCE_MAPPING.items():
-            if src == "hacker-news":
-                # Hacker Newsは個別記事として追加
-                stories_data = storage.load_json(service_name, target_date)
-                if stories_data:
-                    # スコアで降順ソート
-                    sorted_stories = sorted(stories_data, key=lambda x: x.get("score", 0), reverse=True)
-                    for story in sorted_stories:
-                        # 要約があれば要約を、なければ本文を使用
-                        content = ""
-                        if story.get("summary"):
-                            content = f"**要約**:\n{story['summary']}\n\n"
-                        elif story.get("text"):
-                            text_preview = story["text"][:500]
-                            if len(story["text"]) > 500:
-                                text_preview += "..."
-                            content = f"{text_preview}\n\n"
-
-                        content += f"スコア: {story['score']}"
-
-                        items.append(
-                            _create_content_item(
-                                title=story["title"],
-                                content=content,
-                                url=story.get("url"),
-                                source=src,
-                            )
-                        )
-            elif src in (
-                "trendradar-zhihu",
-                "trendradar-juejin",
-                "trendradar-ithome",
-                "trendradar-36kr",
-                "trendradar-weibo",
-                "trendradar-toutiao",
-                "trendradar-sspai",
-                "trendradar-producthunt",
-                "trendradar-freebuf",
-                "trendradar-wallstreetcn",
-                "trendradar-tencent",
-                "trendradar-v2ex",
-            ):
-                # TrendRadar系はJSONから個別記事として追加
-                articles_data = storage.load_json(service_name, target_date)
-                if articles_data:
-                    items.extend(_process_trendradar_articles(articles_data, src))
-            else:
-                # 他のソースは従来通りMarkdownから取得
-                content = storage.load_markdown(service_name, target_date)
-                if content:
-                    # 論文要約の場合はタイトルを変換
-                    if src == "arxiv":
-                        content = convert_paper_summary_titles(content)
-
-                    items.append(
-                        _create_content_item(
-                            title=(
-                                ""
-                                if src == "github"
-                                else f"{_get_source_display_name(src)} - {target_date.strftime('%Y-%m-%d')}"
-                            ),
-                            content=content,
-                            source=src,
-                        )
-                    )
-
-    if not items:
-        if explicit_date_requested:
-            return ContentResponse(items=[])
+        cache_control = PAST_DATE_CACHE_CONTROL if target_date.date() < today.date() else RECENT_CACHE_CONTROL
+        return await _load_payload(source, target_date, structured=structured), cache_control, target_date
 
+    target_date = today
+    payload = await _load_payload(source, target_date, structured=structured)
+    if payload.item_count == 0:
         # 利用可能な日付を確認
-        available_dates = []
-        if source != "all":
-            service_name = SOURCE_MAPPING[source]
-            available_dates = storage.list_dates(service_name)
-        else:
-            for service_name in SOURCE_MAPPING.values():
-                dates = storage.list_dates(service_name)
-                available_dates.extend(dates)
-
+        available_dates = await _list_available_dates(source, structured=structured)
         if not available_dates:
             raise HTTPException(
                 status_code=404,
                 detail="No content available. Please run the services first.",
             )
+
+        # 最新の利用可能な日付のコンテンツを取得
+        target_date = max(available_dates)
+        payload = await _load_payload(source, target_date, structured=structured)
+
+    # 日付未指定のURLは新しい日のデータで内容が変わるため常に短い再検証にする
+    return payload, RECENT_CACHE_CONTROL, target_date
+
+
+def _json_payload(document: object, base: CachedPayload, item_count: int) -> CachedPayload:
+    """派生レスポンスを直列化し、元ペイロードのフィンガープリントでETagを付与する"""
+    return build_payload(dumps(document), base.fingerprint, item_count=item_count)
+
+
+def _batch_key(entry: BatchContentEntry) -> str:
+    """一括取得レスポンスのキーを返す"""
+    return f"{entry.source}:{entry.date}" if entry.date else entry.source
+
+
+async def _resolve_batch_entry(entry: BatchContentEntry) -> bytes:
+    """
+    一括取得の1件を解決し、直列化済みの結果（BatchContentResult形式）を返します。
+
+    キャッシュ済みのボディを再直列化せずにそのまま埋め込みます。
+    """
+    head = {"source": entry.source}
+    try:
+        payload, _, resolved = await _resolve_payload(entry.source, entry.date)
+    except HTTPException as e:
+        head.update({"date": entry.date, "status": e.status_code, "detail": str(e.detail), "data": None})
+        return dumps(head)
+    except Exception as e:
+        logger.warning(f"Failed to resolve batch entry {_batch_key(entry)}: {e}")
+        head.update({"date": entry.date, "status": 500, "detail": "Internal server error", "data": None})
+        return dumps(head)
+
+    head.update({"date": resolved.strftime("%Y-%m-%d"), "status": 200, "detail": None})
+    # 末尾の "}" を外して data フィールドにボディを連結する
+    return dumps(head)[:-1] + b',"data":' + payload.body + b"}"
+
+
+@router.post("/content/batch", response_model=BatchContentResponse)
+async def get_content_batch(batch: BatchContentRequest) -> Response:
+    """
+    複数の (source, date) のコンテンツを一括で取得します。
+
+    各エントリはサーバー側で並行に解決され、単体取得した場合のステータスとともに
+    1つのレスポンスにまとめて返されます。一部のソースが見つからなくても
+    全体は200で返り、該当エントリの ``status`` と ``detail`` にエラーが入ります。
+
+    Parameters
+    ----------
+    batch : BatchContentRequest
+        取得する (source, date) の組のリスト。
+
+    Returns
+    -------
+    Response
+        BatchContentResponse形式のJSON。
+    """
+    entries = list({_batch_key(entry): entry for entry in batch.entries}.items())
+    bodies = await asyncio.gather(*(_resolve_batch_entry(entry) for _, entry in entries))
+
+    parts = [dumps(key) + b":" + body for (key, _), body in zip(entries, bodies, strict=True)]
+    return Response(
+        content=b'{"results":{' + b",".join(parts) + b"}}",
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+def _parse_export_sources(sources: str | None) -> list[str]:
+    """エクスポート対象のソース指定（カンマ区切り、"all" 可）を展開する"""
+    if not sources:
+        return list(SOURCE_MAPPING)
+    selected: list[str] = []
+    for name in (part.strip() for part in sources.split(",")):
+        if not name:
+            continue
+        if name == "all":
+            selected.extend(SOURCE_MAPPING)
+        elif name in SOURCE_MAPPING:
+            selected.append(name)
         else:
-            # 最新の利用可能な日付のコンテンツを取得
-            latest_date = max(available_dates)
-            return await get_content(source, latest_date.strftime("%Y-%m-%d"))
+            raise HTTPException(status_code=404, detail=f"Source '{name}' not found")
+    return list(dict.fromkeys(selected))
 
-    return ContentResponse(items=items)
 
+async def _export_records(sources: list[str], start: datetime, days: int) -> AsyncIterator[bytes]:
+    """
+    日付・ソースの順に1日分のファイルずつ読み込み、NDJSONの行を生成します。
 
-def _get_source_display_name(source: str) -> str:
+    レスポンスキャッシュを経由せず1ファイル分だけを保持するため、期間が長くても
+    サーバー側のメモリ使用量は一定です。送信はクライアントの受信に合わせて待機します。
     """
-    ソースの表示名を取得します。
+    for offset in range(days):
+        target_date = start + timedelta(days=offset)
+        date_str = target_date.strftime("%Y-%m-%d")
+        for source in sources:
+            items, _status, error = await builder.load_source(storage, source, target_date, preview_length=1000)
+            if error is not None:
+                record = {"date": date_str, "source": source, "error": str(error)}
+                yield dumps(record) + b"\n"
+                continue
+            for item in items:
+                record = {"date": date_str, **item.model_dump()}
+                yield dumps(record) + b"\n"
+
+
+@router.get("/export")
+async def export_content(
+    start: str = Query(..., description="開始日（YYYY-MM-DD形式）"),
+    end: str | None = Query(None, description="終了日（YYYY-MM-DD形式、省略時は開始日と同じ）"),
+    sources: str | None = Query(None, description="ソースのカンマ区切りリスト（省略時は全ソース）"),
+) -> StreamingResponse:
+    """
+    期間・ソースを指定してコンテンツをNDJSON形式でストリーミング出力します。
+
+    各行は ``date`` を付与したContentItemです。読み込みに失敗したファイルは
+    ``{"date", "source", "error"}`` の行として出力し、処理を継続します。
+
+    Parameters
+    ----------
+    start : str
+        開始日（YYYY-MM-DD形式）。
+    end : str, optional
+        終了日（YYYY-MM-DD形式）。
+    sources : str, optional
+        ソースのカンマ区切りリスト。
+
+    Returns
+    -------
+    StreamingResponse
+        application/x-ndjson のストリーミングレスポンス。
+
+    Raises
+    ------
+    HTTPException
+        日付やソースの指定が不正な場合。
+    """
+    try:
+        start_date = datetime.strptime(start, "%Y-%m-%d")
+        end_date = datetime.strptime(end, "%Y-%m-%d") if end else start_date
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date range: {start} - {end}") from None
+
+    days = (end_date - start_date).days + 1
+    if days < 1:
+        raise HTTPException(status_code=400, detail="end must not be earlier than start")
+    if days > MAX_EXPORT_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range must be at most {MAX_EXPORT_DAYS} days")
+
+    selected = _parse_export_sources(sources)
+    return StreamingResponse(
+        _export_records(selected, start_date, days),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+def _source_head(source: str) -> int:
+    """ソースのチェンジログの最新リビジョンを返します。"""
+    return ChangeLog(storage.base_dir / service_dir_name(source)).head
+
+
+def _read_source_changes(source: str, since: int) -> tuple[list[SourceChanges], int, bool]:
+    """
+    1ソースのチェンジログから since より後の変更項目を組み立てます（スレッドプールで実行）。
+
+    Returns
+    -------
+    tuple[list[SourceChanges], int, bool]
+        日付ごとの変更項目、ソースの最新リビジョン、全件の再取得が必要かどうか。
+    """
+    change_log = ChangeLog(storage.base_dir / SOURCE_MAPPING[source])
+    entries, reset = change_log.read_since(since)
+    head = change_log.head
+    if reset:
+        return [], head, True
+
+    # APIが読む側のファイル（JSONまたはMarkdown）の変更のみを対象にする
+    extension = ".json" if uses_json(source) else ".md"
+    by_date: dict[str, tuple[int, set | None]] = {}
+    for entry in entries:
+        if not entry.filename.endswith(extension):
+            continue
+        revision, keys = by_date.get(entry.date_str, (0, set()))
+        if keys is not None and entry.keys is not None:
+            keys = keys | set(entry.keys)
+        else:
+            keys = None
+        by_date[entry.date_str] = (max(revision, entry.revision), keys)
+
+    changes = []
+    for date_str, (revision, keys) in sorted(by_date.items()):
+        items = builder.build_source_items(
+            storage, source, datetime.strptime(date_str, "%Y-%m-%d"), preview_length=1000
+        )
+        if keys is not None:
+            items = [item for item in items if record_key({"title": item.title, "url": item.url}) in keys]
+        if items:
+            changes.append(SourceChanges(source=source, date=date_str, revision=revision, items=items))
+    return changes, head, False
+
+
+def _dates_payload(sources: list[str]) -> CachedPayload:
+    """ソース群の日付マニフェストから利用可能な日付のレスポンスを生成します（スレッドプールで実行）。"""
+    source_dates = []
+    for source in sources:
+        entries = sorted(_date_manifest(source).entries().values(), key=lambda entry: entry.date, reverse=True)
+        dates = [AvailableDate(date=entry.date, item_count=entry.item_count) for entry in entries]
+        source_dates.append(SourceDates(source=source, dates=dates))
+
+    body = AvailableDatesResponse(sources=source_dates).model_dump_json().encode("utf-8")
+    fingerprint = tuple(file_signature(_date_manifest(source).path) for source in sources)
+    return build_payload(body, fingerprint, item_count=len(source_dates))
+
+
+@router.get("/dates", response_model=AvailableDatesResponse)
+async def get_available_dates(
+    request: Request,
+    sources: str | None = Query(None, description="ソースのカンマ区切りリスト（省略時は全ソース）"),
+) -> Response:
+    """
+    ソースごとの利用可能な日付と項目数を返します（日付ピッカー用）。
+
+    収集処理が日次ファイルを保存するたびに更新される日付マニフェストを参照するため、
+    ディレクトリを走査せずに1回の呼び出しで全ソースの日付を取得できます。
+
+    Parameters
+    ----------
+    request : Request
+        HTTPリクエスト（If-None-Match の参照に使用）。
+    sources : str, optional
+        ソースのカンマ区切りリスト。
+
+    Returns
+    -------
+    Response
+        AvailableDatesResponse形式のJSON、または304。
+    """
+    selected = _parse_export_sources(sources)
+    payload = await run_io(_dates_payload, selected)
+    return _cached_response(request, payload, RECENT_CACHE_CONTROL)
+
+
+@router.get("/changes", response_model=ChangesResponse)
+async def get_changes(
+    since: int | None = Query(None, ge=0, description="前回のレスポンスの revision"),
+    sources: str | None = Query(None, description="ソースのカンマ区切りリスト（省略時は全ソース）"),
+) -> ChangesResponse:
+    """
+    指定リビジョンより後に追加・更新された項目のみを返します（差分同期）。
+
+    収集処理が日次ファイルを保存するたびに記録されるチェンジログを参照します。
+    ``since`` を省略した場合は現在のリビジョンのみを返すため、クライアントは
+    通常のAPIで全件を取得した後、このリビジョンから差分同期を開始できます。
+
+    Parameters
+    ----------
+    since : int, optional
+        前回のレスポンスの ``revision``。
+    sources : str, optional
+        ソースのカンマ区切りリスト。
+
+    Returns
+    -------
+    ChangesResponse
+        差分同期レスポンス。``reset`` がTrueの場合は全件を再取得してください。
+    """
+    selected = _parse_export_sources(sources)
+    if since is None:
+        heads = await asyncio.gather(*(run_io(_source_head, src) for src in selected))
+        return ChangesResponse(revision=max([0, *heads]))
+
+    results = await asyncio.gather(*(run_io(_read_source_changes, src, since) for src in selected))
+    revision = max([since, *(head for _, head, _ in results)])
+    if any(reset for _, _, reset in results):
+        return ChangesResponse(revision=revision, reset=True)
+
+    changes = [change for source_changes, _, _ in results for change in source_changes]
+    return ChangesResponse(revision=revision, changes=changes)
+
+
+@router.get("/structured/{source}", response_model=StructuredResponse)
+async def get_structured_content(source: str, request: Request, date: str | None = None) -> Response:
+    """
+    特定のソースのコンテンツを、ソース共通の構造化スキーマで取得します。
+
+    各項目は要約の見出しごとのセクション、スコア、タグなどを型付きのフィールドとして
+    含むため、クライアントはMarkdownを解析する必要がありません。サービスが保存した
+    日次JSONのみを読み込み、キャッシュ・ETag・日付のフォールバックは
+    ``/content/{source}`` と同じです。
+
+    Parameters
+    ----------
+    source : str
+        データソース（"all" を含む）。
+    request : Request
+        HTTPリクエスト（If-None-Match の参照に使用）。
+    date : str, optional
+        表示する日付（YYYY-MM-DD形式）。
+
+    Returns
+    -------
+    Response
+        StructuredResponse形式のJSON、または304。
+
+    Raises
+    ------
+    HTTPException
+        ソースが無効な場合や、コンテンツが見つからない場合。
+    """
+    payload, cache_control, _ = await _resolve_payload(source, date, structured=True)
+    return _cached_response(request, payload, cache_control)
+
+
+@router.get("/content/{source}", response_model=ContentResponse)
+async def get_content(
+    source: str,
+    request: Request,
+    date: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="1ページの最大件数"),
+    cursor: str | None = Query(None, description="前ページの next_cursor"),
+    fields: str | None = Query(None, description="返すフィールド（カンマ区切り、例: title,url,category）"),
+    view: str = Query("full", pattern="^(full|list)$", description="list の場合は本文を含まない軽量ビュー"),
+) -> Response:
+    """
+    特定のソースのコンテンツを取得します。
+
+    レスポンスには強いETagとLast-Modifiedが付与され、If-None-Match が一致する
+    場合は304を返します。過去日を明示した場合は長めのmax-ageを、当日や日付未指定の
+    場合は短い間隔での再検証を指示します。ファイルの読み込みはスレッドプールで行い、
+    "all" では各ソースを並行に読み込んでソースごとの読み込み結果を ``sources`` に含めます。
+
+    ``limit`` / ``cursor`` でページ分割、``fields`` / ``view=list`` でフィールド射影を行います。
+    いずれかを指定した場合、レスポンスは ``items`` と ``next_cursor`` のみを含みます。
+    カーソルは発行時のデータに結び付いており、その後にデータが更新された場合は
+    409を返すため、先頭のページから取得し直します。
 
     Parameters
     ----------
     source : str
-        データソース
+        データソース（reddit, hackernews, github, techfeed, paper）。
+    request : Request
+        HTTPリクエスト（If-None-Match の参照に使用）。
+    date : str, optional
+        表示する日付（YYYY-MM-DD形式）。
+    limit : int, optional
+        1ページの最大件数。
+    cursor : str, optional
+        前ページのレスポンスの ``next_cursor``。
+    fields : str, optional
+        返すフィールドのカンマ区切りリスト。
+    view : str, default="full"
+        "list" の場合は本文を含まない軽量ビュー。
 
     Returns
     -------
-    str
-        表示名
-    """
-    source_names = {
-        "reddit": "Reddit",
-        "hacker-news": "Hacker News",
-        "github": "GitHub Trending",
-        "tech-news": "Tech News",
-        "business-news": "Business News",
-        "paper": "ArXiv",
-        "zenn": "Zenn",
-        "qiita": "Qiita",
-        "note": "Note",
-        "4chan": "4chan",
-        "5chan": "5ちゃんねる",
-        "trendradar-zhihu": "知乎 (Zhihu)",
-        "trendradar-juejin": "掘金 (Juejin)",
-        "trendradar-ithome": "IT之家 (ITHome)",
-        "trendradar-36kr": "36氪 (36Kr)",
-        "trendradar-weibo": "微博 (Weibo)",
-        "trendradar-toutiao": "今日头条 (Toutiao)",
-        "trendradar-sspai": "少数派 (SSPai)",
-        "trendradar-producthunt": "Product Hunt",
-        "trendradar-freebuf": "FreeBuf (FreeBuf)",
-        "trendradar-wallstreetcn": "华尔街见闻 (Wallstreetcn)",
-        "trendradar-tencent": "腾讯新闻 (Tencent News)",
-        "trendradar-v2ex": "V2EX",
-    }
-    return source_names.get(source, source)
+    Response
+        コンテンツレスポンス（ContentResponse形式のJSON）、または304。
+
+    Raises
+    ------
+    HTTPException
+        ソースが無効な場合や、コンテンツが見つからない場合。
+    """
+    payload, cache_control, _ = await _resolve_payload(source, date)
+
+    selected_fields = _parse_fields(fields, view)
+    if limit is None and cursor is None and selected_fields is None:
+        return _cached_response(request, payload, cache_control)
+
+    items = payload.document["items"]
+    offset = _decode_cursor(cursor, items, payload.etag) if cursor else 0
+    end = len(items) if limit is None else offset + limit
+    page = items[offset:end]
+    next_cursor = _encode_cursor(payload.etag, end - 1, items[end - 1].get("id")) if end < len(items) else None
+    if selected_fields is not None:
+        page = [{name: item.get(name) for name in selected_fields} for item in page]
+
+    document = {"items": page, "next_cursor": next_cursor}
+    return _cached_response(request, _json_payload(document, payload, len(page)), cache_control)
+
+
+@router.get("/content/{source}/items/{item_id}", response_model=ContentItem)
+async def get_content_item(source: str, item_id: str, request: Request, date: str | None = None) -> Response:
+    """
+    一覧ビューで取得した項目の詳細（本文を含む全フィールド）を取得します。
+
+    Parameters
+    ----------
+    source : str
+        データソース。
+    item_id : str
+        項目ID（一覧レスポンスの ``id``）。
+    request : Request
+        HTTPリクエスト（If-None-Match の参照に使用）。
+    date : str, optional
+        日付（YYYY-MM-DD形式）。一覧取得時と同じ値を指定します。
+
+    Returns
+    -------
+    Response
+        ContentItem形式のJSON、または304。
+
+    Raises
+    ------
+    HTTPException
+        ソース・日付が無効な場合や、項目が見つからない場合。
+    """
+    payload, cache_control, _ = await _resolve_payload(source, date)
+
+    for item in payload.document["items"]:
+        if item.get("id") == item_id:
+            return _cached_response(request, _json_payload(item, payload, 1), cache_control)
+
+    raise HTTPException(status_code=404, detail=f"Item '{item_id}' not found")
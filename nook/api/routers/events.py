@@ -0,0 +1,103 @@
+"""
+新着コンテンツ通知APIルーター。
+データの更新を Server-Sent Events で配信します。
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from nook.api.content_events import ContentUpdate, broker
+from nook.core.content.sources import RANKED_SOURCE, SOURCE_MAPPING
+
+router = APIRouter(tags=["events"])
+
+# 接続を保つためのコメントを送る間隔（秒）
+HEARTBEAT_INTERVAL = 15.0
+# 切断後にブラウザが再接続するまでの待ち時間（ミリ秒）
+RECONNECT_DELAY_MS = 5000
+
+
+def _parse_event_sources(sources: str | None) -> set[str] | None:
+    """購読するソースのカンマ区切りリストを展開する（None はすべて）。"""
+    if not sources:
+        return None
+    available = {*SOURCE_MAPPING, RANKED_SOURCE}
+    selected: set[str] = set()
+    for name in (part.strip() for part in sources.split(",")):
+        if not name:
+            continue
+        if name == "all":
+            return None
+        if name not in available:
+            raise HTTPException(status_code=404, detail=f"Source '{name}' not found")
+        selected.add(name)
+    return selected or None
+
+
+def _sse(event: str, data: object, event_id: int | None = None) -> bytes:
+    """Server-Sent Events の1イベントを直列化します。"""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode()
+
+
+async def _update_events(http_request: Request, sources: set[str] | None) -> AsyncIterator[bytes]:
+    """更新イベントの列を生成します。"""
+    queue = broker.subscribe()
+    try:
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n".encode()
+        yield _sse("ready", {"sources": sorted(sources) if sources else None})
+        while True:
+            try:
+                update: ContentUpdate | None = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_INTERVAL)
+            except TimeoutError:
+                if await http_request.is_disconnected():
+                    return
+                yield b": keepalive\n\n"
+                continue
+            if update is None:
+                # 取りこぼしが発生したため、クライアントに全体の再取得を促す
+                yield _sse("reset", {})
+                continue
+            if sources is None or update.source in sources:
+                yield _sse("update", update.to_dict(), update.revision)
+    finally:
+        broker.unsubscribe(queue)
+
+
+@router.get("/events")
+async def content_events(
+    http_request: Request,
+    sources: str | None = Query(None, description="購読するソースのカンマ区切りリスト（省略時は全ソース）"),
+) -> StreamingResponse:
+    """
+    データの更新を Server-Sent Events で配信します。
+
+    収集処理がデータディレクトリに日次ファイルを書き込むと、``update`` イベント
+    （``{"source", "date", "revision"}``）を送ります。クライアントは該当する
+    ソース・日付（と同じ日付の "all"・"top"）だけを取得し直してください。
+    配信が追いつかずイベントを取りこぼした場合は ``reset`` イベントを送ります。
+    再接続した場合は、最後に受け取ったイベントの ID（revision）を ``/api/changes`` の
+    ``since`` に指定すると、切断中の変更を取得できます。
+
+    Parameters
+    ----------
+    http_request : Request
+        HTTPリクエスト（切断の検知に使用）
+    sources : str, optional
+        購読するソースのカンマ区切りリスト（"top" を含む）。
+
+    Returns
+    -------
+    StreamingResponse
+        text/event-stream のストリーミングレスポンス。
+    """
+    selected = _parse_event_sources(sources)
+    return StreamingResponse(
+        _update_events(http_request, selected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,58 @@
+"""
+メトリクスAPIルーター。
+Prometheus のテキスト形式でメトリクスを提供します。
+
+メトリクスとエラーの件数はワーカープロセスごとに保持するため、複数ワーカーで
+起動した場合の /metrics は応答したワーカーの値だけを返します。ワーカーの
+区別はラベルに含まれないため、ワーカー全体の値はワーカーごとに取得して
+合算する必要があります。
+"""
+
+from fastapi import APIRouter, HTTPException, Response
+
+from nook.api.content_events import broker
+from nook.api.routers import content
+from nook.core.config import BaseConfig
+from nook.core.errors.error_metrics import error_metrics
+from nook.core.metrics import CONTENT_TYPE, metrics
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_CACHE_ENTRIES = metrics.gauge("nook_content_cache_entries", "Entries in the in-memory content response cache.")
+EVENT_SUBSCRIBERS = metrics.gauge("nook_event_subscribers", "Clients subscribed to /api/events.")
+RECENT_ERRORS = metrics.gauge(
+    "nook_recent_errors",
+    "Errors recorded in the error metrics window, by error type and service.",
+    ("error_type", "service"),
+)
+
+
+def _update_gauges() -> None:
+    """取得時点の値を持つゲージを更新します。"""
+    CONTENT_CACHE_ENTRIES.set(len(content.content_cache))
+    EVENT_SUBSCRIBERS.set(broker.subscriber_count)
+    RECENT_ERRORS.reset()
+    for error_type, stats in error_metrics.get_error_stats().items():
+        for service, count in stats["by_service"].items():
+            RECENT_ERRORS.set(count, error_type=error_type, service=service)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    Prometheus のテキスト形式でメトリクスを返します（応答したワーカープロセスの値）。
+
+    Returns
+    -------
+    Response
+        text/plain（version=0.0.4）のレスポンス。
+
+    Raises
+    ------
+    HTTPException
+        METRICS_ENABLED が無効の場合（404）。
+    """
+    if not BaseConfig().METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    _update_gauges()
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,262 @@
+"""全文検索・関連記事APIルーター。
+
+検索インデックスは収集処理が保存時に更新する。収集処理を経由せずに置かれた
+ファイルは SearchIndexSync がバックグラウンドで一定間隔ごとに突き合わせて
+拾うため、リクエストはその時点のインデックスを読むだけで同期を待たない。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query
+
+from nook.api.models.schemas import RelatedItem, RelatedResponse, SearchResponse, SearchResult
+from nook.api.routers import content
+from nook.core.config import BaseConfig
+from nook.core.content.builder import run_io
+from nook.core.content.indexing import search_index, sync_search_index
+from nook.core.content.sources import SOURCE_MAPPING
+from nook.core.search import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MAX_SEARCH_RESULTS = 100
+MAX_RELATED_RESULTS = 50
+# 停止時に実行中の突き合わせの終了を待つ秒数
+STOP_TIMEOUT = 5.0
+
+
+def _search_index() -> SearchIndex:
+    """コンテンツAPIと同じデータディレクトリの検索インデックスを返します。"""
+    return search_index(content.storage.base_dir)
+
+
+class SearchIndexSync:
+    """
+    検索インデックスとデータディレクトリを一定間隔で突き合わせるバックグラウンドタスク。
+
+    起動直後に1回、その後は ``interval`` 秒ごとに、変更されたファイルのみを登録し直す。
+
+    Parameters
+    ----------
+    interval : float
+        突き合わせの間隔（秒）。
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop_event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_config(cls, config: BaseConfig) -> SearchIndexSync | None:
+        """設定から作成する。突き合わせが無効な場合は None。"""
+        if not config.SEARCH_SYNC_ENABLED:
+            return None
+        return cls(config.SEARCH_SYNC_INTERVAL)
+
+    async def sync_once(self) -> int:
+        """
+        インデックスとデータディレクトリを1回突き合わせる。
+
+        Returns
+        -------
+        int
+            登録し直した（または削除した）ファイル数。失敗した場合は0。
+        """
+        try:
+            updated = await run_io(sync_search_index, content.storage.base_dir, _search_index())
+        except Exception as e:
+            logger.warning(f"Failed to synchronize search index: {e}")
+            return 0
+        if updated:
+            logger.info(f"Search index synchronized: {updated} files")
+        return updated
+
+    async def _run(self) -> None:
+        while not self._stop_event.is_set():
+            await self.sync_once()
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.interval)
+
+    def start(self) -> None:
+        """突き合わせを開始する。"""
+        if self._task is None:
+            self._stop_event.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """突き合わせを停止し、終了を待つ。"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        self._stop_event.set()
+        try:
+            await asyncio.wait_for(task, timeout=STOP_TIMEOUT)
+        except TimeoutError:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+
+def _validate_date(value: str | None) -> str | None:
+    if value is None:
+        return None
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {value}") from None
+    return value
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="検索語（空白区切りでAND検索）"),
+    sources: str | None = Query(None, description="ソースのカンマ区切りリスト（省略時は全ソース）"),
+    start: str | None = Query(None, description="開始日（YYYY-MM-DD形式）"),
+    end: str | None = Query(None, description="終了日（YYYY-MM-DD形式）"),
+    sort: str = Query(
+        "relevance", pattern="^(relevance|date)$", description="relevance（関連度順）または date（新しい順）"
+    ),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS, description="最大件数"),
+    offset: int = Query(0, ge=0, description="読み飛ばす件数"),
+) -> SearchResponse:
+    """
+    保存済みの全ソースのタイトル・要約・URLを全文検索します。
+
+    SQLite FTS5 の trigram トークナイザで部分文字列に一致させるため、日本語・中国語の
+    語も分かち書きなしで検索できます。関連度はタイトルを重く重み付けしたBM25です。
+    ``title_highlight`` と ``snippet`` はHTMLエスケープ済みで、一致箇所が ``<mark>`` で
+    囲まれています。
+
+    Parameters
+    ----------
+    q : str
+        検索語。
+    sources : str, optional
+        ソースのカンマ区切りリスト。
+    start : str, optional
+        開始日（YYYY-MM-DD形式）。
+    end : str, optional
+        終了日（YYYY-MM-DD形式）。
+    sort : str, default="relevance"
+        並び順。
+    limit : int, default=20
+        最大件数。
+    offset : int, default=0
+        読み飛ばす件数。
+
+    Returns
+    -------
+    SearchResponse
+        検索結果と総件数。
+
+    Raises
+    ------
+    HTTPException
+        ソースや日付の指定が不正な場合。
+    """
+    selected = content._parse_export_sources(sources)
+    start, end = _validate_date(start), _validate_date(end)
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Query must not be blank")
+
+    index = _search_index()
+    hits, total = await run_io(
+        index.search,
+        q,
+        sources=None if sources is None else selected,
+        start=start,
+        end=end,
+        sort=sort,
+        limit=limit,
+        offset=offset,
+    )
+    return SearchResponse(
+        query=q,
+        total=total,
+        items=[
+            SearchResult(
+                source=hit.source,
+                date=hit.date,
+                id=hit.item_id,
+                title=hit.title,
+                url=hit.url or None,
+                title_highlight=hit.title_highlight,
+                snippet=hit.snippet,
+                score=hit.score,
+            )
+            for hit in hits
+        ],
+    )
+
+
+@router.get("/content/{source}/items/{item_id}/related", response_model=RelatedResponse)
+async def get_related_items(
+    source: str,
+    item_id: str,
+    date: str | None = Query(None, description="日付（YYYY-MM-DD形式、省略時は最新の登録）"),
+    limit: int = Query(10, ge=1, le=MAX_RELATED_RESULTS, description="最大件数"),
+    min_similarity: float = Query(0.2, ge=0.0, le=1.0, description="返す最小の推定類似度"),
+) -> RelatedResponse:
+    """
+    項目と話題の近い記事をソース横断で返します。
+
+    検索インデックスへの登録時に計算したタイトル＋要約の MinHash シグネチャを
+    LSH で照合し、推定類似度の高い順に返します。登録時に近似重複と判定され
+    同じクラスタに入った記事は ``duplicate`` がTrueになります。
+
+    Parameters
+    ----------
+    source : str
+        データソース。
+    item_id : str
+        項目ID（コンテンツAPIの ``id``）。
+    date : str, optional
+        日付（YYYY-MM-DD形式）。
+    limit : int, default=10
+        最大件数。
+    min_similarity : float, default=0.2
+        返す最小の推定類似度。
+
+    Returns
+    -------
+    RelatedResponse
+        関連記事。
+
+    Raises
+    ------
+    HTTPException
+        ソース・日付が無効な場合や、項目が見つからない場合。
+    """
+    if source not in SOURCE_MAPPING:
+        raise HTTPException(status_code=404, detail=f"Source '{source}' not found")
+    date = _validate_date(date)
+
+    index = _search_index()
+    related = await run_io(index.related, source, item_id, date_str=date, limit=limit, min_similarity=min_similarity)
+    if related is None:
+        raise HTTPException(status_code=404, detail=f"Item '{item_id}' not found")
+
+    return RelatedResponse(
+        source=source,
+        id=item_id,
+        items=[
+            RelatedItem(
+                source=doc.source,
+                date=doc.date,
+                id=doc.item_id,
+                title=doc.title,
+                url=doc.url or None,
+                similarity=doc.similarity,
+                duplicate=doc.duplicate,
+            )
+            for doc in related
+        ],
+    )
@@ -1,5 +1,6 @@
 """天気APIルーター。"""
 
+import asyncio
 import os
 
 import requests
@@ -7,49 +8,97 @@ from dotenv import load_dotenv
 from fastapi import APIRouter, HTTPException
 
 from nook.api.models.schemas import WeatherResponse
+from nook.core.config import BaseConfig
+from nook.core.storage import SharedCache
+from nook.core.utils.async_utils import StaleWhileRevalidateCache
 
 # 環境変数の読み込み
 load_dotenv(".env.production")
 
 router = APIRouter()
 
+# 神奈川の天気を取得
+WEATHER_CITY = "Kanagawa"
+# 取得した天気を新しいとみなす秒数
+WEATHER_TTL_SECONDS = 600
+# 期限切れの天気を待たずに返す最大の経過秒数（超えた場合は取得を待つ）
+WEATHER_MAX_STALE_SECONDS = 3 * 3600
+# 取得に失敗した後、再取得を控える秒数
+WEATHER_ERROR_TTL_SECONDS = 60
 
-@router.get("/weather", response_model=WeatherResponse)
-async def get_weather_data() -> WeatherResponse:
+# ページを表示するたびに外部APIを呼ばないよう、プロセス内で天気を保持する
+weather_cache: StaleWhileRevalidateCache[WeatherResponse] = StaleWhileRevalidateCache(
+    ttl=WEATHER_TTL_SECONDS,
+    max_stale=WEATHER_MAX_STALE_SECONDS,
+    error_ttl=WEATHER_ERROR_TTL_SECONDS,
+)
+# 複数ワーカーで動かす場合に、他のワーカーが取得した天気を再利用するキャッシュ
+shared_cache = SharedCache.from_config(BaseConfig())
+SHARED_CACHE_NAMESPACE = "weather"
+
+
+async def _fetch_weather(api_key: str, city: str) -> WeatherResponse:
     """
-    天気データを取得します。
+    OpenWeatherMap APIから天気を取得します。
 
-    Returns
-    -------
-    WeatherResponse
-        天気レスポンス。
+    ブロッキングするHTTP呼び出しはスレッドで実行し、イベントループを止めません。
 
     Raises
     ------
     HTTPException
         天気データの取得に失敗した場合。
     """
+    url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
     try:
-        # OpenWeatherMap APIを使用して天気データを取得
-        api_key = os.environ.get("OPENWEATHERMAP_API_KEY")
-        if not api_key:
-            # デモ用のダミーデータを返す
-            return WeatherResponse(temperature=20.5, icon="01d")
-
-        # 神奈川の天気を取得
-        city = "Kanagawa"
-        url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
-
-        response = requests.get(url, timeout=10)
+        response = await asyncio.to_thread(requests.get, url, timeout=10)
         if response.status_code != 200:
             raise HTTPException(status_code=500, detail="Failed to fetch weather data")
 
         data = response.json()
+        return WeatherResponse(temperature=data["main"]["temp"], icon=data["weather"][0]["icon"])
+    except (requests.RequestException, KeyError, ValueError) as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching weather data: {str(e)}") from e
 
-        temperature = data["main"]["temp"]
-        icon = data["weather"][0]["icon"]
 
-        return WeatherResponse(temperature=temperature, icon=icon)
+async def _load_weather(api_key: str, city: str) -> WeatherResponse:
+    """
+    他のワーカーが WEATHER_TTL_SECONDS 以内に取得した天気があれば使い、
+    なければ取得して共有します。
+    """
+    if shared_cache is None:
+        return await _fetch_weather(api_key, city)
 
-    except (requests.RequestException, KeyError, ValueError) as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching weather data: {str(e)}") from e
+    entry = await asyncio.to_thread(shared_cache.get, SHARED_CACHE_NAMESPACE, city, max_age=WEATHER_TTL_SECONDS)
+    if entry is not None:
+        return WeatherResponse.model_validate_json(entry.value)
+    weather = await _fetch_weather(api_key, city)
+    await asyncio.to_thread(shared_cache.put, SHARED_CACHE_NAMESPACE, city, weather.model_dump_json().encode())
+    return weather
+
+
+@router.get("/weather", response_model=WeatherResponse)
+async def get_weather_data() -> WeatherResponse:
+    """
+    天気データを取得します。
+
+    取得した天気は WEATHER_TTL_SECONDS の間キャッシュし、期限切れの場合は
+    キャッシュを返しつつバックグラウンドで取得し直します。同時に発生した
+    取得は1回にまとめ、取得に失敗した場合は最後に取得できた天気を返します。
+
+    Returns
+    -------
+    WeatherResponse
+        天気レスポンス。
+
+    Raises
+    ------
+    HTTPException
+        天気データの取得に失敗し、キャッシュもない場合。
+    """
+    # OpenWeatherMap APIを使用して天気データを取得
+    api_key = os.environ.get("OPENWEATHERMAP_API_KEY")
+    if not api_key:
+        # デモ用のダミーデータを返す
+        return WeatherResponse(temperature=20.5, icon="01d")
+
+    return await weather_cache.get((WEATHER_CITY, api_key), lambda: _load_weather(api_key, WEATHER_CITY))
@@ -1,6 +1,7 @@
 """APIサーバーを起動するためのスクリプト。"""
 
 import argparse
+import os
 import warnings
 
 import uvicorn
@@ -20,11 +21,19 @@ load_dotenv(".env.production")
 # Expose ArgumentParser for tests to patch
 ArgumentParser = argparse.ArgumentParser
 
+# 複数ワーカーで起動し、SHARED_CACHE_PATH が未設定の場合に使う共有キャッシュ
+DEFAULT_SHARED_CACHE_PATH = "var/cache/api-shared.sqlite3"
+
 
 def main():
     """
     APIサーバーを起動します。
-    コマンドライン引数でホストとポートを指定できます。
+    コマンドライン引数でホスト・ポート・ワーカー数を指定できます。
+
+    ワーカーを2つ以上にすると、各ワーカーのプロセス内キャッシュに加えて、
+    生成したレスポンスと天気をワーカー間で共有するキャッシュ（SQLite）を使います。
+    データディレクトリの監視と総合ランキングの更新は1つのワーカーだけが行います。
+    /metrics と /api/health/alerts の値はワーカーごとに集計されます。
     """
     parser = ArgumentParser(description="Nook APIサーバーを起動します")
     parser.add_argument(
@@ -35,12 +44,25 @@ def main():
     )
     parser.add_argument("--port", type=int, default=8000, help="ポート番号 (デフォルト: 8000)")
     parser.add_argument("--reload", action="store_true", help="コード変更時に自動リロードする")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="ワーカープロセス数 (デフォルト: 1。--reload とは併用できません)",
+    )
 
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers は 1 以上である必要があります")
+    if args.reload and args.workers > 1:
+        parser.error("--reload と --workers は同時に指定できません")
+    if args.workers > 1:
+        # ワーカーは環境変数を引き継ぐため、すべてのワーカーが同じキャッシュを使う
+        os.environ.setdefault("SHARED_CACHE_PATH", DEFAULT_SHARED_CACHE_PATH)
 
     print(f"Nook APIサーバーを起動しています... http://{args.host}:{args.port}")
 
-    uvicorn.run("nook.api.main:app", host=args.host, port=args.port, reload=args.reload)
+    uvicorn.run("nook.api.main:app", host=args.host, port=args.port, reload=args.reload, workers=args.workers)
 
 
 if __name__ == "__main__":
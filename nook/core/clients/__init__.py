@@ -1,6 +1,7 @@
 # noqa: D104
 """HTTP and API clients."""
 
+from nook.core.clients.context_window import ChatContext, ContextBudget, build_chat_context
 from nook.core.clients.gpt_client import GPTClient
 from nook.core.clients.http_client import (
     AsyncHTTPClient,
@@ -11,9 +12,12 @@ from nook.core.clients.rate_limiter import RateLimitedHTTPClient, RateLimiter
 
 __all__ = [
     "AsyncHTTPClient",
+    "ChatContext",
+    "ContextBudget",
     "GPTClient",
     "RateLimitedHTTPClient",
     "RateLimiter",
+    "build_chat_context",
     "close_http_client",
     "get_http_client",
 ]
@@ -0,0 +1,322 @@
+"""チャットの履歴と添付コンテンツをトークン予算に収める。
+
+tiktoken で数えたトークン数をもとに、予算を超えた古いやり取りを切り捨てて
+要約（ローリングサマリー）に畳み込み、長いMarkdownは質問に関連する
+チャンクだけを選んで渡す。要約はモデルを呼ばずに各発言の冒頭を抜き出して作る。
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+
+from nook.core.search.fts_index import query_terms
+from nook.core.utils.tokens import count_tokens, truncate_to_tokens
+
+# メッセージ1件あたりのロール・区切りのトークン数（概算）
+MESSAGE_OVERHEAD_TOKENS = 4
+# 要約で1発言あたりに残す最小トークン数
+MIN_SUMMARY_LINE_TOKENS = 24
+# 省略したチャンクの間に挟む区切り
+OMISSION_MARKER = "\n\n…\n\n"
+SUMMARY_HEADER = "これまでの会話の要約（古いやり取りは省略しています）:"
+
+_ROLE_LABELS = {"user": "ユーザー", "assistant": "アシスタント"}
+_HEADING_PATTERN = re.compile(r"^#{1,6}\s")
+
+# BM25 のパラメータ
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+@dataclass(frozen=True)
+class ContextBudget:
+    """
+    チャットに渡す文脈のトークン予算。
+
+    Parameters
+    ----------
+    history_tokens : int, default=3000
+        チャット履歴（要約を含む）に使う上限。
+    markdown_tokens : int, default=4000
+        添付のMarkdownに使う上限。
+    summary_tokens : int, default=400
+        切り捨てた履歴の要約に使う上限（history_tokens の内数）。
+    chunk_tokens : int, default=300
+        Markdownを分割するチャンクの目安の大きさ。
+    """
+
+    history_tokens: int = 3000
+    markdown_tokens: int = 4000
+    summary_tokens: int = 400
+    chunk_tokens: int = 300
+
+
+@dataclass
+class ChatContext:
+    """
+    予算に収めたチャットの文脈。
+
+    Parameters
+    ----------
+    messages : list[dict[str, str]]
+        モデルに渡す履歴（切り捨てた場合は先頭に要約のシステムメッセージを含む）。
+    markdown : str
+        予算に収めたMarkdown。
+    summary : str
+        切り捨てた履歴の要約（切り捨てがない場合は空文字列）。
+    dropped_turns : int
+        要約に畳み込んだ発言の数。
+    markdown_truncated : bool
+        Markdownの一部を省略した場合は True。
+    """
+
+    messages: list[dict[str, str]]
+    markdown: str = ""
+    summary: str = ""
+    dropped_turns: int = 0
+    markdown_truncated: bool = False
+
+
+def message_tokens(message: dict[str, str]) -> int:
+    """メッセージ1件のトークン数（ロールの分を含む概算）を返す。"""
+    return count_tokens(message.get("content", "")) + MESSAGE_OVERHEAD_TOKENS
+
+
+def roll_summary(previous: str, dropped: list[dict[str, str]], max_tokens: int) -> str:
+    """
+    これまでの要約に新しく切り捨てた発言を加え、予算に収まる要約を返す。
+
+    各発言は冒頭だけを1行に抜き出し、予算を超える場合は古い行から捨てる。
+
+    Parameters
+    ----------
+    previous : str
+        これまでの要約（SUMMARY_HEADER を含まない行の並び）。
+    dropped : list[dict[str, str]]
+        新しく切り捨てた発言（古い順）。
+    max_tokens : int
+        要約に使うトークン数の上限。
+
+    Returns
+    -------
+    str
+        更新した要約。
+    """
+    available = max_tokens - count_tokens(SUMMARY_HEADER)
+    lines = [line for line in previous.splitlines() if line.strip()]
+    if dropped:
+        per_line = max(MIN_SUMMARY_LINE_TOKENS, available // len(dropped))
+        for message in dropped:
+            content = " ".join(message.get("content", "").split())
+            if not content:
+                continue
+            label = _ROLE_LABELS.get(message.get("role", "user"), message.get("role", "user"))
+            lines.append(f"- {label}: {truncate_to_tokens(content, per_line)}")
+
+    kept: list[str] = []
+    for line in reversed(lines):
+        tokens = count_tokens(line) + 1
+        if tokens > available:
+            break
+        kept.append(line)
+        available -= tokens
+    return "\n".join(reversed(kept))
+
+
+def fit_history(
+    messages: list[dict[str, str]], budget: ContextBudget, *, previous_summary: str = ""
+) -> tuple[list[dict[str, str]], list[dict[str, str]]]:
+    """
+    新しい発言から予算に収まる分だけ残し、残りを切り捨てる。
+
+    切り捨てが発生する（または既存の要約がある）場合は要約の分の予算を確保する。
+    最新の発言は予算を超えていても末尾を切り詰めて必ず残す。
+
+    Parameters
+    ----------
+    messages : list[dict[str, str]]
+        チャット履歴（古い順）。
+    budget : ContextBudget
+        トークン予算。
+    previous_summary : str, default=""
+        これまでの要約。
+
+    Returns
+    -------
+    tuple[list[dict[str, str]], list[dict[str, str]]]
+        残す発言と、切り捨てる発言（どちらも古い順）。
+    """
+    total = sum(message_tokens(message) for message in messages)
+    if total <= budget.history_tokens and not previous_summary:
+        return list(messages), []
+
+    available = budget.history_tokens - budget.summary_tokens
+    kept: list[dict[str, str]] = []
+    for message in reversed(messages):
+        tokens = message_tokens(message)
+        if tokens > available:
+            if not kept:
+                content = truncate_to_tokens(message.get("content", ""), available - MESSAGE_OVERHEAD_TOKENS)
+                kept.append({**message, "content": content})
+            break
+        kept.append(message)
+        available -= tokens
+    kept.reverse()
+    return kept, list(messages[: len(messages) - len(kept)])
+
+
+def summary_message(summary: str) -> dict[str, str]:
+    """要約をモデルに渡すシステムメッセージに変換する。"""
+    return {"role": "system", "content": f"{SUMMARY_HEADER}\n{summary}"}
+
+
+def _split_chunks(markdown: str, chunk_tokens: int) -> list[str]:
+    """見出しと空行を境界として、目安の大きさ以下のチャンクに分割する。"""
+    blocks: list[str] = []
+    for block in re.split(r"\n\s*\n", markdown):
+        block = block.strip()
+        if not block:
+            continue
+        if count_tokens(block) <= chunk_tokens:
+            blocks.append(block)
+            continue
+        # 大きな段落は行単位で分け、それでも大きい行は切り詰める
+        blocks.extend(truncate_to_tokens(line, chunk_tokens) for line in block.splitlines() if line.strip())
+
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+    for block in blocks:
+        tokens = count_tokens(block)
+        starts_section = bool(_HEADING_PATTERN.match(block))
+        if current and (starts_section or current_tokens + tokens > chunk_tokens):
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(block)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _bm25_scores(chunks: list[str], terms: list[str]) -> list[float]:
+    """チャンクごとの BM25 スコアを返す。"""
+    lowered = [chunk.lower() for chunk in chunks]
+    terms = [term.lower() for term in terms]
+    lengths = [max(count_tokens(chunk), 1) for chunk in chunks]
+    average = sum(lengths) / len(lengths)
+    document_frequency = {term: sum(1 for chunk in lowered if term in chunk) for term in terms}
+
+    scores = []
+    for chunk, length in zip(lowered, lengths, strict=True):
+        score = 0.0
+        for term in terms:
+            frequency = chunk.count(term)
+            if not frequency:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (len(chunks) - df + 0.5) / (df + 0.5))
+            norm = frequency + _BM25_K1 * (1 - _BM25_B + _BM25_B * length / average)
+            score += idf * frequency * (_BM25_K1 + 1) / norm
+        scores.append(score)
+    return scores
+
+
+def select_markdown(markdown: str, query: str, max_tokens: int, *, chunk_tokens: int = 300) -> tuple[str, bool]:
+    """
+    Markdownが予算を超える場合、質問に関連するチャンクを選んで予算に収める。
+
+    冒頭のチャンク（タイトル・導入）は常に残し、残りは質問との BM25 スコアが
+    高い順に詰める。選んだチャンクは元の順序で並べ、省略箇所に区切りを挟む。
+
+    Parameters
+    ----------
+    markdown : str
+        添付のMarkdown。
+    query : str
+        ユーザーの質問。
+    max_tokens : int
+        使用するトークン数の上限。
+    chunk_tokens : int, default=300
+        チャンクの目安の大きさ。
+
+    Returns
+    -------
+    tuple[str, bool]
+        予算に収めたMarkdownと、一部を省略したかどうか。
+    """
+    if not markdown or count_tokens(markdown) <= max_tokens:
+        return markdown or "", False
+
+    chunks = _split_chunks(markdown, chunk_tokens)
+    terms = query_terms(query)
+    scores = _bm25_scores(chunks, terms) if terms else [0.0] * len(chunks)
+    # スコアが同じ場合は文書の前の方を優先する
+    order = [0, *sorted(range(1, len(chunks)), key=lambda index: (-scores[index], index))]
+
+    marker_tokens = count_tokens(OMISSION_MARKER)
+    remaining = max_tokens
+    selected: set[int] = set()
+    for index in order:
+        tokens = count_tokens(chunks[index]) + marker_tokens
+        if tokens > remaining:
+            continue
+        selected.add(index)
+        remaining -= tokens
+
+    if not selected:
+        return truncate_to_tokens(markdown, max_tokens), True
+
+    parts: list[str] = []
+    previous = -1
+    for index in sorted(selected):
+        if parts:
+            parts.append(OMISSION_MARKER if index != previous + 1 else "\n\n")
+        parts.append(chunks[index])
+        previous = index
+    if previous != len(chunks) - 1:
+        parts.append(OMISSION_MARKER.rstrip())
+    return "".join(parts), True
+
+
+def build_chat_context(
+    history: list[dict[str, str]],
+    markdown: str | None,
+    query: str,
+    budget: ContextBudget | None = None,
+) -> ChatContext:
+    """
+    チャット履歴と添付Markdownをトークン予算に収めた文脈を組み立てる。
+
+    Parameters
+    ----------
+    history : list[dict[str, str]]
+        チャット履歴（古い順）。
+    markdown : str | None
+        添付のMarkdown。
+    query : str
+        ユーザーの質問（Markdownのチャンク選択に使う）。
+    budget : ContextBudget | None
+        トークン予算。None の場合は既定値。
+
+    Returns
+    -------
+    ChatContext
+        予算に収めた文脈。
+    """
+    budget = budget or ContextBudget()
+    kept, dropped = fit_history(history, budget)
+    summary = roll_summary("", dropped, budget.summary_tokens) if dropped else ""
+    messages = [summary_message(summary), *kept] if summary else kept
+    selected, truncated = select_markdown(
+        markdown or "", query, budget.markdown_tokens, chunk_tokens=budget.chunk_tokens
+    )
+    return ChatContext(
+        messages=messages,
+        markdown=selected,
+        summary=summary,
+        dropped_turns=len(dropped),
+        markdown_truncated=truncated,
+    )
@@ -4,6 +4,10 @@ import asyncio
 import inspect
 import logging
 import os
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -12,6 +16,9 @@ import tiktoken
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from nook.core.clients.context_window import ContextBudget, fit_history, roll_summary, summary_message
+from nook.core.metrics import metrics
+
 # 環境変数の読み込み
 load_dotenv(".env.production")
 
@@ -20,6 +27,38 @@ logger = logging.getLogger(__name__)
 # 料金設定（USD per 1M tokens）
 PRICING = {"input": 0.20, "cached_input": 0.05, "output": 0.80}
 
+GPT_REQUESTS = metrics.counter(
+    "nook_gpt_requests_total",
+    "GPT API calls by calling service, operation and status.",
+    ("service", "operation", "status"),
+)
+GPT_DURATION = metrics.histogram(
+    "nook_gpt_request_duration_seconds",
+    "Latency of GPT API calls by calling service and operation.",
+    ("service", "operation"),
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0),
+)
+GPT_TOKENS = metrics.counter("nook_gpt_tokens_total", "GPT tokens by calling service and kind.", ("service", "kind"))
+GPT_COST = metrics.counter("nook_gpt_cost_usd_total", "Estimated GPT cost in USD by calling service.", ("service",))
+
+
+@dataclass
+class _CallRecord:
+    """計測中のAPI呼び出しの結果（呼び出し側が設定する）。"""
+
+    output_text: str = ""
+    usage: tuple[int, int] | None = None
+
+
+def _response_usage(response: Any) -> tuple[int, int] | None:
+    """Chat Completions のレスポンスから (入力, 出力) のトークン数を返します。"""
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if isinstance(prompt_tokens, int) and isinstance(completion_tokens, int):
+        return prompt_tokens, completion_tokens
+    return None
+
 
 class GPTClient:
     """
@@ -54,6 +93,11 @@ class GPTClient:
 
         # OpenAI APIの設定
         self.client = openai.OpenAI(api_key=self.api_key)
+        # 非同期クライアントはAPIサーバーなど非同期で使う場合のみ作成する
+        self._async_client: openai.AsyncOpenAI | None = None
+
+        # チャットセッションの履歴に使うトークン予算
+        self.context_budget = ContextBudget()
 
         # トークンエンコーダーの初期化
         try:
@@ -61,6 +105,19 @@ class GPTClient:
         except KeyError:
             self.encoding = tiktoken.get_encoding("cl100k_base")
 
+    @property
+    def async_client(self) -> openai.AsyncOpenAI:
+        """非同期のOpenAIクライアント（初回アクセス時に作成）。"""
+        if self._async_client is None:
+            self._async_client = openai.AsyncOpenAI(api_key=self.api_key)
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """非同期クライアントの接続を閉じます。"""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
     def _count_tokens(self, text: str) -> int:
         """テキストのトークン数を計算します。"""
         try:
@@ -222,36 +279,94 @@ class GPTClient:
         """
         return self.model.lower().startswith("gpt-5")
 
+    def _chat_completion_params(
+        self, messages: list[dict[str, str]], temperature: float, max_tokens: int
+    ) -> dict[str, Any]:
+        """Chat Completions APIのパラメータを組み立てます。"""
+        completion_params: dict[str, Any] = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        if self._supports_max_completion_tokens():
+            completion_params["max_completion_tokens"] = max_tokens
+        else:
+            completion_params["max_tokens"] = max_tokens
+        return completion_params
+
     def _get_calling_service(self) -> str:
-        """呼び出し元のサービス名を取得します。"""
+        """
+        呼び出し元のサービス名を取得します。
+
+        ``nook/services/<explorers|feeds|analyzers>/<サービス>/`` 配下のファイルから
+        呼ばれた場合に、そのサービスのディレクトリ名を返します。API からの呼び出しは
+        ``service_name="api"`` を渡すため、ここでは判定しません。
+        """
         try:
             frame = inspect.currentframe()
             while frame:
                 frame = frame.f_back
                 if frame and frame.f_code.co_filename:
-                    filepath = Path(frame.f_code.co_filename)
-                    # services/ディレクトリ内のファイルを検出
-                    if "services" in filepath.parts:
-                        # services/の次のディレクトリ名をサービス名として使用
-                        service_idx = filepath.parts.index("services")
-                        if service_idx + 1 < len(filepath.parts):
-                            service_name = filepath.parts[service_idx + 1]
-                            # 特殊ケースの処理
-                            if service_name in [
-                                "run_services.py",
-                                "run_services_sync.py",
-                                "runner",
-                            ]:
-                                continue
-                            # __pycache__や.pyファイルを除外
-                            if service_name.startswith("__") or service_name.endswith(".py"):
-                                continue
-                            return service_name
+                    parts = Path(frame.f_code.co_filename).parts
+                    if "services" not in parts:
+                        continue
+                    # services/ の次はサービスの分類（explorers など）、その次がサービスのディレクトリ
+                    service_idx = parts.index("services")
+                    if service_idx + 3 >= len(parts):
+                        # runner や base など、分類の直下のモジュールはサービスではない
+                        continue
+                    service_name = parts[service_idx + 2]
+                    if service_name.startswith("__"):
+                        continue
+                    return service_name
             # services/ディレクトリ内でない場合はunknownを返す
             return "unknown"
         except Exception:
             return "unknown"
 
+    @contextmanager
+    def _track_call(
+        self, operation: str, messages: list[dict[str, str]], service_name: str | None = None
+    ) -> Iterator[_CallRecord]:
+        """
+        API呼び出しのレイテンシ・トークン数・料金をメトリクスに記録します。
+
+        トークン数はレスポンスの usage を優先し、ない場合（Responses API・ストリーミング）は
+        tiktoken で数えます。ストリーミングが途中で打ち切られた場合も、生成済みの分は
+        記録します。計測の失敗で呼び出しを失敗させることはありません。
+        """
+        service = service_name or self._get_calling_service()
+        record = _CallRecord()
+        status = "success"
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception:
+            status = "error"
+            raise
+        except BaseException:
+            status = "cancelled"
+            raise
+        finally:
+            GPT_DURATION.observe(time.perf_counter() - started, service=service, operation=operation)
+            GPT_REQUESTS.inc(service=service, operation=operation, status=status)
+            if status == "success" or record.output_text:
+                self._record_usage(service, messages, record)
+
+    def _record_usage(self, service: str, messages: list[dict[str, str]], record: _CallRecord) -> None:
+        """トークン数と料金をメトリクスに記録します。"""
+        try:
+            if record.usage is not None:
+                input_tokens, output_tokens = record.usage
+            else:
+                input_tokens = self._count_tokens(" ".join(msg.get("content", "") for msg in messages))
+                output_tokens = self._count_tokens(record.output_text or "")
+            GPT_TOKENS.inc(input_tokens, service=service, kind="input")
+            GPT_TOKENS.inc(output_tokens, service=service, kind="output")
+            GPT_COST.inc(self._calculate_cost(input_tokens, output_tokens), service=service)
+        except Exception as exc:
+            logger.debug("Failed to record GPT usage: %s", exc)
+
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def generate_content(
         self,
@@ -287,37 +402,19 @@ class GPTClient:
 
         messages.append({"role": "user", "content": prompt})
 
-        # トークン数の計算
-        # service = service_name or self._get_calling_service()
-        # input_text = ""
-        # for msg in messages:
-        #     input_text += msg["content"] + " "
-        # input_tokens = self._count_tokens(input_text.strip())
         # モデルに応じて適切なAPIを使用
-        if self._is_gpt5_model():
-            # Responses API（継続生成込み）
-            output_text = self._call_gpt5(prompt, system_instruction, max_tokens)
-        else:
-            # Chat Completions API を使用
-            completion_params = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-            }
-
-            if self._supports_max_completion_tokens():
-                completion_params["max_completion_tokens"] = max_tokens
+        with self._track_call("generate", messages, service_name) as call:
+            if self._is_gpt5_model():
+                # Responses API（継続生成込み）
+                output_text = self._call_gpt5(prompt, system_instruction, max_tokens)
             else:
-                completion_params["max_tokens"] = max_tokens
-
-            response = self.client.chat.completions.create(**completion_params)
-            output_text = response.choices[0].message.content
-
-        # 出力トークン数の計算
-        # output_tokens = self._count_tokens(output_text)
-
-        # 料金計算
-        # cost = self._calculate_cost(input_tokens, output_tokens)
+                # Chat Completions API を使用
+                response = self.client.chat.completions.create(
+                    **self._chat_completion_params(messages, temperature, max_tokens)
+                )
+                output_text = response.choices[0].message.content
+                call.usage = _response_usage(response)
+            call.output_text = output_text
 
         return output_text
 
@@ -348,7 +445,8 @@ class GPTClient:
         str
             生成されたテキスト。
         """
-        # 同期メソッドを非同期で実行
+        # 同期メソッドを非同期で実行（スレッドからは呼び出し元をたどれないため、ここで解決する）
+        service_name = service_name or self._get_calling_service()
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             None,
@@ -380,7 +478,27 @@ class GPTClient:
         if system_instruction:
             messages.append({"role": "system", "content": system_instruction})
 
-        return {"messages": messages}
+        return {"messages": messages, "summary": ""}
+
+    def _fit_session(self, chat_session: dict[str, Any]) -> list[dict[str, str]]:
+        """
+        セッションの履歴をトークン予算に収め、モデルに渡すメッセージを返します。
+
+        予算を超えた古い発言はセッションから取り除き、``chat_session["summary"]`` の
+        ローリングサマリーに畳み込みます（システム指示は常に残します）。
+        """
+        messages = chat_session["messages"]
+        system = [msg for msg in messages if msg.get("role") == "system"]
+        turns = [msg for msg in messages if msg.get("role") != "system"]
+        previous = chat_session.get("summary", "")
+        kept, dropped = fit_history(turns, self.context_budget, previous_summary=previous)
+        if not dropped and not previous:
+            return messages
+
+        summary = roll_summary(previous, dropped, self.context_budget.summary_tokens) if dropped else previous
+        chat_session["summary"] = summary
+        chat_session["messages"] = [*system, *kept]
+        return [*system, summary_message(summary), *kept] if summary else chat_session["messages"]
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def send_message(
@@ -410,34 +528,19 @@ class GPTClient:
             AIの応答。
         """
         chat_session["messages"].append({"role": "user", "content": message})
-
-        # トークン数の計算
-        # service = self._get_calling_service()
-        # input_text = ""
-        # for msg in chat_session["messages"]:
-        #     input_text += msg["content"] + " "
-        # input_tokens = self._count_tokens(input_text.strip())
+        request_messages = self._fit_session(chat_session)
 
         # モデルに応じて適切なAPIを使用
-        if self._is_gpt5_model():
-            assistant_message = self._call_gpt5_chat(chat_session["messages"], None, max_tokens)
-        else:
-            completion_params = {
-                "model": self.model,
-                "messages": chat_session["messages"],
-                "temperature": temperature,
-            }
-            if self._supports_max_completion_tokens():
-                completion_params["max_completion_tokens"] = max_tokens
+        with self._track_call("send_message", request_messages) as call:
+            if self._is_gpt5_model():
+                assistant_message = self._call_gpt5_chat(request_messages, None, max_tokens)
             else:
-                completion_params["max_tokens"] = max_tokens
-
-            response = self.client.chat.completions.create(**completion_params)
-            assistant_message = response.choices[0].message.content
-        # output_tokens = self._count_tokens(assistant_message)
-
-        # 料金計算
-        # cost = self._calculate_cost(input_tokens, output_tokens)
+                response = self.client.chat.completions.create(
+                    **self._chat_completion_params(request_messages, temperature, max_tokens)
+                )
+                assistant_message = response.choices[0].message.content
+                call.usage = _response_usage(response)
+            call.output_text = assistant_message
 
         chat_session["messages"].append({"role": "assistant", "content": assistant_message})
 
@@ -485,34 +588,17 @@ class GPTClient:
 
         messages.append({"role": "user", "content": f"コンテキスト: {context}\n\n質問: {message}"})
 
-        # トークン数の計算
-        # service = self._get_calling_service()
-        # input_text = ""
-        # for msg in messages:
-        #     input_text += msg["content"] + " "
-        # input_tokens = self._count_tokens(input_text.strip())
-
         # モデルに応じて適切なAPIを使用
-        if self._is_gpt5_model():
-            output_text = self._call_gpt5_chat(messages, system_instruction=None, max_tokens=max_tokens)
-        else:
-            completion_params = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-            }
-            if self._supports_max_completion_tokens():
-                completion_params["max_completion_tokens"] = max_tokens
+        with self._track_call("chat_with_search", messages) as call:
+            if self._is_gpt5_model():
+                output_text = self._call_gpt5_chat(messages, system_instruction=None, max_tokens=max_tokens)
             else:
-                completion_params["max_tokens"] = max_tokens
-
-            response = self.client.chat.completions.create(**completion_params)
-            # 出力トークン数の計算
-            output_text = response.choices[0].message.content
-        # output_tokens = self._count_tokens(output_text)
-
-        # 料金計算
-        # cost = self._calculate_cost(input_tokens, output_tokens)
+                response = self.client.chat.completions.create(
+                    **self._chat_completion_params(messages, temperature, max_tokens)
+                )
+                output_text = response.choices[0].message.content
+                call.usage = _response_usage(response)
+            call.output_text = output_text
 
         return output_text
 
@@ -549,33 +635,126 @@ class GPTClient:
 
         all_messages.extend(messages)
 
-        # トークン数の計算
-        # service = self._get_calling_service()
-        # input_text = ""
-        # for msg in all_messages:
-        #     input_text += msg["content"] + " "
-        # input_tokens = self._count_tokens(input_text.strip())
-
         # モデルに応じて適切なAPIを使用
-        if self._is_gpt5_model():
-            output_text = self._call_gpt5_chat(all_messages, system_instruction=None, max_tokens=max_tokens)
-        else:
-            completion_params = {
-                "model": self.model,
-                "messages": all_messages,
-                "temperature": temperature,
-            }
-            if self._supports_max_completion_tokens():
-                completion_params["max_completion_tokens"] = max_tokens
+        with self._track_call("chat", all_messages) as call:
+            if self._is_gpt5_model():
+                output_text = self._call_gpt5_chat(all_messages, system_instruction=None, max_tokens=max_tokens)
             else:
-                completion_params["max_tokens"] = max_tokens
+                response = self.client.chat.completions.create(
+                    **self._chat_completion_params(all_messages, temperature, max_tokens)
+                )
+                output_text = response.choices[0].message.content
+                call.usage = _response_usage(response)
+            call.output_text = output_text
 
-            response = self.client.chat.completions.create(**completion_params)
-            # 出力トークン数の計算
-            output_text = response.choices[0].message.content
-        # output_tokens = self._count_tokens(output_text)
+        return output_text
 
-        # 料金計算
-        # cost = self._calculate_cost(input_tokens, output_tokens)
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    async def chat_async(
+        self,
+        messages: list[dict[str, str]],
+        system: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        service_name: str | None = None,
+    ) -> str:
+        """
+        イベントループをブロックせずにチャットを実行します。
 
-        return output_text
+        Parameters
+        ----------
+        messages : List[Dict[str, str]]
+            メッセージのリスト。
+        system : str, optional
+            システム指示。
+        temperature : float, default=0.7
+            生成の多様性を制御するパラメータ。
+        max_tokens : int, default=1000
+            生成するトークンの最大数。
+        service_name : str, optional
+            メトリクスに記録するサービス名。省略時は呼び出し元から判定。
+
+        Returns
+        -------
+        str
+            AIの応答。
+        """
+        all_messages = [{"role": "system", "content": system}] if system else []
+        all_messages.extend(messages)
+
+        with self._track_call("chat_async", all_messages, service_name) as call:
+            if self._is_gpt5_model():
+                # Responses APIの継続生成は同期実装をスレッドで実行する
+                call.output_text = await asyncio.to_thread(self._call_gpt5_chat, all_messages, None, max_tokens)
+            else:
+                response = await self.async_client.chat.completions.create(
+                    **self._chat_completion_params(all_messages, temperature, max_tokens)
+                )
+                call.output_text = response.choices[0].message.content
+                call.usage = _response_usage(response)
+        return call.output_text
+
+    async def stream_chat(
+        self,
+        messages: list[dict[str, str]],
+        system: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        service_name: str | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        チャットの応答を生成されたそばから返します。
+
+        呼び出し側が途中で反復をやめた場合（クライアントの切断など）は、
+        上流のストリームを閉じて生成を打ち切ります。
+
+        Parameters
+        ----------
+        messages : List[Dict[str, str]]
+            メッセージのリスト。
+        system : str, optional
+            システム指示。
+        temperature : float, default=0.7
+            生成の多様性を制御するパラメータ。
+        max_tokens : int, default=1000
+            生成するトークンの最大数。
+        service_name : str, optional
+            メトリクスに記録するサービス名。省略時は呼び出し元から判定。
+
+        Yields
+        ------
+        str
+            応答のテキスト断片。
+        """
+        all_messages = [{"role": "system", "content": system}] if system else []
+        all_messages.extend(messages)
+
+        is_gpt5 = self._is_gpt5_model()
+        if is_gpt5:
+            stream = await self.async_client.responses.create(
+                model=self.model,
+                input=self._messages_to_responses_input(all_messages),
+                max_output_tokens=max_tokens,
+                reasoning={"effort": "minimal"},
+                text={"verbosity": "medium"},
+                stream=True,
+            )
+        else:
+            stream = await self.async_client.chat.completions.create(
+                **self._chat_completion_params(all_messages, temperature, max_tokens), stream=True
+            )
+
+        with self._track_call("stream_chat", all_messages, service_name) as call:
+            pieces: list[str] = []
+            try:
+                async for event in stream:
+                    if is_gpt5:
+                        delta = event.delta if getattr(event, "type", None) == "response.output_text.delta" else None
+                    else:
+                        delta = event.choices[0].delta.content if event.choices else None
+                    if delta:
+                        pieces.append(delta)
+                        yield delta
+            finally:
+                call.output_text = "".join(pieces)
+                await stream.close()
@@ -1,4 +1,5 @@
 import logging
+import time
 from datetime import UTC, datetime
 from typing import Any
 
@@ -6,10 +7,51 @@ import httpx
 
 from nook.core.config import BaseConfig
 from nook.core.errors.exceptions import APIException
+from nook.core.metrics import metrics
 from nook.core.utils.decorators import handle_errors
 
 logger = logging.getLogger(__name__)
 
+HTTP_CLIENT_REQUESTS = metrics.counter(
+    "nook_http_client_requests_total",
+    'Outgoing HTTP requests by host, method and status ("error" when no response was received).',
+    ("host", "method", "status"),
+)
+HTTP_CLIENT_DURATION = metrics.histogram(
+    "nook_http_client_request_duration_seconds",
+    "Latency of outgoing HTTP requests until the response headers arrive.",
+    ("host", "method"),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+async def _start_timer(request: httpx.Request) -> None:
+    """リクエストの送信時刻を記録する（httpx のイベントフック）。"""
+    request.extensions["nook_started"] = time.perf_counter()
+
+
+async def _observe_response(response: httpx.Response) -> None:
+    """レスポンスのステータスとレイテンシを記録する（httpx のイベントフック）。"""
+    request = response.request
+    host = request.url.host or "unknown"
+    started = request.extensions.get("nook_started")
+    if started is not None:
+        HTTP_CLIENT_DURATION.observe(time.perf_counter() - started, host=host, method=request.method)
+    HTTP_CLIENT_REQUESTS.inc(host=host, method=request.method, status=response.status_code)
+
+
+def _observe_request_error(error: httpx.RequestError) -> None:
+    """レスポンスを受け取れなかったリクエストを記録する。"""
+    try:
+        request = error.request
+    except RuntimeError:
+        return
+    HTTP_CLIENT_REQUESTS.inc(host=request.url.host or "unknown", method=request.method, status="error")
+
+
+# すべてのリクエスト（リダイレクト・リトライ・フォールバックを含む）を計測するフック
+METRICS_EVENT_HOOKS = {"request": [_start_timer], "response": [_observe_response]}
+
 
 class AsyncHTTPClient:
     """非同期HTTPクライアント with connection pooling"""
@@ -66,6 +108,7 @@ class AsyncHTTPClient:
                 limits=self.limits,
                 follow_redirects=True,
                 http2=False,  # HTTP/2を無効化してh2パッケージ依存を回避
+                event_hooks=METRICS_EVENT_HOOKS,
             )
             self._session_start = datetime.now(UTC)
             logger.info("HTTP client session started")
@@ -78,6 +121,7 @@ class AsyncHTTPClient:
                 limits=self.limits,
                 follow_redirects=True,
                 http2=False,  # HTTP/1.1専用
+                event_hooks=METRICS_EVENT_HOOKS,
             )
             logger.info("HTTP/1.1 client session started")
 
@@ -186,6 +230,7 @@ class AsyncHTTPClient:
             ) from e
 
         except httpx.RequestError as e:
+            _observe_request_error(e)
             logger.error(f"Request error for {url}: {e}")
             raise APIException(f"Request failed: {str(e)}") from e
 
@@ -221,6 +266,7 @@ class AsyncHTTPClient:
             ) from e
 
         except httpx.RequestError as e:
+            _observe_request_error(e)
             logger.error(f"Request error for {url}: {e}")
             raise APIException(f"Request failed: {str(e)}") from e
 
@@ -270,6 +316,7 @@ class AsyncHTTPClient:
                 response_body=e.response.text,
             ) from e
         except httpx.RequestError as e:
+            _observe_request_error(e)
             logger.error(f"Browser retry request error for {url}: {e}")
             raise APIException(f"Request failed: {str(e)}") from e
 
@@ -28,6 +28,52 @@ class BaseConfig(BaseSettings):
     REQUEST_DELAY: float = Field(default=1.0, ge=0.1, le=10.0)
     MAX_RETRIES: int = Field(default=3, ge=1, le=10)
 
+    # チャット関連（履歴・添付コンテンツに使うトークン数の上限）
+    CHAT_HISTORY_TOKENS: int = Field(default=3000, ge=256)
+    CHAT_MARKDOWN_TOKENS: int = Field(default=4000, ge=256)
+
+    # レート制限関連（クライアントIPごと。BURSTは連続して受け付ける数、PER_MINUTEは1分あたりの回復数）
+    RATE_LIMIT_ENABLED: bool = Field(default=True)
+    RATE_LIMIT_BURST: int = Field(default=120, ge=1)
+    RATE_LIMIT_PER_MINUTE: float = Field(default=300, gt=0)
+    CONTENT_RATE_LIMIT_BURST: int = Field(default=60, ge=1)
+    CONTENT_RATE_LIMIT_PER_MINUTE: float = Field(default=120, gt=0)
+    CHAT_RATE_LIMIT_BURST: int = Field(default=5, ge=1)
+    CHAT_RATE_LIMIT_PER_MINUTE: float = Field(default=10, gt=0)
+    # API の手前にある信頼できるリバースプロキシの数（X-Forwarded-For の右から数える。直接公開する場合は0）
+    RATE_LIMIT_TRUSTED_PROXIES: int = Field(default=1, ge=0)
+    # チャットの1日あたりのトークン数の上限（クライアントごと・全体。0は無制限）
+    CHAT_DAILY_TOKEN_QUOTA: int = Field(default=200_000, ge=0)
+    CHAT_DAILY_TOTAL_TOKEN_QUOTA: int = Field(default=2_000_000, ge=0)
+
+    # 新着コンテンツの通知（データディレクトリの監視）関連
+    CONTENT_WATCH_ENABLED: bool = Field(default=True)
+    CONTENT_WATCH_POLL_INTERVAL: float = Field(default=5.0, gt=0)
+    CONTENT_WATCH_FORCE_POLLING: bool = Field(default=False)
+
+    # 検索インデックスとデータディレクトリの突き合わせ（APIのバックグラウンドで一定間隔・秒）
+    SEARCH_SYNC_ENABLED: bool = Field(default=True)
+    SEARCH_SYNC_INTERVAL: float = Field(default=300.0, gt=0)
+
+    # メトリクス関連（API は /metrics、収集処理は TEXTFILE_PATH に Prometheus のテキスト形式で出力）
+    METRICS_ENABLED: bool = Field(default=True)
+    METRICS_TEXTFILE_PATH: str | None = Field(default=None)
+    # エラーの種類ごとの1分あたりの件数の上限（超えると /api/health/alerts に表示）
+    ERROR_ALERT_THRESHOLDS: dict[str, int] = Field(default_factory=lambda: {"rate_limited": 60})
+    # Server-Timing ヘッダーと遅いリクエストのプロファイル（SAMPLE_RATE の割合で PROFILE_DIR に保存）
+    SERVER_TIMING_ENABLED: bool = Field(default=True)
+    PROFILE_SLOW_REQUEST_MS: float = Field(default=500, ge=0)
+    PROFILE_SAMPLE_RATE: float = Field(default=0.0, ge=0, le=1)
+    PROFILE_DIR: str = Field(default="var/profiles")
+
+    # 複数のAPIワーカーで共有するキャッシュ（SQLite）。未設定の場合はプロセス内のキャッシュのみ
+    SHARED_CACHE_PATH: str | None = Field(default=None)
+    SHARED_CACHE_MAX_ENTRIES: int = Field(default=512, ge=1)
+    # ワーカーごとのプロセス内のレスポンスキャッシュの最大エントリ数。各ワーカーが同じ
+    # レスポンスを別々に保持するため、メモリ使用量はワーカー数に比例する。外れた場合も
+    # 事前生成済みのレスポンスや共有キャッシュを読むだけなので、小さくしてもよい
+    CONTENT_CACHE_MAX_ENTRIES: int = Field(default=64, ge=1)
+
     # データ保存関連
     DATA_DIR: str = Field(default="var/data")
     LOG_DIR: str = Field(default="var/logs")
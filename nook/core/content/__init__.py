@@ -0,0 +1,28 @@
+# noqa: D104
+"""Content payloads shared by the API and the collectors."""
+
+from nook.core.content.indexing import index_saved_files, search_index, sync_search_index
+from nook.core.content.publishing import (
+    materialize_saved_files,
+    publish_aggregates,
+    publish_content,
+    publish_ranking,
+    publish_saved_aggregates,
+    publish_saved_files,
+)
+from nook.core.content.sources import RANKED_SOURCE, SOURCE_MAPPING, source_for_directory
+
+__all__ = [
+    "RANKED_SOURCE",
+    "SOURCE_MAPPING",
+    "index_saved_files",
+    "materialize_saved_files",
+    "publish_aggregates",
+    "publish_content",
+    "publish_ranking",
+    "publish_saved_aggregates",
+    "publish_saved_files",
+    "search_index",
+    "source_for_directory",
+    "sync_search_index",
+]
@@ -0,0 +1,444 @@
+"""保存済みの日次ファイルからコンテンツのレスポンスを組み立てる。
+
+コンテンツAPIはリクエスト時のキャッシュミスで、収集処理は保存直後の事前生成で
+同じ関数を使うため、読み込み先の LocalStorage は引数で受け取る。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import TypeVar
+
+from nook.core.content.cache import CachedPayload, build_payload, file_signature
+from nook.core.content.models import (
+    ContentItem,
+    ContentResponse,
+    SourceLoadStatus,
+    StructuredItem,
+    StructuredResponse,
+)
+from nook.core.content.ranking import rank_items, reference_time
+from nook.core.content.sources import (
+    RANKED_SOURCE,
+    SOURCE_MAPPING,
+    TRENDRADAR_SOURCES,
+    service_dir_name,
+    source_display_name,
+    source_file_path,
+    uses_json,
+)
+from nook.core.content.structured import PAPER_SUMMARY_TITLE_MAPPING, make_item_id, structure_records
+from nook.core.metrics.spans import span
+from nook.core.storage import LocalStorage
+from nook.core.utils.scores import parse_popularity_score
+
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+
+# ファイルI/Oはイベントループを塞がないよう専用のスレッドプールで実行する
+CONTENT_IO_MAX_WORKERS = 8
+_io_executor = ThreadPoolExecutor(max_workers=CONTENT_IO_MAX_WORKERS, thread_name_prefix="content-io")
+
+
+async def run_io(func: Callable[..., T], *args, **kwargs) -> T:
+    """同期のファイルI/Oをスレッドプールで実行します（リクエストのスパンを記録できるようコンテキストを引き継ぐ）。"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_io_executor, partial(context.run, func, *args, **kwargs))
+
+
+def convert_paper_summary_titles(content: str) -> str:
+    """論文要約の質問文を読みやすいタイトルに変換"""
+    result = content
+
+    # 各質問文を対応するタイトルに置換
+    for original_title in PAPER_SUMMARY_TITLE_MAPPING:
+        # 質問文の全体または一部にマッチするよう調整
+        # "4. 制限や問題点は何ですか。"のような質問文に対応
+        if original_title in result:
+            result = result.replace(original_title, PAPER_SUMMARY_TITLE_MAPPING[original_title])
+
+    return result
+
+
+def _create_content_item(
+    title: str, content: str, source: str, url: str | None = None, category: str | None = None
+) -> ContentItem:
+    """ContentItemを作成するヘルパー関数"""
+    return ContentItem(
+        title=title,
+        content=content,
+        url=url,
+        source=source,
+        id=make_item_id(source, title, url),
+        category=category,
+    )
+
+
+def _process_trendradar_articles(articles_data: list[dict], source: str) -> list[ContentItem]:
+    """TrendRadar系記事をContentItemリストに変換する共通関数.
+
+    Parameters
+    ----------
+    articles_data : list[dict]
+        TrendRadar系サービスから取得した記事データのリスト。
+    source : str
+        ソース名（例: "trendradar-zhihu", "trendradar-juejin"）。
+
+    Returns
+    -------
+    list[ContentItem]
+        変換されたContentItemのリスト。
+    """
+    items = []
+    # 人気度（popularity_score）の降順でソート
+    # 変換不可能な値（None, "N/A"等）は0として扱う
+    # Note: sorted()を使用して元のリストを変更しない（副作用防止）
+    with span("sort"):
+        sorted_articles = sorted(
+            articles_data,
+            key=lambda x: parse_popularity_score(x.get("popularity_score")),
+            reverse=True,
+        )
+
+    for article in sorted_articles:
+        content = ""
+        if article.get("summary"):
+            # 要約は既にMarkdown形式で構造化されているため、そのまま使用
+            content = f"{article['summary']}\n\n"
+
+        items.append(
+            _create_content_item(
+                title=article.get("title", ""),
+                content=content,
+                url=article.get("url"),
+                source=source,
+                category=article.get("category"),
+            )
+        )
+    return items
+
+
+def _process_hacker_news_stories(stories_data: list[dict], source: str, preview_length: int) -> list[ContentItem]:
+    """Hacker News記事をスコアの降順でContentItemリストに変換する。
+
+    Parameters
+    ----------
+    stories_data : list[dict]
+        Hacker Newsサービスが保存した記事データのリスト。
+    source : str
+        ソース名。
+    preview_length : int
+        要約がない場合に本文から切り出す最大文字数。
+
+    Returns
+    -------
+    list[ContentItem]
+        変換されたContentItemのリスト。
+    """
+    items = []
+    # スコアで降順ソート
+    with span("sort"):
+        sorted_stories = sorted(stories_data, key=lambda x: x.get("score", 0), reverse=True)
+    for story in sorted_stories:
+        # 要約があれば要約を、なければ本文を使用
+        content = ""
+        if story.get("summary"):
+            content = f"**要約**:\n{story['summary']}\n\n"
+        elif story.get("text"):
+            text_preview = story["text"][:preview_length]
+            if len(story["text"]) > preview_length:
+                text_preview += "..."
+            content = f"{text_preview}\n\n"
+
+        content += f"スコア: {story['score']}"
+
+        items.append(
+            _create_content_item(
+                title=story["title"],
+                content=content,
+                url=story.get("url"),
+                source=source,
+            )
+        )
+    return items
+
+
+def _process_ranked_records(ranked_records: list[dict]) -> list[ContentItem]:
+    """総合ランキングのレコードを順位順のContentItemリストに変換する。
+
+    各項目は元のソース・IDのまま返し、同じ話題を報じた他ソースを本文の末尾に添える。
+
+    Parameters
+    ----------
+    ranked_records : list[dict]
+        ``RankedItem.to_record`` 形式のレコードのリスト。
+
+    Returns
+    -------
+    list[ContentItem]
+        変換されたContentItemのリスト。
+    """
+    items = []
+    with span("sort"):
+        ranked_records = sorted(ranked_records, key=lambda x: x.get("rank", 0))
+    for record in ranked_records:
+        item = record["item"]
+        content = item.get("summary") or ""
+        duplicates = record.get("duplicates") or []
+        if duplicates:
+            names = dict.fromkeys(source_display_name(dup["source"]) for dup in duplicates)
+            content += f"\n\n関連: {', '.join(names)}"
+        items.append(
+            ContentItem(
+                title=item["title"],
+                content=content,
+                url=item.get("url"),
+                source=item["source"],
+                id=item["id"],
+                category=item.get("category"),
+            )
+        )
+    return items
+
+
+def _ranked_structured_item(record: dict) -> StructuredItem:
+    """総合ランキングのレコードを、スコアを総合スコアに置き換えたStructuredItemに変換する。"""
+    item = StructuredItem.model_validate(record["item"])
+    metadata = {
+        **item.metadata,
+        "rank": record.get("rank"),
+        "source_score": item.score,
+        "percentile": record.get("percentile"),
+        "decay": record.get("decay"),
+        "boost": record.get("boost"),
+        "duplicates": record.get("duplicates") or [],
+    }
+    return item.model_copy(update={"score": record.get("score"), "metadata": metadata})
+
+
+def _structured_content_item(item: StructuredItem) -> ContentItem:
+    """構造化された項目を、要約を本文とするContentItemに変換する。"""
+    content = item.summary or ""
+    if item.source == "arxiv":
+        content = convert_paper_summary_titles(content)
+    return ContentItem(
+        title=item.title,
+        content=content,
+        url=item.url,
+        source=item.source,
+        id=item.id,
+        category=item.category,
+    )
+
+
+def _content_file_path(storage: LocalStorage, source: str, target_date: datetime) -> Path:
+    """
+    コンテンツAPIが読む日次ファイルのパスを返す。
+
+    Markdownで返していたソースも日次JSONがあればJSONを読み、
+    JSONに変換されていない過去日のみMarkdownを読む。
+    """
+    json_path = source_file_path(storage.base_dir, source, target_date, structured=True)
+    if uses_json(source) or json_path.exists():
+        return json_path
+    return source_file_path(storage.base_dir, source, target_date)
+
+
+def build_source_items(
+    storage: LocalStorage, source: str, target_date: datetime, *, preview_length: int
+) -> list[ContentItem]:
+    """
+    1ソース分のコンテンツをストレージから読み込みContentItemに変換します。
+
+    Parameters
+    ----------
+    storage : LocalStorage
+        データディレクトリのストレージ。
+    source : str
+        データソース。
+    target_date : datetime
+        対象日付。
+    preview_length : int
+        Hacker Newsで要約がない場合の本文プレビュー文字数。
+
+    Returns
+    -------
+    list[ContentItem]
+        コンテンツ項目のリスト。データがない場合は空リスト。
+    """
+    service_name = service_dir_name(source)
+
+    # 総合ランキングは事前計算済みのJSONから取得
+    if source == RANKED_SOURCE:
+        ranked_records = storage.load_json(service_name, target_date)
+        if not ranked_records:
+            return []
+        return _process_ranked_records(ranked_records)
+
+    # Hacker Newsの場合はJSONから個別記事を取得
+    if source == "hacker-news":
+        stories_data = storage.load_json(service_name, target_date)
+        if not stories_data:
+            return []
+        return _process_hacker_news_stories(stories_data, source, preview_length)
+
+    # TrendRadar系はJSONから個別記事を取得
+    if source in TRENDRADAR_SOURCES:
+        articles_data = storage.load_json(service_name, target_date)
+        if not articles_data:
+            return []
+        return _process_trendradar_articles(articles_data, source)
+
+    # 他のソースも日次JSONから個別記事を取得
+    records = storage.load_json(service_name, target_date)
+    if records:
+        with span("structure"):
+            return [_structured_content_item(item) for item in structure_records(source, records)]
+
+    # JSONに変換されていない過去日のみMarkdownから取得
+    # （python -m nook.services.runner.convert_markdown で変換できる）
+    content = storage.load_markdown(service_name, target_date)
+    if not content:
+        return []
+
+    with span("markdown"):
+        # 論文要約の場合はタイトルを変換
+        if source == "arxiv":
+            content = convert_paper_summary_titles(content)
+
+        # マークダウンからContentItemを作成
+        return [
+            _create_content_item(
+                title=(
+                    "" if source == "github" else f"{source_display_name(source)} - {target_date.strftime('%Y-%m-%d')}"
+                ),
+                content=content,
+                source=source,
+            )
+        ]
+
+
+def build_structured_items(storage: LocalStorage, source: str, target_date: datetime) -> list[StructuredItem]:
+    """
+    1ソース分の日次JSONを読み込み、構造化された項目に変換します。
+
+    Markdownしか保存されていない日付は空リストになります
+    （``python -m nook.services.runner.convert_markdown`` で変換してください）。
+    """
+    records = storage.load_json(service_dir_name(source), target_date)
+    if not records:
+        return []
+    with span("structure"):
+        if source == RANKED_SOURCE:
+            return [_ranked_structured_item(record) for record in records]
+        return structure_records(source, records)
+
+
+def fingerprint(storage: LocalStorage, sources: list[str], target_date: datetime, *, structured: bool = False) -> tuple:
+    """ソース群の元ファイルのフィンガープリントを返します。"""
+    with span("fingerprint"):
+        return tuple(
+            file_signature(
+                source_file_path(storage.base_dir, src, target_date, structured=True)
+                if structured
+                else _content_file_path(storage, src, target_date)
+            )
+            for src in sources
+        )
+
+
+async def load_source(
+    storage: LocalStorage, source: str, target_date: datetime, *, preview_length: int, structured: bool = False
+) -> tuple[list[ContentItem] | list[StructuredItem], SourceLoadStatus, Exception | None]:
+    """
+    1ソースをスレッドプールで読み込み、所要時間とともに返します。
+
+    Returns
+    -------
+    tuple[list[ContentItem] | list[StructuredItem], SourceLoadStatus, Exception | None]
+        項目（structured=True の場合は構造化された項目）、読み込み結果、失敗した場合の例外。
+    """
+    started = perf_counter()
+    error: Exception | None = None
+    try:
+        if structured:
+            items = await run_io(build_structured_items, storage, source, target_date)
+        else:
+            items = await run_io(build_source_items, storage, source, target_date, preview_length=preview_length)
+    except Exception as e:
+        logger.warning(f"Failed to load content for {source} ({target_date.strftime('%Y-%m-%d')}): {e}")
+        items, error = [], e
+
+    status = SourceLoadStatus(
+        source=source,
+        status="error" if error else ("ok" if items else "empty"),
+        item_count=len(items),
+        elapsed_ms=round((perf_counter() - started) * 1000, 3),
+    )
+    return items, status, error
+
+
+async def build_content_payload(
+    storage: LocalStorage, source: str, target_date: datetime, fingerprint: tuple, *, structured: bool = False
+) -> tuple[CachedPayload, list[Exception]]:
+    """
+    ストレージからコンテンツを読み込み、直列化済みのレスポンスを生成します。
+
+    全ソースの場合は各ソースを並行に読み込み、失敗したソースを除いた部分的な
+    結果とソースごとの読み込み結果を返します。
+
+    Returns
+    -------
+    tuple[CachedPayload, list[Exception]]
+        生成したペイロードと、読み込みに失敗したソースの例外。
+    """
+    sources = list(SOURCE_MAPPING) if source == "all" else [source]
+    # 全ソース表示ではHacker Newsの本文プレビューを短くする
+    preview_length = 500 if source == "all" else 1000
+    results = await asyncio.gather(
+        *(
+            load_source(storage, src, target_date, preview_length=preview_length, structured=structured)
+            for src in sources
+        )
+    )
+
+    items: list = []
+    statuses: list[SourceLoadStatus] = []
+    errors: list[Exception] = []
+    for src_items, status, error in results:
+        items.extend(src_items)
+        statuses.append(status)
+        if error is not None:
+            errors.append(error)
+
+    if source != "all" and errors:
+        raise errors[0]
+
+    with span("serialize"):
+        response_model = StructuredResponse if structured else ContentResponse
+        response = response_model(items=items, sources=statuses if source == "all" else None)
+        exclude = {"next_cursor"} if response.sources is not None else {"sources", "next_cursor"}
+        exclude &= set(response_model.model_fields)
+        body = response.model_dump_json(exclude=exclude).encode("utf-8")
+    return build_payload(body, fingerprint, item_count=len(items)), errors
+
+
+def compute_ranking(storage: LocalStorage, target_date: datetime) -> list[dict]:
+    """全ソースの1日分の構造化項目から総合ランキングのレコードを計算します（スレッドプールで実行）。"""
+    items_by_source = {}
+    for source in SOURCE_MAPPING:
+        try:
+            items_by_source[source] = build_structured_items(storage, source, target_date)
+        except Exception as e:
+            logger.warning(f"Failed to load {source} for ranking ({target_date.strftime('%Y-%m-%d')}): {e}")
+    ranked = rank_items(items_by_source, reference_time(target_date))
+    return [entry.to_record(rank) for rank, entry in enumerate(ranked, start=1)]
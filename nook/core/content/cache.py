@@ -0,0 +1,383 @@
+"""コンテンツAPIレスポンスのキャッシュ。
+
+ソース・日付ごとに直列化済みのレスポンスボディを保持し、元ファイルの
+更新時刻とサイズ（フィンガープリント）が変わらない限り再利用する。
+インプロセスのLRUキャッシュに加え、収集時に事前生成したレスポンスを
+ファイルとして保存・読み込みする MaterializedPayloadStore を提供する。
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+try:
+    import brotli
+except ImportError:  # brotli が入っていない環境では gzip のみ生成
+    brotli = None
+
+# フィンガープリントの1要素: ファイルが存在しない場合は None
+FileSignature = tuple[int, int] | None
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    """
+    キャッシュされたレスポンス。
+
+    Parameters
+    ----------
+    body : bytes
+        直列化済みのJSONレスポンスボディ。
+    etag : str
+        ボディから算出した強いETag（ダブルクォート付き）。
+    last_modified : datetime | None
+        元ファイルの最終更新時刻（UTC）。元ファイルがない場合はNone。
+    fingerprint : tuple[FileSignature, ...]
+        生成時点の元ファイルのフィンガープリント。
+    item_count : int
+        レスポンスに含まれる項目数。
+    encoded_paths : dict[str, Path]
+        事前圧縮済みファイルのパス（Content-Encoding名 -> パス）。
+    """
+
+    body: bytes
+    etag: str
+    last_modified: datetime | None
+    fingerprint: tuple[FileSignature, ...]
+    item_count: int = 0
+    encoded_paths: dict[str, Path] = field(default_factory=dict)
+
+    @cached_property
+    def document(self) -> dict[str, Any]:
+        """ボディをパースしたJSONオブジェクト（ページ分割・射影用に初回のみパース）。"""
+        return json.loads(self.body)
+
+    @property
+    def last_modified_header(self) -> str | None:
+        """Last-Modified ヘッダー用のHTTP日付文字列を返す。"""
+        if self.last_modified is None:
+            return None
+        return format_datetime(self.last_modified, usegmt=True)
+
+
+def file_signature(path: Path) -> FileSignature:
+    """
+    ファイルの (mtime_ns, size) を返す。
+
+    Parameters
+    ----------
+    path : Path
+        対象ファイルのパス。
+
+    Returns
+    -------
+    FileSignature
+        ファイルが存在しない場合は None。
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def build_payload(body: bytes, fingerprint: tuple[FileSignature, ...], *, item_count: int = 0) -> CachedPayload:
+    """
+    レスポンスボディとフィンガープリントから CachedPayload を生成する。
+
+    Parameters
+    ----------
+    body : bytes
+        直列化済みのレスポンスボディ。
+    fingerprint : tuple[FileSignature, ...]
+        元ファイルのフィンガープリント。
+    item_count : int, default=0
+        レスポンスに含まれる項目数。
+
+    Returns
+    -------
+    CachedPayload
+        ETag と Last-Modified を算出済みのペイロード。
+    """
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    mtimes = [signature[0] for signature in fingerprint if signature is not None]
+    last_modified = None
+    if mtimes:
+        # HTTP日付は秒精度のため切り捨てる
+        last_modified = datetime.fromtimestamp(max(mtimes) // 1_000_000_000, tz=timezone.utc)
+    return CachedPayload(
+        body=body,
+        etag=etag,
+        last_modified=last_modified,
+        fingerprint=fingerprint,
+        item_count=item_count,
+    )
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    If-None-Match ヘッダーが ETag に一致するか判定する。
+
+    RFC 9110 に従い、If-None-Match の比較は弱い比較で行う。
+
+    Parameters
+    ----------
+    if_none_match : str | None
+        リクエストの If-None-Match ヘッダー値。
+    etag : str
+        現在のETag。
+
+    Returns
+    -------
+    bool
+        一致する場合は True。
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def _opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    current = _opaque(etag)
+    return any(_opaque(candidate) == current for candidate in if_none_match.split(","))
+
+
+class ContentCache:
+    """
+    フィンガープリントで検証するスレッドセーフなLRUキャッシュ。
+
+    Parameters
+    ----------
+    max_entries : int
+        保持する最大エントリ数。
+    """
+
+    def __init__(self, max_entries: int = 256):
+        if max_entries < 1:
+            raise ValueError("max_entries は 1 以上である必要があります")
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, CachedPayload] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, fingerprint: tuple[FileSignature, ...]) -> CachedPayload | None:
+        """
+        フィンガープリントが一致するエントリを取得する。
+
+        Parameters
+        ----------
+        key : Hashable
+            キャッシュキー。
+        fingerprint : tuple[FileSignature, ...]
+            現在の元ファイルのフィンガープリント。
+
+        Returns
+        -------
+        CachedPayload | None
+            有効なエントリ。存在しないか古い場合は None。
+        """
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None or payload.fingerprint != fingerprint:
+                if payload is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, key: Hashable, payload: CachedPayload) -> None:
+        """
+        エントリを登録し、上限を超えた古いエントリを追い出す。
+
+        Parameters
+        ----------
+        key : Hashable
+            キャッシュキー。
+        payload : CachedPayload
+            登録するペイロード。
+        """
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        キーが条件に一致するエントリを破棄する。
+
+        Parameters
+        ----------
+        predicate : Callable[[Hashable], bool]
+            破棄するキーで True を返す関数。
+
+        Returns
+        -------
+        int
+            破棄したエントリ数。
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """すべてのエントリと統計をクリアする。"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """一時ファイル経由でファイルを置き換え、読み手に書きかけの内容を見せない。"""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class MaterializedPayloadStore:
+    """
+    事前生成したレスポンスをソース・日付ごとのファイルとして保存・読み込みする。
+
+    ``<base_dir>/<source>/<YYYY-MM-DD>.json`` に直列化済みのボディを、
+    ``.json.gz`` / ``.json.br`` に事前圧縮版を、``.meta.json`` にETagと
+    生成時のフィンガープリントを保存する。メタデータは最後に書き込むため、
+    メタデータが存在すればボディは揃っている。
+
+    Parameters
+    ----------
+    base_dir : Path
+        保存先のベースディレクトリ。
+    version : int, default=1
+        レスポンス形式のバージョン。異なるバージョンで書かれたファイルは読み込まない。
+    """
+
+    def __init__(self, base_dir: Path, version: int = 1):
+        self.base_dir = Path(base_dir)
+        self.version = version
+
+    def body_path(self, source: str, date_str: str) -> Path:
+        """非圧縮ボディのパスを返す。"""
+        return self.base_dir / source / f"{date_str}.json"
+
+    def _meta_path(self, source: str, date_str: str) -> Path:
+        return self.base_dir / source / f"{date_str}.meta.json"
+
+    def write(self, source: str, date_str: str, payload: CachedPayload) -> Path:
+        """
+        ペイロードをボディ・圧縮版・メタデータとして書き込む。
+
+        Parameters
+        ----------
+        source : str
+            ソース名。
+        date_str : str
+            日付（YYYY-MM-DD形式）。
+        payload : CachedPayload
+            書き込むペイロード。
+
+        Returns
+        -------
+        Path
+            非圧縮ボディのパス。
+        """
+        body_path = self.body_path(source, date_str)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+
+        _atomic_write(body_path, payload.body)
+        # mtime=0 で再生成時もバイト列を安定させる
+        _atomic_write(body_path.with_name(f"{body_path.name}.gz"), gzip.compress(payload.body, 9, mtime=0))
+        br_path = body_path.with_name(f"{body_path.name}.br")
+        if brotli is not None:
+            _atomic_write(br_path, brotli.compress(payload.body))
+        else:
+            # 古い世代の圧縮版が残らないようにする
+            br_path.unlink(missing_ok=True)
+
+        meta = {
+            "version": self.version,
+            "etag": payload.etag,
+            "fingerprint": [list(signature) if signature else None for signature in payload.fingerprint],
+            "item_count": payload.item_count,
+        }
+        _atomic_write(self._meta_path(source, date_str), json.dumps(meta).encode("utf-8"))
+        return body_path
+
+    def read(self, source: str, date_str: str, fingerprint: tuple[FileSignature, ...]) -> CachedPayload | None:
+        """
+        フィンガープリントが一致する事前生成済みペイロードを読み込む。
+
+        Parameters
+        ----------
+        source : str
+            ソース名。
+        date_str : str
+            日付（YYYY-MM-DD形式）。
+        fingerprint : tuple[FileSignature, ...]
+            現在の元ファイルのフィンガープリント。
+
+        Returns
+        -------
+        CachedPayload | None
+            有効なペイロード。存在しないか元ファイルが更新されている場合は None。
+        """
+        try:
+            meta = json.loads(self._meta_path(source, date_str).read_bytes())
+            if meta.get("version", 1) != self.version:
+                return None
+            stored = tuple(tuple(signature) if signature else None for signature in meta["fingerprint"])
+            if stored != fingerprint:
+                return None
+            body_path = self.body_path(source, date_str)
+            body = body_path.read_bytes()
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        payload = build_payload(body, fingerprint, item_count=meta.get("item_count", 0))
+        # 書き込み途中の世代が混ざった場合は使わない
+        if payload.etag != meta["etag"]:
+            return None
+
+        encoded_paths = {}
+        for encoding, suffix in (("br", "br"), ("gzip", "gz")):
+            path = body_path.with_name(f"{body_path.name}.{suffix}")
+            if path.exists():
+                encoded_paths[encoding] = path
+        return CachedPayload(
+            body=payload.body,
+            etag=payload.etag,
+            last_modified=payload.last_modified,
+            fingerprint=payload.fingerprint,
+            item_count=payload.item_count,
+            encoded_paths=encoded_paths,
+        )
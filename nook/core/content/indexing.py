@@ -0,0 +1,142 @@
+"""保存済みの日次JSONの全文検索インデックスへの登録。
+
+収集処理は保存した日次JSONを保存直後に登録し、APIは起動時にディレクトリと
+インデックスを突き合わせて、収集処理を経由せずに置かれたファイルを拾う。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from nook.core.content.builder import run_io
+from nook.core.content.cache import file_signature
+from nook.core.content.sources import RANKED_SOURCE, SOURCE_MAPPING, source_for_directory
+from nook.core.content.structured import structure_records
+from nook.core.search import SearchDocument, SearchIndex
+from nook.core.storage.change_log import is_daily_file
+
+logger = logging.getLogger(__name__)
+
+# 検索インデックスの保存先（DATA_DIR 配下）
+SEARCH_DB_NAME = "_search.sqlite3"
+
+_indexes: dict[Path, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def search_index(base_dir: Path) -> SearchIndex:
+    """データディレクトリの検索インデックスを返します（接続の初期化を再利用するためインスタンスを保持）。"""
+    db_path = Path(base_dir) / SEARCH_DB_NAME
+    with _indexes_lock:
+        index = _indexes.get(db_path)
+        if index is None:
+            index = _indexes[db_path] = SearchIndex(db_path)
+    return index
+
+
+def _documents(source: str, records: list[dict]) -> list[SearchDocument]:
+    """保存レコードを構造化スキーマ経由で検索用の項目に変換します。"""
+    documents = []
+    for item in structure_records(source, records):
+        # 要約がない場合はアブストラクト・本文を検索対象にする
+        summary = item.summary or item.metadata.get("abstract") or item.metadata.get("text") or ""
+        documents.append(SearchDocument(item_id=item.id, title=item.title, summary=str(summary), url=item.url or ""))
+    return documents
+
+
+def index_source_file(index: SearchIndex, source: str, path: Path) -> int:
+    """
+    1ソース・1日分の日次JSONをインデックスに登録し直します。
+
+    Parameters
+    ----------
+    index : SearchIndex
+        検索インデックス。
+    source : str
+        データソース。
+    path : Path
+        日次JSONのパス。
+
+    Returns
+    -------
+    int
+        登録した項目数（ファイルがない場合は削除して0）。
+    """
+    signature = file_signature(path)
+    if signature is None:
+        index.remove(source, path.stem)
+        return 0
+    try:
+        records = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        logger.warning(f"Skipping invalid JSON for search index: {path}")
+        records = []
+    if not isinstance(records, list):
+        records = []
+    return index.replace(source, path.stem, _documents(source, records), signature)
+
+
+def sync_search_index(base_dir: Path, index: SearchIndex | None = None) -> int:
+    """
+    全ソースの日次JSONとインデックスを突き合わせ、変更されたファイルのみを登録し直します。
+
+    Parameters
+    ----------
+    base_dir : Path
+        データディレクトリ。
+    index : SearchIndex, optional
+        検索インデックス。省略時はデータディレクトリのインデックス。
+
+    Returns
+    -------
+    int
+        登録し直した（または削除した）ファイル数。
+    """
+    index = index or search_index(base_dir)
+    updated = 0
+    for source, service_name in SOURCE_MAPPING.items():
+        service_dir = Path(base_dir) / service_name
+        known = index.signatures(source)
+        current: set[str] = set()
+        if service_dir.exists():
+            for path in service_dir.glob("*.json"):
+                if not is_daily_file(path.name):
+                    continue
+                current.add(path.stem)
+                if known.get(path.stem) != file_signature(path):
+                    index_source_file(index, source, path)
+                    updated += 1
+        for date_str in known.keys() - current:
+            index.remove(source, date_str)
+            updated += 1
+    return updated
+
+
+async def index_saved_files(saved_files: Iterable[tuple[str, str]]) -> int:
+    """
+    収集処理が返した保存ファイル一覧から、対応する日次JSONをインデックスに登録します。
+
+    Parameters
+    ----------
+    saved_files : Iterable[tuple[str, str]]
+        ``store_daily_snapshots`` などが返す [(json_path, md_path), ...]。
+
+    Returns
+    -------
+    int
+        登録した項目数。
+    """
+    indexed = 0
+    for json_path, _md_path in saved_files:
+        if not json_path:
+            continue
+        path = Path(json_path)
+        source = source_for_directory(path.parent.name)
+        if source is None or source == RANKED_SOURCE or not is_daily_file(path.name) or not path.exists():
+            continue
+        indexed += await run_io(index_source_file, search_index(path.parent.parent), source, path)
+    return indexed
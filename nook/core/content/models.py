@@ -0,0 +1,153 @@
+"""
+コンテンツのデータモデル。
+
+コンテンツAPIのレスポンスと、収集時に事前生成するレスポンスで共有する。
+"""
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class ContentItem(BaseModel):
+    """
+    コンテンツ項目。
+
+    Parameters
+    ----------
+    title : str
+        タイトル。
+    content : str
+        コンテンツ本文。
+    url : str, optional
+        関連URL。
+    source : str
+        ソース（reddit, hackernews, github, techfeed, paper）。
+    id : str, optional
+        項目ID（詳細エンドポイントで使用）。
+    category : str, optional
+        カテゴリ。
+    """
+
+    title: str = Field(..., description="タイトル")
+    content: str = Field(..., description="コンテンツ本文")
+    url: str | None = Field(None, description="関連URL")
+    source: str = Field(..., description="ソース（reddit, hackernews, github, techfeed, paper）")
+    id: str | None = Field(None, description="項目ID（詳細エンドポイントで使用）")
+    category: str | None = Field(None, description="カテゴリ")
+
+
+class SourceLoadStatus(BaseModel):
+    """
+    ソースごとの読み込み結果。
+
+    Parameters
+    ----------
+    source : str
+        ソース名。
+    status : str
+        読み込み結果（ok, empty, error）。
+    item_count : int
+        読み込まれた項目数。
+    elapsed_ms : float
+        読み込みに要した時間（ミリ秒）。
+    """
+
+    source: str = Field(..., description="ソース名")
+    status: str = Field(..., description="読み込み結果（ok, empty, error）")
+    item_count: int = Field(0, description="読み込まれた項目数")
+    elapsed_ms: float = Field(..., description="読み込みに要した時間（ミリ秒）")
+
+
+class ContentResponse(BaseModel):
+    """
+    コンテンツレスポンス。
+
+    Parameters
+    ----------
+    items : List[ContentItem]
+        コンテンツ項目のリスト。
+    sources : List[SourceLoadStatus], optional
+        全ソース取得時のソースごとの読み込み結果。
+    next_cursor : str, optional
+        ページ分割時の次ページのカーソル。最終ページの場合はNone。
+    """
+
+    items: list[ContentItem] = Field(..., description="コンテンツ項目のリスト")
+    sources: list[SourceLoadStatus] | None = Field(None, description="全ソース取得時のソースごとの読み込み結果")
+    next_cursor: str | None = Field(None, description="ページ分割時の次ページのカーソル")
+
+
+class SummarySection(BaseModel):
+    """
+    要約の1セクション。
+
+    Parameters
+    ----------
+    heading : str, optional
+        見出し。見出しより前の本文の場合はNone。
+    body : str
+        セクションの本文（Markdown）。
+    """
+
+    heading: str | None = Field(None, description="見出し")
+    body: str = Field(..., description="セクションの本文（Markdown）")
+
+
+class StructuredItem(BaseModel):
+    """
+    ソース共通の構造化された項目。
+
+    Parameters
+    ----------
+    id : str
+        項目ID（コンテンツAPIの ``id`` と同じ値）。
+    source : str
+        データソース。
+    title : str
+        タイトル。
+    url : str, optional
+        記事・投稿のURL。
+    summary : str, optional
+        要約全文（Markdown）。
+    sections : List[SummarySection]
+        見出しごとに分割した要約。
+    score : float, optional
+        ソースごとの人気指標（HNのスコア、Redditのupvote、GitHubのスター数など）。
+    tags : List[str]
+        言語・サブレディット・カテゴリなどのタグ。
+    category : str, optional
+        カテゴリ。
+    published_at : str, optional
+        公開日時（ISO 8601形式）。
+    metadata : Dict[str, Any]
+        ソース固有の追加フィールド。
+    """
+
+    id: str = Field(..., description="項目ID")
+    source: str = Field(..., description="データソース")
+    title: str = Field(..., description="タイトル")
+    url: str | None = Field(None, description="記事・投稿のURL")
+    summary: str | None = Field(None, description="要約全文（Markdown）")
+    sections: list[SummarySection] = Field(default_factory=list, description="見出しごとに分割した要約")
+    score: float | None = Field(None, description="ソースごとの人気指標")
+    tags: list[str] = Field(default_factory=list, description="タグ")
+    category: str | None = Field(None, description="カテゴリ")
+    published_at: str | None = Field(None, description="公開日時（ISO 8601形式）")
+    metadata: dict[str, Any] = Field(default_factory=dict, description="ソース固有の追加フィールド")
+
+
+class StructuredResponse(BaseModel):
+    """
+    構造化コンテンツレスポンス。
+
+    Parameters
+    ----------
+    items : List[StructuredItem]
+        構造化された項目のリスト。
+    sources : List[SourceLoadStatus], optional
+        全ソース取得時のソースごとの読み込み結果。
+    """
+
+    items: list[StructuredItem] = Field(..., description="構造化された項目のリスト")
+    sources: list[SourceLoadStatus] | None = Field(None, description="全ソース取得時のソースごとの読み込み結果")
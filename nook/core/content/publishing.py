@@ -0,0 +1,257 @@
+"""収集時のAPIレスポンスの事前生成。
+
+収集処理が日次ファイルを保存した直後に、ソース・日付ごとのレスポンスを
+直列化して ``_published`` 配下に書き出す。APIはリクエスト時に ContentItem を
+組み立てずに、直列化済みのバイト列（および事前圧縮版）を返せる。
+構造化レスポンスも ``_published_structured`` 配下に書き出すため、要約の
+見出しごとのセクション分割はリクエスト時ではなくここで行われる。
+
+ソース単位のレスポンスは保存のたびに生成し、全ソース（"all"）と総合
+ランキング（"top"）は全サービスの収集が終わった後に1回だけ生成し直す
+（:func:`publish_saved_aggregates`）。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Iterable
+from datetime import date, datetime, time
+from pathlib import Path
+
+from nook.core.content.builder import build_content_payload, compute_ranking, fingerprint, run_io
+from nook.core.content.cache import MaterializedPayloadStore
+from nook.core.content.indexing import index_saved_files
+from nook.core.content.sources import (
+    PAYLOAD_VERSION,
+    PUBLISHED_DIR_NAME,
+    PUBLISHED_STRUCTURED_DIR_NAME,
+    RANKED_DIR_NAME,
+    RANKED_SOURCE,
+    SOURCE_MAPPING,
+    source_for_directory,
+)
+from nook.core.storage import LocalStorage
+from nook.core.storage.change_log import is_daily_file
+
+logger = logging.getLogger(__name__)
+
+# 総合ランキングとともに生成し直すソース横断のレスポンス
+AGGREGATE_SOURCES = ("all", RANKED_SOURCE)
+
+
+def _as_datetime(target: date | datetime) -> datetime:
+    return target if isinstance(target, datetime) else datetime.combine(target, time.min)
+
+
+def published_store(storage: LocalStorage, *, structured: bool = False) -> MaterializedPayloadStore:
+    """事前生成レスポンス（structured=True の場合は構造化レスポンス）の保存先を返します。"""
+    dir_name = PUBLISHED_STRUCTURED_DIR_NAME if structured else PUBLISHED_DIR_NAME
+    return MaterializedPayloadStore(storage.base_dir / dir_name, version=PAYLOAD_VERSION)
+
+
+def saved_dates_by_source(saved_files: Iterable[tuple[str, str]]) -> dict[Path, dict[str, set[date]]]:
+    """
+    保存ファイル一覧を、データディレクトリ・ソースごとの日付に分類します。
+
+    Parameters
+    ----------
+    saved_files : Iterable[tuple[str, str]]
+        ``store_daily_snapshots`` などが返す [(json_path, md_path), ...]。
+
+    Returns
+    -------
+    dict[Path, dict[str, set[date]]]
+        データディレクトリ -> ソース -> 日付。APIのソースに対応しないファイルは含まない。
+    """
+    grouped: dict[Path, dict[str, set[date]]] = {}
+    for json_path, _md_path in saved_files:
+        if not json_path:
+            continue
+        path = Path(json_path)
+        source = source_for_directory(path.parent.name)
+        if source is None or source == RANKED_SOURCE or not is_daily_file(path.name):
+            continue
+        try:
+            saved_date = datetime.strptime(path.stem, "%Y-%m-%d").date()
+        except ValueError:
+            continue
+        grouped.setdefault(path.parent.parent, {}).setdefault(source, set()).add(saved_date)
+    return grouped
+
+
+async def publish_ranking(storage: LocalStorage, target_date: date | datetime) -> Path | None:
+    """
+    指定日付の総合ランキング（上位 RANKING_TOP_K 件）を計算して保存します。
+
+    各ソースの人気指標をソース・日の中でのパーセンタイルに正規化し、
+    経過時間による減衰と複数ソースで報じられた話題への加点を掛け合わせて順位付けします。
+    内容が変わらない場合は書き込みません。
+
+    Parameters
+    ----------
+    storage : LocalStorage
+        データディレクトリのストレージ。
+    target_date : date | datetime
+        対象日付。
+
+    Returns
+    -------
+    Path | None
+        保存したランキングのパス。対象日の項目がない場合は None。
+    """
+    target_date = _as_datetime(target_date)
+    records = await run_io(compute_ranking, storage, target_date)
+    if not records:
+        return None
+
+    ranked_storage = LocalStorage(str(storage.base_dir / RANKED_DIR_NAME))
+    filename = f"{target_date.strftime('%Y-%m-%d')}.json"
+    if await ranked_storage.load(filename) == json.dumps(records, ensure_ascii=False, indent=2):
+        return ranked_storage.base_dir / filename
+    return await ranked_storage.save(records, filename)
+
+
+async def _publish(storage: LocalStorage, sources: Iterable[str], target_date: datetime) -> list[Path]:
+    """
+    ソース群の1日分のレスポンスと構造化レスポンスを生成して書き出します。
+
+    読み込みに失敗した・空のレスポンスは書き出しません。
+    """
+    date_str = target_date.strftime("%Y-%m-%d")
+    written: list[Path] = []
+    for src in sources:
+        targets = list(SOURCE_MAPPING) if src == "all" else [src]
+        for structured in (False, True):
+            signature = await run_io(fingerprint, storage, targets, target_date, structured=structured)
+            payload, errors = await build_content_payload(storage, src, target_date, signature, structured=structured)
+            if errors or payload.item_count == 0:
+                continue
+            store = published_store(storage, structured=structured)
+            written.append(await run_io(store.write, src, date_str, payload))
+    return written
+
+
+async def publish_content(storage: LocalStorage, source: str, target_dates: Iterable[date | datetime]) -> list[Path]:
+    """
+    ソースの指定日付分のレスポンスを事前生成してファイルに書き出します。
+
+    "all" と総合ランキングのレスポンスは :func:`publish_aggregates` で生成します。
+
+    Parameters
+    ----------
+    storage : LocalStorage
+        データディレクトリのストレージ。
+    source : str
+        データソース。
+    target_dates : Iterable[date | datetime]
+        事前生成する日付。
+
+    Returns
+    -------
+    list[Path]
+        書き出したレスポンスボディのパス。
+    """
+    if source not in SOURCE_MAPPING:
+        raise ValueError(f"Unknown source: {source}")
+
+    written: list[Path] = []
+    for target in sorted({_as_datetime(target) for target in target_dates}):
+        written.extend(await _publish(storage, [source], target))
+    return written
+
+
+async def publish_aggregates(storage: LocalStorage, target_dates: Iterable[date | datetime]) -> list[Path]:
+    """
+    指定日付の総合ランキングを計算し直し、"all" と "top" のレスポンスを事前生成します。
+
+    全ソースを読み込むため、サービスごとではなく収集処理の最後に1回だけ呼び出します。
+
+    Parameters
+    ----------
+    storage : LocalStorage
+        データディレクトリのストレージ。
+    target_dates : Iterable[date | datetime]
+        事前生成する日付。
+
+    Returns
+    -------
+    list[Path]
+        書き出したレスポンスボディのパス。
+    """
+    written: list[Path] = []
+    for target in sorted({_as_datetime(target) for target in target_dates}):
+        await publish_ranking(storage, target)
+        written.extend(await _publish(storage, AGGREGATE_SOURCES, target))
+    return written
+
+
+async def publish_saved_files(saved_files: Iterable[tuple[str, str]]) -> list[Path]:
+    """
+    収集処理が保存したファイル一覧から、ソースごとのレスポンスを事前生成します。
+
+    Parameters
+    ----------
+    saved_files : Iterable[tuple[str, str]]
+        ``store_daily_snapshots`` などが返す [(json_path, md_path), ...]。
+
+    Returns
+    -------
+    list[Path]
+        書き出したレスポンスボディのパス。
+    """
+    written: list[Path] = []
+    for base_dir, dates_by_source in saved_dates_by_source(saved_files).items():
+        storage = LocalStorage(str(base_dir))
+        for source, dates in dates_by_source.items():
+            written.extend(await publish_content(storage, source, dates))
+    return written
+
+
+async def publish_saved_aggregates(saved_files: Iterable[tuple[str, str]]) -> list[Path]:
+    """
+    保存ファイル一覧に含まれる日付について、"all" と総合ランキングを生成し直します。
+
+    Parameters
+    ----------
+    saved_files : Iterable[tuple[str, str]]
+        収集処理全体で保存されたファイルの一覧。
+
+    Returns
+    -------
+    list[Path]
+        書き出したレスポンスボディのパス。
+    """
+    written: list[Path] = []
+    for base_dir, dates_by_source in saved_dates_by_source(saved_files).items():
+        dates = set().union(*dates_by_source.values())
+        written.extend(await publish_aggregates(LocalStorage(str(base_dir)), dates))
+    return written
+
+
+async def materialize_saved_files(saved_files: Iterable[tuple[str, str]]) -> None:
+    """
+    保存直後の日次ファイルを、ソースごとの事前生成レスポンスと検索インデックスに反映します。
+
+    失敗してもログに出力するだけで、呼び出し元の保存処理は成功扱いにします。
+
+    Parameters
+    ----------
+    saved_files : Iterable[tuple[str, str]]
+        ``store_daily_snapshots`` などが返す [(json_path, md_path), ...]。
+    """
+    saved_files = list(saved_files)
+    try:
+        published = await publish_saved_files(saved_files)
+    except Exception as e:
+        logger.warning(f"Failed to publish API payloads for saved snapshots: {e}")
+    else:
+        if published:
+            logger.info(f"Published {len(published)} API payloads")
+    try:
+        indexed = await index_saved_files(saved_files)
+    except Exception as e:
+        logger.warning(f"Failed to index saved snapshots: {e}")
+    else:
+        if indexed:
+            logger.info(f"Indexed {indexed} items for search")
@@ -0,0 +1,231 @@
+"""ソース横断の総合ランキング。
+
+ソースごとに人気指標の尺度が異なる（HNのスコア、Redditのupvote、
+TrendRadarの人気度など）ため、各ソース・各日の中でのパーセンタイルに
+正規化してから比較する。公開からの経過時間による減衰と、複数ソースで
+報じられた話題（近似重複）の加点を掛け合わせてスコアとし、話題ごとに
+代表の1件だけを残した上位K件を返す。
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from nook.core.content.models import StructuredItem
+from nook.core.search.fts_index import DUPLICATE_THRESHOLD
+from nook.core.search.minhash import MinHasher, shingles
+
+# 事前生成する上位件数
+RANKING_TOP_K = 100
+# 経過時間による減衰の半減期（時間）
+RECENCY_HALF_LIFE_HOURS = 24.0
+# 公開日時が不明な項目に仮定する経過時間（時間）
+DEFAULT_AGE_HOURS = 12.0
+# 同じ話題を報じた別ソース1つあたりの加点（倍率）
+DUPLICATE_BOOST = 0.25
+# 人気指標のないソース（arXivなど）のパーセンタイル
+NEUTRAL_PERCENTILE = 0.5
+
+
+@dataclass
+class RankedItem:
+    """
+    ランキングの1件。
+
+    Parameters
+    ----------
+    item : StructuredItem
+        代表の項目。
+    score : float
+        総合スコア。
+    percentile : float
+        ソース・日の中での人気パーセンタイル（0〜1）。
+    decay : float
+        経過時間による減衰（0〜1）。
+    boost : float
+        近似重複による加点（1以上）。
+    duplicates : list[StructuredItem]
+        同じ話題を報じた他の項目。
+    """
+
+    item: StructuredItem
+    score: float
+    percentile: float
+    decay: float
+    boost: float = 1.0
+    duplicates: list[StructuredItem] = field(default_factory=list)
+
+    def to_record(self, rank: int) -> dict:
+        """保存用のレコードに変換する。"""
+        return {
+            "rank": rank,
+            "score": round(self.score, 6),
+            "percentile": round(self.percentile, 6),
+            "decay": round(self.decay, 6),
+            "boost": round(self.boost, 6),
+            "item": self.item.model_dump(),
+            "duplicates": [
+                {"source": dup.source, "id": dup.id, "title": dup.title, "url": dup.url} for dup in self.duplicates
+            ],
+        }
+
+
+def popularity_percentiles(items: list[StructuredItem]) -> list[float]:
+    """
+    1ソース・1日分の項目の人気パーセンタイルを返す。
+
+    中間順位（同点は半分ずつ数える）によるパーセンタイルで、最も人気の高い
+    項目が1.0に近くなる。スコアのない項目は NEUTRAL_PERCENTILE とする。
+
+    Parameters
+    ----------
+    items : list[StructuredItem]
+        1ソース・1日分の項目。
+
+    Returns
+    -------
+    list[float]
+        items と同じ順序のパーセンタイル。
+    """
+    scores = sorted(item.score for item in items if item.score is not None)
+    percentiles = []
+    for item in items:
+        if item.score is None:
+            percentiles.append(NEUTRAL_PERCENTILE)
+            continue
+        below = bisect_left(scores, item.score)
+        ties = bisect_right(scores, item.score) - below
+        percentiles.append((below + ties / 2) / len(scores))
+    return percentiles
+
+
+def recency_decay(published_at: str | None, reference: datetime) -> float:
+    """
+    公開日時から基準時刻までの経過時間による減衰を返す。
+
+    Parameters
+    ----------
+    published_at : str | None
+        公開日時（ISO 8601形式）。
+    reference : datetime
+        基準時刻（タイムゾーン付き）。
+
+    Returns
+    -------
+    float
+        0.5 ** (経過時間 / 半減期)。未来の日時は1.0とする。
+    """
+    age_hours = DEFAULT_AGE_HOURS
+    if published_at:
+        try:
+            published = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+        except ValueError:
+            published = None
+        if published is not None:
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=timezone.utc)
+            age_hours = max(0.0, (reference - published).total_seconds() / 3600)
+    return 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+
+
+def _cluster(items: list[StructuredItem], hasher: MinHasher) -> list[int]:
+    """タイトル＋要約の近似重複を Union-Find でまとめ、各項目の代表インデックスを返す。"""
+    parent = list(range(len(items)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    signatures = [hasher.signature(shingles(f"{item.title} {item.summary or ''}")) for item in items]
+    buckets: dict[tuple[int, int], list[int]] = {}
+    for index, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        for bucket in hasher.buckets(signature):
+            for other in buckets.setdefault(bucket, []):
+                if (
+                    find(index) != find(other)
+                    and hasher.similarity(signature, signatures[other]) >= DUPLICATE_THRESHOLD
+                ):
+                    parent[find(index)] = find(other)
+            buckets[bucket].append(index)
+    return [find(index) for index in range(len(items))]
+
+
+def rank_items(
+    items_by_source: dict[str, list[StructuredItem]],
+    reference: datetime,
+    *,
+    top_k: int = RANKING_TOP_K,
+    hasher: MinHasher | None = None,
+) -> list[RankedItem]:
+    """
+    ソース横断で項目をランキングする。
+
+    Parameters
+    ----------
+    items_by_source : dict[str, list[StructuredItem]]
+        ソースごとの1日分の項目。
+    reference : datetime
+        経過時間の基準時刻（タイムゾーン付き）。
+    top_k : int, default=RANKING_TOP_K
+        返す最大件数。
+    hasher : MinHasher | None
+        近似重複の判定に使う MinHasher。
+
+    Returns
+    -------
+    list[RankedItem]
+        スコアの降順のランキング。近似重複は代表の1件にまとめる。
+    """
+    candidates: list[RankedItem] = []
+    for items in items_by_source.values():
+        for item, percentile in zip(items, popularity_percentiles(items), strict=True):
+            decay = recency_decay(item.published_at, reference)
+            candidates.append(RankedItem(item=item, score=percentile * decay, percentile=percentile, decay=decay))
+    if not candidates:
+        return []
+
+    roots = _cluster([candidate.item for candidate in candidates], hasher or MinHasher())
+    clusters: dict[int, list[RankedItem]] = {}
+    for candidate, root in zip(candidates, roots, strict=True):
+        clusters.setdefault(root, []).append(candidate)
+
+    ranked = []
+    for members in clusters.values():
+        members.sort(key=lambda member: member.score, reverse=True)
+        best = members[0]
+        # 同じソース内の重複は加点しない
+        other_sources = {member.item.source for member in members} - {best.item.source}
+        best.boost = 1.0 + DUPLICATE_BOOST * len(other_sources)
+        best.score *= best.boost
+        best.duplicates = [member.item for member in members[1:]]
+        ranked.append(best)
+
+    ranked.sort(key=lambda entry: (entry.score, entry.item.published_at or ""), reverse=True)
+    return ranked[:top_k]
+
+
+def reference_time(target_date: datetime, now: datetime | None = None) -> datetime:
+    """
+    日付のランキングの基準時刻を返す（当日は現在時刻、過去日はその日の終わり）。
+
+    Parameters
+    ----------
+    target_date : datetime
+        対象日付。
+    now : datetime | None
+        現在時刻。None の場合は datetime.now(timezone.utc)。
+
+    Returns
+    -------
+    datetime
+        タイムゾーン付きの基準時刻。
+    """
+    now = now or datetime.now(timezone.utc)
+    end_of_day = datetime.combine(target_date.date() + timedelta(days=1), datetime.min.time()).astimezone()
+    return min(now, end_of_day)
@@ -0,0 +1,121 @@
+"""コンテンツのソースと保存先の対応。
+
+APIのソース名（"hacker-news" など）と、収集処理が日次ファイルを保存する
+ディレクトリ名（"hacker_news" など）の対応を定義する。
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+SOURCE_MAPPING = {
+    "arxiv": "arxiv_summarizer",
+    "github": "github_trending",
+    "hacker-news": "hacker_news",
+    "tech-news": "tech_feed",
+    "business-news": "business_feed",
+    "zenn": "zenn_explorer",
+    "qiita": "qiita_explorer",
+    "note": "note_explorer",
+    "reddit": "reddit_explorer",
+    "4chan": "fourchan_explorer",
+    "5chan": "fivechan_explorer",
+    "trendradar-zhihu": "trendradar-zhihu",
+    "trendradar-juejin": "trendradar-juejin",
+    "trendradar-ithome": "trendradar-ithome",
+    "trendradar-36kr": "trendradar-36kr",
+    "trendradar-weibo": "trendradar-weibo",
+    "trendradar-toutiao": "trendradar-toutiao",
+    "trendradar-sspai": "trendradar-sspai",
+    "trendradar-producthunt": "trendradar-producthunt",
+    "trendradar-freebuf": "trendradar-freebuf",
+    "trendradar-wallstreetcn": "trendradar-wallstreetcn",
+    "trendradar-tencent": "trendradar-tencent",
+    "trendradar-v2ex": "trendradar-v2ex",
+}
+
+# TrendRadar系ソースはJSONから個別記事として返す
+TRENDRADAR_SOURCES = frozenset(source for source in SOURCE_MAPPING if source.startswith("trendradar-"))
+
+# ソース横断の総合ランキング。SOURCE_MAPPING には含めず、"all" やエクスポートの対象外とする
+RANKED_SOURCE = "top"
+# 日付ごとの事前計算済みランキングの保存先（DATA_DIR 配下）
+RANKED_DIR_NAME = "_ranked"
+
+# 収集時に事前生成したレスポンスの保存先（DATA_DIR 配下）
+PUBLISHED_DIR_NAME = "_published"
+# 構造化レスポンス（要約のセクション分割済み）の保存先（DATA_DIR 配下）
+PUBLISHED_STRUCTURED_DIR_NAME = "_published_structured"
+# レスポンス形式を変えた場合に上げ、古い形式の事前生成ファイルを無効化する
+PAYLOAD_VERSION = 3
+
+SOURCE_DISPLAY_NAMES = {
+    RANKED_SOURCE: "総合ランキング",
+    "reddit": "Reddit",
+    "hacker-news": "Hacker News",
+    "github": "GitHub Trending",
+    "tech-news": "Tech News",
+    "business-news": "Business News",
+    "paper": "ArXiv",
+    "zenn": "Zenn",
+    "qiita": "Qiita",
+    "note": "Note",
+    "4chan": "4chan",
+    "5chan": "5ちゃんねる",
+    "trendradar-zhihu": "知乎 (Zhihu)",
+    "trendradar-juejin": "掘金 (Juejin)",
+    "trendradar-ithome": "IT之家 (ITHome)",
+    "trendradar-36kr": "36氪 (36Kr)",
+    "trendradar-weibo": "微博 (Weibo)",
+    "trendradar-toutiao": "今日头条 (Toutiao)",
+    "trendradar-sspai": "少数派 (SSPai)",
+    "trendradar-producthunt": "Product Hunt",
+    "trendradar-freebuf": "FreeBuf (FreeBuf)",
+    "trendradar-wallstreetcn": "华尔街见闻 (Wallstreetcn)",
+    "trendradar-tencent": "腾讯新闻 (Tencent News)",
+    "trendradar-v2ex": "V2EX",
+}
+
+
+def source_display_name(source: str) -> str:
+    """
+    ソースの表示名を取得します。
+
+    Parameters
+    ----------
+    source : str
+        データソース
+
+    Returns
+    -------
+    str
+        表示名
+    """
+    return SOURCE_DISPLAY_NAMES.get(source, source)
+
+
+def uses_json(source: str) -> bool:
+    """ソースが個別記事をJSONから返すかどうかを判定する。"""
+    return source in ("hacker-news", RANKED_SOURCE) or source in TRENDRADAR_SOURCES
+
+
+def service_dir_name(source: str) -> str:
+    """ソースの保存ディレクトリ名を返す。"""
+    return RANKED_DIR_NAME if source == RANKED_SOURCE else SOURCE_MAPPING[source]
+
+
+def source_file_path(base_dir: Path, source: str, target_date: datetime, *, structured: bool = False) -> Path:
+    """ソースと日付に対応する保存ファイルのパスを返す（構造化レスポンスは常にJSON）。"""
+    extension = "json" if structured or uses_json(source) else "md"
+    return base_dir / service_dir_name(source) / f"{target_date.strftime('%Y-%m-%d')}.{extension}"
+
+
+def source_for_directory(directory: str) -> str | None:
+    """保存ディレクトリ名に対応するソースを返します（総合ランキングは "top"、対象外は None）。"""
+    if directory == RANKED_DIR_NAME:
+        return RANKED_SOURCE
+    for source, service_name in SOURCE_MAPPING.items():
+        if service_name == directory:
+            return source
+    return None
@@ -0,0 +1,262 @@
+"""ソースごとの保存レコードを共通の構造化スキーマに変換する。
+
+各サービスが保存する日次JSONのレコードを StructuredItem に正規化する。
+要約の見出し分割もここで行う。収集処理が保存時に構造化レスポンスを事前生成
+するため（:mod:`nook.core.content.publishing`）、APIはリクエスト時に
+Markdownを解析しない（事前生成されていない過去日のみ読み込み時に変換する）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Callable
+from typing import Any
+
+from nook.core.content.models import StructuredItem, SummarySection
+from nook.core.utils.scores import parse_popularity_score
+
+# 論文要約の質問文を読みやすいタイトルに変換するマッピング
+PAPER_SUMMARY_TITLE_MAPPING = {
+    "1. 既存研究では何ができなかったのか": "🔍 研究背景と課題",
+    "2. どのようなアプローチでそれを解決しようとしたか": "💡 提案手法",
+    "3. 結果、何が達成できたのか": "🎯 主要な成果",
+    "4. 制限や問題点は何ですか。本文で言及されているやあなたが考えるものも含めて教えてください": "⚠️ 限界と今後の課題",
+    "5. 技術的な詳細について。技術者が読むことを想定したトーンで教えてください": "🔧 技術詳細",
+    "6. コストや物理的な詳細について教えてください。例えばトレーニングに使用したGPUの数や時間、データセット、モデルのサイズなど": "💻 計算リソースと規模",
+    "7. 参考文献のうち、特に参照すべきものを教えてください": "📚 重要な関連研究",
+    "8. この論文を140字以内で要約するとどうなりますか？": "📝 140字要約",
+}
+
+# 要約中の見出し行: "## 見出し" / "**見出し**" / "1. **見出し**"（末尾のコロンは任意）
+_HEADING_PATTERNS = (
+    re.compile(r"^#{1,6}\s+(?P<heading>.+?)\s*#*$"),
+    re.compile(r"^(?:\d+\.\s*)?\*\*(?P<heading>[^*]+?)\*\*\s*[:：]?$"),
+)
+
+FEED_SOURCES = frozenset({"tech-news", "business-news", "zenn", "qiita", "note"})
+
+
+def make_item_id(source: str, title: str, url: str | None) -> str:
+    """ソース・URL・タイトルから安定した項目IDを生成する"""
+    digest = hashlib.sha256(f"{source}\n{url or ''}\n{title}".encode()).hexdigest()
+    return digest[:16]
+
+
+def _match_heading(line: str) -> str | None:
+    """行が見出しであれば見出し文字列を返す。"""
+    stripped = line.strip()
+    # 論文要約の質問文は見出し記号の有無にかかわらず見出しとして扱う
+    question = stripped.lstrip("#").strip().strip("*").strip()
+    if question in PAPER_SUMMARY_TITLE_MAPPING:
+        return PAPER_SUMMARY_TITLE_MAPPING[question]
+    for pattern in _HEADING_PATTERNS:
+        match = pattern.match(stripped)
+        if match:
+            return match.group("heading").strip()
+    return None
+
+
+def split_summary_sections(summary: str | None) -> list[SummarySection]:
+    """
+    要約を見出しごとのセクションに分割する。
+
+    Parameters
+    ----------
+    summary : str | None
+        要約（Markdown）。
+
+    Returns
+    -------
+    list[SummarySection]
+        セクションのリスト。見出しより前の本文は heading=None のセクションになる。
+        要約が空の場合は空リスト。
+    """
+    if not summary or not summary.strip():
+        return []
+
+    sections: list[SummarySection] = []
+    heading: str | None = None
+    lines: list[str] = []
+
+    def _flush() -> None:
+        body = "\n".join(lines).strip()
+        if body or heading is not None:
+            sections.append(SummarySection(heading=heading, body=body))
+
+    for line in summary.splitlines():
+        matched = _match_heading(line)
+        if matched is None:
+            lines.append(line)
+            continue
+        _flush()
+        heading, lines = matched, []
+    _flush()
+    return sections
+
+
+def _to_float(value: Any) -> float | None:
+    """数値に変換できる値をfloatで返す（欠損・変換不可はNone）。"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        return float(value)
+    try:
+        return float(str(value).replace(",", "").strip())
+    except ValueError:
+        return None
+
+
+def _tags(*values: Any) -> list[str]:
+    """空でない値を重複なくタグとして並べる。"""
+    return list(dict.fromkeys(str(value) for value in values if value))
+
+
+def _item(source: str, title: str, url: str | None, summary: str | None, **fields: Any) -> StructuredItem:
+    return StructuredItem(
+        id=make_item_id(source, title, url),
+        source=source,
+        title=title,
+        url=url,
+        summary=summary or None,
+        sections=split_summary_sections(summary),
+        **fields,
+    )
+
+
+def _structure_hacker_news(source: str, record: dict[str, Any]) -> StructuredItem:
+    return _item(
+        source,
+        record.get("title", ""),
+        record.get("url"),
+        record.get("summary"),
+        score=_to_float(record.get("score")),
+        published_at=record.get("published_at"),
+        metadata={"text": record["text"]} if record.get("text") else {},
+    )
+
+
+def _structure_github(source: str, record: dict[str, Any]) -> StructuredItem:
+    return _item(
+        source,
+        record.get("name", ""),
+        record.get("link"),
+        record.get("description"),
+        score=_to_float(record.get("stars")),
+        tags=_tags(record.get("language")),
+        category=record.get("language"),
+        published_at=record.get("published_at"),
+    )
+
+
+def _structure_arxiv(source: str, record: dict[str, Any]) -> StructuredItem:
+    return _item(
+        source,
+        record.get("title", ""),
+        record.get("url"),
+        record.get("summary"),
+        published_at=record.get("published_at"),
+        metadata={"abstract": record["abstract"]} if record.get("abstract") else {},
+    )
+
+
+def _structure_reddit(source: str, record: dict[str, Any]) -> StructuredItem:
+    return _item(
+        source,
+        record.get("title", ""),
+        record.get("permalink") or record.get("url"),
+        record.get("summary"),
+        score=_to_float(record.get("upvotes")),
+        tags=_tags(record.get("subreddit"), record.get("type")),
+        category=record.get("subreddit"),
+        published_at=record.get("published_at") or record.get("created_at"),
+        metadata={
+            key: record[key] for key in ("url", "text", "thumbnail", "comments") if record.get(key) not in (None, "")
+        },
+    )
+
+
+def _structure_thread(source: str, record: dict[str, Any]) -> StructuredItem:
+    return _item(
+        source,
+        record.get("title", ""),
+        record.get("url"),
+        record.get("summary"),
+        score=_to_float(record.get("popularity_score")),
+        tags=_tags(record.get("board")),
+        category=record.get("board"),
+        published_at=record.get("published_at"),
+        metadata={key: record[key] for key in ("thread_id", "timestamp") if record.get(key) is not None},
+    )
+
+
+def _structure_feed_article(source: str, record: dict[str, Any]) -> StructuredItem:
+    return _item(
+        source,
+        record.get("title", ""),
+        record.get("url"),
+        record.get("summary"),
+        score=_to_float(record.get("popularity_score")),
+        tags=_tags(record.get("feed_name")),
+        category=record.get("category"),
+        published_at=record.get("published_at"),
+    )
+
+
+def _structure_trendradar(source: str, record: dict[str, Any]) -> StructuredItem:
+    return _item(
+        source,
+        record.get("title", ""),
+        record.get("url"),
+        record.get("summary"),
+        score=_to_float(record.get("popularity_score")),
+        tags=_tags(record.get("category")),
+        category=record.get("category"),
+        published_at=record.get("published_at"),
+        metadata={
+            key: record[key]
+            for key in ("feed_name", "rank", "best_rank", "first_seen_at", "last_seen_at")
+            if record.get(key) is not None
+        },
+    )
+
+
+_STRUCTURERS: dict[str, Callable[[str, dict[str, Any]], StructuredItem]] = {
+    "hacker-news": _structure_hacker_news,
+    "github": _structure_github,
+    "arxiv": _structure_arxiv,
+    "reddit": _structure_reddit,
+    "4chan": _structure_thread,
+    "5chan": _structure_thread,
+    **dict.fromkeys(FEED_SOURCES, _structure_feed_article),
+}
+
+
+def structure_records(source: str, records: list[dict[str, Any]]) -> list[StructuredItem]:
+    """
+    1ソース・1日分の保存レコードを構造化された項目に変換する。
+
+    Hacker News はスコア、TrendRadar系は人気度の降順に並べ替え（コンテンツAPIと同じ順序）、
+    それ以外は保存された順序のまま返す。
+
+    Parameters
+    ----------
+    source : str
+        データソース（SOURCE_MAPPING のキー）。
+    records : list[dict[str, Any]]
+        サービスが保存した日次JSONのレコード。
+
+    Returns
+    -------
+    list[StructuredItem]
+        構造化された項目のリスト。
+    """
+    if source.startswith("trendradar-"):
+        records = sorted(records, key=lambda x: parse_popularity_score(x.get("popularity_score")), reverse=True)
+        structurer = _structure_trendradar
+    elif source == "hacker-news":
+        records = sorted(records, key=lambda x: x.get("score", 0), reverse=True)
+        structurer = _structure_hacker_news
+    else:
+        structurer = _STRUCTURERS.get(source, _structure_feed_article)
+    return [structurer(source, record) for record in records if isinstance(record, dict)]
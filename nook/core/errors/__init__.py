@@ -1,7 +1,7 @@
 # noqa: D104
 """Error handling and exceptions."""
 
-from nook.core.errors.error_metrics import ErrorMetrics
+from nook.core.errors.error_metrics import AlertThreshold, ErrorMetrics
 from nook.core.errors.exceptions import (
     APIException,
     RetryException,
@@ -11,6 +11,7 @@ from nook.core.errors.service_errors import ServiceErrorHandler
 
 __all__ = [
     "APIException",
+    "AlertThreshold",
     "ErrorMetrics",
     "RetryException",
     "ServiceErrorHandler",
@@ -1,45 +1,286 @@
 import threading
-from collections import defaultdict
-from datetime import UTC, datetime, timedelta
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+# 集計の単位（秒）と保持するバケット数（1分単位で1時間分、1時間単位で1日分）
+MINUTE_SECONDS = 60
+HOUR_SECONDS = 3600
+MINUTE_BUCKETS = 60
+HOUR_BUCKETS = 24
+
+# サービスを指定せずに記録したエラーのサービス名
+DEFAULT_SERVICE = "unknown"
+
+
+class TimeBucketCounter:
+    """
+    一定幅の時間バケットごとの件数を固定長のリングバッファで保持する。
+
+    古いバケットは次に同じ位置を使うときに上書きするため、メモリ使用量は
+    稼働時間に関係なく一定になる。
+
+    Parameters
+    ----------
+    width : int
+        1バケットの幅（秒）。
+    size : int
+        保持するバケット数。
+    """
+
+    __slots__ = ("width", "size", "_epochs", "_counts", "_first")
+
+    def __init__(self, width: int, size: int):
+        self.width = width
+        self.size = size
+        # 各位置のバケットの番号（UNIX時刻 // width）。-1 は未使用
+        self._epochs = [-1] * size
+        self._counts = [0] * size
+        self._first = [0.0] * size
+
+    def add(self, timestamp: float, amount: int = 1) -> None:
+        """時刻のバケットに件数を加える。"""
+        epoch = int(timestamp // self.width)
+        slot = epoch % self.size
+        if self._epochs[slot] != epoch:
+            self._epochs[slot] = epoch
+            self._counts[slot] = 0
+            self._first[slot] = timestamp
+        self._counts[slot] += amount
+
+    def _live_slots(self, now: float, buckets: int | None) -> list[int]:
+        current = int(now // self.width)
+        span = min(buckets or self.size, self.size)
+        return [slot for slot, epoch in enumerate(self._epochs) if current - span < epoch <= current]
+
+    def total(self, now: float, buckets: int | None = None) -> int:
+        """
+        直近のバケットの件数の合計を返す。
+
+        Parameters
+        ----------
+        now : float
+            現在のUNIX時刻。
+        buckets : int, optional
+            合計するバケット数（現在のバケットを含む）。省略時はすべて。
+        """
+        return sum(self._counts[slot] for slot in self._live_slots(now, buckets))
+
+    def first_timestamp(self, now: float, buckets: int | None = None) -> float | None:
+        """直近のバケットで最初に記録された時刻を返す（記録がない場合は None）。"""
+        live = [self._first[slot] for slot in self._live_slots(now, buckets) if self._counts[slot]]
+        return min(live) if live else None
+
+    def series(self, now: float) -> list[int]:
+        """古い順のバケットごとの件数を返す（最後が現在のバケット）。"""
+        current = int(now // self.width)
+        result = []
+        for epoch in range(current - self.size + 1, current + 1):
+            slot = epoch % self.size
+            result.append(self._counts[slot] if self._epochs[slot] == epoch else 0)
+        return result
+
+
+class _ErrorSeries:
+    """エラーの種類・サービスの組ごとの集計。"""
+
+    __slots__ = ("minutes", "hours", "last_seen", "last_details")
+
+    def __init__(self):
+        self.minutes = TimeBucketCounter(MINUTE_SECONDS, MINUTE_BUCKETS)
+        self.hours = TimeBucketCounter(HOUR_SECONDS, HOUR_BUCKETS)
+        self.last_seen = 0.0
+        self.last_details: dict = {}
+
+    def add(self, timestamp: float, details: dict) -> None:
+        self.minutes.add(timestamp)
+        self.hours.add(timestamp)
+        self.last_seen = max(self.last_seen, timestamp)
+        self.last_details = details
+
+    def counter_for(self, minutes: int) -> tuple[TimeBucketCounter, int]:
+        """期間（分）の集計に使うバケットと、その数を返す。"""
+        if minutes <= MINUTE_BUCKETS:
+            return self.minutes, max(1, minutes)
+        return self.hours, min(HOUR_BUCKETS, -(-minutes // 60))
+
+
+@dataclass(frozen=True)
+class AlertThreshold:
+    """
+    エラー率のしきい値（例: 1分あたり60件を超える rate_limited）。
+
+    Parameters
+    ----------
+    error_type : str
+        対象のエラーの種類。
+    limit : int
+        期間内の件数がこれを超えたら通知する。
+    minutes : int, default=1
+        集計する期間（分）。
+    service : str, optional
+        対象のサービス。省略時はすべてのサービスの合計。
+    """
+
+    error_type: str
+    limit: int
+    minutes: int = 1
+    service: str | None = None
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, UTC).isoformat()
 
 
 class ErrorMetrics:
-    """エラーメトリクスの収集と集約"""
+    """
+    エラーメトリクスの収集と集約。
+
+    エラーの種類とサービスの組ごとに、直近1時間を1分単位、直近1日を1時間単位の
+    リングバッファで数える。記録・集計のコストとメモリ使用量は稼働時間や
+    エラー件数に依存しない。件数はプロセス内にだけ保持するため、API を複数の
+    ワーカーで動かす場合はワーカーごとの件数になる。
 
-    def __init__(self, window_minutes: int = 60):
+    Parameters
+    ----------
+    window_minutes : int, default=60
+        get_error_stats で集計する期間（分、最大1日）。60分以下は1分単位、
+        それより長い場合は1時間単位で集計する。
+    clock : Callable[[], float], default=time.time
+        現在のUNIX時刻を返す関数（テスト用）。
+    """
+
+    def __init__(self, window_minutes: int = 60, clock: Callable[[], float] = time.time):
         self.window_minutes = window_minutes
-        self.errors: dict[str, list[tuple[datetime, dict]]] = defaultdict(list)
+        self.clock = clock
+        self._series: dict[tuple[str, str], _ErrorSeries] = {}
         self.lock = threading.Lock()
 
-    def record_error(self, error_type: str, details: dict):
-        """エラーを記録"""
+    def record_error(self, error_type: str, details: dict, service: str = DEFAULT_SERVICE):
+        """
+        エラーを記録。
+
+        Parameters
+        ----------
+        error_type : str
+            エラーの種類。
+        details : dict
+            エラーの詳細（種類・サービスごとに最新のものだけを保持する）。
+        service : str, default=DEFAULT_SERVICE
+            エラーが発生したサービス。
+        """
+        now = self.clock()
+        with self.lock:
+            series = self._series.get((error_type, service))
+            if series is None:
+                series = self._series[(error_type, service)] = _ErrorSeries()
+            series.add(now, details)
+
+    def count(self, error_type: str, minutes: int = 1, service: str | None = None) -> int:
+        """
+        直近の期間のエラー件数を返す。
+
+        Parameters
+        ----------
+        error_type : str
+            エラーの種類。
+        minutes : int, default=1
+            期間（分）。60分以下は1分単位、それより長い場合は1時間単位で数える。
+        service : str, optional
+            サービス。省略時はすべてのサービスの合計。
+        """
+        now = self.clock()
         with self.lock:
-            now = datetime.now(UTC)
-            self.errors[error_type].append((now, details))
+            total = 0
+            for (kind, name), series in self._series.items():
+                if kind == error_type and (service is None or name == service):
+                    counter, buckets = series.counter_for(minutes)
+                    total += counter.total(now, buckets)
+            return total
 
-            # 古いエラーを削除
-            cutoff = now - timedelta(minutes=self.window_minutes)
-            self.errors[error_type] = [(ts, d) for ts, d in self.errors[error_type] if ts > cutoff]
+    def rate_per_minute(self, error_type: str, minutes: int = 1, service: str | None = None) -> float:
+        """直近の期間の1分あたりのエラー件数を返す。"""
+        return self.count(error_type, minutes, service) / max(1, minutes)
+
+    def check_alerts(self, thresholds: Iterable[AlertThreshold]) -> list[dict]:
+        """
+        しきい値を超えたエラーを返す。
+
+        Parameters
+        ----------
+        thresholds : Iterable[AlertThreshold]
+            判定するしきい値。
+
+        Returns
+        -------
+        list[dict]
+            超えたしきい値と件数（error_type, service, minutes, limit, count）。
+        """
+        alerts = []
+        for threshold in thresholds:
+            count = self.count(threshold.error_type, threshold.minutes, threshold.service)
+            if count > threshold.limit:
+                alerts.append(
+                    {
+                        "error_type": threshold.error_type,
+                        "service": threshold.service,
+                        "minutes": threshold.minutes,
+                        "limit": threshold.limit,
+                        "count": count,
+                    }
+                )
+        return alerts
 
     def get_error_stats(self) -> dict[str, dict]:
         """エラー統計を取得"""
+        now = self.clock()
         with self.lock:
-            now = datetime.now(UTC)
-            cutoff = now - timedelta(minutes=self.window_minutes)
-
-            stats = {}
-            for error_type, error_list in self.errors.items():
-                recent_errors = [(ts, d) for ts, d in error_list if ts > cutoff]
-
-                if recent_errors:
-                    stats[error_type] = {
-                        "count": len(recent_errors),
-                        "first_occurrence": recent_errors[0][0].isoformat(),
-                        "last_occurrence": recent_errors[-1][0].isoformat(),
-                        "rate_per_minute": len(recent_errors) / self.window_minutes,
-                    }
+            stats: dict[str, dict] = {}
+            for (error_type, service), series in self._series.items():
+                counter, buckets = series.counter_for(self.window_minutes)
+                count = counter.total(now, buckets)
+                if not count:
+                    continue
+                first = counter.first_timestamp(now, buckets)
+                stat = stats.setdefault(
+                    error_type, {"count": 0, "first": first, "last": series.last_seen, "by_service": {}}
+                )
+                stat["count"] += count
+                stat["first"] = min(stat["first"], first)
+                stat["last"] = max(stat["last"], series.last_seen)
+                stat["by_service"][service] = count
 
-            return stats
+        return {
+            error_type: {
+                "count": stat["count"],
+                "first_occurrence": _isoformat(stat["first"]),
+                "last_occurrence": _isoformat(stat["last"]),
+                "rate_per_minute": stat["count"] / self.window_minutes,
+                "by_service": stat["by_service"],
+            }
+            for error_type, stat in stats.items()
+        }
+
+    def get_error_timeline(self, error_type: str, service: str | None = None) -> dict[str, list[int]]:
+        """
+        エラー件数の推移を返す。
+
+        Returns
+        -------
+        dict[str, list[int]]
+            "per_minute"（直近60分）と "per_hour"（直近24時間）の古い順の件数。
+        """
+        now = self.clock()
+        per_minute = [0] * MINUTE_BUCKETS
+        per_hour = [0] * HOUR_BUCKETS
+        with self.lock:
+            for (kind, name), series in self._series.items():
+                if kind != error_type or (service is not None and name != service):
+                    continue
+                per_minute = [a + b for a, b in zip(per_minute, series.minutes.series(now), strict=True)]
+                per_hour = [a + b for a, b in zip(per_hour, series.hours.series(now), strict=True)]
+        return {"per_minute": per_minute, "per_hour": per_hour}
 
     def get_error_report(self) -> str:
         """エラーレポートを生成"""
@@ -63,6 +304,11 @@ class ErrorMetrics:
 
         return "\n".join(report_lines)
 
+    def clear(self) -> None:
+        """記録したエラーをすべて消す"""
+        with self.lock:
+            self._series.clear()
+
 
 # グローバルインスタンス
 error_metrics = ErrorMetrics()
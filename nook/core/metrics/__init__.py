@@ -0,0 +1,26 @@
+# noqa: D104
+"""Metrics collection and Prometheus exposition."""
+
+from nook.core.metrics.registry import (
+    CONTENT_TYPE,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    metrics,
+)
+from nook.core.metrics.spans import RequestTimings, current_timings, span, start_timings, stop_timings
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "RequestTimings",
+    "current_timings",
+    "metrics",
+    "span",
+    "start_timings",
+    "stop_timings",
+]
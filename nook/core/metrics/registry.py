@@ -0,0 +1,329 @@
+"""Prometheus のテキスト形式で出力できるメトリクス（カウンター・ゲージ・ヒストグラム）。
+
+外部ライブラリに依存しない最小限の実装。API サーバーは ``/metrics`` で
+:meth:`MetricsRegistry.render` の結果を返し、収集処理だけを実行するプロセスは
+:meth:`MetricsRegistry.write_textfile` で node_exporter の textfile collector が
+読み込むファイル（``*.prom``）に書き出す。同じテキストは Pushgateway にも
+そのまま送れる。
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+
+# /metrics のレスポンスの Content-Type（テキスト形式 0.0.4）
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# ヒストグラムの既定のバケット（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values, strict=True))
+    return f"{{{pairs}}}"
+
+
+class Metric:
+    """
+    メトリクスの基底クラス。
+
+    Parameters
+    ----------
+    name : str
+        メトリクス名。
+    documentation : str
+        説明（HELP 行に出力する）。
+    labelnames : Sequence[str]
+        ラベル名。値を記録するときはすべてのラベルを指定する。
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        """(サンプル名, ラベル, 値) の一覧を返す。"""
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """記録した値をすべて消す。"""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """テキスト形式で出力する。"""
+        lines = [f"# HELP {self.name} {_escape_help(self.documentation)}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return "\n".join(lines) + "\n"
+
+
+class _ValueMetric(Metric):
+    """ラベルごとに1つの値を持つメトリクス。"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def _add(self, amount: float, labels: dict[str, object]) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        """現在の値を返す。"""
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in items]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_ValueMetric):
+    """単調増加する値（名前は ``_total`` で終える）。"""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """値を増やす。"""
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+        self._add(amount, labels)
+
+
+class Gauge(_ValueMetric):
+    """増減する値。"""
+
+    type_name = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """値を増やす。"""
+        self._add(amount, labels)
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        """値を減らす。"""
+        self._add(-amount, labels)
+
+    def set(self, value: float, **labels: object) -> None:
+        """値を設定する。"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def set_to_current_time(self, **labels: object) -> None:
+        """現在のUNIX時刻を設定する。"""
+        self.set(time.time(), **labels)
+
+
+class Histogram(Metric):
+    """
+    観測値の分布（バケットごとの累積数・合計・件数）。
+
+    Parameters
+    ----------
+    name : str
+        メトリクス名。
+    documentation : str
+        説明。
+    labelnames : Sequence[str]
+        ラベル名。
+    buckets : Sequence[float], default=DEFAULT_BUCKETS
+        バケットの上限（昇順。+Inf は自動で追加する）。
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        bounds = sorted(float(bound) for bound in buckets)
+        if not bounds or bounds[-1] != math.inf:
+            bounds.append(math.inf)
+        self.buckets = tuple(bounds)
+        # ラベルごとの (バケットごとの件数, 合計)
+        self._values: dict[LabelValues, tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        """値を記録する。"""
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        """ブロックの実行時間（秒）を記録する。"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: object) -> int:
+        """記録した件数を返す。"""
+        key = self._key(labels)
+        with self._lock:
+            counts, _total = self._values.get(key) or ([], 0.0)
+            return sum(counts)
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        result = []
+        bucket_labels = (*self.labelnames, "le")
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts, strict=True):
+                cumulative += count
+                labels = _format_labels(bucket_labels, (*key, _format_value(bound)))
+                result.append((f"{self.name}_bucket", labels, cumulative))
+            labels = _format_labels(self.labelnames, key)
+            result.append((f"{self.name}_sum", labels, total))
+            result.append((f"{self.name}_count", labels, cumulative))
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """
+    メトリクスを名前で管理し、まとめて出力する。
+
+    ``counter`` / ``gauge`` / ``histogram`` は同じ名前のメトリクスが登録済みなら
+    それを返すため、モジュールの読み込み時に何度呼んでもよい。
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls: type[Metric], name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """カウンターを登録する。"""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """ゲージを登録する。"""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """ヒストグラムを登録する。"""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Metric | None:
+        """登録済みのメトリクスを返す。"""
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        """値が記録されたメトリクスをテキスト形式で出力する。"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return "".join(metric.render() for metric in metrics if metric.samples())
+
+    def write_textfile(self, path: str | Path) -> Path:
+        """
+        textfile collector 用のファイルに書き出す。
+
+        読み込み途中のファイルを見せないよう、同じディレクトリの一時ファイルに
+        書き込んでから置き換える。
+
+        Parameters
+        ----------
+        path : str | Path
+            出力先（node_exporter が読み込むよう拡張子は ``.prom`` にする）。
+
+        Returns
+        -------
+        Path
+            書き出したファイルのパス。
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return path
+
+    def reset(self) -> None:
+        """記録した値をすべて消す（登録したメトリクスは残す）。"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+# アプリケーション全体で共有するレジストリ
+metrics = MetricsRegistry()
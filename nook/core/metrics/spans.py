@@ -0,0 +1,142 @@
+"""リクエスト内の処理段階ごとの所要時間（スパン）の記録。
+
+API のミドルウェアがリクエストごとに :class:`RequestTimings` を開始し、処理の
+各段階（ファイルの読み込み・JSONの解析・直列化など）を :func:`span` で囲むと、
+段階ごとの合計時間が ``Server-Timing`` ヘッダーとして返される。タイミングの
+記録を開始していない処理（収集処理など）では :func:`span` は何もしない。
+
+記録先は contextvars で受け渡すため、``asyncio.to_thread`` やコンテキストを
+コピーしてスレッドプールで実行した処理のスパンも同じリクエストに記録される。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SpanEvent:
+    """
+    1回分のスパン（プロファイルの出力用）。
+
+    Parameters
+    ----------
+    name : str
+        段階の名前。
+    start : float
+        リクエストの開始からの経過時間（秒）。
+    duration : float
+        所要時間（秒）。
+    thread_id : int
+        実行したスレッドのID。
+    """
+
+    name: str
+    start: float
+    duration: float
+    thread_id: int
+
+
+class RequestTimings:
+    """
+    1リクエスト分のスパンを段階の名前ごとに集計する。
+
+    Parameters
+    ----------
+    keep_events : bool, default=False
+        True の場合は個々のスパンも保持する（プロファイルを出力するリクエストのみ）。
+    """
+
+    def __init__(self, keep_events: bool = False):
+        self.started = time.perf_counter()
+        self.keep_events = keep_events
+        self.events: list[SpanEvent] = []
+        # 名前ごとの [合計秒数, 回数]（登場順を保つ）
+        self._totals: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, started: float, duration: float) -> None:
+        """スパンを記録する（started は perf_counter の値）。"""
+        with self._lock:
+            total = self._totals.setdefault(name, [0.0, 0])
+            total[0] += duration
+            total[1] += 1
+            if self.keep_events:
+                self.events.append(SpanEvent(name, started - self.started, duration, threading.get_ident()))
+
+    def totals(self) -> dict[str, tuple[float, int]]:
+        """名前ごとの (合計ミリ秒, 回数) を返す。"""
+        with self._lock:
+            return {name: (seconds * 1000, int(count)) for name, (seconds, count) in self._totals.items()}
+
+    def server_timing(self, total_ms: float | None = None) -> str:
+        """
+        ``Server-Timing`` ヘッダーの値を返す。
+
+        並行に実行したスパンは合計するため、段階の合計がリクエスト全体の時間を
+        超えることがある（回数は desc に出力する）。
+
+        Parameters
+        ----------
+        total_ms : float, optional
+            リクエスト全体の所要時間（ミリ秒）。指定した場合は ``total`` として出力する。
+        """
+        entries = [
+            f"{name};dur={duration:.3f}" + (f';desc="{count}x"' if count > 1 else "")
+            for name, (duration, count) in self.totals().items()
+        ]
+        if total_ms is not None:
+            entries.append(f"total;dur={total_ms:.3f}")
+        return ", ".join(entries)
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("nook_request_timings", default=None)
+
+
+def start_timings(keep_events: bool = False) -> tuple[RequestTimings, Token]:
+    """
+    現在のコンテキストでスパンの記録を開始する。
+
+    Returns
+    -------
+    tuple[RequestTimings, Token]
+        記録先と、:func:`stop_timings` に渡すトークン。
+    """
+    timings = RequestTimings(keep_events=keep_events)
+    return timings, _current.set(timings)
+
+
+def stop_timings(token: Token) -> None:
+    """スパンの記録を終了する。"""
+    _current.reset(token)
+
+
+def current_timings() -> RequestTimings | None:
+    """現在のコンテキストの記録先を返す（記録していない場合は None）。"""
+    return _current.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    ブロックの所要時間を現在のリクエストに記録する。
+
+    Parameters
+    ----------
+    name : str
+        段階の名前（``Server-Timing`` のメトリクス名になるため英数字と ``_`` のみ）。
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, started, time.perf_counter() - started)
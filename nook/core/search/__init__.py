@@ -0,0 +1,14 @@
+# noqa: D104
+"""Full-text search."""
+
+from nook.core.search.fts_index import Passage, RelatedDocument, SearchDocument, SearchHit, SearchIndex
+from nook.core.search.minhash import MinHasher
+
+__all__ = [
+    "MinHasher",
+    "Passage",
+    "RelatedDocument",
+    "SearchDocument",
+    "SearchHit",
+    "SearchIndex",
+]
@@ -0,0 +1,671 @@
+"""SQLite FTS5 による全文検索インデックス。
+
+ソース・日付単位でタイトル・要約・URLを登録し、trigram トークナイザで
+日本語・中国語を含む部分文字列検索を行う。元ファイルの (mtime, size) を
+記録しておき、変更されたファイルのみを再登録する。
+
+登録時にタイトル＋要約の MinHash シグネチャと LSH バケットも保存し、
+ソースを横断した近似重複のクラスタ割り当てと関連記事の検索に使う。
+"""
+
+from __future__ import annotations
+
+import html
+import re
+import sqlite3
+import threading
+from array import array
+from collections.abc import Iterable, Sequence
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from nook.core.search.minhash import MinHasher, shingles
+
+# trigram トークナイザは3文字未満の語を索引から引けないため、短い語は LIKE で絞り込む
+MIN_TRIGRAM_LENGTH = 3
+
+# snippet()/highlight() の区切りに使う制御文字（エスケープ後に <mark> へ置き換える）
+_MARK_OPEN = "\x02"
+_MARK_CLOSE = "\x03"
+
+# 自然文の質問から取り出す検索語の上限（trigram に分解した語を含む）
+MAX_QUERY_TERMS = 64
+# 日本語・中国語・韓国語の連続部分は分かち書きせず trigram に分解する
+_CJK_RUN = re.compile(r"([぀-ヿ㐀-鿿가-힯豈-﫿]+)")
+# ひらがなのみの trigram（助詞・活用語尾）は内容を表さないため検索語にしない
+_HIRAGANA_ONLY = re.compile(r"^[぀-ゟ]+$")
+
+# 推定 Jaccard 類似度がこの値以上の項目を近似重複として同じクラスタに入れる
+DUPLICATE_THRESHOLD = 0.5
+
+# スキーマを変えた場合に上げる（インデックスは元ファイルから再構築できるため作り直す）
+SCHEMA_VERSION = 2
+
+_TABLES = ("documents_fts", "lsh_buckets", "documents", "indexed_files")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    date TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    url TEXT NOT NULL,
+    cluster_id INTEGER,
+    minhash BLOB
+);
+CREATE INDEX IF NOT EXISTS documents_source_date ON documents (source, date);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, summary, url, content='documents', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts (rowid, title, summary, url) VALUES (new.id, new.title, new.summary, new.url);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, summary, url)
+    VALUES ('delete', old.id, old.title, old.summary, old.url);
+    DELETE FROM lsh_buckets WHERE doc_id = old.id;
+END;
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lsh_buckets_bucket ON lsh_buckets (band, bucket);
+CREATE INDEX IF NOT EXISTS lsh_buckets_doc ON lsh_buckets (doc_id);
+CREATE TABLE IF NOT EXISTS indexed_files (
+    source TEXT NOT NULL,
+    date TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (source, date)
+);
+"""
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    """
+    インデックスに登録する1項目。
+
+    Parameters
+    ----------
+    item_id : str
+        項目ID。
+    title : str
+        タイトル。
+    summary : str
+        要約（検索・スニペットの対象）。
+    url : str
+        URL。
+    """
+
+    item_id: str
+    title: str
+    summary: str = ""
+    url: str = ""
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """
+    検索結果の1件。
+
+    Parameters
+    ----------
+    source : str
+        データソース。
+    date : str
+        日付（YYYY-MM-DD形式）。
+    item_id : str
+        項目ID。
+    title : str
+        タイトル。
+    url : str
+        URL。
+    title_highlight : str
+        一致箇所を ``<mark>`` で囲んだタイトル（HTMLエスケープ済み）。
+    snippet : str
+        一致箇所を含む要約の抜粋（HTMLエスケープ済み）。
+    score : float
+        関連度（大きいほど関連が高い）。
+    """
+
+    source: str
+    date: str
+    item_id: str
+    title: str
+    url: str
+    title_highlight: str
+    snippet: str
+    score: float
+
+
+@dataclass(frozen=True)
+class RelatedDocument:
+    """
+    関連記事の1件。
+
+    Parameters
+    ----------
+    source : str
+        データソース。
+    date : str
+        日付（YYYY-MM-DD形式）。
+    item_id : str
+        項目ID。
+    title : str
+        タイトル。
+    url : str
+        URL。
+    similarity : float
+        タイトル＋要約の推定 Jaccard 類似度。
+    duplicate : bool
+        近似重複として同じクラスタに属する場合は True。
+    """
+
+    source: str
+    date: str
+    item_id: str
+    title: str
+    url: str
+    similarity: float
+    duplicate: bool
+
+
+@dataclass(frozen=True)
+class Passage:
+    """
+    質問に関連する項目として取り出した1件（RAGの文脈に使う）。
+
+    Parameters
+    ----------
+    source : str
+        データソース。
+    date : str
+        日付（YYYY-MM-DD形式）。
+    item_id : str
+        項目ID。
+    title : str
+        タイトル。
+    url : str
+        URL。
+    text : str
+        要約。
+    score : float
+        BM25 による関連度（大きいほど関連が高い）。
+    """
+
+    source: str
+    date: str
+    item_id: str
+    title: str
+    url: str
+    text: str
+    score: float
+
+
+def _unpack(blob: bytes) -> array:
+    """保存した MinHash シグネチャを配列に戻す。"""
+    signature = array("Q")
+    signature.frombytes(blob)
+    return signature
+
+
+def _quote(term: str) -> str:
+    """FTS5のフレーズとして語を引用する。"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def query_terms(query: str) -> list[str]:
+    """
+    自然文の質問から FTS5 の検索語を取り出す。
+
+    英数字の語は3文字以上のものをそのまま使い、日本語などの連続部分は
+    trigram トークナイザに合わせて3文字ずつずらした部分文字列に分解する
+    （ひらがなのみの部分文字列は除く）。
+
+    Parameters
+    ----------
+    query : str
+        質問文。
+
+    Returns
+    -------
+    list[str]
+        重複を除いた検索語（最大 MAX_QUERY_TERMS 件）。
+    """
+    terms: list[str] = []
+    for word in re.findall(r"\w+", query):
+        for index, part in enumerate(_CJK_RUN.split(word)):
+            if index % 2 == 1:
+                # CJK の連続部分（2文字以下はそのまま trigram に満たないため使わない）
+                trigrams = (part[i : i + MIN_TRIGRAM_LENGTH] for i in range(len(part) - MIN_TRIGRAM_LENGTH + 1))
+                terms.extend(trigram for trigram in trigrams if not _HIRAGANA_ONLY.match(trigram))
+            elif len(part) >= MIN_TRIGRAM_LENGTH:
+                terms.append(part)
+    return list(dict.fromkeys(terms))[:MAX_QUERY_TERMS]
+
+
+def _mark(text: str) -> str:
+    """制御文字の区切りを残したままHTMLエスケープし、<mark> に置き換える。"""
+    return html.escape(text).replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+
+
+def _mark_terms(text: str, terms: Sequence[str], *, width: int | None = None) -> str:
+    """FTS5の関数を使えない短い語のみの検索で、一致箇所を <mark> で囲む。"""
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    if width is not None:
+        match = pattern.search(text)
+        start = max(0, match.start() - width // 2) if match else 0
+        excerpt = text[start : start + width]
+        text = ("…" if start > 0 else "") + excerpt + ("…" if start + width < len(text) else "")
+    return _mark(pattern.sub(lambda m: f"{_MARK_OPEN}{m.group(0)}{_MARK_CLOSE}", text))
+
+
+class SearchIndex:
+    """
+    SQLite FTS5（trigram）による全文検索インデックス。
+
+    接続は操作ごとに開くため、APIのスレッドプールや収集処理の別プロセスから
+    同じデータベースを安全に更新・検索できる（WALモード）。
+
+    Parameters
+    ----------
+    db_path : Path
+        データベースファイルのパス。
+    """
+
+    def __init__(self, db_path: Path, hasher: MinHasher | None = None):
+        self.db_path = Path(db_path)
+        self.hasher = hasher or MinHasher()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            if not self._initialized:
+                with self._init_lock:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                        for table in _TABLES:
+                            conn.execute(f"DROP TABLE IF EXISTS {table}")
+                    conn.executescript(_SCHEMA)
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                    self._initialized = True
+            with conn:
+                yield conn
+
+    def _assign_cluster(
+        self, conn: sqlite3.Connection, doc_id: int, minhash: array | None, buckets: list[tuple[int, int]]
+    ) -> int:
+        """LSH の候補から最も類似した近似重複のクラスタを選ぶ（なければ自身のIDを使う）。"""
+        if not buckets:
+            return doc_id
+        placeholders = ", ".join("(?, ?)" for _ in buckets)
+        candidates = conn.execute(
+            "SELECT d.id, d.cluster_id, d.minhash FROM documents d WHERE d.id IN ("  # noqa: S608  値はすべてプレースホルダで渡す
+            f" SELECT doc_id FROM lsh_buckets WHERE (band, bucket) IN (VALUES {placeholders})) AND d.id != ?",
+            [*(value for bucket in buckets for value in bucket), doc_id],
+        ).fetchall()
+
+        best: tuple[float, int] | None = None
+        for _candidate_id, cluster_id, candidate_minhash in candidates:
+            if candidate_minhash is None:
+                continue
+            similarity = self.hasher.similarity(minhash, _unpack(candidate_minhash))
+            if similarity >= DUPLICATE_THRESHOLD and (best is None or similarity > best[0]):
+                best = (similarity, cluster_id)
+        return best[1] if best is not None else doc_id
+
+    def replace(
+        self,
+        source: str,
+        date_str: str,
+        documents: Iterable[SearchDocument],
+        signature: tuple[int, int] | None = None,
+    ) -> int:
+        """
+        ソース・日付の項目をまとめて置き換える。
+
+        Parameters
+        ----------
+        source : str
+            データソース。
+        date_str : str
+            日付（YYYY-MM-DD形式）。
+        documents : Iterable[SearchDocument]
+            登録する項目。
+        signature : tuple[int, int] | None
+            元ファイルの (mtime_ns, size)。指定した場合は同期の判定に使う。
+
+        Returns
+        -------
+        int
+            登録した項目数。
+        """
+        # シグネチャの計算は書き込みロックを取る前に済ませる
+        rows = []
+        for doc in documents:
+            minhash = self.hasher.signature(shingles(f"{doc.title} {doc.summary}"))
+            buckets = self.hasher.buckets(minhash) if minhash is not None else []
+            rows.append((doc, minhash, buckets))
+
+        with self._connect() as conn:
+            conn.execute("DELETE FROM documents WHERE source = ? AND date = ?", (source, date_str))
+            for doc, minhash, buckets in rows:
+                doc_id = conn.execute(
+                    "INSERT INTO documents (source, date, item_id, title, summary, url, minhash)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        source,
+                        date_str,
+                        doc.item_id,
+                        doc.title,
+                        doc.summary,
+                        doc.url,
+                        minhash.tobytes() if minhash is not None else None,
+                    ),
+                ).lastrowid
+                cluster_id = self._assign_cluster(conn, doc_id, minhash, buckets)
+                conn.execute("UPDATE documents SET cluster_id = ? WHERE id = ?", (cluster_id, doc_id))
+                conn.executemany(
+                    "INSERT INTO lsh_buckets (band, bucket, doc_id) VALUES (?, ?, ?)",
+                    [(band, bucket, doc_id) for band, bucket in buckets],
+                )
+            if signature is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO indexed_files (source, date, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                    (source, date_str, *signature),
+                )
+        return len(rows)
+
+    def remove(self, source: str, date_str: str) -> None:
+        """ソース・日付の項目を削除する。"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM documents WHERE source = ? AND date = ?", (source, date_str))
+            conn.execute("DELETE FROM indexed_files WHERE source = ? AND date = ?", (source, date_str))
+
+    def signatures(self, source: str) -> dict[str, tuple[int, int]]:
+        """
+        ソースの登録済みファイルの (mtime_ns, size) を返す。
+
+        Returns
+        -------
+        dict[str, tuple[int, int]]
+            日付をキーとするシグネチャ。
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT date, mtime_ns, size FROM indexed_files WHERE source = ?", (source,)).fetchall()
+        return {date_str: (mtime_ns, size) for date_str, mtime_ns, size in rows}
+
+    def search(
+        self,
+        query: str,
+        *,
+        sources: Sequence[str] | None = None,
+        start: str | None = None,
+        end: str | None = None,
+        sort: str = "relevance",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[list[SearchHit], int]:
+        """
+        全文検索を行う。
+
+        空白区切りの語をすべて含む項目を返す（AND検索）。3文字以上の語は
+        FTS5のインデックスで、それ未満の語は LIKE で絞り込む。
+
+        Parameters
+        ----------
+        query : str
+            検索語。
+        sources : Sequence[str] | None
+            対象ソース。None の場合は全ソース。
+        start : str | None
+            開始日（YYYY-MM-DD形式、この日を含む）。
+        end : str | None
+            終了日（YYYY-MM-DD形式、この日を含む）。
+        sort : str, default="relevance"
+            "relevance"（BM25）または "date"（新しい順）。
+        limit : int, default=20
+            最大件数。
+        offset : int, default=0
+            読み飛ばす件数。
+
+        Returns
+        -------
+        tuple[list[SearchHit], int]
+            検索結果と、条件に一致する総件数。
+        """
+        terms = list(dict.fromkeys(term for term in query.split() if term))
+        if not terms:
+            return [], 0
+        long_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+        short_terms = [term for term in terms if len(term) < MIN_TRIGRAM_LENGTH]
+
+        conditions: list[str] = []
+        params: list[object] = []
+        if long_terms:
+            conditions.append("documents_fts MATCH ?")
+            params.append(" AND ".join(_quote(term) for term in long_terms))
+        for term in short_terms:
+            pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions.append(
+                "(d.title LIKE ? ESCAPE '\\' OR d.summary LIKE ? ESCAPE '\\' OR d.url LIKE ? ESCAPE '\\')"
+            )
+            params.extend([pattern] * 3)
+        if sources is not None:
+            conditions.append(f"d.source IN ({', '.join('?' * len(sources))})")
+            params.extend(sources)
+        if start:
+            conditions.append("d.date >= ?")
+            params.append(start)
+        if end:
+            conditions.append("d.date <= ?")
+            params.append(end)
+        where = " AND ".join(conditions)
+
+        if long_terms:
+            # title を最も重く、URL を最も軽く重み付けする（bm25 は小さいほど関連が高い）
+            columns = (
+                f"highlight(documents_fts, 0, '{_MARK_OPEN}', '{_MARK_CLOSE}'),"
+                f" snippet(documents_fts, 1, '{_MARK_OPEN}', '{_MARK_CLOSE}', '…', 24),"
+                " bm25(documents_fts, 10.0, 1.0, 0.5)"
+            )
+        else:
+            columns = "d.title, d.summary, 0.0"
+        order = "relevance, d.date DESC" if sort == "relevance" and long_terms else "d.date DESC, d.id"
+
+        if long_terms:
+            sql_from = "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid"
+        else:
+            sql_from = "FROM documents d"
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT count(*) {sql_from} WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT d.source, d.date, d.item_id, d.title, d.url, {columns} AS relevance {sql_from}"
+                f" WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+
+        hits = []
+        for source, date_str, item_id, title, url, title_marked, snippet, relevance in rows:
+            if long_terms:
+                title_highlight, snippet_text = _mark(title_marked), _mark(snippet)
+            else:
+                title_highlight = _mark_terms(title_marked, short_terms)
+                snippet_text = _mark_terms(snippet, short_terms, width=64)
+            hits.append(
+                SearchHit(
+                    source=source,
+                    date=date_str,
+                    item_id=item_id,
+                    title=title,
+                    url=url,
+                    title_highlight=title_highlight,
+                    snippet=snippet_text,
+                    score=round(-relevance, 6),
+                )
+            )
+        return hits, total
+
+    def related(
+        self,
+        source: str,
+        item_id: str,
+        *,
+        date_str: str | None = None,
+        limit: int = 10,
+        min_similarity: float = 0.2,
+    ) -> list[RelatedDocument] | None:
+        """
+        項目に類似した他の項目（ソース横断）を類似度の高い順に返す。
+
+        LSH バケットを共有する候補と同じクラスタの項目について、MinHash
+        シグネチャから類似度を推定する。同じソース・同じ項目IDの別日付の
+        登録は除外する。
+
+        Parameters
+        ----------
+        source : str
+            データソース。
+        item_id : str
+            項目ID。
+        date_str : str | None
+            日付（YYYY-MM-DD形式）。None の場合は最新の登録を使う。
+        limit : int, default=10
+            最大件数。
+        min_similarity : float, default=0.2
+            返す最小の推定類似度。
+
+        Returns
+        -------
+        list[RelatedDocument] | None
+            関連記事。項目が登録されていない場合は None。
+        """
+        with self._connect() as conn:
+            params: list[object] = [source, item_id]
+            date_condition = ""
+            if date_str is not None:
+                date_condition = " AND date = ?"
+                params.append(date_str)
+            row = conn.execute(
+                f"SELECT id, cluster_id, minhash FROM documents WHERE source = ? AND item_id = ?{date_condition}"  # noqa: S608  値はすべてプレースホルダで渡す
+                " ORDER BY date DESC LIMIT 1",
+                params,
+            ).fetchone()
+            if row is None:
+                return None
+            doc_id, cluster_id, minhash = row
+            if minhash is None:
+                return []
+            signature = _unpack(minhash)
+            buckets = self.hasher.buckets(signature)
+            placeholders = ", ".join("(?, ?)" for _ in buckets)
+            candidates = conn.execute(
+                "SELECT source, date, item_id, title, url, cluster_id, minhash FROM documents WHERE (id IN ("  # noqa: S608  値はすべてプレースホルダで渡す
+                f" SELECT doc_id FROM lsh_buckets WHERE (band, bucket) IN (VALUES {placeholders}))"
+                " OR cluster_id = ?) AND NOT (source = ? AND item_id = ?)",
+                [*(value for bucket in buckets for value in bucket), cluster_id, source, item_id],
+            ).fetchall()
+
+        best: dict[tuple[str, str], RelatedDocument] = {}
+        for cand_source, cand_date, cand_item_id, title, url, cand_cluster, cand_minhash in candidates:
+            if cand_minhash is None:
+                continue
+            similarity = self.hasher.similarity(signature, _unpack(cand_minhash))
+            duplicate = cand_cluster == cluster_id
+            if similarity < min_similarity and not duplicate:
+                continue
+            key = (cand_source, cand_item_id)
+            current = best.get(key)
+            if current is None or cand_date > current.date:
+                best[key] = RelatedDocument(
+                    source=cand_source,
+                    date=cand_date,
+                    item_id=cand_item_id,
+                    title=title,
+                    url=url,
+                    similarity=round(similarity, 4),
+                    duplicate=duplicate,
+                )
+        return sorted(best.values(), key=lambda doc: (doc.similarity, doc.date), reverse=True)[:limit]
+
+    def retrieve(
+        self,
+        query: str,
+        *,
+        start: str | None = None,
+        end: str | None = None,
+        limit: int = 20,
+    ) -> list[Passage]:
+        """
+        自然文の質問に関連する項目を BM25 の高い順に返す。
+
+        ``search`` と異なり検索語のいずれかを含む項目を対象にし（OR検索）、
+        近似重複のクラスタからは最も関連の高い1件だけを返す。
+
+        Parameters
+        ----------
+        query : str
+            質問文。
+        start : str | None
+            開始日（YYYY-MM-DD形式、この日を含む）。
+        end : str | None
+            終了日（YYYY-MM-DD形式、この日を含む）。
+        limit : int, default=20
+            最大件数。
+
+        Returns
+        -------
+        list[Passage]
+            関連する項目。検索語を取り出せない場合は空リスト。
+        """
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        conditions = ["documents_fts MATCH ?"]
+        params: list[object] = [" OR ".join(_quote(term) for term in terms)]
+        if start:
+            conditions.append("d.date >= ?")
+            params.append(start)
+        if end:
+            conditions.append("d.date <= ?")
+            params.append(end)
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT d.source, d.date, d.item_id, d.title, d.url, d.summary, d.cluster_id,"  # noqa: S608  値はすべてプレースホルダで渡す
+                " bm25(documents_fts, 10.0, 1.0, 0.5) AS relevance"
+                " FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid"
+                f" WHERE {' AND '.join(conditions)} ORDER BY relevance, d.date DESC LIMIT ?",
+                # 近似重複を除いた後も limit 件残るよう多めに取る
+                [*params, limit * 3],
+            ).fetchall()
+
+        passages: list[Passage] = []
+        seen_clusters: set[int] = set()
+        for source, date_str, item_id, title, url, summary, cluster_id, relevance in rows:
+            if cluster_id is not None:
+                if cluster_id in seen_clusters:
+                    continue
+                seen_clusters.add(cluster_id)
+            passages.append(
+                Passage(
+                    source=source,
+                    date=date_str,
+                    item_id=item_id,
+                    title=title,
+                    url=url,
+                    text=summary,
+                    score=round(-relevance, 6),
+                )
+            )
+            if len(passages) >= limit:
+                break
+        return passages
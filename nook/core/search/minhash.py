@@ -0,0 +1,109 @@
+"""MinHash/LSH による近似重複検出。
+
+タイトルと要約を正規化した文字 n-gram（シングル）の集合から MinHash
+シグネチャを求め、バンドごとのハッシュ（LSH バケット）で類似候補を絞り込む。
+日本語・中国語は分かち書きせず文字単位で扱う。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+from array import array
+
+from nook.core.utils.dedup import TitleNormalizer
+
+# メルセンヌ素数 2^61 - 1（ユニバーサルハッシュの法）
+_PRIME = (1 << 61) - 1
+
+
+def shingles(text: str, k: int = 3) -> set[str]:
+    """
+    テキストを正規化し、空白を除いた文字 k-gram の集合を返す。
+
+    Parameters
+    ----------
+    text : str
+        対象のテキスト。
+    k : int, default=3
+        n-gram の長さ。
+
+    Returns
+    -------
+    set[str]
+        シングルの集合。k 文字未満のテキストは全体を1つのシングルとする。
+    """
+    normalized = re.sub(r"\s+", "", TitleNormalizer.normalize(text))
+    if not normalized:
+        return set()
+    if len(normalized) < k:
+        return {normalized}
+    return {normalized[i : i + k] for i in range(len(normalized) - k + 1)}
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class MinHasher:
+    """
+    MinHash シグネチャと LSH バケットを計算する。
+
+    Parameters
+    ----------
+    num_perm : int, default=64
+        シグネチャの長さ（ハッシュ関数の数）。
+    bands : int, default=32
+        LSH のバンド数。num_perm を割り切れる必要がある。バンドあたりの行数を
+        r とすると、類似度がおよそ (1 / bands) ** (1 / r) を超える組が候補になる。
+    seed : int, default=1
+        ハッシュ関数の係数を決める乱数シード。
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 32, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm は bands で割り切れる必要があります")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)  # noqa: S311  暗号用途ではなく係数の再現性のため
+        self._coefficients = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, items: set[str]) -> array | None:
+        """
+        シングル集合の MinHash シグネチャを返す。
+
+        Parameters
+        ----------
+        items : set[str]
+            シングルの集合。
+
+        Returns
+        -------
+        array | None
+            長さ num_perm の符号なし64bit整数の配列。集合が空の場合は None。
+        """
+        if not items:
+            return None
+        hashes = [_hash64(item) for item in items]
+        return array("Q", (min((a * h + b) % _PRIME for h in hashes) for a, b in self._coefficients))
+
+    def buckets(self, signature: array) -> list[tuple[int, int]]:
+        """
+        シグネチャの LSH バケットを (バンド番号, バケット値) のリストで返す。
+
+        バケット値は SQLite の INTEGER に収まるよう 56bit に切り詰める。
+        """
+        result = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            result.append((band, int.from_bytes(hashlib.blake2b(chunk, digest_size=7).digest(), "big")))
+        return result
+
+    @staticmethod
+    def similarity(left: array, right: array) -> float:
+        """2つのシグネチャから Jaccard 類似度を推定する。"""
+        if len(left) != len(right) or not left:
+            return 0.0
+        return sum(1 for a, b in zip(left, right, strict=True) if a == b) / len(left)
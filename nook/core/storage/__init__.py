@@ -1,15 +1,30 @@
 # noqa: D104
 """Storage utilities."""
 
+from nook.core.storage.change_log import ChangeEntry, ChangeLog
 from nook.core.storage.daily_merge import merge_grouped_records, merge_records
 from nook.core.storage.daily_snapshot import (
     group_records_by_date,
     store_daily_snapshots,
 )
+from nook.core.storage.date_manifest import DateEntry, DateManifest
+from nook.core.storage.shared_cache import SharedCache, SharedEntry
 from nook.core.storage.storage import LocalStorage
+from nook.core.storage.watcher import ChangeLogFollower, StorageChange, StorageWatcher
+from nook.core.storage.worker_lock import WorkerLock
 
 __all__ = [
+    "ChangeEntry",
+    "ChangeLog",
+    "ChangeLogFollower",
+    "DateEntry",
+    "DateManifest",
     "LocalStorage",
+    "SharedCache",
+    "SharedEntry",
+    "StorageChange",
+    "StorageWatcher",
+    "WorkerLock",
     "group_records_by_date",
     "merge_grouped_records",
     "merge_records",
@@ -0,0 +1,211 @@
+"""日次ファイルの変更履歴（差分同期用のチェンジログ）。
+
+サービスのディレクトリごとに ``_changes.jsonl`` を追記し、日次ファイル
+（``YYYY-MM-DD.json`` / ``YYYY-MM-DD.md``）が保存されるたびに、追加・更新
+されたレコードを単調増加するリビジョンとともに記録する。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+CHANGE_LOG_FILENAME = "_changes.jsonl"
+
+_DAILY_FILE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}\.(json|md)$")
+
+RecordKey = tuple[str, str]
+
+
+@dataclass(frozen=True)
+class ChangeEntry:
+    """
+    チェンジログの1エントリ。
+
+    Parameters
+    ----------
+    revision : int
+        単調増加するリビジョン（ナノ秒単位のUNIX時刻を基準とする）。
+    filename : str
+        変更された日次ファイル名。
+    keys : tuple[RecordKey, ...] | None
+        追加・更新されたレコードの (title, url)。ファイル全体が変更された場合は None。
+    """
+
+    revision: int
+    filename: str
+    keys: tuple[RecordKey, ...] | None
+
+    @property
+    def date_str(self) -> str:
+        """日次ファイルの日付（YYYY-MM-DD形式）。"""
+        return self.filename.split(".", 1)[0]
+
+
+def is_daily_file(filename: str) -> bool:
+    """チェンジログの対象となる日次ファイル名かどうかを判定する。"""
+    return bool(_DAILY_FILE_PATTERN.match(filename))
+
+
+def record_key(record: dict[str, Any]) -> RecordKey:
+    """レコードを識別する (title, url) を返す。"""
+    return (str(record.get("title") or ""), str(record.get("url") or ""))
+
+
+def _record_hashes(text: str | None) -> dict[RecordKey, str] | None:
+    """JSON配列の各レコードのハッシュを返す。JSON配列でない場合は None。"""
+    if not text:
+        return {}
+    try:
+        records = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(records, list):
+        return None
+    return {
+        record_key(record): hashlib.sha256(
+            json.dumps(record, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        for record in records
+        if isinstance(record, dict)
+    }
+
+
+def changed_keys(previous: str | None, current: str) -> tuple[RecordKey, ...] | None:
+    """
+    JSON配列の保存前後を比較し、追加・更新されたレコードのキーを返す。
+
+    Parameters
+    ----------
+    previous : str | None
+        保存前のファイル内容。新規作成の場合は None。
+    current : str
+        保存後のファイル内容。
+
+    Returns
+    -------
+    tuple[RecordKey, ...] | None
+        変更されたレコードのキー。比較できない場合は None（ファイル全体の変更として扱う）。
+    """
+    before = _record_hashes(previous)
+    after = _record_hashes(current)
+    if before is None or after is None:
+        return None
+    return tuple(key for key, digest in after.items() if before.get(key) != digest)
+
+
+class ChangeLog:
+    """
+    サービスディレクトリ単位のチェンジログ。
+
+    Parameters
+    ----------
+    directory : Path
+        サービスのデータディレクトリ。
+    max_entries : int, default=1000
+        保持する最大エントリ数。超えた場合は古いエントリを切り詰め、
+        切り詰めた位置をマーカーとして残す。
+    """
+
+    def __init__(self, directory: Path, max_entries: int = 1000):
+        self.path = Path(directory) / CHANGE_LOG_FILENAME
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _read_lines(self) -> list[dict[str, Any]]:
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return []
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries
+
+    @property
+    def head(self) -> int:
+        """最新のリビジョン。エントリがない場合は 0。"""
+        entries = self._read_lines()
+        return max((entry.get("revision", 0) for entry in entries), default=0)
+
+    def record(self, filename: str, previous: str | None, current: str) -> ChangeEntry | None:
+        """
+        日次ファイルの保存を記録する。
+
+        内容が変わっていない保存や日次ファイル以外は記録しない。
+
+        Parameters
+        ----------
+        filename : str
+            保存されたファイル名。
+        previous : str | None
+            保存前のファイル内容。
+        current : str
+            保存後のファイル内容。
+
+        Returns
+        -------
+        ChangeEntry | None
+            記録したエントリ。記録しなかった場合は None。
+        """
+        if not is_daily_file(filename) or previous == current:
+            return None
+
+        keys = changed_keys(previous, current) if filename.endswith(".json") else None
+        if keys == ():
+            return None
+
+        with self._lock:
+            entries = self._read_lines()
+            last = max((entry.get("revision", 0) for entry in entries), default=0)
+            # 同一ナノ秒や時計の巻き戻りでも単調増加を保証する
+            revision = max(time.time_ns(), last + 1)
+            line = {"revision": revision, "file": filename, "keys": [list(key) for key in keys] if keys else None}
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if len(entries) + 1 > self.max_entries:
+                kept = [entry for entry in entries if not entry.get("truncated")][-(self.max_entries // 2) :]
+                marker = {"revision": kept[0]["revision"] - 1 if kept else revision - 1, "truncated": True}
+                text = "".join(json.dumps(entry) + "\n" for entry in [marker, *kept, line])
+                self.path.write_text(text, encoding="utf-8")
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(line) + "\n")
+
+        return ChangeEntry(revision=revision, filename=filename, keys=keys)
+
+    def read_since(self, since: int) -> tuple[list[ChangeEntry], bool]:
+        """
+        指定リビジョンより後のエントリを返す。
+
+        Parameters
+        ----------
+        since : int
+            クライアントが最後に受け取ったリビジョン。
+
+        Returns
+        -------
+        tuple[list[ChangeEntry], bool]
+            エントリのリストと、履歴が切り詰められていて差分を返せない場合の True。
+        """
+        entries = self._read_lines()
+        reset = any(entry.get("truncated") and entry.get("revision", 0) > since for entry in entries)
+        changes = [
+            ChangeEntry(
+                revision=entry["revision"],
+                filename=entry["file"],
+                keys=tuple(tuple(key) for key in entry["keys"]) if entry.get("keys") else None,
+            )
+            for entry in entries
+            if not entry.get("truncated") and entry.get("revision", 0) > since and "file" in entry
+        ]
+        return changes, reset
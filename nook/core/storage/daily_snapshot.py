@@ -60,6 +60,9 @@ async def store_daily_snapshots(
     """
     Persist grouped records into per-day JSON and Markdown snapshots.
 
+    保存したスナップショットは、APIのソースごとの事前生成レスポンスと
+    検索インデックスにも反映する（失敗しても保存は成功扱い）。
+
     Returns
     -------
     list[tuple[str, str]]
@@ -96,4 +99,10 @@ async def store_daily_snapshots(
 
         saved_files.append((str(json_path), str(md_path)))
 
+    if saved_files:
+        # nook.core.content は nook.core.storage に依存するため、呼び出し時に読み込む
+        from nook.core.content.publishing import materialize_saved_files
+
+        await materialize_saved_files(saved_files)
+
     return saved_files
@@ -0,0 +1,187 @@
+"""日次ファイルの日付インデックス（マニフェスト）。
+
+サービスのディレクトリごとに ``_dates.json`` を保持し、日次ファイル
+（``YYYY-MM-DD.json`` / ``YYYY-MM-DD.md``）が保存されるたびに、その日付の
+保存形式と項目数を更新する。利用可能な日付の一覧をディレクトリの走査なしに
+取得できる。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from nook.core.storage.change_log import is_daily_file
+
+MANIFEST_FILENAME = "_dates.json"
+
+
+@dataclass(frozen=True)
+class DateEntry:
+    """
+    マニフェストの1日分のエントリ。
+
+    Parameters
+    ----------
+    date : str
+        日付（YYYY-MM-DD形式）。
+    formats : tuple[str, ...]
+        保存されている形式（"json" / "md"）。
+    item_count : int | None
+        日次JSONのレコード数。JSONがない場合は None。
+    """
+
+    date: str
+    formats: tuple[str, ...]
+    item_count: int | None
+
+
+def _count_records(text: str) -> int | None:
+    """JSON配列のレコード数を返す。JSON配列でない場合は None。"""
+    try:
+        records = json.loads(text)
+    except ValueError:
+        return None
+    return len(records) if isinstance(records, list) else None
+
+
+def _to_entry(date_str: str, raw: dict[str, Any]) -> DateEntry:
+    return DateEntry(date=date_str, formats=tuple(raw.get("formats", ())), item_count=raw.get("item_count"))
+
+
+class DateManifest:
+    """
+    サービスディレクトリ単位の日付マニフェスト。
+
+    マニフェストが存在しない場合は、初回の読み込み時にディレクトリを一度だけ
+    走査して作成する。読み込み結果はファイルの (mtime, size) が変わるまで再利用する。
+
+    Parameters
+    ----------
+    directory : Path
+        サービスのデータディレクトリ。
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.path = self.directory / MANIFEST_FILENAME
+        self._lock = threading.Lock()
+        self._cached: tuple[tuple[int, int], dict[str, dict[str, Any]]] | None = None
+
+    def _read(self) -> dict[str, dict[str, Any]] | None:
+        """マニフェストを読み込む。存在しないか壊れている場合は None。"""
+        try:
+            stat = self.path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._cached is not None and self._cached[0] == signature:
+                return self._cached[1]
+            dates = json.loads(self.path.read_text(encoding="utf-8"))["dates"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if not isinstance(dates, dict):
+            return None
+        self._cached = (signature, dates)
+        return dates
+
+    def _write(self, dates: dict[str, dict[str, Any]]) -> None:
+        """一時ファイル経由でマニフェストを置き換える。"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({"dates": dict(sorted(dates.items()))}, ensure_ascii=False)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=f".{MANIFEST_FILENAME}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _scan(self) -> dict[str, dict[str, Any]]:
+        """ディレクトリを走査して日次ファイルからマニフェストを組み立てる。"""
+        dates: dict[str, dict[str, Any]] = {}
+        if not self.directory.exists():
+            return dates
+        for path in sorted(self.directory.iterdir()):
+            if not is_daily_file(path.name):
+                continue
+            entry = dates.setdefault(path.stem, {"formats": [], "item_count": None})
+            extension = path.suffix.lstrip(".")
+            entry["formats"] = sorted({*entry["formats"], extension})
+            if extension == "json":
+                try:
+                    entry["item_count"] = _count_records(path.read_text(encoding="utf-8"))
+                except OSError:
+                    continue
+        return dates
+
+    def rebuild(self) -> dict[str, DateEntry]:
+        """
+        ディレクトリを走査してマニフェストを作り直す。
+
+        Returns
+        -------
+        dict[str, DateEntry]
+            日付をキーとするエントリ。
+        """
+        with self._lock:
+            dates = self._scan()
+            try:
+                self._write(dates)
+            except OSError:
+                # 読み取り専用のデータディレクトリでも一覧は返す
+                pass
+        return {date_str: _to_entry(date_str, raw) for date_str, raw in dates.items()}
+
+    def entries(self) -> dict[str, DateEntry]:
+        """
+        日付ごとのエントリを返す。
+
+        Returns
+        -------
+        dict[str, DateEntry]
+            日付をキーとするエントリ。
+        """
+        dates = self._read()
+        if dates is None:
+            return self.rebuild()
+        return {date_str: _to_entry(date_str, raw) for date_str, raw in dates.items()}
+
+    def record(self, filename: str, text: str) -> DateEntry | None:
+        """
+        日次ファイルの保存をマニフェストに反映する。
+
+        Parameters
+        ----------
+        filename : str
+            保存されたファイル名。
+        text : str
+            保存された内容。
+
+        Returns
+        -------
+        DateEntry | None
+            更新後のエントリ。日次ファイル以外の場合は None。
+        """
+        if not is_daily_file(filename):
+            return None
+
+        date_str, extension = filename.split(".", 1)
+        with self._lock:
+            dates = self._read()
+            if dates is None:
+                # 既存の日付も含めるため、初回は保存済みのファイルから組み立てる
+                dates = self._scan()
+            else:
+                dates = dict(dates)
+            entry = dict(dates.get(date_str, {"formats": [], "item_count": None}))
+            entry["formats"] = sorted({*entry.get("formats", []), extension})
+            if extension == "json":
+                entry["item_count"] = _count_records(text)
+            dates[date_str] = entry
+            self._write(dates)
+        return _to_entry(date_str, entry)
@@ -0,0 +1,210 @@
+"""複数のAPIワーカーで共有するキャッシュ。
+
+API を複数のワーカープロセスで動かすと、プロセス内のキャッシュはワーカーごとに
+作られ、同じ日付のレスポンスの生成や外部APIの呼び出しがワーカーの数だけ
+繰り返される。SharedCache は同じホストのワーカーが SQLite（WALモード）の
+ファイル1つを介して値を共有する。あるワーカーが生成した値は、他のワーカーが
+プロセス内のキャッシュを外したときに再利用される。
+
+キャッシュは補助的なものであり、SQLite の操作に失敗した場合はログに出力して
+キャッシュがないものとして扱う。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from nook.core.config import BaseConfig
+
+logger = logging.getLogger(__name__)
+
+# 既定の最大エントリ数（超えた場合は古く保存したものから削除する）
+DEFAULT_MAX_ENTRIES = 512
+# ロックの解放を待つ秒数
+BUSY_TIMEOUT_SECONDS = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    validator TEXT NOT NULL,
+    value BLOB NOT NULL,
+    meta TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at);
+"""
+
+
+@dataclass(frozen=True)
+class SharedEntry:
+    """
+    共有キャッシュのエントリ。
+
+    Parameters
+    ----------
+    value : bytes
+        保存した値。
+    meta : dict[str, Any]
+        値に添えた情報。
+    stored_at : float
+        保存したUNIX時刻。
+    """
+
+    value: bytes
+    meta: dict[str, Any]
+    stored_at: float
+
+
+class SharedCache:
+    """
+    SQLite に保存するプロセス間で共有のキャッシュ。
+
+    接続は操作ごとに開くため、スレッドプールや別のワーカープロセスから同じ
+    ファイルを安全に読み書きできる。値は ``validator``（元ファイルの
+    フィンガープリントなど）が一致する場合、または保存からの経過秒数が
+    ``max_age`` 以内の場合にだけ返す。
+
+    Parameters
+    ----------
+    db_path : Path
+        データベースファイルのパス。
+    max_entries : int, default=DEFAULT_MAX_ENTRIES
+        保持する最大エントリ数。
+    """
+
+    def __init__(self, db_path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries は 1 以上である必要があります")
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    @classmethod
+    def from_config(cls, config: BaseConfig) -> SharedCache | None:
+        """設定から作成する。SHARED_CACHE_PATH が未設定の場合は None。"""
+        if not config.SHARED_CACHE_PATH:
+            return None
+        return cls(Path(config.SHARED_CACHE_PATH), max_entries=config.SHARED_CACHE_MAX_ENTRIES)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SECONDS)) as conn:
+            if not self._initialized:
+                with self._init_lock:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    self._initialized = True
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+
+    def get(self, namespace: str, key: str, *, validator: str = "", max_age: float | None = None) -> SharedEntry | None:
+        """
+        エントリを取得する。
+
+        Parameters
+        ----------
+        namespace : str
+            用途ごとの名前空間（"content"、"weather" など）。
+        key : str
+            キー。
+        validator : str, default=""
+            保存時と一致する必要がある検証用の文字列。
+        max_age : float, optional
+            保存からの最大経過秒数。省略時は経過時間で判定しない。
+
+        Returns
+        -------
+        SharedEntry | None
+            有効なエントリ。存在しないか無効な場合は None。
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT validator, value, meta, stored_at FROM entries WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read shared cache {self.db_path}: {e}")
+            return None
+        if row is None or row[0] != validator:
+            return None
+        stored_at = row[3]
+        if max_age is not None and time.time() - stored_at > max_age:
+            return None
+        return SharedEntry(value=bytes(row[1]), meta=json.loads(row[2]), stored_at=stored_at)
+
+    def put(
+        self, namespace: str, key: str, value: bytes, *, validator: str = "", meta: dict[str, Any] | None = None
+    ) -> None:
+        """
+        エントリを保存し、上限を超えた古いエントリを削除する。
+
+        Parameters
+        ----------
+        namespace : str
+            名前空間。
+        key : str
+            キー。
+        value : bytes
+            保存する値。
+        validator : str, default=""
+            取得時に照合する検証用の文字列。
+        meta : dict[str, Any], optional
+            値に添える情報（JSONに変換できるもの）。
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (namespace, key, validator, value, meta, stored_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (namespace, key, validator, value, json.dumps(meta or {}), time.time()),
+                )
+                conn.execute(
+                    "DELETE FROM entries WHERE rowid IN"
+                    " (SELECT rowid FROM entries ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write shared cache {self.db_path}: {e}")
+
+    def delete(self, namespace: str, keys: Iterable[str]) -> int:
+        """
+        エントリを削除する。
+
+        Returns
+        -------
+        int
+            削除したエントリ数。
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.executemany(
+                    "DELETE FROM entries WHERE namespace = ? AND key = ?", [(namespace, key) for key in keys]
+                )
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to remove shared cache entries in {self.db_path}: {e}")
+            return 0
+
+    def clear(self) -> None:
+        """すべてのエントリを削除する。"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
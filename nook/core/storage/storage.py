@@ -7,6 +7,10 @@ from typing import Any
 
 import aiofiles
 
+from nook.core.metrics.spans import span
+from nook.core.storage.change_log import ChangeLog, is_daily_file
+from nook.core.storage.date_manifest import DateManifest
+
 
 class LocalStorage:
     """
@@ -29,6 +33,8 @@ class LocalStorage:
         """
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.change_log = ChangeLog(self.base_dir)
+        self.date_manifest = DateManifest(self.base_dir)
 
     def save_markdown(self, content: str, service_name: str, date: datetime | None = None) -> Path:
         """
@@ -87,7 +93,7 @@ class LocalStorage:
         if not file_path.exists():
             return None
 
-        with open(file_path, encoding="utf-8") as f:
+        with span("read"), open(file_path, encoding="utf-8") as f:
             return f.read()
 
     def list_dates(self, service_name: str) -> list[datetime]:
@@ -141,12 +147,20 @@ class LocalStorage:
 
         # JSONファイルの場合
         if filename.endswith(".json"):
-            async with aiofiles.open(file_path, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(data, ensure_ascii=False, indent=2))
+            text = json.dumps(data, ensure_ascii=False, indent=2)
         # テキストファイルの場合
         else:
-            async with aiofiles.open(file_path, "w", encoding="utf-8") as f:
-                await f.write(str(data))
+            text = str(data)
+
+        # 日次ファイルは差分同期用に変更前の内容と比較してチェンジログに記録する
+        previous = await self.load(filename) if is_daily_file(filename) else None
+
+        async with aiofiles.open(file_path, "w", encoding="utf-8") as f:
+            await f.write(text)
+
+        if is_daily_file(filename):
+            self.change_log.record(filename, previous, text)
+            self.date_manifest.record(filename, text)
 
         return file_path
 
@@ -196,5 +210,7 @@ class LocalStorage:
         if not file_path.exists():
             return None
 
-        with open(file_path, encoding="utf-8") as f:
-            return json.load(f)
+        with span("read"), open(file_path, encoding="utf-8") as f:
+            text = f.read()
+        with span("json_parse"):
+            return json.loads(text)
@@ -0,0 +1,270 @@
+"""データディレクトリの日次ファイルの変更を監視する。
+
+``<base_dir>/<サービス>/<YYYY-MM-DD>.(json|md)`` の作成・更新・削除を検知し、
+(サービスディレクトリ, 日付) の単位でまとめて通知する。watchfiles が
+インストールされている場合は OS の通知（Linux では inotify）を使い、ない場合や
+通知を使えない環境では (mtime, size) の定期的な走査にフォールバックする。
+
+ChangeLogFollower は同じ形式の変更を、ディレクトリを走査せずに各サービスの
+チェンジログから読み取る（監視を担当しない API ワーカー向け）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from nook.core.storage.change_log import CHANGE_LOG_FILENAME, ChangeLog, is_daily_file
+
+try:
+    import watchfiles
+except ImportError:  # watchfiles が入っていない環境では定期的な走査
+    watchfiles = None
+
+logger = logging.getLogger(__name__)
+
+# 連続した書き込みをまとめる待ち時間（秒）
+DEFAULT_DEBOUNCE = 0.5
+# 走査によるフォールバックの間隔（秒）
+DEFAULT_POLL_INTERVAL = 5.0
+
+# ファイルごとの (mtime_ns, size)
+Snapshot = dict[Path, tuple[int, int]]
+
+
+@dataclass(frozen=True, order=True)
+class StorageChange:
+    """
+    日次ファイルの変更。
+
+    Parameters
+    ----------
+    directory : str
+        サービスディレクトリ名（base_dir 直下）。
+    date : str
+        日付（YYYY-MM-DD形式）。
+    """
+
+    directory: str
+    date: str
+
+
+def daily_change(base_dir: Path, path: Path) -> StorageChange | None:
+    """
+    パスが base_dir 直下のサービスディレクトリの日次ファイルなら、その変更を返す。
+
+    Parameters
+    ----------
+    base_dir : Path
+        データディレクトリ。
+    path : Path
+        変更されたファイルのパス。
+
+    Returns
+    -------
+    StorageChange | None
+        日次ファイル以外（一時ファイルやマニフェスト、さらに深い階層）の場合は None。
+    """
+    try:
+        relative = Path(path).relative_to(base_dir)
+    except ValueError:
+        return None
+    if len(relative.parts) != 2 or not is_daily_file(relative.name):
+        return None
+    return StorageChange(directory=relative.parts[0], date=relative.name.split(".", 1)[0])
+
+
+def snapshot(base_dir: Path) -> Snapshot:
+    """base_dir 直下のサービスディレクトリにある日次ファイルの (mtime_ns, size) を返す。"""
+    result: Snapshot = {}
+    try:
+        directories = [path for path in base_dir.iterdir() if path.is_dir()]
+    except OSError:
+        return result
+    for directory in directories:
+        try:
+            paths = list(directory.iterdir())
+        except OSError:
+            continue
+        for path in paths:
+            if not is_daily_file(path.name):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            result[path] = (stat.st_mtime_ns, stat.st_size)
+    return result
+
+
+def diff_snapshots(base_dir: Path, before: Snapshot, after: Snapshot) -> set[StorageChange]:
+    """2つのスナップショットの間で作成・更新・削除された日次ファイルの変更を返す。"""
+    changed = {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+    return {change for path in changed if (change := daily_change(base_dir, path)) is not None}
+
+
+class StorageWatcher:
+    """
+    データディレクトリの日次ファイルの変更を監視する。
+
+    Parameters
+    ----------
+    base_dir : Path
+        データディレクトリ。
+    poll_interval : float, default=DEFAULT_POLL_INTERVAL
+        走査によるフォールバックの間隔（秒）。
+    debounce : float, default=DEFAULT_DEBOUNCE
+        連続した書き込みをまとめる待ち時間（秒）。
+    force_polling : bool, default=False
+        True の場合は OS の通知を使わず走査する。
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        force_polling: bool = False,
+    ):
+        self.base_dir = Path(base_dir)
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.force_polling = force_polling or watchfiles is None
+
+    async def watch(self, stop_event: asyncio.Event | None = None) -> AsyncIterator[set[StorageChange]]:
+        """
+        変更をまとめて生成する。
+
+        Parameters
+        ----------
+        stop_event : asyncio.Event | None
+            セットされると監視を終了する。
+
+        Yields
+        ------
+        set[StorageChange]
+            まとめて検知した変更（空の集合は生成しない）。
+        """
+        stop_event = stop_event or asyncio.Event()
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        if not self.force_polling:
+            try:
+                async for changes in self._watch_events(stop_event):
+                    yield changes
+                return
+            except Exception as e:
+                if stop_event.is_set():
+                    return
+                logger.warning(f"File system notifications unavailable; falling back to polling: {e}")
+        async for changes in self._poll(stop_event):
+            yield changes
+
+    async def _watch_events(self, stop_event: asyncio.Event) -> AsyncIterator[set[StorageChange]]:
+        """OS の通知で変更を監視する。"""
+        async for events in watchfiles.awatch(
+            self.base_dir,
+            stop_event=stop_event,
+            debounce=int(self.debounce * 1000),
+            watch_filter=lambda _change, path: daily_change(self.base_dir, Path(path)) is not None,
+        ):
+            changes = {
+                change for _kind, path in events if (change := daily_change(self.base_dir, Path(path))) is not None
+            }
+            if changes:
+                yield changes
+
+    async def _poll(self, stop_event: asyncio.Event) -> AsyncIterator[set[StorageChange]]:
+        """(mtime, size) の定期的な走査で変更を監視する。"""
+        previous = await asyncio.to_thread(snapshot, self.base_dir)
+        while not stop_event.is_set():
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=self.poll_interval)
+                return
+            except TimeoutError:
+                pass
+            current = await asyncio.to_thread(snapshot, self.base_dir)
+            changes = diff_snapshots(self.base_dir, previous, current)
+            previous = current
+            if changes:
+                yield changes
+
+
+class ChangeLogFollower:
+    """
+    各サービスのチェンジログに追記された保存を、日次ファイルの変更として通知する。
+
+    ディレクトリの監視・走査は行わず、チェンジログの末尾を一定間隔で読むだけのため、
+    監視を担当する1つのワーカー以外が同じ変更を受け取るのに使う。LocalStorage を
+    経由せずに置かれたファイル（チェンジログに記録されない変更）は通知しない。
+
+    Parameters
+    ----------
+    base_dir : Path
+        データディレクトリ。
+    poll_interval : float, default=DEFAULT_POLL_INTERVAL
+        チェンジログを読む間隔（秒）。
+    """
+
+    def __init__(self, base_dir: Path, *, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.base_dir = Path(base_dir)
+        self.poll_interval = poll_interval
+
+    def _change_logs(self) -> dict[str, ChangeLog]:
+        return {path.parent.name: ChangeLog(path.parent) for path in self.base_dir.glob(f"*/{CHANGE_LOG_FILENAME}")}
+
+    def heads(self) -> dict[str, int]:
+        """サービスディレクトリごとのチェンジログの最新リビジョンを返す。"""
+        return {directory: change_log.head for directory, change_log in self._change_logs().items()}
+
+    def read_changes(self, heads: dict[str, int]) -> set[StorageChange]:
+        """
+        heads より後に記録された変更を返し、heads を最新のリビジョンに進める。
+
+        Parameters
+        ----------
+        heads : dict[str, int]
+            サービスディレクトリごとの読み取り済みのリビジョン。
+
+        Returns
+        -------
+        set[StorageChange]
+            記録された日次ファイルの変更。
+        """
+        changes: set[StorageChange] = set()
+        for directory, change_log in self._change_logs().items():
+            entries, _reset = change_log.read_since(heads.get(directory, 0))
+            for entry in entries:
+                if is_daily_file(entry.filename):
+                    changes.add(StorageChange(directory=directory, date=entry.filename.split(".", 1)[0]))
+                heads[directory] = max(heads.get(directory, 0), entry.revision)
+        return changes
+
+    async def watch(self, stop_event: asyncio.Event | None = None) -> AsyncIterator[set[StorageChange]]:
+        """
+        開始後に記録された変更をまとめて生成する。
+
+        Parameters
+        ----------
+        stop_event : asyncio.Event | None
+            セットされると終了する。
+
+        Yields
+        ------
+        set[StorageChange]
+            前回の読み取り以降に記録された変更（空の集合は生成しない）。
+        """
+        stop_event = stop_event or asyncio.Event()
+        heads = await asyncio.to_thread(self.heads)
+        while not stop_event.is_set():
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=self.poll_interval)
+                return
+            except TimeoutError:
+                pass
+            changes = await asyncio.to_thread(self.read_changes, heads)
+            if changes:
+                yield changes
@@ -0,0 +1,76 @@
+"""同じホストのワーカープロセスのうち1つだけが保持するロック。
+
+API を複数のワーカープロセスで動かす場合に、データディレクトリの監視や
+総合ランキングの更新のようなバックグラウンド処理を1つのワーカーだけで
+行うために使う。ロックはファイルの flock で、保持しているプロセスが終了すると
+OS が解放する（再起動されたワーカーが起動時に取得し直せる）。
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import IO
+
+try:
+    import fcntl
+except ImportError:  # Windows には flock がない（ワーカー間の排他は行わない）
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerLock:
+    """
+    ファイルの排他ロック。
+
+    取得はブロックせず、他のプロセスが保持している場合はすぐに False を返す。
+
+    Parameters
+    ----------
+    path : Path
+        ロックファイルのパス。
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file: IO[str] | None = None
+
+    @property
+    def held(self) -> bool:
+        """このインスタンスがロックを保持しているかどうか。"""
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """
+        ロックの取得を試みる。
+
+        Returns
+        -------
+        bool
+            取得できた（すでに保持している場合を含む）場合は True。
+        """
+        if self._file is not None:
+            return True
+        if fcntl is None:
+            logger.warning("File locks are unavailable; background tasks run in every worker")
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115  解放まで開いたままにする
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            file.close()
+            return False
+        self._file = file
+        return True
+
+    def release(self) -> None:
+        """ロックを解放する。保持していない場合は何もしない。"""
+        if self._file is None:
+            return
+        file, self._file = self._file, None
+        try:
+            fcntl.flock(file, fcntl.LOCK_UN)
+        finally:
+            file.close()
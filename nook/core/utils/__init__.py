@@ -3,6 +3,7 @@
 
 from nook.core.utils.async_utils import (
     AsyncTaskManager,
+    StaleWhileRevalidateCache,
     TaskResult,
     batch_process,
     gather_with_errors,
@@ -21,14 +22,17 @@ from nook.core.utils.dedup import (
     TitleNormalizer,
     load_existing_titles_from_storage,
 )
+from nook.core.utils.tokens import count_tokens, truncate_to_tokens
 
 __all__ = [
     "AsyncTaskManager",
     "DedupTracker",
+    "StaleWhileRevalidateCache",
     "TaskResult",
     "TitleNormalizer",
     "batch_process",
     "compute_target_dates",
+    "count_tokens",
     "gather_with_errors",
     "handle_errors",
     "is_within_target_dates",
@@ -38,4 +42,5 @@ __all__ = [
     "run_sync_in_thread",
     "run_with_semaphore",
     "target_dates_set",
+    "truncate_to_tokens",
 ]
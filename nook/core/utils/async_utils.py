@@ -1,10 +1,11 @@
 import asyncio
 import logging
-from collections.abc import Callable
+import time
+from collections.abc import Awaitable, Callable, Hashable
 from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from functools import partial
-from typing import Any, TypeVar
+from typing import Any, Generic, TypeVar
 
 logger = logging.getLogger(__name__)
 T = TypeVar("T")
@@ -197,3 +198,119 @@ class AsyncTaskManager:
             "failed": list(self.errors.keys()),
             "total": len(self.tasks) + len(self.results) + len(self.errors),
         }
+
+
+class StaleWhileRevalidateCache(Generic[T]):
+    """
+    TTL付きの非同期キャッシュ（stale-while-revalidate）。
+
+    有効期限内の値はそのまま返し、期限切れの値は返しつつバックグラウンドで
+    取得し直す。同じキーの取得が同時に発生した場合は1回の取得にまとめる。
+    取得に失敗した場合は最後に取得できた値を返し、値がない場合のみ例外を送出する。
+
+    Parameters
+    ----------
+    ttl : float
+        値を新しいとみなす秒数。
+    max_stale : float | None, default=None
+        期限切れの値を待たずに返す最大の経過秒数。超えた場合は取得を待つ
+        （失敗した場合は古い値を返す）。None の場合は常に待たずに返す。
+    error_ttl : float, default=0.0
+        取得に失敗した後、再取得せずに期限切れの値を返す秒数。
+    clock : Callable[[], float], default=time.monotonic
+        経過時間の計測に使う時計。
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_stale: float | None = None,
+        error_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.error_ttl = error_ttl
+        self._clock = clock
+        # キーごとの (値, 取得時刻)
+        self._values: dict[Hashable, tuple[T, float]] = {}
+        # キーごとの最後に取得に失敗した時刻
+        self._failed_at: dict[Hashable, float] = {}
+        self._inflight: dict[Hashable, asyncio.Task[T]] = {}
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        """
+        キャッシュから値を取得する。
+
+        Parameters
+        ----------
+        key : Hashable
+            キャッシュキー。
+        loader : Callable[[], Awaitable[T]]
+            値を取得するコルーチン関数。
+
+        Returns
+        -------
+        T
+            キャッシュされた値、または取得した値。
+
+        Raises
+        ------
+        Exception
+            取得に失敗し、返せる値もない場合は loader の例外。
+        """
+        now = self._clock()
+        cached = self._values.get(key)
+        if cached is not None:
+            value, fetched_at = cached
+            age = now - fetched_at
+            if age < self.ttl:
+                return value
+            failed_at = self._failed_at.get(key)
+            if failed_at is not None and now - failed_at < self.error_ttl:
+                # 直前に失敗しているため、取得し直さずに古い値を返す
+                return value
+            if self.max_stale is None or age < self.max_stale:
+                self._refresh(key, loader)
+                return value
+
+        try:
+            return await asyncio.shield(self._refresh(key, loader))
+        except Exception:
+            if cached is None:
+                raise
+            return cached[0]
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> asyncio.Task[T]:
+        """取得中のタスクがあれば再利用し、なければ取得を開始する。"""
+        task = self._inflight.get(key)
+        # 別のイベントループで作成したタスクは待てないため作り直す
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            return task
+        task = asyncio.get_running_loop().create_task(self._load(key, loader))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return task
+
+    def _forget(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # バックグラウンドの取得の失敗を「未取得の例外」として警告させない
+        if not task.cancelled():
+            task.exception()
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        try:
+            value = await loader()
+        except Exception as e:
+            self._failed_at[key] = self._clock()
+            logger.warning(f"Failed to refresh cached value for {key!r}: {e}")
+            raise
+        self._values[key] = (value, self._clock())
+        self._failed_at.pop(key, None)
+        return value
+
+    def clear(self) -> None:
+        """すべての値を破棄する（取得中のタスクはそのまま完了させる）。"""
+        self._values.clear()
+        self._failed_at.clear()
@@ -0,0 +1,35 @@
+"""人気指標の値の解析。"""
+
+import math
+
+
+def parse_popularity_score(value: object) -> float:
+    """人気スコアを安全にパース.
+
+    Parameters
+    ----------
+    value : object
+        パースする値。
+
+    Returns
+    -------
+    float
+        パースされた人気スコア。失敗時は0.0。
+    """
+    if value is None:
+        return 0.0
+    try:
+        # 文字列の場合、カンマやプラス記号を正規化
+        if isinstance(value, str):
+            normalized = value.strip().replace(",", "")
+            if normalized.startswith("+"):
+                normalized = normalized[1:]
+            result = float(normalized)
+        else:
+            result = float(value)
+        # NaN/Infinity は 0.0 にフォールバック
+        if not math.isfinite(result):
+            return 0.0
+        return result
+    except (ValueError, TypeError):
+        return 0.0
@@ -0,0 +1,117 @@
+"""tiktoken によるトークン数の計測。"""
+
+import logging
+import math
+import re
+import threading
+from typing import Any
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# GPTClient と同じエンコーディング
+ENCODING_MODEL = "gpt-4"
+FALLBACK_ENCODING = "cl100k_base"
+
+# エンコーダーを取得できない場合の概算（CJK は1文字1トークン、それ以外は4文字1トークン）
+_CJK_PATTERN = re.compile(r"[぀-ヿ㐀-鿿가-힯豈-﫿]")
+_CHARS_PER_TOKEN = 4
+
+_encoding: Any = None
+_encoding_failed = False
+_encoding_lock = threading.Lock()
+
+
+def get_encoding() -> Any:
+    """
+    プロセス内で共有する tiktoken のエンコーダーを返す。
+
+    初回のみ読み込み、以降は同じインスタンスを再利用する。BPE ファイルを
+    取得できない環境（オフラインなど）では None を返し、再試行しない。
+
+    Returns
+    -------
+    Any
+        tiktoken.Encoding。取得できない場合は None。
+    """
+    global _encoding, _encoding_failed
+    if _encoding is not None or _encoding_failed:
+        return _encoding
+    with _encoding_lock:
+        if _encoding is None and not _encoding_failed:
+            try:
+                try:
+                    _encoding = tiktoken.encoding_for_model(ENCODING_MODEL)
+                except KeyError:
+                    _encoding = tiktoken.get_encoding(FALLBACK_ENCODING)
+            except Exception as e:
+                logger.warning(f"Failed to load tiktoken encoding; falling back to estimation: {e}")
+                _encoding_failed = True
+    return _encoding
+
+
+def _estimate_tokens(text: str) -> int:
+    """エンコーダーがない場合のトークン数の概算。"""
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / _CHARS_PER_TOKEN)
+
+
+def count_tokens(text: str) -> int:
+    """
+    テキストのトークン数を返す。
+
+    Parameters
+    ----------
+    text : str
+        対象のテキスト。
+
+    Returns
+    -------
+    int
+        トークン数（エンコーダーを取得できない場合は概算）。
+    """
+    if not text:
+        return 0
+    encoding = get_encoding()
+    if encoding is None:
+        return _estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, *, suffix: str = "…") -> str:
+    """
+    テキストを最大トークン数に収まるよう末尾を切り詰める。
+
+    Parameters
+    ----------
+    text : str
+        対象のテキスト。
+    max_tokens : int
+        最大トークン数。
+    suffix : str, default="…"
+        切り詰めた場合に末尾に付ける文字列（トークン数に含む）。
+
+    Returns
+    -------
+    str
+        切り詰めたテキスト。収まる場合はそのまま返す。
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    limit = max(0, max_tokens - count_tokens(suffix))
+    encoding = get_encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:limit]) + suffix
+
+    # 概算の場合は収まる最長の接頭辞を二分探索する
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if _estimate_tokens(text[:middle]) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + suffix
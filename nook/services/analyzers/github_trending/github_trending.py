@@ -331,6 +331,7 @@ class GithubTrending(BaseService):
                                 prompt=prompt,
                                 temperature=0.3,
                                 max_tokens=300,
+                                service_name=self.service_name,
                             )
                             if repo.description:
                                 repo.description = repo.description.strip()
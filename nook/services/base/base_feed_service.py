@@ -9,6 +9,7 @@ from pathlib import Path
 
 from bs4 import BeautifulSoup
 
+from nook.core.content.publishing import materialize_saved_files
 from nook.core.storage.daily_merge import merge_records
 from nook.core.utils.date_utils import (
     is_within_target_dates,
@@ -408,7 +409,9 @@ class BaseFeedService(BaseService):
         markdown = self._render_markdown(merged, snapshot_datetime)
         md_path = await self.save_markdown(markdown, filename_md)
 
-        return (str(json_path), str(md_path))
+        saved = (str(json_path), str(md_path))
+        await materialize_saved_files([saved])
+        return saved
 
     def _render_markdown(self, records: list[dict], today: datetime) -> str:
         """
@@ -461,6 +464,7 @@ class BaseFeedService(BaseService):
                 system_instruction=system_instruction,
                 temperature=0.3,
                 max_tokens=1000,
+                service_name=self.service_name,
             )
             article.summary = summary
         except Exception as e:
@@ -1036,6 +1036,7 @@ class FiveChanExplorer(BaseService):
                 system_instruction=system_instruction,
                 temperature=0.3,
                 max_tokens=1000,
+                service_name=self.service_name,
             )
             thread.summary = summary
         except Exception as e:
@@ -5,11 +5,16 @@
 """
 
 import asyncio
+import math
 from abc import abstractmethod
 from datetime import date, datetime, timezone
 from typing import Any
 
 from nook.core.config import BaseConfig
+from nook.core.content.publishing import materialize_saved_files
+from nook.core.storage.daily_merge import merge_records
+from nook.core.utils.date_utils import compute_target_dates
+from nook.core.utils.dedup import TitleNormalizer
 from nook.services.base.base_feed_service import Article
 from nook.services.base.base_service import BaseService
 from nook.services.explorers.trendradar.trendradar_client import TrendRadarClient
@@ -46,6 +51,8 @@ class BaseTrendRadarExplorer(BaseService):
 
     # 共通設定
     TOTAL_LIMIT = 5
+    DAILY_RECORD_LIMIT = 30
+    MAX_RANK_HISTORY = 48
     GPT_TEMPERATURE = 0.3
     GPT_MAX_TOKENS = 600
     MAX_CONCURRENT_REQUESTS = 5
@@ -129,36 +136,33 @@ class BaseTrendRadarExplorer(BaseService):
     ) -> list[tuple[str, str]]:
         """ホットトピックを収集して保存（非同期版）.
 
+        最新の対象日は現在のホットリストを、それより前の日付は
+        TrendRadarに蓄積された履歴を日付指定で取得します。
+        全日付分の要約はまとめて並行実行されます。
+
         Parameters
         ----------
         days : int, default=1
-            何日分のデータを処理するか。
+            何日分のデータを処理するか。target_dates指定時は無視される。
         limit : int | None, default=None
-            取得するトピック数。Noneの場合はTOTAL_LIMITを使用。
+            1日あたりの取得トピック数。Noneの場合はTOTAL_LIMITを使用。
         target_dates : list[date] | None, default=None
-            対象日付のリスト（将来の拡張用）。
+            対象日付のリスト。
 
         Returns
         -------
         list[tuple[str, str]]
             保存されたファイルパスのリスト [(json_path, md_path), ...]
         """
-        if days != 1:
-            raise ValueError(
-                "複数日の収集 (days > 1) はまだ実装されていません。days=1 を指定するか、パラメータを省略してください。"
-            )
-
         if target_dates is not None:
             if len(target_dates) == 0:
                 raise ValueError("target_dates には少なくとも1つの日付を指定してください")
-            if len(target_dates) > 1:
-                raise NotImplementedError(
-                    "複数日の収集 (len(target_dates) > 1) はまだ実装されていません。"
-                    "単一の日付を指定するか、days=1 を使用してください。"
-                )
-            target_date = target_dates[0]
+            effective_dates = sorted(set(target_dates))
         else:
-            target_date = datetime.now(timezone.utc).date()
+            if not isinstance(days, int) or isinstance(days, bool) or days < 1:
+                raise ValueError(f"days は 1 以上の整数である必要があります。指定値: {days}")
+            today = datetime.now(timezone.utc).date()
+            effective_dates = sorted(compute_target_dates(days, base_date=today))
 
         if limit is not None:
             if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1 or limit > 100:
@@ -167,13 +171,99 @@ class BaseTrendRadarExplorer(BaseService):
         else:
             effective_limit = self.TOTAL_LIMIT
 
-        news_items = await self.client.get_latest_news(platform=self.PLATFORM_NAME, limit=effective_limit)
+        news_by_date = await self._fetch_news_by_date(effective_dates, effective_limit)
+
+        articles_by_date: dict[str, list[Article]] = {}
+        pending: list[Article] = []
+        for target_date, news_items in news_by_date.items():
+            if not news_items:
+                self.logger.info(f"TrendRadarから取得したニュース項目がありません: {target_date}")
+                continue
+
+            date_str = target_date.strftime("%Y-%m-%d")
+            articles = [self._transform_to_article(item) for item in news_items]
+            existing_records = await self._load_existing_records(date_str)
+            date_pending = self._reuse_existing_summaries(articles, existing_records)
+            if len(date_pending) < len(articles):
+                self.logger.info(
+                    f"[{date_str}] 既存の要約を再利用: {len(articles) - len(date_pending)}件 / "
+                    f"新規要約: {len(date_pending)}件"
+                )
+            articles_by_date[date_str] = articles
+            pending.extend(date_pending)
 
-        if not news_items:
-            self.logger.info("TrendRadarから取得したニュース項目がありません")
+        if not articles_by_date:
             return []
 
-        articles = [self._transform_to_article(item) for item in news_items]
+        await self._summarize_pending(pending)
+
+        saved_files: list[tuple[str, str]] = []
+        for date_str, articles in articles_by_date.items():
+            saved_files.extend(await self._store_articles(articles, date_str))
+
+        return saved_files
+
+    async def _fetch_news_by_date(self, target_dates: list[date], limit: int) -> dict[date, list[dict[str, Any]]]:
+        """対象日ごとのホットリストを並行取得.
+
+        最新の対象日が今日以降であれば現在のホットリストを使用し、
+        それ以外の日付は履歴として日付指定で取得します。
+
+        Parameters
+        ----------
+        target_dates : list[date]
+            昇順にソートされた対象日付。
+        limit : int
+            1日あたりの取得件数。
+
+        Returns
+        -------
+        dict[date, list[dict[str, Any]]]
+            日付をキーとしたTrendRadarアイテムのリスト（対象日付の昇順）。
+            取得に失敗した日付は含まれない。
+
+        Raises
+        ------
+        Exception
+            全日付の取得に失敗した場合、最初の例外を再送出。
+        """
+        live_date = target_dates[-1] if target_dates[-1] >= datetime.now(timezone.utc).date() else None
+        sem = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+        async def fetch(target_date: date) -> list[dict[str, Any]]:
+            async with sem:
+                if target_date == live_date:
+                    return await self.client.get_latest_news(platform=self.PLATFORM_NAME, limit=limit)
+                return await self.client.get_news_by_date(target_date, platform=self.PLATFORM_NAME, limit=limit)
+
+        results = await asyncio.gather(
+            *[fetch(target_date) for target_date in target_dates],
+            return_exceptions=True,
+        )
+
+        failures = [result for result in results if isinstance(result, BaseException)]
+        if len(failures) == len(results):
+            raise failures[0]
+
+        news_by_date: dict[date, list[dict[str, Any]]] = {}
+        for target_date, result in zip(target_dates, results, strict=True):
+            if isinstance(result, BaseException):
+                self.logger.error(f"TrendRadarからの取得に失敗したためスキップします: {target_date} - {result}")
+                continue
+            news_by_date[target_date] = result
+        return news_by_date
+
+    async def _summarize_pending(self, pending: list[Article]) -> None:
+        """要約が必要な記事を並行して要約（破壊的変更）.
+
+        同一記事（URL/正規化タイトルが一致）が複数日に現れる場合は
+        1回だけ要約し、結果を共有します。
+        """
+        groups: dict[str, list[Article]] = {}
+        for article in pending:
+            keys = self._identity_keys(article.title, article.url) or [f"id:{id(article)}"]
+            groups.setdefault(keys[0], []).append(article)
+        representatives = [group[0] for group in groups.values()]
 
         sem = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
 
@@ -182,23 +272,22 @@ class BaseTrendRadarExplorer(BaseService):
                 await self._summarize_article(article)
 
         results = await asyncio.gather(
-            *[bounded_summarize(article) for article in articles],
+            *[bounded_summarize(article) for article in representatives],
             return_exceptions=True,
         )
 
         for i, result in enumerate(results):
             if isinstance(result, BaseException) and not isinstance(result, asyncio.CancelledError):
                 self.logger.error(
-                    f"Unexpected error in summary generation for article '{articles[i].title}': {result}",
+                    f"Unexpected error in summary generation for article '{representatives[i].title}': {result}",
                     exc_info=(type(result), result, result.__traceback__),
                 )
-                if not articles[i].summary:
-                    articles[i].summary = self.ERROR_MSG_GENERATION_FAILED
+                if not representatives[i].summary:
+                    representatives[i].summary = self.ERROR_MSG_GENERATION_FAILED
 
-        date_str = target_date.strftime("%Y-%m-%d")
-        saved_files = await self._store_articles(articles, date_str)
-
-        return saved_files
+        for group in groups.values():
+            for duplicate in group[1:]:
+                duplicate.summary = group[0].summary
 
     def _transform_to_article(self, item: dict[str, Any]) -> Article:
         """TrendRadar形式のアイテムをArticleオブジェクトに変換."""
@@ -315,6 +404,7 @@ class BaseTrendRadarExplorer(BaseService):
                 system_instruction=system_instruction,
                 temperature=self.GPT_TEMPERATURE,
                 max_tokens=self.GPT_MAX_TOKENS,
+                service_name=self.service_name,
             )
             if summary and summary.strip():
                 article.summary = summary
@@ -327,15 +417,104 @@ class BaseTrendRadarExplorer(BaseService):
             self.logger.exception(f"要約生成に失敗 (article: {article.title})")
             article.summary = self.ERROR_MSG_GENERATION_FAILED
 
-    async def _store_articles(self, articles: list[Article], date_str: str) -> list[tuple[str, str]]:
-        """記事をJSON/Markdown形式で保存."""
-        if not articles:
+    async def _load_existing_records(self, date_str: str) -> list[dict[str, Any]]:
+        """指定日の保存済みレコードを読み込む（存在しない・壊れている場合は空リスト）."""
+        try:
+            records = await self.load_json(f"{date_str}.json")
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"既存データの読み込みに失敗したため新規として扱います: {date_str}.json - {e}")
+            return []
+        if not isinstance(records, list):
             return []
+        return [record for record in records if isinstance(record, dict)]
+
+    @staticmethod
+    def _identity_keys(title: str | None, url: str | None) -> list[str]:
+        """URLと正規化タイトルから同一性判定用のキーを生成."""
+        keys = []
+        if url:
+            keys.append(f"url:{url}")
+        normalized = TitleNormalizer.normalize(title or "")
+        if normalized:
+            keys.append(f"title:{normalized}")
+        return keys
+
+    @staticmethod
+    def _record_identity(record: dict[str, Any]) -> str:
+        """マージ用のレコード識別子（URL優先、なければ正規化タイトル）."""
+        url = record.get("url")
+        if url:
+            return f"url:{url}"
+        return f"title:{TitleNormalizer.normalize(record.get('title') or '')}"
+
+    def _index_records(self, records: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        """URL/正規化タイトルの両方で引けるレコードの索引を作成."""
+        index: dict[str, dict[str, Any]] = {}
+        for record in records:
+            for key in self._identity_keys(record.get("title"), record.get("url")):
+                index.setdefault(key, record)
+        return index
+
+    def _find_existing(self, index: dict[str, dict[str, Any]], article: Article) -> dict[str, Any] | None:
+        """記事に対応する既存レコードを索引から検索."""
+        for key in self._identity_keys(article.title, article.url):
+            if key in index:
+                return index[key]
+        return None
+
+    def _has_valid_summary(self, record: dict[str, Any]) -> bool:
+        """要約が生成済み（空やエラーメッセージではない）か判定."""
+        summary = record.get("summary")
+        return bool(summary) and summary not in (
+            self.ERROR_MSG_EMPTY_SUMMARY,
+            self.ERROR_MSG_GENERATION_FAILED,
+        )
 
-        records = []
+    def _reuse_existing_summaries(self, articles: list[Article], existing: list[dict[str, Any]]) -> list[Article]:
+        """既存レコードの要約を記事に引き継ぎ、要約が必要な記事のみを返す（破壊的変更）."""
+        index = self._index_records(existing)
+        pending = []
         for article in articles:
-            records.append(
-                {
+            record = self._find_existing(index, article)
+            if record is not None and self._has_valid_summary(record):
+                article.summary = record["summary"]
+            else:
+                pending.append(article)
+        return pending
+
+    def _merge_hot_list(
+        self,
+        existing: list[dict[str, Any]],
+        articles: list[Article],
+        observed_at: datetime,
+    ) -> list[dict[str, Any]]:
+        """今回のホットリストを既存レコードへマージし、人気度と順位履歴を更新.
+
+        今回のホットリストに含まれない既存レコードは現在順位（rank）をNoneにし、
+        最高順位と順位履歴のみを残す。
+
+        Parameters
+        ----------
+        existing : list[dict[str, Any]]
+            当日の保存済みレコード。
+        articles : list[Article]
+            今回取得した記事（ホットリストの順位順）。
+        observed_at : datetime
+            今回の取得時刻。
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            最高順位順に並べ、DAILY_RECORD_LIMIT件に制限したレコード。
+        """
+        index = self._index_records(existing)
+        observed_iso = observed_at.isoformat()
+        updated: list[dict[str, Any]] = []
+
+        for rank, article in enumerate(articles, 1):
+            current = self._find_existing(index, article)
+            if current is None:
+                record = {
                     "title": article.title,
                     "url": article.url,
                     "feed_name": article.feed_name,
@@ -343,8 +522,71 @@ class BaseTrendRadarExplorer(BaseService):
                     "popularity_score": article.popularity_score,
                     "published_at": (article.published_at.isoformat() if article.published_at else None),
                     "category": article.category,
+                    "first_seen_at": observed_iso,
+                    "rank_history": [],
+                }
+            else:
+                record = dict(current)
+                record["popularity_score"] = article.popularity_score
+                record.setdefault("first_seen_at", observed_iso)
+                if article.summary and not self._has_valid_summary(record):
+                    record["summary"] = article.summary
+
+            history = list(record.get("rank_history") or [])
+            history.append(
+                {
+                    "rank": rank,
+                    "popularity_score": article.popularity_score,
+                    "observed_at": observed_iso,
                 }
             )
+            record["rank_history"] = history[-self.MAX_RANK_HISTORY :]
+            record["rank"] = rank
+            record["best_rank"] = min(rank, record.get("best_rank") or rank)
+            record["last_seen_at"] = observed_iso
+
+            updated.append(record)
+            for key in self._identity_keys(record.get("title"), record.get("url")):
+                index.setdefault(key, record)
+
+        # 今回のホットリストにないレコードは圏外（更新されたレコードはmergeで上書きされる）
+        dropped = [{**record, "rank": None} for record in existing]
+        return merge_records(
+            dropped,
+            updated,
+            key=self._record_identity,
+            sort_key=self._hot_list_sort_key,
+            limit=self.DAILY_RECORD_LIMIT,
+            reverse=False,
+        )
+
+    def _hot_list_sort_key(self, record: dict[str, Any]) -> tuple[float, float]:
+        """最高順位の昇順、同順位は人気度の降順で並べるソートキー."""
+        best_rank = record.get("best_rank")
+        return (
+            float(best_rank) if isinstance(best_rank, (int, float)) else math.inf,
+            -self._parse_popularity_score(record.get("popularity_score")),
+        )
+
+    @staticmethod
+    def _observed_at(date_str: str, now: datetime | None = None) -> datetime:
+        """ホットリストを観測した時刻（当日は現在時刻、過去日はその日の終わり）を返す."""
+        now = now or datetime.now(timezone.utc)
+        target = date.fromisoformat(date_str)
+        if target >= now.date():
+            return now
+        return now.replace(
+            year=target.year, month=target.month, day=target.day, hour=23, minute=59, second=59, microsecond=0
+        )
+
+    async def _store_articles(self, articles: list[Article], date_str: str) -> list[tuple[str, str]]:
+        """記事を当日の既存データへマージしてJSON/Markdown形式で保存."""
+        if not articles:
+            return []
+
+        existing = await self._load_existing_records(date_str)
+        # 過去日を補完する場合に、履歴へ今日の日時を記録しない
+        records = self._merge_hot_list(existing, articles, self._observed_at(date_str))
 
         filename_json = f"{date_str}.json"
         json_path = await self.save_json(records, filename_json)
@@ -353,9 +595,11 @@ class BaseTrendRadarExplorer(BaseService):
         filename_md = f"{date_str}.md"
         md_path = await self.save_markdown(markdown, filename_md)
 
-        self.logger.info(f"{len(articles)}件の記事を保存しました: {date_str}")
+        self.logger.info(f"{len(articles)}件の記事をマージして保存しました: {date_str}（合計{len(records)}件）")
 
-        return [(str(json_path), str(md_path))]
+        saved_files = [(str(json_path), str(md_path))]
+        await materialize_saved_files(saved_files)
+        return saved_files
 
     def _render_markdown(self, records: list[dict], date_str: str) -> str:
         """記事をMarkdown形式でレンダリング."""
@@ -369,6 +613,11 @@ class BaseTrendRadarExplorer(BaseService):
 
             content += f"## {i}. [{title}]({url})\n\n"
             content += f"**人気度**: {hot:,.0f}\n\n"
+            if record.get("best_rank"):
+                if record.get("rank"):
+                    content += f"**順位**: {record['rank']}位（最高{record['best_rank']}位）\n\n"
+                else:
+                    content += f"**順位**: 圏外（最高{record['best_rank']}位）\n\n"
             content += f"**要約**:\n\n{summary}\n\n"
             content += "---\n\n"
 
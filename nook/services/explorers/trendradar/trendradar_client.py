@@ -7,6 +7,7 @@ to retrieve hot topics from various supported platforms.
 import json
 import logging
 import warnings
+from datetime import date
 from typing import Any
 
 from fastmcp import Client
@@ -162,6 +163,25 @@ class TrendRadarClient:
         # Primitive/unknown payload types
         return [{"text": str(payload)}]
 
+    def _validate_request(self, platform: str, limit: int) -> None:
+        """Validate platform and limit parameters shared by news tools.
+
+        Raises
+        ------
+        ValueError
+            If platform is not supported or limit is out of valid range.
+        """
+        # Validate platform parameter
+        if not platform or platform not in self.SUPPORTED_PLATFORMS:
+            raise ValueError(
+                f"Invalid platform '{platform}'. Supported platforms: {', '.join(self.SUPPORTED_PLATFORMS)}"
+            )
+
+        # Validate limit parameter
+        # Note: bool is subclass of int, so explicitly exclude it
+        if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1 or limit > 100:
+            raise ValueError(f"Invalid limit {limit}. Must be an integer between 1 and 100.")
+
     async def get_latest_news(
         self,
         platform: str = "zhihu",
@@ -188,20 +208,70 @@ class TrendRadarClient:
         TrendRadarError
             If the request fails or response is invalid.
         """
-        # Validate platform parameter
-        if not platform or platform not in self.SUPPORTED_PLATFORMS:
-            raise ValueError(
-                f"Invalid platform '{platform}'. Supported platforms: {', '.join(self.SUPPORTED_PLATFORMS)}"
-            )
-
-        # Validate limit parameter
-        # Note: bool is subclass of int, so explicitly exclude it
-        if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1 or limit > 100:
-            raise ValueError(f"Invalid limit {limit}. Must be an integer between 1 and 100.")
+        self._validate_request(platform, limit)
 
         # TrendRadar uses get_latest_news with platforms parameter
-        tool_name = "get_latest_news"
+        return await self._call_news_tool(
+            "get_latest_news",
+            {"platforms": [platform], "limit": limit, "include_url": True},
+            platform=platform,
+        )
 
+    async def get_news_by_date(
+        self,
+        target_date: date,
+        platform: str = "zhihu",
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Get news recorded by TrendRadar on a past date.
+
+        TrendRadar keeps every crawl in its local storage, so historical hot
+        lists can be queried through the ``get_news_by_date`` tool.
+
+        Parameters
+        ----------
+        target_date : date
+            Date to query (interpreted in TrendRadar's configured timezone).
+        platform : str, default="zhihu"
+            Platform to get news from (e.g., "zhihu", "weibo").
+        limit : int, default=50
+            Maximum number of news items to return.
+
+        Returns
+        -------
+        list[dict]
+            List of news items.
+
+        Raises
+        ------
+        ValueError
+            If platform is not supported or limit is out of valid range.
+        TrendRadarError
+            If the request fails or response is invalid.
+        """
+        self._validate_request(platform, limit)
+
+        return await self._call_news_tool(
+            "get_news_by_date",
+            {
+                "date_query": target_date.strftime("%Y-%m-%d"),
+                "platforms": [platform],
+                "limit": limit,
+                "include_url": True,
+            },
+            platform=platform,
+        )
+
+    async def _call_news_tool(
+        self, tool_name: str, arguments: dict[str, Any], *, platform: str
+    ) -> list[dict[str, Any]]:
+        """Call a TrendRadar news tool and normalize the result into news dicts.
+
+        Raises
+        ------
+        TrendRadarError
+            If the request fails or response is invalid.
+        """
         try:
             client = self._create_client()
             # Suppress DeprecationWarning from mcp's @deprecated decorator
@@ -209,10 +279,7 @@ class TrendRadarClient:
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore", DeprecationWarning)
                 async with client:
-                    result = await client.call_tool(
-                        tool_name,
-                        {"platforms": [platform], "limit": limit, "include_url": True},
-                    )
+                    result = await client.call_tool(tool_name, arguments)
 
             # FastMCP returns CallToolResult which may include structured data (.data)
             # and/or content blocks (.content).
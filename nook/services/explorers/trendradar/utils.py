@@ -1,11 +1,11 @@
 """TrendRadar Explorer共通ユーティリティ.
 
-このモジュールは、TrendRadar系ExplorerとAPIルーターで
-共通して使用されるユーティリティ関数を提供します。
+このモジュールは、TrendRadar系Explorerで共通して使用される
+ユーティリティ関数を提供します。人気スコアの解析はAPIと共有するため
+``nook.core.utils.scores`` にあります。
 """
 
 import html
-import math
 import re
 import unicodedata
 from datetime import datetime, timezone
@@ -14,6 +14,17 @@ from typing import Any
 from bs4 import BeautifulSoup
 from dateutil import parser
 
+from nook.core.utils.scores import parse_popularity_score
+
+__all__ = [
+    "create_empty_soup",
+    "escape_markdown_text",
+    "escape_markdown_url",
+    "parse_popularity_score",
+    "parse_published_at",
+    "sanitize_prompt_input",
+]
+
 
 def create_empty_soup() -> BeautifulSoup:
     """空のBeautifulSoupオブジェクトを生成するファクトリ関数.
@@ -31,38 +42,6 @@ def create_empty_soup() -> BeautifulSoup:
     return BeautifulSoup("", "html.parser")
 
 
-def parse_popularity_score(value: object) -> float:
-    """人気スコアを安全にパース.
-
-    Parameters
-    ----------
-    value : object
-        パースする値。
-
-    Returns
-    -------
-    float
-        パースされた人気スコア。失敗時は0.0。
-    """
-    if value is None:
-        return 0.0
-    try:
-        # 文字列の場合、カンマやプラス記号を正規化
-        if isinstance(value, str):
-            normalized = value.strip().replace(",", "")
-            if normalized.startswith("+"):
-                normalized = normalized[1:]
-            result = float(normalized)
-        else:
-            result = float(value)
-        # NaN/Infinity は 0.0 にフォールバック
-        if not math.isfinite(result):
-            return 0.0
-        return result
-    except (ValueError, TypeError):
-        return 0.0
-
-
 def sanitize_prompt_input(text: str, max_length: int = 500) -> str:
     """プロンプト入力用のサニタイズ処理.
 
@@ -619,6 +619,7 @@ class HackerNewsRetriever(BaseService):
                 system_instruction=system_instruction,
                 temperature=0.3,
                 max_tokens=1000,
+                service_name=self.service_name,
             )
             story.summary = summary
             await self.rate_limit()  # API呼び出し後のレート制限
@@ -0,0 +1,106 @@
+"""Markdownのみで保存された過去日のデータを日次JSONに変換する一回限りのスクリプト。
+
+構造化API（``/api/structured/{source}``）は日次JSONのみを読み込むため、
+JSONスナップショットの導入前に保存された ``YYYY-MM-DD.md`` しかない日付を、
+各サービス自身の ``_parse_markdown`` で ``YYYY-MM-DD.json`` に変換する。
+
+使い方::
+
+    python -m nook.services.runner.convert_markdown [--service reddit] [--dry-run]
+"""
+
+import asyncio
+import logging
+import re
+from pathlib import Path
+
+from nook.services.base.base_service import BaseService
+
+logger = logging.getLogger(__name__)
+
+_DAILY_MARKDOWN_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}\.md$")
+
+
+def find_unconverted(base_dir: Path) -> list[Path]:
+    """
+    対応するJSONがない日次Markdownファイルを日付順に返す。
+
+    Parameters
+    ----------
+    base_dir : Path
+        サービスのデータディレクトリ。
+
+    Returns
+    -------
+    list[Path]
+        変換対象のMarkdownファイル。
+    """
+    if not base_dir.exists():
+        return []
+    return sorted(
+        path
+        for path in base_dir.glob("*.md")
+        if _DAILY_MARKDOWN_PATTERN.match(path.name) and not path.with_suffix(".json").exists()
+    )
+
+
+async def convert_service(service: BaseService, *, dry_run: bool = False) -> list[Path]:
+    """
+    1サービス分の日次Markdownを日次JSONに変換する。
+
+    既にJSONがある日付は変更しない。レコードを1件も取り出せなかった
+    Markdownは警告を出してスキップする。
+
+    Parameters
+    ----------
+    service : BaseService
+        ``_parse_markdown`` を持つサービスのインスタンス。
+    dry_run : bool, default=False
+        True の場合は書き込まずに変換対象のみを返す。
+
+    Returns
+    -------
+    list[Path]
+        書き込んだ（dry_run の場合は書き込む予定の）JSONファイルのパス。
+    """
+    written: list[Path] = []
+    for md_path in find_unconverted(Path(service.storage.base_dir)):
+        records = service._parse_markdown(md_path.read_text(encoding="utf-8"))
+        if not records:
+            logger.warning(f"No records parsed from {md_path}; skipping")
+            continue
+        json_path = md_path.with_suffix(".json")
+        if not dry_run:
+            json_path = await service.storage.save(records, json_path.name)
+        written.append(json_path)
+    return written
+
+
+async def main():
+    """メイン実行関数"""
+    import argparse
+
+    from nook.services.runner.runner_impl import TRENDRADAR_SERVICES, ServiceRunner
+
+    runner = ServiceRunner()
+    # TrendRadar系は当初からJSONで保存しているため対象外
+    service_names = [name for name in runner.service_classes if name not in TRENDRADAR_SERVICES]
+
+    parser = argparse.ArgumentParser(description="Markdownのみの過去データを日次JSONに変換します")
+    parser.add_argument("--service", choices=["all", *service_names], default="all", help="変換するサービス")
+    parser.add_argument("--dry-run", action="store_true", help="書き込まずに変換対象を表示します")
+    args = parser.parse_args()
+
+    targets = service_names if args.service == "all" else [args.service]
+    for name in targets:
+        service = runner.service_classes[name]()
+        if not hasattr(service, "_parse_markdown"):
+            continue
+        paths = await convert_service(service, dry_run=args.dry_run)
+        for path in paths:
+            print(f"{'(dry-run) ' if args.dry_run else ''}{path}")
+        print(f"{name}: {len(paths)}件のJSONを{'作成予定' if args.dry_run else '作成しました'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
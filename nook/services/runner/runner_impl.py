@@ -4,17 +4,25 @@ Nookの各サービスを非同期で実行するスクリプト。
 """
 
 import asyncio
+import json
 import signal
 import sys
+import time
 import traceback
 import warnings
 from datetime import date, datetime
+from pathlib import Path
 from typing import Set
 
 from dotenv import load_dotenv
 
 from nook.core.clients.http_client import close_http_client
+from nook.core.config import BaseConfig
+from nook.core.content.publishing import publish_aggregates, publish_saved_aggregates
+from nook.core.errors.error_metrics import error_metrics
 from nook.core.logging import setup_logger
+from nook.core.metrics import metrics
+from nook.core.storage import LocalStorage
 from nook.core.utils.async_utils import AsyncTaskManager, gather_with_errors
 from nook.core.utils.date_utils import target_dates_set
 
@@ -28,10 +36,26 @@ warnings.filterwarnings(
 # 環境変数の読み込み
 load_dotenv(".env.production")
 
-logger = setup_logger("service_runner")
+logger = setup_logger("service_runner", log_dir=BaseConfig().LOG_DIR)
+
+COLLECTOR_RUNS = metrics.counter(
+    "nook_collector_runs_total", "Collector runs by service and status.", ("service", "status")
+)
+COLLECTOR_DURATION = metrics.histogram(
+    "nook_collector_run_duration_seconds",
+    "Duration of collector runs by service.",
+    ("service",),
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0),
+)
+COLLECTOR_ITEMS = metrics.counter(
+    "nook_collector_items_total", "Items saved by collectors (records in the saved daily JSON files).", ("service",)
+)
+COLLECTOR_LAST_SUCCESS = metrics.gauge(
+    "nook_collector_last_success_timestamp_seconds", "Unix time of the last successful run by service.", ("service",)
+)
 
 
-# TrendRadar系のサービス一覧（単一日実行のみ対応）
+# TrendRadar系のサービス一覧（過去日はTrendRadarの履歴から取得）
 TRENDRADAR_SERVICES = {
     "trendradar-zhihu",
     "trendradar-juejin",
@@ -133,25 +157,12 @@ class ServiceRunner:
         service,
         days: int = 1,
         target_dates: Set[date] | None = None,
-    ):
-        """同期サービスを非同期で実行"""
+    ) -> list[tuple[str, str]]:
+        """同期サービスを非同期で実行し、保存したファイルの一覧を返す"""
         # days パラメータを使用するサービスの場合、対象期間を表示
         effective_dates = target_dates or target_dates_set(days)
         sorted_dates = sorted(effective_dates)
 
-        # trendradar系サービスは単一日のみ対応のため、days/target_dates の整合性を厳密に検証する
-        # Note: Explorer.collect 内でも検証されるが、runner 側で早期に失敗させる
-        if service_name in TRENDRADAR_SERVICES:
-            if days != 1:
-                raise ValueError(
-                    f"{service_name} は単一日のみ対応しています。単一の日付を指定してください。指定された日数: {days}日"
-                )
-            if len(sorted_dates) > 1:
-                raise ValueError(
-                    f"{service_name} は単一日のみ対応しています。単一の日付を指定してください。"
-                    f"指定された日数: {len(sorted_dates)}日"
-                )
-
         logger.info("\n" + "━" * 60)
         if len(sorted_dates) <= 1:
             logger.info(f"📅 対象日: {sorted_dates[0] if sorted_dates else datetime.now().date()}")
@@ -163,6 +174,7 @@ class ServiceRunner:
         logger.info("━" * 60)
 
         saved_files: list[tuple[str, str]] = []
+        started = time.perf_counter()
         try:
             # サービスごとに異なるlimitパラメータを設定
             if service_name == "hacker_news":
@@ -183,7 +195,7 @@ class ServiceRunner:
                 saved_files = result if result else []
             else:
                 # その他のサービスはデフォルト値を使用
-                # trendradar系サービス は days の検証を service 側でも行う
+                # trendradar系サービスは days と target_dates の両方を受け取る
                 if service_name in TRENDRADAR_SERVICES:
                     result = await service.collect(days=days, target_dates=sorted_dates)
                 else:
@@ -202,8 +214,53 @@ class ServiceRunner:
                 logger.info(f"✨ 完了: 合計{total_articles}日分のデータを処理しました\n")
 
         except Exception as e:
+            COLLECTOR_RUNS.inc(service=service_name, status="failure")
+            error_metrics.record_error("collector_failure", {"error": str(e)}, service=service_name)
             logger.error(f"Error executing {service_name}: {e}\n{traceback.format_exc()}")
             raise
+        finally:
+            COLLECTOR_DURATION.observe(time.perf_counter() - started, service=service_name)
+
+        COLLECTOR_RUNS.inc(service=service_name, status="success")
+        COLLECTOR_LAST_SUCCESS.set_to_current_time(service=service_name)
+        if saved_files:
+            COLLECTOR_ITEMS.inc(await asyncio.to_thread(_count_saved_items, saved_files), service=service_name)
+        return saved_files
+
+    async def _publish_aggregates(self, saved_files: list[tuple[str, str]]) -> None:
+        """
+        保存された日付の全ソース・総合ランキングのAPIレスポンスを事前生成する。
+
+        ソースごとのレスポンスと検索インデックスは各サービスの保存時に更新される。
+        全ソースを読み込むこれらはサービスごとではなく実行の最後に1回だけ生成する
+        （失敗しても収集は成功扱い）。
+        """
+        if not saved_files:
+            return
+        try:
+            published = await publish_saved_aggregates(saved_files)
+        except Exception as e:
+            logger.warning(f"APIレスポンスの事前生成に失敗しました: {e}")
+            return
+        if published:
+            logger.info(f"📦 全ソース・総合ランキングのAPIレスポンスを事前生成しました: {len(published)}件")
+
+    async def publish_aggregates(self, days: int = 1) -> None:
+        """
+        対象日付の全ソース・総合ランキングのAPIレスポンスのみを事前生成する。
+
+        ``run_service`` は全ソースを読み込むこれらを生成しないため、サービスを
+        1つずつ別プロセスで実行するスクリプト（crawl_with_days.sh など）が
+        全サービスの実行後に1回だけ呼び出す（``--publish-aggregates``）。
+        """
+        target_dates = target_dates_set(days)
+        logger.info(f"Publishing aggregate payloads for {len(target_dates)} day(s)")
+        try:
+            published = await publish_aggregates(LocalStorage(BaseConfig().DATA_DIR), target_dates)
+        except Exception as e:
+            logger.error(f"APIレスポンスの事前生成に失敗しました: {e}", exc_info=True)
+            raise
+        logger.info(f"📦 全ソース・総合ランキングのAPIレスポンスを事前生成しました: {len(published)}件")
 
     async def run_all(self, days: int = 1) -> None:
         """すべてのサービスを並行実行"""
@@ -230,6 +287,8 @@ class ServiceRunner:
 
             results = await gather_with_errors(*service_tasks, task_names=list(self.sync_services.keys()))
 
+            await self._publish_aggregates([saved for r in results if r.success for saved in r.result or []])
+
             # 結果をレポート
             successful = sum(1 for r in results if r.success)
             failed = sum(1 for r in results if not r.success)
@@ -260,9 +319,15 @@ class ServiceRunner:
             self.running = False
             # HTTPクライアントをクリーンアップ
             await close_http_client()
+            export_metrics()
 
     async def run_service(self, service_name: str, days: int = 1) -> None:
-        """特定のサービスを実行"""
+        """
+        特定のサービスを実行
+
+        全ソース・総合ランキングのレスポンスは生成しない。複数のサービスを個別に
+        実行した後に :meth:`publish_aggregates` で1回だけ生成する。
+        """
         if service_name not in self.service_classes:
             raise ValueError(f"Service {service_name} not found")
 
@@ -286,6 +351,8 @@ class ServiceRunner:
         except Exception as e:
             logger.error(f"Service {service_name} failed: {e}", exc_info=True)
             raise
+        finally:
+            export_metrics()
 
     async def run_continuous(self, interval_seconds: int = 3600, days: int = 1) -> None:
         """定期的にサービスを実行"""
@@ -307,6 +374,47 @@ class ServiceRunner:
         self.running = False
 
 
+def _count_saved_items(saved_files: list[tuple[str, str]]) -> int:
+    """保存したJSONファイルのレコード数を合計する（読み込めないファイルは数えない）"""
+    total = 0
+    for json_path, _md_path in saved_files:
+        try:
+            records = json.loads(Path(json_path).read_text(encoding="utf-8"))
+        except (OSError, TypeError, ValueError):
+            continue
+        if isinstance(records, list):
+            total += len(records)
+    return total
+
+
+def export_metrics(path: str | None = None) -> Path | None:
+    """
+    メトリクスを textfile collector 用のファイルに書き出す。
+
+    収集処理だけを実行するプロセスは /metrics を公開しないため、実行のたびに
+    METRICS_TEXTFILE_PATH（node_exporter の --collector.textfile.directory 配下の
+    ``*.prom``）へ書き出す。未設定の場合は何もしない。
+
+    Parameters
+    ----------
+    path : str, optional
+        出力先。省略時は設定の METRICS_TEXTFILE_PATH。
+
+    Returns
+    -------
+    Path | None
+        書き出したファイルのパス。
+    """
+    try:
+        path = path or BaseConfig().METRICS_TEXTFILE_PATH
+        if not path:
+            return None
+        return metrics.write_textfile(path)
+    except Exception as e:
+        logger.warning(f"メトリクスの書き出しに失敗しました: {e}")
+        return None
+
+
 def run_service_sync(service_name: str):
     """特定のサービスを同期的に実行（後方互換性のため）"""
     runner = ServiceRunner()
@@ -358,6 +466,11 @@ async def main():
         default=1,
         help="何日前までの記事を取得するか（RSSフィードサービスのみ）",
     )
+    parser.add_argument(
+        "--publish-aggregates",
+        action="store_true",
+        help="サービスを実行せず、--days の日付の全ソース・総合ランキングのレスポンスのみ生成します",
+    )
 
     args = parser.parse_args()
 
@@ -373,7 +486,9 @@ async def main():
     signal.signal(signal.SIGTERM, signal_handler)
 
     try:
-        if args.continuous:
+        if args.publish_aggregates:
+            await runner.publish_aggregates(args.days)
+        elif args.continuous:
             await runner.run_continuous(args.interval, args.days)
         elif args.service == "all":
             await runner.run_all(args.days)
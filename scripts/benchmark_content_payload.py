@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""/api/content/all のJSON直列化時間と転送量を計測するスクリプト
+
+直列化は次の3通りを比較する。
+
+- json: model_dump() を標準の json で直列化（FastAPI の JSONResponse と同じ経路）
+- pydantic: model_dump_json()（コンテンツAPIが使う経路）
+- fast: model_dump() を nook.api.responses.dumps で直列化（orjson があれば orjson）
+
+転送量は Accept-Encoding を変えて実際にエンドポイントを呼び出し、
+圧縮ミドルウェアを通した Content-Length を比較する。
+
+使い方:
+    # 合成データ（日本語の要約付きの記事）で計測
+    python scripts/benchmark_content_payload.py --items 500
+
+    # 保存済みのデータで計測
+    python scripts/benchmark_content_payload.py --data-dir var/data --date 2024-01-01
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from nook.api.main import app  # noqa: E402
+from nook.api.middleware import compression  # noqa: E402
+from nook.api.models.schemas import ContentResponse  # noqa: E402
+from nook.api.responses import dumps, orjson  # noqa: E402
+from nook.api.routers import content  # noqa: E402
+from nook.core.storage import LocalStorage  # noqa: E402
+
+SYNTHETIC_DATE = "2024-01-01"
+SUMMARY = (
+    "本記事では、大規模言語モデルを用いた検索拡張生成の実装について解説している。"
+    "インデックスの構築方法、チャンク分割の粒度、再ランキングの効果を比較し、"
+    "社内ドキュメントを対象にした評価では回答の正確性が大きく向上したと報告している。"
+)
+
+
+def write_synthetic_data(base_dir: Path, items: int) -> None:
+    """Hacker Newsの形式で合成データを書き込む"""
+    service_dir = base_dir / "hacker_news"
+    service_dir.mkdir(parents=True, exist_ok=True)
+    stories = [
+        {
+            "title": f"記事 {i}: LLMとRAGの実践",
+            "summary": f"{SUMMARY}（{i}件目）",
+            "score": 1000 - i,
+            "url": f"https://example.com/articles/{i}",
+        }
+        for i in range(items)
+    ]
+    (service_dir / f"{SYNTHETIC_DATE}.json").write_text(json.dumps(stories, ensure_ascii=False), encoding="utf-8")
+
+
+def measure(func, repeat: int) -> float:
+    """関数を repeat 回実行し、中央値（ミリ秒）を返す"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def wire_bytes(client: TestClient, url: str, accept_encoding: str) -> tuple[int, str]:
+    """エンドポイントを呼び出し、転送されたバイト数と Content-Encoding を返す"""
+    response = client.get(url, headers={"Accept-Encoding": accept_encoding})
+    response.raise_for_status()
+    return response.num_bytes_downloaded, response.headers.get("Content-Encoding", "identity")
+
+
+def run(date: str, repeat: int) -> None:
+    client = TestClient(app)
+    url = f"/api/content/all?date={date}"
+    identity = client.get(url, headers={"Accept-Encoding": "identity"})
+    identity.raise_for_status()
+    document = ContentResponse.model_validate_json(identity.content)
+    print(f"items: {len(document.items)}, payload: {len(identity.content):,} bytes")
+
+    print("\n[serialization] median of", repeat, "runs")
+    results = {
+        "json": measure(lambda: json.dumps(document.model_dump(), ensure_ascii=False).encode("utf-8"), repeat),
+        "pydantic": measure(lambda: document.model_dump_json().encode("utf-8"), repeat),
+        "fast": measure(lambda: dumps(document.model_dump()), repeat),
+    }
+    for name, elapsed in results.items():
+        print(f"  {name:<9} {elapsed:8.3f} ms")
+    print(f"  (fast uses {'orjson' if orjson is not None else 'json (orjson is not installed)'})")
+
+    print("\n[bytes on wire]")
+    for accept in ("identity", "gzip", "br, gzip"):
+        size, encoding = wire_bytes(client, url, accept)
+        print(f"  Accept-Encoding: {accept:<9} -> {size:>10,} bytes ({encoding})")
+    body = identity.content
+    print(
+        f"  gzip: {measure(lambda: compression.compress(body, 'gzip'), repeat):.3f} ms to compress"
+        + (
+            f", br: {measure(lambda: compression.compress(body, 'br'), repeat):.3f} ms"
+            if compression.brotli is not None
+            else " (brotli is not installed)"
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", help="保存済みデータのディレクトリ（省略時は合成データ）")
+    parser.add_argument("--date", default=SYNTHETIC_DATE, help="計測する日付（YYYY-MM-DD）")
+    parser.add_argument("--items", type=int, default=500, help="合成データの記事数")
+    parser.add_argument("--repeat", type=int, default=50, help="直列化の計測回数")
+    args = parser.parse_args()
+
+    if args.data_dir:
+        content.storage = LocalStorage(args.data_dir)
+        run(args.date, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_synthetic_data(Path(tmp), args.items)
+        content.storage = LocalStorage(tmp)
+        run(SYNTHETIC_DATE, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -186,6 +186,18 @@ main() {
         "trendradar-freebuf" \
         "trendradar-v2ex" \
     || ((total_failed+=$?))
+
+    # ==========================================================================
+    # 全ソース・総合ランキングのレスポンス（全サービスの実行後に1回だけ生成）
+    # ==========================================================================
+    local aggregates_log="${LOG_DIR}/aggregates_${TIMESTAMP}.log"
+    log_info "開始: 全ソース・総合ランキングのレスポンス生成"
+    if uv run python -m nook.services.runner.run_services --publish-aggregates > "$aggregates_log" 2>&1; then
+        log_success "完了: 全ソース・総合ランキングのレスポンス生成"
+    else
+        log_error "失敗: 全ソース・総合ランキングのレスポンス生成 (ログ: ${aggregates_log})"
+        total_failed=$((total_failed + 1))
+    fi
     
     # 完了サマリー
     local end_time=$(date +%s)
@@ -268,6 +268,10 @@ execute_services() {
         done
         wait
     fi
+
+    # 全ソース・総合ランキングのレスポンスは全サービスの実行後に1回だけ生成する
+    log "Publishing aggregate payloads..."
+    python -m nook.services.runner.run_services --publish-aggregates
     
     # 仮想環境を非アクティブ化
     deactivate
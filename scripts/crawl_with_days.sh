@@ -45,6 +45,18 @@ run_service() {
     fi
 }
 
+# 全ソース・総合ランキングのレスポンスは全サービスの実行後に1回だけ生成する
+publish_aggregates() {
+    local cmd=(python -m nook.services.runner.run_services --publish-aggregates --days "$DAYS")
+
+    log "Publishing aggregate payloads..."
+    if [ "$DRY_RUN" = true ]; then
+        echo "DRY-RUN: ${cmd[*]}"
+    else
+        "${cmd[@]}"
+    fi
+}
+
 run_batch() {
     local batch_label="$1"
     shift
@@ -147,24 +159,42 @@ if [ ${#SERVICE_ARRAY[@]} -gt 0 ]; then
         wait
     fi
 else
-    run_batch "Starting batch 1/3..." \
+    run_batch "Starting batch 1/5..." \
         hacker_news \
         github_trending \
         reddit
 
-    run_batch "Starting batch 2/3..." \
+    run_batch "Starting batch 2/5..." \
         tech_news \
         business_news \
         arxiv \
         zenn
 
-    run_batch "Starting batch 3/3..." \
+    run_batch "Starting batch 3/5..." \
         qiita \
         note \
         4chan \
         5chan
+
+    run_batch "Starting batch 4/5 (TrendRadar)..." \
+        trendradar-zhihu \
+        trendradar-weibo \
+        trendradar-toutiao \
+        trendradar-36kr \
+        trendradar-wallstreetcn \
+        trendradar-tencent
+
+    run_batch "Starting batch 5/5 (TrendRadar)..." \
+        trendradar-juejin \
+        trendradar-ithome \
+        trendradar-sspai \
+        trendradar-producthunt \
+        trendradar-freebuf \
+        trendradar-v2ex
 fi
 
+publish_aggregates
+
 log "All services completed"
 
 deactivate_environment
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import json
 import sys
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
@@ -12,7 +14,25 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from nook.api.main import app  # noqa: E402
+from nook.api.middleware.rate_limit import RequestRateLimiter  # noqa: E402
 from nook.api.routers import chat as chat_module  # noqa: E402
+from nook.api.routers import content as content_module  # noqa: E402
+from nook.core.content.indexing import sync_search_index  # noqa: E402
+from nook.core.storage import LocalStorage  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Reset the app-wide chat client so each test constructs its own (patched) GPTClient."""
+
+    monkeypatch.setattr(app.state, "chat_client", None, raising=False)
+
+
+@pytest.fixture(autouse=True)
+def _isolate_archive(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Point archive retrieval at a temporary data directory so tests never touch var/data."""
+
+    monkeypatch.setattr(content_module, "storage", LocalStorage(str(tmp_path)))
 
 
 def _make_client() -> TestClient:
@@ -92,15 +112,18 @@ def test_chat_calls_gptclient_with_expected_arguments(
 
     class DummyGPTClient:
         def __init__(self, api_key: str):
+            self.api_key = api_key
             calls["api_key"] = api_key
 
-        def chat(
+        async def chat_async(
             self,
             messages: list[dict[str, str]],
             system: str,
             temperature: float,
             max_tokens: int,
+            service_name: str | None = None,
         ) -> str:
+            calls["service_name"] = service_name
             calls["messages"] = messages
             calls["system"] = system
             calls["temperature"] = temperature
@@ -123,6 +146,50 @@ def test_chat_calls_gptclient_with_expected_arguments(
     assert "Context" in calls["system"]
     assert calls["temperature"] == 0.7
     assert calls["max_tokens"] == 1000
+    assert calls["service_name"] == "api"
+
+
+def test_chat_charges_daily_quota_and_rejects_when_exhausted(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test chat token usage is charged to the client's daily quota.
+
+    Args:
+        monkeypatch: Pytest monkeypatch fixture.
+
+    Returns:
+        None
+
+    Raises:
+        AssertionError: If usage is not recorded or the quota is not enforced.
+    """
+
+    # Given: A rate limiter with a small daily chat quota shared by the router and middleware
+    limiter = RequestRateLimiter(rules=[], chat_daily_tokens=20)
+    monkeypatch.setattr(chat_module, "rate_limiter", limiter)
+    monkeypatch.setattr("nook.api.middleware.rate_limit.rate_limiter", limiter)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+    class DummyGPTClient:
+        def __init__(self, api_key: str):
+            self.api_key = api_key
+
+        async def chat_async(self, messages, system, temperature, max_tokens, service_name=None) -> str:
+            return "dummy-response"
+
+    monkeypatch.setattr(chat_module, "GPTClient", DummyGPTClient)
+    client = _make_client()
+    payload = _base_payload()
+
+    # When: Sending a chat request and then another one
+    first = client.post("/api/chat", json=payload)
+    second = client.post("/api/chat", json=payload)
+
+    # Then: The first request consumes the quota and the second is rejected with 429
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.json()["error"]["type"] == "quota_exceeded"
+    assert "Retry-After" in second.headers
 
 
 def test_chat_returns_500_when_gptclient_raises(
@@ -146,9 +213,9 @@ def test_chat_returns_500_when_gptclient_raises(
 
     class FailingClient:
         def __init__(self, api_key: str) -> None:
-            _ = api_key
+            self.api_key = api_key
 
-        def chat(self, *args: Any, **kwargs: Any) -> str:
+        async def chat_async(self, *args: Any, **kwargs: Any) -> str:
             raise RuntimeError("boom")
 
     monkeypatch.setattr(chat_module, "GPTClient", FailingClient)
@@ -160,3 +227,167 @@ def test_chat_returns_500_when_gptclient_raises(
     assert resp.status_code == 500
     data = resp.json()
     assert "チャットリクエストの処理中にエラーが発生しました" in data["detail"]
+
+
+def test_chat_injects_archive_passages_with_citations(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test chat endpoint retrieves related archive articles and returns them as citations.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+        monkeypatch: Pytest monkeypatch fixture.
+
+    Returns:
+        None
+
+    Raises:
+        AssertionError: If archive passages are not injected into the system prompt.
+    """
+
+    # Given: Archive containing a related story for today and a patched GPT client
+    client = _make_client()
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(content_module, "storage", LocalStorage(str(tmp_path)))
+    service_dir = tmp_path / "hacker_news"
+    service_dir.mkdir()
+    stories = [
+        {"title": "Rust compiler release", "summary": "borrow checker improvements", "score": 10, "url": "u1"},
+        {"title": "Gardening tips", "summary": "tomatoes", "score": 5, "url": "u2"},
+    ]
+    (service_dir / f"{datetime.now().strftime('%Y-%m-%d')}.json").write_text(json.dumps(stories), encoding="utf-8")
+    sync_search_index(tmp_path)
+
+    calls: dict[str, Any] = {}
+
+    class DummyGPTClient:
+        def __init__(self, api_key: str):
+            self.api_key = api_key
+
+        async def chat_async(
+            self,
+            messages: list[dict[str, str]],
+            system: str,
+            temperature: float,
+            max_tokens: int,
+            service_name: str | None = None,
+        ) -> str:
+            calls["system"] = system
+            return "answer [1]"
+
+    monkeypatch.setattr(chat_module, "GPTClient", DummyGPTClient)
+    payload = {**_base_payload(), "message": "What happened with the Rust compiler?"}
+
+    # When: Posting chat requests with archive retrieval enabled and with the default (disabled)
+    resp = client.post("/api/chat", json={**payload, "use_archive": True})
+    system_with_archive = calls["system"]
+    without = client.post("/api/chat", json=payload)
+
+    # Then: Related story is cited and injected into the system prompt
+    assert resp.status_code == 200
+    citations = resp.json()["citations"]
+    assert [(c["index"], c["title"], c["url"]) for c in citations] == [(1, "Rust compiler release", "u1")]
+    assert "[1] Rust compiler release" in system_with_archive
+    assert "Gardening" not in system_with_archive
+    assert without.json()["citations"] == []
+    assert "[1]" not in calls["system"]
+
+
+class _StreamingGPTClient:
+    """GPT client double that streams fixed tokens and records construction and closing."""
+
+    instances: list[_StreamingGPTClient] = []
+
+    def __init__(self, api_key: str) -> None:
+        self.api_key = api_key
+        self.stream_closed = False
+        self.closed = False
+        _StreamingGPTClient.instances.append(self)
+
+    async def stream_chat(self, *args: Any, **kwargs: Any):
+        try:
+            for text in ("Hel", "lo"):
+                yield text
+        finally:
+            self.stream_closed = True
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def _parse_sse(body: str) -> list[tuple[str, Any]]:
+    """Parse a Server-Sent Events body into (event, data) pairs."""
+
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_chat_stream_emits_sse_events_and_shares_lifespan_client(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test streaming chat emits citations/delta/done events using one client created at startup.
+
+    Args:
+        monkeypatch: Pytest monkeypatch fixture.
+
+    Returns:
+        None
+
+    Raises:
+        AssertionError: If events or client lifecycle differ from expectations.
+    """
+
+    # Given: Streaming GPT client double and an app started with its lifespan
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(chat_module, "GPTClient", _StreamingGPTClient)
+    monkeypatch.setattr(_StreamingGPTClient, "instances", [])
+    payload = _base_payload()
+
+    # When: Posting two streaming chat requests within the application lifespan
+    with TestClient(app) as client:
+        first = client.post("/api/chat/stream", json=payload)
+        second = client.post("/api/chat/stream", json=payload)
+
+    # Then: Tokens arrive as SSE events and a single shared client is closed on shutdown
+    assert first.status_code == 200
+    assert first.headers["content-type"].startswith("text/event-stream")
+    assert _parse_sse(first.text) == [
+        ("citations", []),
+        ("delta", {"text": "Hel"}),
+        ("delta", {"text": "lo"}),
+        ("done", {}),
+    ]
+    assert second.text == first.text
+    assert len(_StreamingGPTClient.instances) == 1
+    assert _StreamingGPTClient.instances[0].closed is True
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_stops_generation_when_client_disconnects() -> None:
+    """Test the stream closes the upstream generation once the HTTP client has disconnected.
+
+    Returns:
+        None
+
+    Raises:
+        AssertionError: If generation continues after disconnect.
+    """
+
+    # Given: A request that reports a disconnect before the first token is sent
+    class DisconnectedRequest:
+        async def is_disconnected(self) -> bool:
+            return True
+
+    gpt_client = _StreamingGPTClient("test-key")
+    request = chat_module.ChatRequest(topic_id="t", message="hi")
+
+    # When: Consuming the event stream
+    events = [event async for event in chat_module._stream_events(request, gpt_client, DisconnectedRequest())]
+
+    # Then: Only the citations event is sent and the upstream stream is closed
+    assert [event.split(b"\n", 1)[0] for event in events] == [b"event: citations"]
+    assert gpt_client.stream_closed is True
@@ -0,0 +1,149 @@
+"""レスポンス圧縮ミドルウェアのテスト。"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import zlib
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from nook.api.middleware import compression as compression_module
+from nook.api.middleware.compression import CompressionMiddleware, accepted_encodings, negotiate_encoding
+from nook.api.responses import FastJSONResponse, dumps
+
+LARGE_BODY = {"items": [{"title": f"記事{i}", "summary": "日本語の要約がここに入ります。" * 10} for i in range(50)]}
+
+
+@pytest.fixture
+def client() -> TestClient:
+    """圧縮ミドルウェアを追加したテストクライアント。"""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large", response_class=FastJSONResponse)
+    async def large():
+        return LARGE_BODY
+
+    @app.get("/tagged")
+    async def tagged():
+        return Response(content=dumps(LARGE_BODY), media_type="application/json", headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small():
+        return {"status": "ok"}
+
+    @app.get("/encoded")
+    async def encoded():
+        body = gzip.compress(dumps(LARGE_BODY))
+        return Response(content=body, media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/events")
+    async def events():
+        async def generate():
+            yield b"event: delta\ndata: {}\n\n" * 20
+            yield b"event: done\ndata: {}\n\n"
+
+        return StreamingResponse(generate(), media_type="text/event-stream")
+
+    @app.get("/ndjson")
+    async def ndjson():
+        async def generate():
+            for item in LARGE_BODY["items"]:
+                yield dumps(item) + b"\n"
+
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+    return TestClient(app)
+
+
+def test_accepted_encodings_respects_quality() -> None:
+    """q=0 のエンコーディングは受け入れないものとして扱う。"""
+    assert accepted_encodings("gzip;q=0, br;q=0.5, identity") == {"br", "identity"}
+    assert accepted_encodings(None) == set()
+
+
+def test_negotiate_encoding_prefers_brotli_when_available(monkeypatch: pytest.MonkeyPatch) -> None:
+    """brotli が使える場合は優先し、使えない場合は gzip にする。"""
+    monkeypatch.setattr(compression_module, "brotli", object())
+    assert negotiate_encoding("gzip, br") == "br"
+
+    monkeypatch.setattr(compression_module, "brotli", None)
+    assert negotiate_encoding("gzip, br") == "gzip"
+    assert negotiate_encoding("br") is None
+    assert negotiate_encoding("identity") is None
+
+
+def test_large_json_is_gzipped(client: TestClient) -> None:
+    """しきい値以上のJSONは gzip で圧縮し、Vary を付ける。"""
+    resp = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert int(resp.headers["Content-Length"]) < len(dumps(LARGE_BODY)) // 5
+    assert resp.json() == LARGE_BODY
+
+
+def test_identity_and_small_responses_are_not_compressed(client: TestClient) -> None:
+    """圧縮を受け入れないクライアントと小さいレスポンスはそのまま返す。"""
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in identity.headers
+    assert identity.json() == LARGE_BODY
+    assert "Content-Encoding" not in small.headers
+    assert small.json() == {"status": "ok"}
+
+
+def test_compressed_response_weakens_etag(client: TestClient) -> None:
+    """圧縮したレスポンスの強いETagは弱いETagにする。"""
+    resp = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["ETag"] == 'W/"abc"'
+
+
+def test_already_encoded_response_is_untouched(client: TestClient) -> None:
+    """既に Content-Encoding が付いたレスポンスは二重に圧縮しない。"""
+    resp = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.json() == LARGE_BODY
+
+
+def test_event_stream_is_passed_through(client: TestClient) -> None:
+    """SSE はバッファリング・圧縮しない。"""
+    events = client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in events.headers
+    assert events.text.endswith("event: done\ndata: {}\n\n")
+
+
+def test_streaming_response_is_compressed_per_chunk(client: TestClient) -> None:
+    """ストリーミングレスポンスは全体を溜め込まず、分割ごとに圧縮して送る。"""
+    ndjson = client.get("/ndjson", headers={"Accept-Encoding": "gzip"})
+
+    assert ndjson.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in ndjson.headers
+    assert [json.loads(line) for line in ndjson.text.splitlines()] == LARGE_BODY["items"]
+
+
+def test_stream_encoder_flushes_each_chunk() -> None:
+    """StreamEncoder は分割ごとに単独で展開できる出力を返す。"""
+    encoder = compression_module.StreamEncoder("gzip")
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    first = encoder.compress(b"first chunk\n", final=False)
+    assert decompressor.decompress(first) == b"first chunk\n"
+    last = encoder.compress(b"last chunk\n", final=True)
+    assert decompressor.decompress(last) == b"last chunk\n"
+    assert decompressor.eof
+
+
+def test_dumps_is_compact_and_keeps_non_ascii() -> None:
+    """dumps は空白を含まず、非ASCII文字をエスケープしない。"""
+    assert dumps({"title": "日本語", "n": [1, 2]}) == '{"title":"日本語","n":[1,2]}'.encode()
@@ -0,0 +1,173 @@
+"""新着コンテンツ通知（SSE）のテスト。"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from nook.api import content_events
+from nook.api.content_events import ContentEventBroker, ContentUpdate, apply_changes
+from nook.api.main import app
+from nook.api.routers import content as content_module
+from nook.api.routers import events as events_module
+from nook.core.config import BaseConfig
+from nook.core.content.cache import ContentCache, build_payload
+from nook.core.content.sources import RANKED_DIR_NAME
+from nook.core.storage import LocalStorage
+from nook.core.storage.watcher import StorageChange
+
+
+class _FakeRequest:
+    """切断されないリクエスト。"""
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def _patch_storage_to_tmp(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> LocalStorage:
+    """コンテンツルーターのストレージを一時ディレクトリに差し替える。"""
+    storage = LocalStorage(str(tmp_path))
+    monkeypatch.setattr(content_module, "storage", storage)
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_broker_publishes_to_all_subscribers():
+    """更新イベントはすべての購読者に届き、購読を終了すると届かない。"""
+    broker = ContentEventBroker()
+    first, second = broker.subscribe(), broker.subscribe()
+    update = ContentUpdate(source="hacker-news", date="2024-01-01", revision=3)
+
+    broker.publish(update)
+    broker.unsubscribe(second)
+    broker.publish(update)
+
+    assert broker.subscriber_count == 1
+    assert [first.get_nowait(), first.get_nowait()] == [update, update]
+    assert second.get_nowait() == update
+    assert second.empty()
+
+
+@pytest.mark.asyncio
+async def test_broker_signals_reset_when_subscriber_falls_behind():
+    """キューが一杯になった購読者には溜まったイベントを捨てて再同期の通知を送る。"""
+    broker = ContentEventBroker(queue_size=2)
+    queue = broker.subscribe()
+
+    for revision in range(3):
+        broker.publish(ContentUpdate(source="arxiv", date="2024-01-01", revision=revision))
+
+    assert queue.get_nowait() is None
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_invalidates_cache_and_maps_directories(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """変更されたソース・日付のキャッシュを破棄し、ディレクトリ名をソース名に変換する。"""
+    _patch_storage_to_tmp(tmp_path, monkeypatch)
+    monkeypatch.setattr(content_module, "content_cache", ContentCache())
+    cache = content_module.content_cache
+    base = str(tmp_path)
+    payload = build_payload(b"{}", ())
+    cache.put((base, "content", "hacker-news", "2024-01-01"), payload)
+    cache.put((base, "content", "all", "2024-01-01"), payload)
+    cache.put((base, "content", "arxiv", "2024-01-01"), payload)
+    cache.put((base, "content", "hacker-news", "2024-01-02"), payload)
+
+    updates = await apply_changes(
+        {
+            StorageChange("hacker_news", "2024-01-01"),
+            StorageChange(RANKED_DIR_NAME, "2024-01-01"),
+            StorageChange("unknown_service", "2024-01-01"),
+        }
+    )
+
+    assert sorted((update.source, update.date) for update in updates) == [
+        ("hacker-news", "2024-01-01"),
+        ("top", "2024-01-01"),
+    ]
+    assert cache.get((base, "content", "hacker-news", "2024-01-01"), ()) is None
+    assert cache.get((base, "content", "all", "2024-01-01"), ()) is None
+    assert cache.get((base, "content", "arxiv", "2024-01-01"), ()) is not None
+    assert cache.get((base, "content", "hacker-news", "2024-01-02"), ()) is not None
+
+
+@pytest.mark.asyncio
+async def test_event_stream_sends_ready_updates_and_reset(monkeypatch: pytest.MonkeyPatch):
+    """ready の後に購読中のソースの update と再同期の reset を送る。"""
+    broker = ContentEventBroker()
+    monkeypatch.setattr(events_module, "broker", broker)
+    stream = events_module._update_events(_FakeRequest(), {"arxiv"})
+
+    assert (await anext(stream)).startswith(b"retry: ")
+    assert b"event: ready" in await anext(stream)
+
+    pending = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+    broker.publish(ContentUpdate(source="hacker-news", date="2024-01-01", revision=1))
+    broker.publish(ContentUpdate(source="arxiv", date="2024-01-01", revision=2))
+    message = (await pending).decode()
+    assert message.startswith("id: 2\nevent: update\n")
+    assert json.loads(message.split("data: ", 1)[1]) == {"source": "arxiv", "date": "2024-01-01", "revision": 2}
+
+    for queue in list(broker._subscribers):
+        queue.put_nowait(None)
+    assert b"event: reset" in await anext(stream)
+
+    await stream.aclose()
+    assert broker.subscriber_count == 0
+
+
+@pytest.mark.asyncio
+async def test_event_stream_sends_keepalive(monkeypatch: pytest.MonkeyPatch):
+    """イベントがない間は keepalive のコメントを送る。"""
+    monkeypatch.setattr(events_module, "broker", ContentEventBroker())
+    monkeypatch.setattr(events_module, "HEARTBEAT_INTERVAL", 0.01)
+    stream = events_module._update_events(_FakeRequest(), None)
+    await anext(stream)
+    await anext(stream)
+
+    assert await anext(stream) == b": keepalive\n\n"
+    await stream.aclose()
+
+
+def test_events_endpoint_rejects_unknown_source():
+    """未知のソースの購読は 404 を返す。"""
+    client = TestClient(app)
+
+    resp = client.get("/api/events?sources=unknown-source")
+
+    assert resp.status_code == 404
+
+
+def test_content_watch_is_disabled_by_config():
+    """CONTENT_WATCH_ENABLED=false の場合は監視を作成しない。"""
+    assert content_events.ContentWatch.from_config(BaseConfig(CONTENT_WATCH_ENABLED=False)) is None
+    watch = content_events.ContentWatch.from_config(BaseConfig(CONTENT_WATCH_ENABLED=True))
+    assert watch is not None
+    assert watch.broker is content_events.broker
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_refreshes_ranking_only_when_asked(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """監視を担当しないワーカー（refresh_ranking=False）は保存済みの総合ランキングを計算し直さない。"""
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    (storage.base_dir / RANKED_DIR_NAME).mkdir()
+    (storage.base_dir / RANKED_DIR_NAME / "2024-01-01.json").write_text("[]", encoding="utf-8")
+    refreshed: list[str] = []
+
+    async def fake_publish_ranking(_storage: LocalStorage, target_date) -> None:
+        refreshed.append(target_date.strftime("%Y-%m-%d"))
+
+    monkeypatch.setattr(content_events, "publish_ranking", fake_publish_ranking)
+    changes = {StorageChange("hacker_news", "2024-01-01")}
+
+    await apply_changes(changes, refresh_ranking=False)
+    assert refreshed == []
+
+    await apply_changes(changes)
+    assert refreshed == ["2024-01-01"]
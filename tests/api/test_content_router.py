@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import base64
 import json
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -15,6 +18,12 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from nook.api.main import app  # noqa: E402
 from nook.api.routers import content as content_module  # noqa: E402
+from nook.core.content import builder, publishing  # noqa: E402
+from nook.core.content.sources import (  # noqa: E402
+    PUBLISHED_DIR_NAME,
+    PUBLISHED_STRUCTURED_DIR_NAME,
+    RANKED_DIR_NAME,
+)
 from nook.core.storage import LocalStorage  # noqa: E402
 
 
@@ -116,6 +125,41 @@ def test_get_content_arxiv_converts_paper_summary_titles(tmp_path: Path, monkeyp
     assert item["title"].startswith("arxiv - ")
 
 
+def test_get_content_builds_markdown_sources_from_json(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test markdown-backed sources return per-record items from the daily JSON, reading markdown only for legacy days."""
+
+    # Given
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    service_dir = storage.base_dir / "tech_feed"
+    service_dir.mkdir(parents=True, exist_ok=True)
+    articles = [
+        {"title": "First", "url": "https://example.com/1", "summary": "要約1", "category": "tech_blogs"},
+        {"title": "Second", "url": "https://example.com/2", "summary": "要約2", "category": "hatena"},
+    ]
+    (service_dir / "2024-01-01.json").write_text(json.dumps(articles, ensure_ascii=False), encoding="utf-8")
+    (service_dir / "2024-01-01.md").write_text("# rendered markdown", encoding="utf-8")
+    (service_dir / "2024-01-02.md").write_text("# legacy markdown only", encoding="utf-8")
+
+    def fail_load_markdown(*args: Any, **kwargs: Any) -> str | None:
+        raise AssertionError("markdown should not be read when the JSON exists")
+
+    # When
+    with monkeypatch.context() as patched:
+        patched.setattr(storage, "load_markdown", fail_load_markdown)
+        resp = client.get("/api/content/tech-news?date=2024-01-01")
+    legacy = client.get("/api/content/tech-news?date=2024-01-02")
+
+    # Then
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert [(item["title"], item["url"], item["content"], item["category"]) for item in items] == [
+        ("First", "https://example.com/1", "要約1", "tech_blogs"),
+        ("Second", "https://example.com/2", "要約2", "hatena"),
+    ]
+    assert [item["content"] for item in legacy.json()["items"]] == ["# legacy markdown only"]
+
+
 def test_get_content_all_aggregates_multiple_sources(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Test all endpoint aggregates from hacker-news and github sources."""
 
@@ -179,9 +223,10 @@ def test_get_content_response_headers(tmp_path: Path, monkeypatch: pytest.Monkey
 
     resp = client.get(f"/api/content/hacker-news?date={date_str}")
     assert resp.status_code == 200
-    assert resp.headers["Cache-Control"] == "no-store, no-cache, must-revalidate, max-age=0"
-    assert resp.headers["Pragma"] == "no-cache"
-    assert resp.headers["Expires"] == "0"
+    # 過去日は確定済みのため長めにキャッシュさせる
+    assert resp.headers["Cache-Control"] == content_module.PAST_DATE_CACHE_CONTROL
+    assert resp.headers["ETag"].startswith('"')
+    assert "Last-Modified" in resp.headers
 
 
 def test_get_content_fallback_to_latest_date(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -287,3 +332,619 @@ def test_get_content_trendradar_sorts_by_popularity(tmp_path: Path, monkeypatch:
     assert items[0]["title"] == "High"  # 9000
     assert items[1]["title"] == "Mid"  # 5000
     assert items[2]["title"] == "Low"  # 100
+
+
+def test_get_content_returns_304_for_matching_etag(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test If-None-Match with the current ETag returns 304 without a body."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+
+    date_str = "2024-01-01"
+    service_dir = storage.base_dir / "github_trending"
+    service_dir.mkdir(parents=True, exist_ok=True)
+    (service_dir / f"{date_str}.md").write_text("content", encoding="utf-8")
+
+    first = client.get(f"/api/content/github?date={date_str}")
+    etag = first.headers["ETag"]
+
+    resp = client.get(f"/api/content/github?date={date_str}", headers={"If-None-Match": f'W/{etag}, "other"'})
+
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["ETag"] == etag
+
+
+def test_get_content_cache_invalidated_when_file_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test cached payload is reused until the source file changes."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    monkeypatch.setattr(content_module, "content_cache", content_module.ContentCache(max_entries=8))
+
+    date_str = "2024-01-01"
+    service_dir = storage.base_dir / "github_trending"
+    service_dir.mkdir(parents=True, exist_ok=True)
+    md_path = service_dir / f"{date_str}.md"
+    md_path.write_text("before", encoding="utf-8")
+
+    first = client.get(f"/api/content/github?date={date_str}")
+    client.get(f"/api/content/github?date={date_str}")
+    assert content_module.content_cache.hits == 1
+
+    md_path.write_text("after update", encoding="utf-8")
+    resp = client.get(f"/api/content/github?date={date_str}", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert resp.status_code == 200
+    assert resp.json()["items"][0]["content"] == "after update"
+    assert resp.headers["ETag"] != first.headers["ETag"]
+
+
+def test_get_content_today_uses_short_revalidation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test today's content and date-less requests are only cached briefly."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    service_dir = storage.base_dir / "github_trending"
+    service_dir.mkdir(parents=True, exist_ok=True)
+    (service_dir / f"{date_str}.md").write_text("content", encoding="utf-8")
+
+    explicit = client.get(f"/api/content/github?date={date_str}")
+    implicit = client.get("/api/content/github")
+
+    assert explicit.headers["Cache-Control"] == content_module.RECENT_CACHE_CONTROL
+    assert implicit.headers["Cache-Control"] == content_module.RECENT_CACHE_CONTROL
+    assert implicit.headers["ETag"] == explicit.headers["ETag"]
+
+
+def test_get_content_all_reports_per_source_status(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test all endpoint returns partial results and per-source status when a source fails."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+
+    date_str = "2024-01-01"
+    github_dir = storage.base_dir / "github_trending"
+    github_dir.mkdir(parents=True, exist_ok=True)
+    (github_dir / f"{date_str}.md").write_text("content", encoding="utf-8")
+    hn_dir = storage.base_dir / "hacker_news"
+    hn_dir.mkdir(parents=True, exist_ok=True)
+    (hn_dir / f"{date_str}.json").write_text("{broken", encoding="utf-8")
+
+    resp = client.get(f"/api/content/all?date={date_str}")
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [item["source"] for item in data["items"]] == ["github"]
+    statuses = {status["source"]: status for status in data["sources"]}
+    assert len(statuses) == len(content_module.SOURCE_MAPPING)
+    assert statuses["github"]["status"] == "ok"
+    assert statuses["github"]["item_count"] == 1
+    assert statuses["hacker-news"]["status"] == "error"
+    assert statuses["reddit"]["status"] == "empty"
+    assert all(status["elapsed_ms"] >= 0 for status in data["sources"])
+
+    # 部分的な結果はキャッシュせず、修復後の再取得で反映される
+    (hn_dir / f"{date_str}.json").write_text(json.dumps([{"title": "HN", "score": 1}]), encoding="utf-8")
+    resp = client.get(f"/api/content/all?date={date_str}")
+    assert {item["source"] for item in resp.json()["items"]} == {"github", "hacker-news"}
+
+
+def test_get_content_loads_files_off_event_loop(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test storage reads run on the content I/O thread pool instead of the event loop."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+
+    date_str = "2024-01-01"
+    service_dir = storage.base_dir / "github_trending"
+    service_dir.mkdir(parents=True, exist_ok=True)
+    (service_dir / f"{date_str}.md").write_text("content", encoding="utf-8")
+
+    thread_names: list[str] = []
+    original = storage.load_markdown
+
+    def recording_load_markdown(service_name: str, date: datetime | None = None) -> str | None:
+        thread_names.append(threading.current_thread().name)
+        return original(service_name, date)
+
+    monkeypatch.setattr(storage, "load_markdown", recording_load_markdown)
+
+    resp = client.get(f"/api/content/github?date={date_str}")
+
+    assert resp.status_code == 200
+    assert "sources" not in resp.json()
+    assert thread_names
+    assert all(name.startswith("content-io") for name in thread_names)
+
+
+def test_publish_content_serves_materialized_payload(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test published payloads are served without rebuilding items, including precompressed bodies."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    monkeypatch.setattr(content_module, "content_cache", content_module.ContentCache(max_entries=8))
+
+    date_str = "2024-01-01"
+    service_dir = storage.base_dir / "hacker_news"
+    service_dir.mkdir(parents=True, exist_ok=True)
+    json_path = service_dir / f"{date_str}.json"
+    json_path.write_text(json.dumps([{"title": "Top", "summary": "s", "score": 10}]), encoding="utf-8")
+
+    saved_files = [(str(json_path), str(service_dir / "x.md"))]
+    written = asyncio.run(publishing.publish_saved_files(saved_files))
+    written += asyncio.run(publishing.publish_saved_aggregates(saved_files))
+
+    published_dir = storage.base_dir / PUBLISHED_DIR_NAME
+    structured_dir = storage.base_dir / PUBLISHED_STRUCTURED_DIR_NAME
+    assert written == [
+        published_dir / "hacker-news" / f"{date_str}.json",
+        structured_dir / "hacker-news" / f"{date_str}.json",
+        published_dir / "all" / f"{date_str}.json",
+        structured_dir / "all" / f"{date_str}.json",
+        published_dir / "top" / f"{date_str}.json",
+        structured_dir / "top" / f"{date_str}.json",
+    ]
+
+    def fail_build(*args: Any, **kwargs: Any) -> list[Any]:
+        raise AssertionError("items should not be rebuilt")
+
+    monkeypatch.setattr(builder, "build_source_items", fail_build)
+
+    resp = client.get(f"/api/content/hacker-news?date={date_str}", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert resp.json()["items"][0]["title"] == "Top"
+
+    identity = client.get(f"/api/content/hacker-news?date={date_str}", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in identity.headers
+    assert identity.content == written[0].read_bytes()
+    # 圧縮版は元のボディと同じ強いETagを名乗らない
+    assert resp.headers["ETag"] == f"W/{identity.headers['ETag']}"
+
+    revalidated = client.get(
+        f"/api/content/hacker-news?date={date_str}",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": resp.headers["ETag"]},
+    )
+    assert revalidated.status_code == 304
+
+
+def test_structured_content_serves_published_sections(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test summary sections are split when publishing, not when serving /structured."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    monkeypatch.setattr(content_module, "content_cache", content_module.ContentCache(max_entries=8))
+
+    # Given: 見出し付きの要約を保存し、収集処理と同じく事前生成する
+    date_str = "2024-01-01"
+    service_dir = storage.base_dir / "hacker_news"
+    service_dir.mkdir(parents=True, exist_ok=True)
+    json_path = service_dir / f"{date_str}.json"
+    summary = "## 要点\n速くなった\n\n## 背景\n遅かった"
+    json_path.write_text(json.dumps([{"title": "Top", "summary": summary, "score": 10}]), encoding="utf-8")
+    asyncio.run(publishing.publish_saved_files([(str(json_path), "")]))
+
+    def fail_build(*args: Any, **kwargs: Any) -> list[Any]:
+        raise AssertionError("sections should not be split at request time")
+
+    monkeypatch.setattr(builder, "build_structured_items", fail_build)
+
+    # When: 構造化レスポンスを取得する
+    resp = client.get(f"/api/structured/hacker-news?date={date_str}")
+
+    # Then: 事前生成したセクション分割済みのレスポンスが返る
+    assert resp.status_code == 200
+    sections = resp.json()["items"][0]["sections"]
+    assert [section["heading"] for section in sections] == ["要点", "背景"]
+
+
+def _write_trendradar_articles(storage: LocalStorage, date_str: str, count: int) -> None:
+    """Write TrendRadar articles with descending popularity for pagination tests."""
+    service_dir = storage.base_dir / "trendradar-zhihu"
+    service_dir.mkdir(parents=True, exist_ok=True)
+    articles = [
+        {
+            "title": f"Article {i}",
+            "url": f"https://example.com/{i}",
+            "summary": "long summary " * 20,
+            "category": "hot",
+            "popularity_score": 1000 - i,
+        }
+        for i in range(count)
+    ]
+    (service_dir / f"{date_str}.json").write_text(json.dumps(articles), encoding="utf-8")
+
+
+def test_get_content_paginates_with_cursor(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test limit/cursor pagination walks through all items exactly once."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    _write_trendradar_articles(storage, "2024-01-01", 5)
+
+    titles: list[str] = []
+    cursor: str | None = None
+    pages = 0
+    while True:
+        params = {"date": "2024-01-01", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get("/api/content/trendradar-zhihu", params=params)
+        assert resp.status_code == 200
+        data = resp.json()
+        titles.extend(item["title"] for item in data["items"])
+        pages += 1
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert titles == [f"Article {i}" for i in range(5)]
+
+
+def test_get_content_rejects_cursor_after_content_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a cursor is bound to the ETag it was issued for and rejected once the data changes."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    _write_trendradar_articles(storage, "2024-01-01", 5)
+    params = {"date": "2024-01-01", "limit": 2}
+    first = client.get("/api/content/trendradar-zhihu", params=params).json()
+
+    # A new article ranked first would shift an offset-based cursor by one item
+    service_file = storage.base_dir / "trendradar-zhihu" / "2024-01-01.json"
+    articles = json.loads(service_file.read_text(encoding="utf-8"))
+    articles.append({"title": "Breaking", "url": "https://example.com/b", "popularity_score": 5000})
+    service_file.write_text(json.dumps(articles), encoding="utf-8")
+
+    resp = client.get("/api/content/trendradar-zhihu", params={**params, "cursor": first["next_cursor"]})
+
+    assert resp.status_code == 409
+
+
+def test_get_content_rejects_cursor_not_pointing_at_its_item(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a cursor whose position does not hold the recorded item id is rejected."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    _write_trendradar_articles(storage, "2024-01-01", 5)
+    params = {"date": "2024-01-01", "limit": 2}
+    cursor = client.get("/api/content/trendradar-zhihu", params=params).json()["next_cursor"]
+    key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    forged = base64.urlsafe_b64encode(json.dumps({**key, "p": key["p"] + 1}).encode()).decode()
+
+    resp = client.get("/api/content/trendradar-zhihu", params={**params, "cursor": forged})
+
+    assert resp.status_code == 400
+
+
+def test_get_content_projects_fields_and_list_view(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test fields projection and the lightweight list view omit content bodies."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    _write_trendradar_articles(storage, "2024-01-01", 2)
+
+    projected = client.get("/api/content/trendradar-zhihu?date=2024-01-01&fields=title,url,category").json()
+    listed = client.get("/api/content/trendradar-zhihu?date=2024-01-01&view=list").json()
+
+    assert projected["items"][0] == {"title": "Article 0", "url": "https://example.com/0", "category": "hot"}
+    assert projected["next_cursor"] is None
+    assert set(listed["items"][0]) == set(content_module.LIST_VIEW_FIELDS)
+    assert listed["items"][0]["id"]
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["fields=title,unknown", "cursor=not-a-cursor", "limit=0", f"limit={content_module.MAX_PAGE_SIZE + 1}"],
+)
+def test_get_content_rejects_invalid_pagination_params(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, query: str
+) -> None:
+    """Test invalid fields, cursor and limit values are rejected."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    _write_trendradar_articles(storage, "2024-01-01", 2)
+
+    resp = client.get(f"/api/content/trendradar-zhihu?date=2024-01-01&{query}")
+
+    assert resp.status_code in (400, 422)
+
+
+def test_get_content_item_returns_detail(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the detail endpoint returns the full item for an id from the list view."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    _write_trendradar_articles(storage, "2024-01-01", 3)
+
+    listed = client.get("/api/content/trendradar-zhihu?date=2024-01-01&view=list").json()
+    item_id = listed["items"][1]["id"]
+
+    resp = client.get(f"/api/content/trendradar-zhihu/items/{item_id}?date=2024-01-01")
+    missing = client.get("/api/content/trendradar-zhihu/items/unknown?date=2024-01-01")
+
+    assert resp.status_code == 200
+    detail = resp.json()
+    assert detail["title"] == "Article 1"
+    assert "long summary" in detail["content"]
+    assert resp.headers["ETag"]
+    assert missing.status_code == 404
+
+
+def test_get_content_batch_returns_keyed_results(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test batch endpoint resolves entries concurrently with per-entry status."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    _write_trendradar_articles(storage, "2024-01-01", 2)
+    github_dir = storage.base_dir / "github_trending"
+    github_dir.mkdir(parents=True, exist_ok=True)
+    (github_dir / "2023-12-31.md").write_text("content", encoding="utf-8")
+
+    resp = client.post(
+        "/api/content/batch",
+        json={
+            "entries": [
+                {"source": "trendradar-zhihu", "date": "2024-01-01"},
+                {"source": "github"},
+                {"source": "unknown-source"},
+                {"source": "hacker-news", "date": "bad-date"},
+            ]
+        },
+    )
+
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert set(results) == {"trendradar-zhihu:2024-01-01", "github", "unknown-source", "hacker-news:bad-date"}
+
+    zhihu = results["trendradar-zhihu:2024-01-01"]
+    assert zhihu["status"] == 200
+    assert [item["title"] for item in zhihu["data"]["items"]] == ["Article 0", "Article 1"]
+
+    github = results["github"]
+    assert github["status"] == 200
+    assert github["date"] == "2023-12-31"
+    assert github["data"]["items"][0]["content"] == "content"
+
+    assert results["unknown-source"]["status"] == 404
+    assert results["unknown-source"]["data"] is None
+    assert results["hacker-news:bad-date"]["status"] == 400
+
+
+def test_get_content_batch_rejects_empty_entries() -> None:
+    """Test batch endpoint validates the entry list."""
+    client = _make_client()
+
+    resp = client.post("/api/content/batch", json={"entries": []})
+
+    assert resp.status_code == 422
+
+
+def test_export_streams_ndjson_for_date_range(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test export endpoint streams one NDJSON record per item in date/source order."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    _write_trendradar_articles(storage, "2024-01-01", 2)
+    github_dir = storage.base_dir / "github_trending"
+    github_dir.mkdir(parents=True, exist_ok=True)
+    (github_dir / "2024-01-02.md").write_text("day two", encoding="utf-8")
+    hn_dir = storage.base_dir / "hacker_news"
+    hn_dir.mkdir(parents=True, exist_ok=True)
+    (hn_dir / "2024-01-02.json").write_text("{broken", encoding="utf-8")
+
+    with client.stream(
+        "GET",
+        "/api/export",
+        params={"start": "2024-01-01", "end": "2024-01-03", "sources": "trendradar-zhihu,github,hacker-news"},
+    ) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in resp.iter_lines() if line]
+
+    assert [(r["date"], r["source"]) for r in records] == [
+        ("2024-01-01", "trendradar-zhihu"),
+        ("2024-01-01", "trendradar-zhihu"),
+        ("2024-01-02", "github"),
+        ("2024-01-02", "hacker-news"),
+    ]
+    assert records[2]["content"] == "day two"
+    assert "error" in records[3]
+
+
+@pytest.mark.parametrize(
+    ("params", "status"),
+    [
+        ({"start": "2024-01-05", "end": "2024-01-01"}, 400),
+        ({"start": "2024-01-01", "end": "2024-12-31"}, 400),
+        ({"start": "bad"}, 400),
+        ({"start": "2024-01-01", "sources": "unknown"}, 404),
+    ],
+)
+def test_export_rejects_invalid_params(params: dict[str, str], status: int) -> None:
+    """Test export endpoint validates the date range and sources before streaming."""
+    client = _make_client()
+
+    resp = client.get("/api/export", params=params)
+
+    assert resp.status_code == status
+
+
+def test_get_changes_returns_only_records_after_revision(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test delta sync returns only records saved after the client's revision."""
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    service_storage = LocalStorage(str(storage.base_dir / "trendradar-zhihu"))
+
+    first = [{"title": "A", "url": "a", "popularity_score": 2}, {"title": "B", "url": "b", "popularity_score": 1}]
+    asyncio.run(service_storage.save(first, "2024-01-01.json"))
+    asyncio.run(service_storage.save("# md", "2024-01-01.md"))
+
+    initial = client.get("/api/changes", params={"sources": "trendradar-zhihu"}).json()
+    assert initial["changes"] == []
+    assert initial["revision"] > 0
+
+    updated = [*first[:1], {"title": "B", "url": "b", "popularity_score": 5, "summary": "new"}]
+    asyncio.run(service_storage.save(updated, "2024-01-01.json"))
+
+    delta = client.get("/api/changes", params={"since": initial["revision"], "sources": "trendradar-zhihu"}).json()
+    assert delta["revision"] > initial["revision"]
+    assert len(delta["changes"]) == 1
+    assert delta["changes"][0]["date"] == "2024-01-01"
+    assert [item["title"] for item in delta["changes"][0]["items"]] == ["B"]
+
+    current = client.get("/api/changes", params={"since": delta["revision"], "sources": "trendradar-zhihu"}).json()
+    assert current == {"revision": delta["revision"], "reset": False, "changes": []}
+
+
+def test_get_structured_content_returns_typed_items(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test structured endpoint returns typed items from JSON without reading markdown."""
+
+    # Given
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    service_dir = storage.base_dir / "arxiv_summarizer"
+    service_dir.mkdir(parents=True, exist_ok=True)
+    papers = [
+        {
+            "title": "Paper",
+            "url": "https://arxiv.org/abs/1",
+            "abstract": "abs",
+            "summary": "1. 既存研究では何ができなかったのか\n背景\n8. この論文を140字以内で要約するとどうなりますか？\n短い要約",
+            "published_at": "2024-01-01T00:00:00+00:00",
+        }
+    ]
+    (service_dir / "2024-01-01.json").write_text(json.dumps(papers, ensure_ascii=False), encoding="utf-8")
+    (service_dir / "2024-01-02.md").write_text("# legacy markdown only", encoding="utf-8")
+
+    # When
+    resp = client.get("/api/structured/arxiv?date=2024-01-01")
+    legacy = client.get("/api/structured/arxiv?date=2024-01-02")
+    revalidated = client.get("/api/structured/arxiv?date=2024-01-01", headers={"If-None-Match": resp.headers["etag"]})
+
+    # Then
+    assert resp.status_code == 200
+    item = resp.json()["items"][0]
+    assert item["source"] == "arxiv"
+    assert item["metadata"] == {"abstract": "abs"}
+    assert [section["heading"] for section in item["sections"]] == ["🔍 研究背景と課題", "📝 140字要約"]
+    assert item["sections"][1]["body"] == "短い要約"
+    assert "sources" not in resp.json()
+    assert legacy.json() == {"items": []}
+    assert revalidated.status_code == 304
+
+
+def test_get_structured_content_ids_match_content_endpoint(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test structured item ids match the ids returned by the content endpoint."""
+
+    # Given
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    service_dir = storage.base_dir / "hacker_news"
+    service_dir.mkdir(parents=True, exist_ok=True)
+    stories = [{"title": "Top", "summary": "s", "score": 10, "url": "u1"}, {"title": "Next", "score": 3, "url": "u2"}]
+    (service_dir / "2024-01-01.json").write_text(json.dumps(stories), encoding="utf-8")
+
+    # When
+    structured = client.get("/api/structured/hacker-news?date=2024-01-01").json()
+    content = client.get("/api/content/hacker-news?date=2024-01-01").json()
+
+    # Then
+    assert [item["id"] for item in structured["items"]] == [item["id"] for item in content["items"]]
+    assert [item["score"] for item in structured["items"]] == [10.0, 3.0]
+
+
+def test_get_available_dates_returns_manifest_dates_and_counts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test available-dates endpoint lists per-source dates and item counts from the manifest."""
+
+    # Given
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    hn_storage = LocalStorage(str(storage.base_dir / "hacker_news"))
+    asyncio.run(hn_storage.save([{"title": "A", "score": 1}, {"title": "B", "score": 2}], "2024-01-01.json"))
+    asyncio.run(hn_storage.save([{"title": "C", "score": 3}], "2024-01-03.json"))
+    arxiv_dir = storage.base_dir / "arxiv_summarizer"
+    arxiv_dir.mkdir(parents=True, exist_ok=True)
+    (arxiv_dir / "2024-01-02.md").write_text("# legacy", encoding="utf-8")
+
+    # When
+    resp = client.get("/api/dates?sources=hacker-news,arxiv")
+    revalidated = client.get("/api/dates?sources=hacker-news,arxiv", headers={"If-None-Match": resp.headers["etag"]})
+
+    # Then
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "sources": [
+            {
+                "source": "hacker-news",
+                "dates": [{"date": "2024-01-03", "item_count": 1}, {"date": "2024-01-01", "item_count": 2}],
+            },
+            {"source": "arxiv", "dates": [{"date": "2024-01-02", "item_count": None}]},
+        ]
+    }
+    assert revalidated.status_code == 304
+    assert client.get("/api/dates?sources=unknown").status_code == 404
+
+
+def test_get_content_top_ranks_across_sources(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the ranked source merges sources, is materialized on first read and reuses the precomputed file."""
+
+    # Given
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path, monkeypatch)
+    monkeypatch.setattr(content_module, "content_cache", content_module.ContentCache(max_entries=8))
+    hn_storage = LocalStorage(str(storage.base_dir / "hacker_news"))
+    asyncio.run(
+        hn_storage.save(
+            [{"title": "HN top", "summary": "s", "score": 300, "url": "u1"}, {"title": "HN low", "score": 1}],
+            "2024-01-01.json",
+        )
+    )
+    reddit_storage = LocalStorage(str(storage.base_dir / "reddit_explorer"))
+    asyncio.run(
+        reddit_storage.save(
+            [{"title": "Reddit top", "upvotes": 40, "permalink": "u2"}, {"title": "Reddit low", "upvotes": 2}],
+            "2024-01-01.json",
+        )
+    )
+
+    # When
+    resp = client.get("/api/content/top?date=2024-01-01")
+    ranked_path = storage.base_dir / RANKED_DIR_NAME / "2024-01-01.json"
+    ranked_mtime = ranked_path.stat().st_mtime_ns
+    structured = client.get("/api/structured/top?date=2024-01-01").json()
+
+    # Then
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert {item["title"] for item in items[:2]} == {"HN top", "Reddit top"}
+    assert {item["source"] for item in items} == {"hacker-news", "reddit"}
+    assert structured["items"][0]["metadata"]["rank"] == 1
+    assert [item["id"] for item in structured["items"]] == [item["id"] for item in items]
+    assert ranked_path.stat().st_mtime_ns == ranked_mtime
+    all_sources = client.get("/api/content/all?date=2024-01-01").json()["sources"]
+    assert "top" not in {status["source"] for status in all_sources}
+
+
+def test_get_content_reuses_payload_from_shared_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a payload built by another worker is served from the shared cache until the file changes."""
+
+    # Given
+    client = _make_client()
+    storage = _patch_storage_to_tmp(tmp_path / "data", monkeypatch)
+    monkeypatch.setattr(content_module, "shared_cache", content_module.SharedCache(tmp_path / "shared.sqlite3"))
+    service_dir = storage.base_dir / "hacker_news"
+    service_dir.mkdir(parents=True)
+    story_path = service_dir / "2024-01-01.json"
+    story_path.write_text(json.dumps([{"title": "Shared", "score": 1}]), encoding="utf-8")
+    first = client.get("/api/structured/hacker-news?date=2024-01-01")
+
+    # When: another worker has an empty in-process cache and cannot build payloads
+    monkeypatch.setattr(content_module, "content_cache", content_module.ContentCache(max_entries=8))
+
+    async def _fail_build(*args, **kwargs):
+        raise AssertionError("payload should come from the shared cache")
+
+    with monkeypatch.context() as m:
+        m.setattr(builder, "build_content_payload", _fail_build)
+        second = client.get("/api/structured/hacker-news?date=2024-01-01")
+    story_path.write_text(json.dumps([{"title": "Updated", "score": 2}]), encoding="utf-8")
+    third = client.get("/api/structured/hacker-news?date=2024-01-01")
+
+    # Then
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert third.json()["items"][0]["title"] == "Updated"
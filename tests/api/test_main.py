@@ -9,8 +9,11 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from nook.api import main as main_module  # noqa: E402
 from nook.api.main import app  # noqa: E402
+from nook.api.routers import content as content_module  # noqa: E402
 from nook.core.errors.error_metrics import error_metrics  # noqa: E402
+from nook.core.storage import ChangeLogFollower, LocalStorage, StorageWatcher, WorkerLock  # noqa: E402
 
 
 def test_root_endpoint_returns_api_info() -> None:
@@ -51,7 +54,7 @@ def test_error_stats_endpoint_uses_error_metrics() -> None:
 
     # Given
     client = TestClient(app)
-    error_metrics.errors.clear()
+    error_metrics.clear()
     error_metrics.record_error("sample_error", {"status_code": 500, "detail": "x"})
 
     # When
@@ -62,3 +65,54 @@ def test_error_stats_endpoint_uses_error_metrics() -> None:
     data = resp.json()
     assert "sample_error" in data
     assert data["sample_error"]["count"] == 1
+
+
+def test_error_alerts_endpoint_reports_exceeded_thresholds(monkeypatch) -> None:
+    """Test /api/health/alerts lists error types above their per-minute threshold."""
+
+    # Given
+    monkeypatch.setenv("ERROR_ALERT_THRESHOLDS", '{"rate_limited": 1}')
+    client = TestClient(app)
+    error_metrics.clear()
+    error_metrics.record_error("rate_limited", {"status_code": 429}, service="api")
+    error_metrics.record_error("rate_limited", {"status_code": 429}, service="api")
+
+    # When
+    resp = client.get("/api/health/alerts")
+
+    # Then
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "alert"
+    assert data["alerts"][0]["error_type"] == "rate_limited"
+    assert data["alerts"][0]["count"] == 2
+    error_metrics.clear()
+
+
+def test_lifespan_runs_background_tasks_in_one_worker_only(tmp_path: Path, monkeypatch) -> None:
+    """Test only the worker holding the background lock watches the directory and syncs the search index."""
+
+    # Given: Background tasks enabled and the lock already held by another worker
+    monkeypatch.setenv("CONTENT_WATCH_ENABLED", "true")
+    monkeypatch.setenv("SEARCH_SYNC_ENABLED", "true")
+    monkeypatch.setattr(content_module, "storage", LocalStorage(str(tmp_path)))
+    other_worker = WorkerLock(tmp_path / main_module.BACKGROUND_LOCK_NAME)
+    assert other_worker.acquire()
+
+    # When: Starting the app while the lock is held, then again after it is released
+    with TestClient(app):
+        follower_watch, follower_sync = app.state.content_watch, app.state.search_sync
+    other_worker.release()
+    with TestClient(app):
+        lead_watch, lead_sync = app.state.content_watch, app.state.search_sync
+        lock_held = app.state.background_lock.held
+
+    # Then: The follower relays change-log updates without refreshing rankings; the lead does everything
+    assert isinstance(follower_watch.watcher, ChangeLogFollower)
+    assert follower_watch.refresh_ranking is False
+    assert follower_sync is None
+    assert isinstance(lead_watch.watcher, StorageWatcher)
+    assert lead_watch.refresh_ranking is True
+    assert lead_sync is not None
+    assert lock_held is True
+    assert app.state.background_lock.held is False
@@ -0,0 +1,37 @@
+"""/metrics エンドポイントとリクエストのメトリクスのテスト。"""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from nook.api.main import app
+from nook.api.middleware.metrics import REQUESTS
+
+
+def test_metrics_endpoint_exposes_route_templates():
+    """リクエストをルートのパステンプレートごとに記録し、テキスト形式で返す。"""
+    client = TestClient(app)
+    before = REQUESTS.value(method="GET", route="/api/content/{source}", status=400)
+
+    client.get("/api/content/hacker-news?date=invalid-date")
+    client.get("/no/such/path")
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert REQUESTS.value(method="GET", route="/api/content/{source}", status=400) == before + 1
+    assert 'nook_api_requests_total{method="GET",route="unmatched",status="404"}' in resp.text
+    assert "/no/such/path" not in resp.text
+    assert "# TYPE nook_api_request_duration_seconds histogram" in resp.text
+    assert "nook_event_subscribers 0.0" in resp.text
+
+
+def test_metrics_endpoint_can_be_disabled(monkeypatch: pytest.MonkeyPatch):
+    """METRICS_ENABLED=false の場合は 404 を返す。"""
+    monkeypatch.setenv("METRICS_ENABLED", "false")
+    client = TestClient(app)
+
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 404
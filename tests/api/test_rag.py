@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import pytest
+
+from nook.api import rag
+from nook.core.search import Passage
+from nook.core.utils import tokens
+
+
+@pytest.fixture(autouse=True)
+def _estimated_tokens(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tokens, "_encoding", None)
+    monkeypatch.setattr(tokens, "_encoding_failed", True)
+
+
+def _passage(item_id: str, text: str) -> Passage:
+    return Passage(
+        source="hacker-news",
+        date="2024-01-01",
+        item_id=item_id,
+        title=f"Title {item_id}",
+        url=f"https://example.com/{item_id}",
+        text=text,
+        score=1.0,
+    )
+
+
+def test_build_archive_context_numbers_passages_as_citations() -> None:
+    """
+    Given: 予算内に収まる2件の項目
+    When: build_archive_context を呼び出す
+    Then: 番号付きの文脈と、同じ番号の出典が返る
+    """
+    context, citations = rag.build_archive_context([_passage("a", "first"), _passage("b", "second")], 1000)
+
+    assert context.startswith(rag.ARCHIVE_INSTRUCTION)
+    assert "[1] Title a（hacker-news, 2024-01-01）\nhttps://example.com/a\nfirst" in context
+    assert "[2] Title b" in context
+    assert [(c.index, c.id, c.url) for c in citations] == [
+        (1, "a", "https://example.com/a"),
+        (2, "b", "https://example.com/b"),
+    ]
+
+
+def test_build_archive_context_respects_token_budget() -> None:
+    """
+    Given: 予算を超える長い要約を持つ項目
+    When: build_archive_context を呼び出す
+    Then: 要約は切り詰められ、残り予算が足りない項目は含まれない
+    """
+    budget = tokens.count_tokens(rag.ARCHIVE_INSTRUCTION) + 120
+    passages = [_passage("a", "要約" * 200), _passage("b", "short")]
+
+    context, citations = rag.build_archive_context(passages, budget)
+
+    assert tokens.count_tokens(context) <= budget + 2
+    assert context.endswith("…")
+    assert [c.id for c in citations] == ["a"]
+    assert rag.build_archive_context([], 1000) == ("", [])
@@ -0,0 +1,182 @@
+"""レート制限ミドルウェアのテスト。"""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from nook.api.middleware import rate_limit as rate_limit_module
+from nook.api.middleware.rate_limit import (
+    MemoryRateLimitStore,
+    RateLimitRule,
+    RequestRateLimiter,
+    rate_limit_middleware,
+)
+
+
+class FakeClock:
+    """テスト用の時計。"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock: FakeClock) -> RequestRateLimiter:
+    """チャット2回・全体3回で制限するレート制限。"""
+    return RequestRateLimiter(
+        rules=[RateLimitRule("chat", capacity=2, per_minute=6, path_prefix="/api/chat")],
+        client_rule=RateLimitRule("client", capacity=3, per_minute=60),
+        chat_daily_tokens=100,
+        store=MemoryRateLimitStore(clock=clock),
+    )
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch, limiter: RequestRateLimiter) -> TestClient:
+    """レート制限を有効にしたテストクライアント。"""
+    monkeypatch.setattr(rate_limit_module, "rate_limiter", limiter)
+    test_app = FastAPI()
+    test_app.middleware("http")(rate_limit_middleware)
+
+    @test_app.get("/api/chat")
+    async def chat_endpoint():
+        return {"message": "success"}
+
+    @test_app.get("/api/content")
+    async def content_endpoint():
+        return {"message": "success"}
+
+    @test_app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return TestClient(test_app)
+
+
+class TestMemoryRateLimitStore:
+    """MemoryRateLimitStoreのテスト。"""
+
+    @pytest.mark.asyncio
+    async def test_take_refills_over_time(self, clock: FakeClock):
+        """容量を使い切ると回復までの秒数を返し、時間の経過で回復する。"""
+        store = MemoryRateLimitStore(clock=clock)
+
+        assert await store.take("key", capacity=2, refill_per_second=0.5) == 0.0
+        assert await store.take("key", capacity=2, refill_per_second=0.5) == 0.0
+        assert await store.take("key", capacity=2, refill_per_second=0.5) == pytest.approx(2.0)
+
+        clock.now += 2.0
+        assert await store.take("key", capacity=2, refill_per_second=0.5) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_keys(self, clock: FakeClock):
+        """キーの上限を超えると古いキーから捨てる。"""
+        store = MemoryRateLimitStore(max_keys=2, clock=clock)
+        for key in ("a", "b", "c"):
+            await store.take(key, capacity=1, refill_per_second=0.1)
+
+        # 捨てられた "a" は満タンのバケットから始まる
+        assert await store.take("a", capacity=1, refill_per_second=0.1) == 0.0
+        assert await store.take("c", capacity=1, refill_per_second=0.1) > 0
+
+    @pytest.mark.asyncio
+    async def test_usage_resets_after_expiry(self):
+        """期限を過ぎた利用量は0から数え直す。"""
+        store = MemoryRateLimitStore()
+
+        assert await store.add_usage("quota", 10, expires_at=0.0) == 10
+        assert await store.get_usage("quota") == 0.0
+        assert await store.add_usage("quota", 5, expires_at=1e12) == 5
+        assert await store.add_usage("quota", 5, expires_at=1e12) == 10
+        assert await store.get_usage("quota") == 10
+
+
+class TestRateLimitMiddleware:
+    """rate_limit_middlewareのテスト。"""
+
+    def test_route_limit_returns_429_with_retry_after(self, client: TestClient):
+        """ルートの容量を超えると Retry-After 付きの 429 を返す。"""
+        assert client.get("/api/chat").status_code == status.HTTP_200_OK
+        assert client.get("/api/chat").status_code == status.HTTP_200_OK
+
+        response = client.get("/api/chat")
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers["Retry-After"] == "10"
+        assert response.json()["error"]["type"] == "rate_limited"
+
+    def test_client_limit_applies_across_routes(self, client: TestClient):
+        """クライアント全体の容量はルートをまたいで消費し、クライアントIPごとに分かれる。"""
+        assert client.get("/api/chat").status_code == status.HTTP_200_OK
+        assert client.get("/api/content").status_code == status.HTTP_200_OK
+        assert client.get("/api/content").status_code == status.HTTP_200_OK
+
+        assert client.get("/api/content").status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        other = client.get("/api/content", headers={"X-Forwarded-For": "203.0.113.9"})
+        assert other.status_code == status.HTTP_200_OK
+        # API以外のパスは制限しない
+        assert client.get("/health").status_code == status.HTTP_200_OK
+
+    @pytest.mark.asyncio
+    async def test_chat_quota_exceeded(self, client: TestClient, limiter: RequestRateLimiter):
+        """チャットの1日あたりのトークン数を使い切ると翌日まで 429 を返す。"""
+        await limiter.record_chat_usage("testclient", 100)
+
+        response = client.get("/api/chat")
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.json()["error"]["type"] == "quota_exceeded"
+        assert 0 < int(response.headers["Retry-After"]) <= 86400
+        # 他のルートは影響を受けない
+        assert client.get("/api/content").status_code == status.HTTP_200_OK
+
+    def test_disabled_limiter_allows_everything(self, client: TestClient, limiter: RequestRateLimiter):
+        """無効にした場合は制限しない。"""
+        limiter.enabled = False
+
+        assert all(client.get("/api/chat").status_code == status.HTTP_200_OK for _ in range(5))
+
+    def test_spoofed_forwarded_for_does_not_get_fresh_bucket(self, client: TestClient):
+        """クライアントが送った X-Forwarded-For を変えても、プロキシが追加したアドレスで制限する。"""
+        # nginx の $proxy_add_x_forwarded_for は、クライアントが送った値の右端に接続元を追加する
+        statuses = [
+            client.get("/api/content", headers={"X-Forwarded-For": f"10.0.0.{i}, 198.51.100.7"}).status_code
+            for i in range(4)
+        ]
+
+        assert statuses[:3] == [status.HTTP_200_OK] * 3
+        assert statuses[3] == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+class TestClientKey:
+    """RequestRateLimiter.client_keyのテスト。"""
+
+    @staticmethod
+    def _request(headers: dict[str, str], host: str = "192.0.2.1"):
+        raw_headers = [(key.lower().encode(), value.encode()) for key, value in headers.items()]
+        return Request({"type": "http", "headers": raw_headers, "client": (host, 1234)})
+
+    def test_uses_hop_added_by_trusted_proxy(self, limiter: RequestRateLimiter):
+        """右から trusted_proxies 番目のアドレスを使う。"""
+        request = self._request({"X-Forwarded-For": "1.2.3.4, 203.0.113.5, 10.0.0.2"})
+
+        assert limiter.client_key(request) == "10.0.0.2"
+        limiter.trusted_proxies = 2
+        assert limiter.client_key(request) == "203.0.113.5"
+
+    def test_falls_back_to_peer_address(self, limiter: RequestRateLimiter):
+        """プロキシを経由していない場合や直接公開の場合は接続元を使う。"""
+        assert limiter.client_key(self._request({})) == "192.0.2.1"
+        limiter.trusted_proxies = 0
+        assert limiter.client_key(self._request({"X-Forwarded-For": "1.2.3.4"})) == "192.0.2.1"
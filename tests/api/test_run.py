@@ -15,7 +15,7 @@ import pytest
 # Add the parent directory to sys.path to import the module
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
-from nook.api.run import main
+from nook.api.run import DEFAULT_SHARED_CACHE_PATH, main
 
 
 class TestMain:
@@ -34,7 +34,9 @@ class TestMain:
             main()
 
         # Verify uvicorn.run was called with correct defaults
-        mock_uvicorn_run.assert_called_once_with("nook.api.main:app", host="127.0.0.1", port=8000, reload=False)
+        mock_uvicorn_run.assert_called_once_with(
+            "nook.api.main:app", host="127.0.0.1", port=8000, reload=False, workers=1
+        )
 
         # Verify startup message
         mock_print.assert_any_call("Nook APIサーバーを起動しています... http://127.0.0.1:8000")
@@ -50,7 +52,9 @@ class TestMain:
         with patch("sys.argv", ["run.py", "--host", "127.0.0.1"]):
             main()
 
-        mock_uvicorn_run.assert_called_once_with("nook.api.main:app", host="127.0.0.1", port=8000, reload=False)
+        mock_uvicorn_run.assert_called_once_with(
+            "nook.api.main:app", host="127.0.0.1", port=8000, reload=False, workers=1
+        )
 
         mock_print.assert_any_call("Nook APIサーバーを起動しています... http://127.0.0.1:8000")
 
@@ -65,7 +69,9 @@ class TestMain:
         with patch("sys.argv", ["run.py", "--port", "9000"]):
             main()
 
-        mock_uvicorn_run.assert_called_once_with("nook.api.main:app", host="127.0.0.1", port=9000, reload=False)
+        mock_uvicorn_run.assert_called_once_with(
+            "nook.api.main:app", host="127.0.0.1", port=9000, reload=False, workers=1
+        )
 
         mock_print.assert_any_call("Nook APIサーバーを起動しています... http://127.0.0.1:9000")
 
@@ -80,7 +86,9 @@ class TestMain:
         with patch("sys.argv", ["run.py", "--reload"]):
             main()
 
-        mock_uvicorn_run.assert_called_once_with("nook.api.main:app", host="127.0.0.1", port=8000, reload=True)
+        mock_uvicorn_run.assert_called_once_with(
+            "nook.api.main:app", host="127.0.0.1", port=8000, reload=True, workers=1
+        )
 
     @patch("nook.api.run.uvicorn.run")
     @patch("builtins.print")
@@ -96,7 +104,9 @@ class TestMain:
         ):
             main()
 
-        mock_uvicorn_run.assert_called_once_with("nook.api.main:app", host="192.168.1.100", port=8080, reload=True)
+        mock_uvicorn_run.assert_called_once_with(
+            "nook.api.main:app", host="192.168.1.100", port=8080, reload=True, workers=1
+        )
 
         mock_print.assert_any_call("Nook APIサーバーを起動しています... http://192.168.1.100:8080")
 
@@ -127,7 +137,7 @@ class TestMain:
         with patch("nook.api.run.ArgumentParser") as mock_parser_class:
             mock_parser = MagicMock()
             mock_parser_class.return_value = mock_parser
-            mock_parser.parse_args.return_value = MagicMock(host="127.0.0.1", port=8000, reload=False)
+            mock_parser.parse_args.return_value = MagicMock(host="127.0.0.1", port=8000, reload=False, workers=1)
 
             with patch("sys.argv", ["run.py"]):
                 main()
@@ -239,7 +249,9 @@ class TestMain:
         with patch("sys.argv", ["run.py", "--host", "127.0.0.1", "--port", "8080"]):
             main()
 
-        mock_uvicorn_run.assert_called_once_with("nook.api.main:app", host="127.0.0.1", port=8080, reload=False)
+        mock_uvicorn_run.assert_called_once_with(
+            "nook.api.main:app", host="127.0.0.1", port=8080, reload=False, workers=1
+        )
 
     @patch("nook.api.run.uvicorn.run")
     @patch("builtins.print")
@@ -277,3 +289,32 @@ class TestMain:
 
         args, kwargs = mock_uvicorn_run.call_args
         assert kwargs["port"] == 65535
+
+    @patch("nook.api.run.uvicorn.run")
+    @patch("builtins.print")
+    def test_main_multiple_workers_use_shared_cache(self, mock_print, mock_uvicorn_run, monkeypatch) -> None:
+        """
+        Given: --workers 4 without SHARED_CACHE_PATH.
+        When: main is called.
+        Then: uvicorn.run starts 4 workers sharing the default cache file.
+        """
+        monkeypatch.delenv("SHARED_CACHE_PATH", raising=False)
+        with patch("sys.argv", ["run.py", "--workers", "4"]):
+            main()
+
+        args, kwargs = mock_uvicorn_run.call_args
+        assert kwargs["workers"] == 4
+        assert os.environ["SHARED_CACHE_PATH"] == DEFAULT_SHARED_CACHE_PATH
+
+    @patch("nook.api.run.uvicorn.run")
+    @patch("builtins.print")
+    def test_main_reload_with_workers_is_rejected(self, mock_print, mock_uvicorn_run) -> None:
+        """
+        Given: --reload together with --workers 2.
+        When: main is called.
+        Then: The parser exits without starting uvicorn.
+        """
+        with patch("sys.argv", ["run.py", "--reload", "--workers", "2"]), pytest.raises(SystemExit):
+            main()
+
+        mock_uvicorn_run.assert_not_called()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from nook.api.main import app
+from nook.api.routers import content as content_module
+from nook.api.routers import search as search_module
+from nook.core.config import BaseConfig
+from nook.core.content.indexing import index_saved_files, sync_search_index
+from nook.core.content.structured import make_item_id
+from nook.core.storage import LocalStorage
+
+
+@pytest.fixture(autouse=True)
+def storage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> LocalStorage:
+    """コンテンツAPIと検索インデックスのデータディレクトリを一時ディレクトリにする。"""
+    storage = LocalStorage(str(tmp_path))
+    monkeypatch.setattr(content_module, "storage", storage)
+    return storage
+
+
+def _write_json(storage: LocalStorage, service_name: str, date_str: str, records: list[dict]) -> Path:
+    service_dir = storage.base_dir / service_name
+    service_dir.mkdir(parents=True, exist_ok=True)
+    path = service_dir / f"{date_str}.json"
+    path.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def test_search_indexes_stored_snapshots_and_filters(storage: LocalStorage) -> None:
+    """
+    Given: 複数ソースの日次JSONを突き合わせたインデックス
+    When: /api/search をソース・日付の条件付きで呼び出す
+    Then: 一致した項目がコンテンツAPIと同じIDとハイライト付きで返る
+    """
+    _write_json(storage, "hacker_news", "2024-01-01", [{"title": "量子コンピュータの進展", "score": 3, "url": "u1"}])
+    _write_json(
+        storage, "tech_feed", "2024-01-02", [{"title": "Daily", "url": "u2", "summary": "量子コンピュータ関連"}]
+    )
+    sync_search_index(storage.base_dir)
+    client = TestClient(app)
+
+    resp = client.get("/api/search", params={"q": "量子コンピュータ"})
+    filtered = client.get(
+        "/api/search", params={"q": "量子コンピュータ", "sources": "tech-news", "start": "2024-01-02"}
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 2
+    assert body["items"][0]["source"] == "hacker-news"
+    assert body["items"][0]["id"] == make_item_id("hacker-news", "量子コンピュータの進展", "u1")
+    assert body["items"][0]["title_highlight"] == "<mark>量子コンピュータ</mark>の進展"
+    assert [item["source"] for item in filtered.json()["items"]] == ["tech-news"]
+
+
+def test_search_rejects_invalid_params() -> None:
+    """
+    Given: 不正な検索パラメータ
+    When: /api/search を呼び出す
+    Then: 400/404/422 が返る
+    """
+    client = TestClient(app)
+
+    assert client.get("/api/search", params={"q": "x", "start": "bad"}).status_code == 400
+    assert client.get("/api/search", params={"q": " "}).status_code == 400
+    assert client.get("/api/search", params={"q": "x", "sources": "unknown"}).status_code == 404
+    assert client.get("/api/search").status_code == 422
+
+
+def test_search_does_not_sync_on_request(storage: LocalStorage) -> None:
+    """
+    Given: インデックスに未登録の日次JSON
+    When: /api/search を呼び出した後、SearchIndexSync で1回突き合わせる
+    Then: リクエストは既存のインデックスだけを読み、突き合わせ後に検索できる
+    """
+    _write_json(storage, "hacker_news", "2024-01-01", [{"title": "量子コンピュータの進展", "url": "u1"}])
+    client = TestClient(app)
+
+    before = client.get("/api/search", params={"q": "量子コンピュータ"})
+    updated = asyncio.run(search_module.SearchIndexSync(interval=60).sync_once())
+    after = client.get("/api/search", params={"q": "量子コンピュータ"})
+
+    assert before.json()["total"] == 0
+    assert updated == 1
+    assert after.json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_index_sync_runs_in_background_until_stopped(storage: LocalStorage) -> None:
+    """
+    Given: 起動した SearchIndexSync
+    When: 日次JSONを追加して間隔が経過するのを待つ
+    Then: 追加したファイルが登録され、停止後はタスクが残らない
+    """
+    sync = search_module.SearchIndexSync(interval=0.01)
+    sync.start()
+    _write_json(storage, "zenn_explorer", "2024-01-03", [{"title": "型システム入門", "url": "z1"}])
+
+    for _ in range(200):
+        if search_module._search_index().search("型システム")[1]:
+            break
+        await asyncio.sleep(0.01)
+    await sync.stop()
+
+    assert search_module._search_index().search("型システム")[1] == 1
+    assert sync._task is None
+    assert search_module.SearchIndexSync.from_config(BaseConfig(SEARCH_SYNC_ENABLED=False)) is None
+
+
+def test_index_saved_files_updates_index_incrementally(storage: LocalStorage) -> None:
+    """
+    Given: 収集処理が保存したスナップショット
+    When: index_saved_files を呼び出す
+    Then: 該当ファイルのみがインデックスに反映され、未知のディレクトリは無視される
+    """
+    path = _write_json(storage, "zenn_explorer", "2024-01-03", [{"title": "型システム入門", "url": "z1"}])
+
+    indexed = asyncio.run(index_saved_files([(str(path), ""), ("/unknown/dir/2024-01-03.json", "")]))
+    hits, total = search_module._search_index().search("型システム")
+
+    assert indexed == 1
+    assert total == 1
+    assert hits[0].source == "zenn"
+    assert sync_search_index(storage.base_dir) == 0
+
+
+def test_get_related_items_returns_cross_source_duplicates(storage: LocalStorage) -> None:
+    """
+    Given: 同じ話題を別の見出しで報じた複数ソースの記事
+    When: 関連記事エンドポイントを呼び出す
+    Then: 別ソースの記事が近似重複として返り、未登録の項目は404になる
+    """
+    summary = "大規模言語モデルの推論コストを半分にする新しい量子化手法が公開された"
+    _write_json(
+        storage, "hacker_news", "2024-01-01", [{"title": "New LLM quantization", "url": "u1", "summary": summary}]
+    )
+    _write_json(
+        storage,
+        "zenn_explorer",
+        "2024-01-01",
+        [{"title": "LLMの新しい量子化手法", "url": "z1", "summary": summary}, {"title": "Rust入門", "url": "z2"}],
+    )
+    sync_search_index(storage.base_dir)
+    client = TestClient(app)
+    item_id = make_item_id("hacker-news", "New LLM quantization", "u1")
+
+    resp = client.get(f"/api/content/hacker-news/items/{item_id}/related", params={"date": "2024-01-01"})
+    missing = client.get("/api/content/hacker-news/items/unknown/related")
+
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert [(item["source"], item["url"]) for item in items] == [("zenn", "z1")]
+    assert items[0]["duplicate"] is True
+    assert missing.status_code == 404
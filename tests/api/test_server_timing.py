@@ -0,0 +1,76 @@
+"""Server-Timing ミドルウェアのテスト。"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from nook.api.main import app
+from nook.api.middleware import server_timing
+from nook.api.routers import content as content_module
+from nook.core.storage import LocalStorage
+
+
+def _write_hacker_news(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    storage = LocalStorage(str(tmp_path))
+    monkeypatch.setattr(content_module, "storage", storage)
+    service_dir = storage.base_dir / "hacker_news"
+    service_dir.mkdir(parents=True)
+    stories = [{"title": "Top", "summary": "s", "score": 10}, {"title": "Second", "text": "b", "score": 5}]
+    (service_dir / "2024-01-01.json").write_text(json.dumps(stories), encoding="utf-8")
+
+
+def test_content_response_has_server_timing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """コンテンツの読み込みの段階ごとの所要時間をヘッダーで返す。"""
+    # Given
+    _write_hacker_news(tmp_path, monkeypatch)
+    client = TestClient(app)
+
+    # When
+    resp = client.get("/api/content/hacker-news?date=2024-01-01")
+
+    # Then
+    assert resp.status_code == 200
+    names = [entry.split(";")[0] for entry in resp.headers["Server-Timing"].split(", ")]
+    for name in ("fingerprint", "read", "json_parse", "sort", "serialize", "total"):
+        assert name in names
+
+
+def test_slow_sampled_request_writes_profile(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """しきい値を超えたサンプリング対象のリクエストはトレースを保存する。"""
+    # Given
+    _write_hacker_news(tmp_path / "data", monkeypatch)
+    profile_dir = tmp_path / "profiles"
+    monkeypatch.setattr(
+        server_timing,
+        "settings",
+        replace(server_timing.settings, slow_request_ms=0, sample_rate=1.0, profile_dir=profile_dir, max_profiles=1),
+    )
+    client = TestClient(app)
+
+    # When
+    client.get("/api/content/hacker-news?date=2024-01-01")
+    client.get("/api/content/hacker-news?date=2024-01-01")
+
+    # Then
+    profiles = list(profile_dir.glob("*.json"))
+    assert len(profiles) == 1
+    trace = json.loads(profiles[0].read_text(encoding="utf-8"))
+    assert trace["metadata"]["path"] == "/api/content/hacker-news"
+    assert trace["metadata"]["status"] == 200
+    assert all(event["ph"] == "X" for event in trace["traceEvents"])
+    assert "fingerprint" in {event["name"] for event in trace["traceEvents"]}
+
+
+def test_server_timing_can_be_disabled(monkeypatch: pytest.MonkeyPatch):
+    """無効な場合はヘッダーを返さない。"""
+    monkeypatch.setattr(server_timing, "settings", replace(server_timing.settings, enabled=False))
+    client = TestClient(app)
+
+    resp = client.get("/health")
+
+    assert "Server-Timing" not in resp.headers
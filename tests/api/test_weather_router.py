@@ -12,12 +12,26 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from nook.api.main import app  # noqa: E402
+from nook.api.routers import weather as weather_module  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _clear_weather_cache() -> None:
+    """Start each test without cached weather."""
+    weather_module.weather_cache.clear()
 
 
 def _make_client() -> TestClient:
     return TestClient(app)
 
 
+def _ok_response(temp: float, icon: str) -> MagicMock:
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"main": {"temp": temp}, "weather": [{"icon": icon}]}
+    return response
+
+
 def test_get_weather_success(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test successful weather data retrieval."""
     client = _make_client()
@@ -90,3 +104,56 @@ def test_get_weather_request_exception(monkeypatch: pytest.MonkeyPatch) -> None:
         resp = client.get("/api/weather")
         assert resp.status_code == 500
         assert "Error fetching weather data" in resp.json()["detail"]
+
+
+def test_get_weather_is_cached_within_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test repeated requests within the TTL reuse the cached upstream response."""
+    client = _make_client()
+    monkeypatch.setenv("OPENWEATHERMAP_API_KEY", "dummy_key")
+
+    with patch("nook.api.routers.weather.requests.get", return_value=_ok_response(25.5, "10d")) as mock_get:
+        first = client.get("/api/weather")
+        second = client.get("/api/weather")
+
+    assert first.json() == second.json() == {"temperature": 25.5, "icon": "10d"}
+    assert mock_get.call_count == 1
+
+
+def test_get_weather_serves_last_good_value_when_upstream_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test an expired entry is served when the refresh fails."""
+    client = _make_client()
+    monkeypatch.setenv("OPENWEATHERMAP_API_KEY", "dummy_key")
+    # Expire entries immediately and always wait for the refresh
+    monkeypatch.setattr(weather_module.weather_cache, "ttl", 0)
+    monkeypatch.setattr(weather_module.weather_cache, "max_stale", 0)
+
+    with patch("nook.api.routers.weather.requests.get", return_value=_ok_response(18.0, "02d")):
+        assert client.get("/api/weather").json()["temperature"] == 18.0
+
+    import requests
+
+    with patch(
+        "nook.api.routers.weather.requests.get",
+        side_effect=requests.RequestException("Connection error"),
+    ) as mock_get:
+        resp = client.get("/api/weather")
+
+    assert mock_get.call_count == 1
+    assert resp.status_code == 200
+    assert resp.json() == {"temperature": 18.0, "icon": "02d"}
+
+
+def test_get_weather_reuses_value_fetched_by_another_worker(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test weather fetched by another worker is read from the shared cache."""
+    client = _make_client()
+    monkeypatch.setenv("OPENWEATHERMAP_API_KEY", "dummy_key")
+    monkeypatch.setattr(weather_module, "shared_cache", weather_module.SharedCache(tmp_path / "shared.sqlite3"))
+
+    with patch("nook.api.routers.weather.requests.get", return_value=_ok_response(21.0, "03d")) as mock_get:
+        first = client.get("/api/weather")
+        # Another worker starts with an empty in-process cache
+        weather_module.weather_cache.clear()
+        second = client.get("/api/weather")
+
+    assert first.json() == second.json() == {"temperature": 21.0, "icon": "03d"}
+    assert mock_get.call_count == 1
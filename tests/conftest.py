@@ -4,6 +4,10 @@
 """
 
 import os
+import tempfile
+from pathlib import Path
+
+import pytest
 
 # 全テスト共通設定:
 # BaseConfigのロード時に検証エラーが発生しないように、
@@ -11,3 +15,22 @@ import os
 # 特定のテストでのみ必要な設定はフィクスチャで定義すること。
 # Note: 明示的に上書きしてテストの一貫性を確保（環境変数依存を排除）
 os.environ["OPENAI_API_KEY"] = "dummy-test-key"
+# 同じクライアントIPから大量に呼び出すため、アプリ全体のレート制限は無効にする
+# （レート制限自体のテストは制限を有効にしたインスタンスを作成する）
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+# アプリの起動時にデータディレクトリの監視を始めない（監視自体のテストは個別に作成する）
+os.environ["CONTENT_WATCH_ENABLED"] = "false"
+# 同様に、起動時に検索インデックスの突き合わせを始めない
+os.environ["SEARCH_SYNC_ENABLED"] = "false"
+# インポート時に作られるモジュールのストレージ（APIのルーターなど）も var/ に書き込まないよう、
+# テストセッション用の一時ディレクトリを使う（検索インデックスも DATA_DIR 配下に作られる）
+_SESSION_DIR = Path(tempfile.mkdtemp(prefix="nook-tests-"))
+os.environ["DATA_DIR"] = str(_SESSION_DIR / "data")
+os.environ["LOG_DIR"] = str(_SESSION_DIR / "logs")
+
+
+@pytest.fixture(autouse=True)
+def _isolate_var_dirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """テストごとに DATA_DIR と LOG_DIR を一時ディレクトリに向ける（実行のたびに var/ が変更されないようにする）。"""
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "var" / "data"))
+    monkeypatch.setenv("LOG_DIR", str(tmp_path / "var" / "logs"))
@@ -5,6 +5,7 @@ import pytest
 
 from nook.core.utils.async_utils import (
     AsyncTaskManager,
+    StaleWhileRevalidateCache,
     batch_process,
     gather_with_errors,
     run_sync_in_thread,
@@ -207,3 +208,76 @@ async def test_manager_wait_all():
 
     status = manager.get_status()
     assert status["total"] == 2
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_swr_cache_coalesces_concurrent_misses():
+    cache = StaleWhileRevalidateCache(ttl=10)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(cache.get("k", loader) for _ in range(5)))
+
+    assert results == [1] * 5
+    assert calls == 1
+    assert await cache.get("k", loader) == 1
+
+
+@pytest.mark.asyncio
+async def test_swr_cache_serves_stale_and_refreshes_in_background():
+    clock = _Clock()
+    cache = StaleWhileRevalidateCache(ttl=10, clock=clock)
+    values = iter(["old", "new"])
+
+    async def loader():
+        return next(values)
+
+    assert await cache.get("k", loader) == "old"
+    clock.now = 11
+
+    assert await cache.get("k", loader) == "old"
+    await asyncio.sleep(0)
+    assert await cache.get("k", loader) == "new"
+
+
+@pytest.mark.asyncio
+async def test_swr_cache_falls_back_to_last_good_value_on_failure():
+    clock = _Clock()
+    cache = StaleWhileRevalidateCache(ttl=10, max_stale=20, error_ttl=5, clock=clock)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            raise RuntimeError("upstream down")
+        return "good"
+
+    assert await cache.get("k", loader) == "good"
+
+    # max_stale を超えると取得を待つが、失敗した場合は最後の値を返す
+    clock.now = 30
+    assert await cache.get("k", loader) == "good"
+    assert calls == 2
+
+    # 失敗直後は再取得を控える
+    clock.now = 31
+    await cache.get("k", loader)
+    assert calls == 2
+
+    cache.clear()
+    with pytest.raises(RuntimeError, match="upstream down"):
+        await cache.get("k", loader)
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from nook.core.storage import ChangeLog, LocalStorage
+from nook.core.storage.change_log import CHANGE_LOG_FILENAME, changed_keys
+
+
+def test_changed_keys_reports_added_and_updated_records():
+    previous = json.dumps([{"title": "A", "url": "a", "score": 1}, {"title": "B", "url": "b", "score": 2}])
+    current = json.dumps(
+        [
+            {"title": "A", "url": "a", "score": 1},
+            {"title": "B", "url": "b", "score": 3},
+            {"title": "C", "url": "c", "score": 4},
+        ]
+    )
+
+    assert changed_keys(previous, current) == (("B", "b"), ("C", "c"))
+    assert changed_keys(None, current) == (("A", "a"), ("B", "b"), ("C", "c"))
+    assert changed_keys("not json", current) is None
+
+
+def test_record_skips_unchanged_and_non_daily_files(tmp_path):
+    log = ChangeLog(tmp_path)
+    body = json.dumps([{"title": "A", "url": "a"}])
+
+    assert log.record("state.json", None, body) is None
+    assert log.record("2024-01-01.json", body, body) is None
+    # 整形だけが変わった場合はレコード単位では変更なし
+    assert log.record("2024-01-01.json", body, json.dumps(json.loads(body), indent=2)) is None
+    assert log.head == 0
+
+
+def test_record_revisions_are_monotonic_and_readable(tmp_path):
+    log = ChangeLog(tmp_path)
+
+    first = log.record("2024-01-01.md", None, "v1")
+    second = log.record("2024-01-01.json", None, json.dumps([{"title": "A", "url": "a"}]))
+
+    assert first is not None and second is not None
+    assert second.revision > first.revision
+    assert log.head == second.revision
+
+    entries, reset = log.read_since(first.revision)
+    assert reset is False
+    assert [(e.filename, e.keys) for e in entries] == [("2024-01-01.json", (("A", "a"),))]
+
+
+def test_record_truncates_history_and_signals_reset(tmp_path):
+    log = ChangeLog(tmp_path, max_entries=4)
+
+    revisions = [log.record("2024-01-01.md", None, f"v{i}").revision for i in range(6)]
+
+    lines = (tmp_path / CHANGE_LOG_FILENAME).read_text(encoding="utf-8").splitlines()
+    assert len(lines) <= 4
+    _, reset = log.read_since(revisions[0])
+    entries, recent_reset = log.read_since(revisions[-2])
+    assert reset is True
+    assert recent_reset is False
+    assert [e.revision for e in entries] == [revisions[-1]]
+
+
+@pytest.mark.asyncio
+async def test_local_storage_save_writes_change_log(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+
+    await storage.save([{"title": "A", "url": "a"}], "2024-01-01.json")
+    await storage.save([{"title": "A", "url": "a"}, {"title": "B", "url": "b"}], "2024-01-01.json")
+    await storage.save({"seen": []}, "state.json")
+
+    entries, _ = storage.change_log.read_since(0)
+    assert [e.keys for e in entries] == [(("A", "a"),), (("B", "b"),)]
@@ -0,0 +1,132 @@
+"""Tests for the in-process content response cache."""
+
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from nook.core.content.cache import (
+    ContentCache,
+    MaterializedPayloadStore,
+    build_payload,
+    etag_matches,
+    file_signature,
+)
+
+
+def test_build_payload_computes_strong_etag_and_last_modified() -> None:
+    """
+    Given: 同じボディと異なるボディ。
+    When: build_payload でペイロードを生成したとき。
+    Then: ETag はボディにのみ依存し、Last-Modified は最新の mtime になる。
+    """
+    fingerprint = ((1_700_000_000_500_000_000, 10), None, (1_600_000_000_000_000_000, 5))
+
+    first = build_payload(b'{"items":[]}', fingerprint)
+    same = build_payload(b'{"items":[]}', ())
+    other = build_payload(b'{"items":[1]}', fingerprint)
+
+    assert first.etag == same.etag
+    assert first.etag != other.etag
+    assert not first.etag.startswith("W/")
+    assert first.last_modified_header == "Tue, 14 Nov 2023 22:13:20 GMT"
+    assert same.last_modified_header is None
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"x", "abc"', True),
+        ("*", True),
+        ('"abd"', False),
+    ],
+)
+def test_etag_matches(header: str | None, expected: bool) -> None:
+    """
+    Given: 様々な If-None-Match ヘッダー。
+    When: etag_matches で判定したとき。
+    Then: 弱い比較で一致判定される。
+    """
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """
+    Given: 最大2件のキャッシュ。
+    When: 3件登録したとき。
+    Then: 最も長く参照されていないエントリが追い出される。
+    """
+    cache = ContentCache(max_entries=2)
+    cache.put("a", build_payload(b"a", ()))
+    cache.put("b", build_payload(b"b", ()))
+    assert cache.get("a", ()) is not None
+
+    cache.put("c", build_payload(b"c", ()))
+
+    assert cache.get("b", ()) is None
+    assert cache.get("a", ()) is not None
+    assert cache.get("c", ()) is not None
+    assert len(cache) == 2
+
+
+def test_cache_rejects_stale_fingerprint(tmp_path: Path) -> None:
+    """
+    Given: ファイルのフィンガープリントで登録したエントリ。
+    When: ファイルが更新された後に取得したとき。
+    Then: エントリは破棄されミスとして扱われる。
+    """
+    path = tmp_path / "2024-01-01.md"
+    path.write_text("v1", encoding="utf-8")
+    fingerprint = (file_signature(path),)
+    cache = ContentCache()
+    cache.put("key", build_payload(b"v1", fingerprint))
+
+    path.write_text("version 2", encoding="utf-8")
+
+    assert cache.get("key", (file_signature(path),)) is None
+    assert cache.misses == 1
+    assert len(cache) == 0
+    assert file_signature(tmp_path / "missing.md") is None
+
+
+def test_materialized_store_round_trip(tmp_path: Path) -> None:
+    """
+    Given: 事前生成したペイロードを書き込んだストア。
+    When: 同じフィンガープリントで読み込んだとき。
+    Then: 同じボディとETag、事前圧縮版のパスが返る。
+    """
+    source_file = tmp_path / "src.md"
+    source_file.write_text("content", encoding="utf-8")
+    fingerprint = (file_signature(source_file),)
+    store = MaterializedPayloadStore(tmp_path / "published")
+    payload = build_payload(b'{"items":[]}', fingerprint, item_count=0)
+
+    body_path = store.write("github", "2024-01-01", payload)
+    loaded = store.read("github", "2024-01-01", fingerprint)
+
+    assert body_path.read_bytes() == payload.body
+    assert loaded is not None
+    assert loaded.etag == payload.etag
+    assert gzip.decompress(loaded.encoded_paths["gzip"].read_bytes()) == payload.body
+
+
+def test_materialized_store_ignores_stale_payload(tmp_path: Path) -> None:
+    """
+    Given: 事前生成後に元ファイルが更新されたストア。
+    When: 現在のフィンガープリントで読み込んだとき。
+    Then: None を返しライブ生成にフォールバックさせる。
+    """
+    source_file = tmp_path / "src.md"
+    source_file.write_text("v1", encoding="utf-8")
+    store = MaterializedPayloadStore(tmp_path / "published")
+    store.write("github", "2024-01-01", build_payload(b"{}", (file_signature(source_file),)))
+
+    source_file.write_text("version 2", encoding="utf-8")
+
+    assert store.read("github", "2024-01-01", (file_signature(source_file),)) is None
+    assert store.read("github", "2024-01-02", (file_signature(source_file),)) is None
@@ -0,0 +1,87 @@
+import pytest
+
+from nook.core.clients.context_window import (
+    OMISSION_MARKER,
+    SUMMARY_HEADER,
+    ContextBudget,
+    build_chat_context,
+    fit_history,
+    roll_summary,
+    select_markdown,
+)
+from nook.core.utils import tokens
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    # 英数字は4文字で1トークンとして数える
+    monkeypatch.setattr(tokens, "_encoding", None)
+    monkeypatch.setattr(tokens, "_encoding_failed", True)
+
+
+def _turns(count, length=40):
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"turn{i} " + "x" * length} for i in range(count)
+    ]
+
+
+def test_fit_history_keeps_everything_within_budget():
+    history = _turns(4)
+
+    kept, dropped = fit_history(history, ContextBudget(history_tokens=1000))
+
+    assert kept == history
+    assert dropped == []
+
+
+def test_build_chat_context_folds_oldest_turns_into_summary():
+    history = _turns(20)
+    budget = ContextBudget(history_tokens=200, summary_tokens=80)
+
+    context = build_chat_context(history, None, "question", budget)
+
+    assert context.dropped_turns > 0
+    assert context.messages[0]["role"] == "system"
+    assert context.messages[0]["content"].startswith(SUMMARY_HEADER)
+    assert context.messages[-1] == history[-1]
+    assert context.messages[1:] == history[context.dropped_turns :]
+    assert sum(tokens.count_tokens(m["content"]) + 4 for m in context.messages[1:]) <= 200 - 80
+    assert "turn" in context.summary
+
+
+def test_fit_history_truncates_oversized_latest_message():
+    history = [{"role": "user", "content": "y" * 4000}]
+
+    kept, dropped = fit_history(history, ContextBudget(history_tokens=100, summary_tokens=40))
+
+    assert dropped == []
+    assert kept[0]["content"].endswith("…")
+    assert tokens.count_tokens(kept[0]["content"]) <= 60
+
+
+def test_roll_summary_appends_new_turns_and_drops_oldest_lines():
+    first = roll_summary("", [{"role": "user", "content": "alpha " * 10}], 100)
+    second = roll_summary(first, [{"role": "assistant", "content": "beta " * 10}], 100)
+    third = roll_summary(second, [{"role": "user", "content": "gamma " * 10}], 60)
+
+    assert first.startswith("- ユーザー: alpha")
+    assert second.splitlines()[0] == first
+    assert second.splitlines()[1].startswith("- アシスタント: beta")
+    assert "alpha" not in third
+    assert third.splitlines()[-1].startswith("- ユーザー: gamma")
+
+
+def test_select_markdown_keeps_lead_and_relevant_sections():
+    sections = [f"## Section {i}\n\n" + f"filler text number {i} " * 30 for i in range(6)]
+    sections[4] = "## Pricing\n\n" + "The subscription pricing changes next month. " * 8
+    markdown = "# Title\n\nLead paragraph.\n\n" + "\n\n".join(sections)
+
+    selected, truncated = select_markdown(markdown, "What about the pricing?", 250, chunk_tokens=120)
+    unchanged, not_truncated = select_markdown("short text", "pricing", 250)
+
+    assert truncated is True
+    assert selected.startswith("# Title")
+    assert "## Pricing" in selected
+    assert OMISSION_MARKER in selected
+    assert tokens.count_tokens(selected) <= 250
+    assert (unchanged, not_truncated) == ("short text", False)
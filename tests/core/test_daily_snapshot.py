@@ -10,6 +10,9 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from nook.core.content.indexing import search_index  # noqa: E402
+from nook.core.content.sources import PUBLISHED_DIR_NAME  # noqa: E402
+from nook.core.storage import LocalStorage  # noqa: E402
 from nook.core.storage.daily_snapshot import (  # noqa: E402
     group_records_by_date,
     store_daily_snapshots,
@@ -122,3 +125,31 @@ async def test_store_daily_snapshots_merges_and_saves(tmp_path):
     assert yesterday_key in stored_markdown
     assert "new-top" in stored_markdown[today_key]
     assert "yesterday-existing" in stored_markdown[yesterday_key]
+
+
+@pytest.mark.asyncio
+async def test_store_daily_snapshots_publishes_source_payload_and_search_index(tmp_path):
+    """保存したスナップショットがソースごとの事前生成レスポンスと検索インデックスに反映される。"""
+    storage = LocalStorage(str(tmp_path / "hacker_news"))
+    snapshot_date = datetime(2024, 1, 1).date()
+
+    async def load_existing(snapshot_datetime: datetime):
+        return []
+
+    await store_daily_snapshots(
+        {snapshot_date: [{"title": "量子コンピュータの進展", "score": 3, "url": "u1"}]},
+        load_existing=load_existing,
+        save_json=storage.save,
+        save_markdown=storage.save,
+        render_markdown=lambda records, _: "\n".join(item["title"] for item in records),
+        key=lambda item: item.get("title"),
+        sort_key=None,
+        limit=None,
+    )
+
+    published_dir = tmp_path / PUBLISHED_DIR_NAME
+    assert (published_dir / "hacker-news" / "2024-01-01.json").exists()
+    # 全ソース・総合ランキングは収集処理の最後に1回だけ生成する
+    assert not (published_dir / "all").exists()
+    _, total = search_index(tmp_path).search("量子コンピュータ")
+    assert total == 1
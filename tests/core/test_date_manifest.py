@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from nook.core.storage import DateManifest, LocalStorage
+from nook.core.storage.date_manifest import MANIFEST_FILENAME
+
+
+def test_entries_builds_manifest_from_existing_files(tmp_path):
+    (tmp_path / "2024-01-01.json").write_text(json.dumps([{"title": "A"}, {"title": "B"}]), encoding="utf-8")
+    (tmp_path / "2024-01-01.md").write_text("# md", encoding="utf-8")
+    (tmp_path / "2024-01-02.md").write_text("# md", encoding="utf-8")
+    (tmp_path / "state.json").write_text("{}", encoding="utf-8")
+
+    entries = DateManifest(tmp_path).entries()
+
+    assert sorted(entries) == ["2024-01-01", "2024-01-02"]
+    assert entries["2024-01-01"].formats == ("json", "md")
+    assert entries["2024-01-01"].item_count == 2
+    assert entries["2024-01-02"].item_count is None
+    assert (tmp_path / MANIFEST_FILENAME).exists()
+
+
+def test_record_updates_entry_without_rescanning(tmp_path):
+    manifest = DateManifest(tmp_path)
+    manifest.record("2024-01-01.json", json.dumps([{"title": "A"}]))
+    # マニフェスト作成後に直接置かれたファイルは走査されない
+    (tmp_path / "2024-01-05.md").write_text("# md", encoding="utf-8")
+
+    entry = manifest.record("2024-01-01.json", json.dumps([{"title": "A"}, {"title": "B"}, {"title": "C"}]))
+
+    assert entry.item_count == 3
+    assert manifest.record("state.json", "{}") is None
+    assert list(DateManifest(tmp_path).entries()) == ["2024-01-01"]
+
+
+@pytest.mark.asyncio
+async def test_local_storage_save_updates_date_manifest(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+
+    await storage.save([{"title": "A"}], "2024-01-01.json")
+    await storage.save("# md", "2024-01-01.md")
+
+    entry = DateManifest(tmp_path).entries()["2024-01-01"]
+    assert entry.formats == ("json", "md")
+    assert entry.item_count == 1
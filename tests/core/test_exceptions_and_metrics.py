@@ -13,7 +13,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from nook.core.clients.rate_limiter import RateLimiter  # noqa: E402
-from nook.core.errors.error_metrics import ErrorMetrics  # noqa: E402
+from nook.core.errors.error_metrics import AlertThreshold, ErrorMetrics  # noqa: E402
 from nook.core.errors.exceptions import APIException, ServiceException  # noqa: E402
 from nook.core.errors.service_errors import ServiceErrorHandler  # noqa: E402
 from nook.core.logging.logging_utils import (  # noqa: E402
@@ -90,8 +90,17 @@ def test_api_exception_fields_preserved():
     assert exc.response_body == "body"
 
 
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
 def test_error_metrics_tracks_recent_errors():
-    metrics = ErrorMetrics(window_minutes=1)
+    clock = FakeClock()
+    metrics = ErrorMetrics(window_minutes=1, clock=clock)
     metrics.record_error("api", {"detail": "x"})
 
     stats = metrics.get_error_stats()
@@ -101,12 +110,65 @@ def test_error_metrics_tracks_recent_errors():
     assert "api" in report
 
     # 古いエラーは集計から除外される
-    old_time = datetime.now(UTC) - timedelta(minutes=5)
-    metrics.errors["api"].append((old_time, {}))
+    clock.now += 5 * 60
+    metrics.record_error("api", {})
     stats_after = metrics.get_error_stats()
     assert stats_after["api"]["count"] == 1
 
 
+def test_error_metrics_counts_per_minute_and_hour_by_service():
+    clock = FakeClock()
+    metrics = ErrorMetrics(clock=clock)
+    for _ in range(3):
+        metrics.record_error("rate_limited", {}, service="api")
+    metrics.record_error("rate_limited", {}, service="runner")
+    clock.now += 2 * 60
+    metrics.record_error("rate_limited", {}, service="api")
+
+    # 直近1分、直近1時間（1分単位）、サービスごとに数える
+    assert metrics.count("rate_limited") == 1
+    assert metrics.count("rate_limited", minutes=60) == 5
+    assert metrics.count("rate_limited", minutes=60, service="api") == 4
+    stats = metrics.get_error_stats()["rate_limited"]
+    assert stats["by_service"] == {"api": 4, "runner": 1}
+
+    # 1時間を過ぎると分単位の集計からは外れ、1日（1時間単位）の集計には残る
+    clock.now += 2 * 3600
+    assert metrics.count("rate_limited", minutes=60) == 0
+    assert metrics.count("rate_limited", minutes=24 * 60) == 5
+    timeline = metrics.get_error_timeline("rate_limited")
+    assert len(timeline["per_minute"]) == 60
+    assert sum(timeline["per_hour"]) == 5
+
+
+def test_error_metrics_memory_does_not_grow_with_errors():
+    clock = FakeClock()
+    metrics = ErrorMetrics(clock=clock)
+    for i in range(10_000):
+        clock.now += 1
+        metrics.record_error("api", {"i": i})
+
+    series = metrics._series[("api", "unknown")]
+    assert len(series.minutes.series(clock.now)) == 60
+    assert metrics.count("api", minutes=1) <= 60
+    assert metrics.count("api", minutes=60) <= 3600
+
+
+def test_error_metrics_check_alerts_uses_rate_thresholds():
+    clock = FakeClock()
+    metrics = ErrorMetrics(clock=clock)
+    thresholds = [AlertThreshold("rate_limited", limit=2), AlertThreshold("not_found", limit=10, minutes=5)]
+    for _ in range(3):
+        metrics.record_error("rate_limited", {}, service="api")
+
+    alerts = metrics.check_alerts(thresholds)
+
+    assert alerts == [{"error_type": "rate_limited", "service": None, "minutes": 1, "limit": 2, "count": 3}]
+    assert metrics.rate_per_minute("rate_limited") == 3
+    clock.now += 60
+    assert metrics.check_alerts(thresholds) == []
+
+
 def test_error_metrics_empty_report_message():
     metrics = ErrorMetrics(window_minutes=1)
     assert metrics.get_error_report().startswith("No errors")
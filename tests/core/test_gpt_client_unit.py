@@ -11,7 +11,9 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from nook.core.clients.context_window import ContextBudget  # noqa: E402
 from nook.core.clients.gpt_client import GPTClient  # noqa: E402
+from nook.core.utils import tokens  # noqa: E402
 
 
 class DummyEncoding:
@@ -54,6 +56,9 @@ def patch_encoding(monkeypatch):
         "nook.core.clients.gpt_client.tiktoken.get_encoding",
         lambda name: DummyEncoding(),
     )
+    # 履歴のトークン予算は共有エンコーダーを使うため、テストでは概算に固定する
+    monkeypatch.setattr(tokens, "_encoding", None)
+    monkeypatch.setattr(tokens, "_encoding_failed", True)
 
 
 @pytest.fixture
@@ -119,21 +124,27 @@ def test_supports_and_gpt5_detection(dummy_openai):
     assert GPTClient(api_key="k", model="gpt-4.1-mini")._is_gpt5_model() is False
 
 
+def _frames(*filenames: str) -> types.SimpleNamespace:
+    """先頭のファイルから呼ばれた順に f_back でつないだスタックフレームを作る。"""
+    frame = None
+    for filename in reversed(filenames):
+        frame = types.SimpleNamespace(f_back=frame, f_code=types.SimpleNamespace(co_filename=filename))
+    return frame
+
+
 def test_get_calling_service(monkeypatch, client):
-    # Given: services配下から呼ばれたスタックフレームを用意
-    service_frame = types.SimpleNamespace(
-        f_back=None,
-        f_code=types.SimpleNamespace(co_filename="/home/bob/nook/services/my_service/run.py"),
-    )
-    caller_frame = types.SimpleNamespace(
-        f_back=service_frame,
-        f_code=types.SimpleNamespace(co_filename="/home/bob/nook/worker.py"),
+    # Given: 分類（explorers）配下のサービスから、共通モジュールを経由して呼ばれたスタックフレーム
+    caller_frame = _frames(
+        "/home/bob/nook/core/clients/gpt_client.py",
+        "/home/bob/nook/services/base/base_feed_service.py",
+        "/home/bob/nook/services/explorers/reddit/reddit_explorer.py",
+        "/home/bob/nook/services/runner/runner_impl.py",
     )
 
     monkeypatch.setattr("nook.core.clients.gpt_client.inspect.currentframe", lambda: caller_frame)
 
-    # When/Then: サービス名を抽出できる
-    assert client._get_calling_service() == "my_service"
+    # When/Then: 分類ではなくサービスのディレクトリ名を抽出できる
+    assert client._get_calling_service() == "reddit"
 
 
 def test_generate_content_uses_chat_completions_params(client):
@@ -482,7 +493,7 @@ def test_get_calling_service_skips_run_services_files(monkeypatch, client):
     # Given: run_services.pyからの呼び出しスタック
     actual_service_frame = types.SimpleNamespace(
         f_back=None,
-        f_code=types.SimpleNamespace(co_filename="/home/bob/nook/services/actual_service/main.py"),
+        f_code=types.SimpleNamespace(co_filename="/home/bob/nook/services/feeds/actual_service/main.py"),
     )
     run_services_frame = types.SimpleNamespace(
         f_back=actual_service_frame,
@@ -725,3 +736,143 @@ def test_chat_with_search_without_history(dummy_openai):
 
     # Then: 正常に動作
     assert result == "chat-output"
+
+
+class DummyAsyncStream:
+    def __init__(self, events):
+        self._events = list(events)
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for event in self._events:
+            yield event
+
+    async def close(self):
+        self.closed = True
+
+
+class DummyAsyncOpenAI:
+    def __init__(self, api_key: str):
+        self.params: list[dict] = []
+        self.streams: list[DummyAsyncStream] = []
+        self.closed = False
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self._create_completion))
+        self.responses = types.SimpleNamespace(create=self._create_response)
+
+    async def _create_completion(self, **params):
+        self.params.append(params)
+        if params.get("stream"):
+            chunks = [
+                types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=text))])
+                for text in ("Hel", None, "lo")
+            ]
+            self.streams.append(DummyAsyncStream(chunks))
+            return self.streams[-1]
+        message = types.SimpleNamespace(content="async-output")
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+    async def _create_response(self, **params):
+        self.params.append(params)
+        events = [
+            types.SimpleNamespace(type="response.created"),
+            types.SimpleNamespace(type="response.output_text.delta", delta="Hi"),
+            types.SimpleNamespace(type="response.output_text.delta", delta="!"),
+        ]
+        self.streams.append(DummyAsyncStream(events))
+        return self.streams[-1]
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def dummy_async_openai(monkeypatch, dummy_openai):
+    monkeypatch.setattr(openai, "AsyncOpenAI", DummyAsyncOpenAI)
+
+
+@pytest.mark.asyncio
+async def test_chat_async_uses_shared_async_client(dummy_async_openai):
+    # Given: 非同期クライアントを遅延作成するGPTClient
+    client = GPTClient(api_key="test-key", model="gpt-4.1-mini")
+
+    # When: 2回チャットを実行し、最後に閉じる
+    first = await client.chat_async([{"role": "user", "content": "hi"}], system="sys", max_tokens=20)
+    async_client = client.async_client
+    await client.chat_async([{"role": "user", "content": "again"}])
+    await client.aclose()
+
+    # Then: 同じ非同期クライアントが使われ、パラメータが期待通り
+    assert first == "async-output"
+    assert len(async_client.params) == 2
+    assert async_client.params[0]["messages"][0] == {"role": "system", "content": "sys"}
+    assert async_client.params[0]["max_completion_tokens"] == 20
+    assert async_client.closed is True
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_yields_deltas_and_closes_stream(dummy_async_openai):
+    # Given: Chat Completions とResponses APIのストリーム
+    client = GPTClient(api_key="test-key", model="gpt-4.1-mini")
+    gpt5 = GPTClient(api_key="test-key", model="gpt-5-mini")
+
+    # When: 全断片を受け取る場合と、途中でやめる場合
+    texts = [text async for text in client.stream_chat([{"role": "user", "content": "hi"}])]
+    gpt5_texts = [text async for text in gpt5.stream_chat([{"role": "user", "content": "hi"}], system="sys")]
+    partial = client.stream_chat([{"role": "user", "content": "hi"}])
+    assert await anext(partial) == "Hel"
+    await partial.aclose()
+
+    # Then: 空の断片は除かれ、上流のストリームはどちらの場合も閉じられる
+    assert texts == ["Hel", "lo"]
+    assert gpt5_texts == ["Hi", "!"]
+    assert client.async_client.params[0]["stream"] is True
+    assert all(stream.closed for stream in client.async_client.streams)
+    assert gpt5.async_client.params[0]["input"][0]["role"] == "system"
+
+
+def test_send_message_bounds_session_history_with_rolling_summary(monkeypatch, client):
+    # Given: 小さなトークン予算（英数字4文字で1トークンとして数える）
+    client.context_budget = ContextBudget(history_tokens=200, summary_tokens=80)
+    chat_session = client.create_chat(system_instruction="sys")
+
+    # When: 予算を超えるまで質問を送り続ける
+    for i in range(10):
+        client.send_message(chat_session, f"question {i} " + "q" * 60)
+
+    # Then: システム指示を残して古い発言が要約に畳み込まれ、セッションは一定の大きさに収まる
+    params = client.client.chat.completions.last_params
+    assert chat_session["messages"][0] == {"role": "system", "content": "sys"}
+    assert len(chat_session["messages"]) < 21
+    assert "question" in chat_session["summary"]
+    assert params["messages"][1]["role"] == "system"
+    assert params["messages"][1]["content"].endswith(chat_session["summary"])
+    assert params["messages"][-1]["content"].startswith("question 9")
+
+
+def test_calls_record_tokens_cost_and_status_per_service(client):
+    # Given: サービス名を指定した呼び出しと失敗する呼び出し
+    from nook.core.clients import gpt_client as gpt_module
+
+    before_input = gpt_module.GPT_TOKENS.value(service="metrics_service", kind="input")
+    before_cost = gpt_module.GPT_COST.value(service="metrics_service")
+
+    # When: 生成に成功する
+    client.generate_content(prompt="hello", service_name="metrics_service")
+
+    # Then: 入出力のトークン数（usage がない場合は数える）と料金が記録される
+    input_tokens = gpt_module.GPT_TOKENS.value(service="metrics_service", kind="input") - before_input
+    assert input_tokens == len("hello")
+    assert gpt_module.GPT_COST.value(service="metrics_service") > before_cost
+    assert gpt_module.GPT_REQUESTS.value(service="metrics_service", operation="generate", status="success") >= 1
+
+    # When/Then: 失敗した呼び出しは error として記録される
+    errors = gpt_module.GPT_REQUESTS.value(service="metrics_service", operation="chat_async", status="error")
+    with pytest.raises(RuntimeError):
+        with client._track_call("chat_async", [], service_name="metrics_service"):
+            raise RuntimeError("boom")
+    assert (
+        gpt_module.GPT_REQUESTS.value(service="metrics_service", operation="chat_async", status="error") == errors + 1
+    )
@@ -672,3 +672,34 @@ async def test_browser_retry_starts_http1_client():
         assert resp.status_code == 200
     finally:
         await client.close()
+
+
+@pytest.mark.asyncio
+async def test_requests_are_recorded_in_metrics():
+    """リクエストのステータスとレイテンシをホストごとに記録することを確認"""
+
+    # Given: メトリクスのフックを設定したクライアント
+    cfg = BaseConfig(OPENAI_API_KEY="dummy-key")
+    client = http_client_module.AsyncHTTPClient(config=cfg)
+
+    async def handler(request: httpx.Request):
+        return make_response(200, json={"ok": True}, request=request)
+
+    client._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+        event_hooks=http_client_module.METRICS_EVENT_HOOKS,
+    )
+    requests = http_client_module.HTTP_CLIENT_REQUESTS
+    duration = http_client_module.HTTP_CLIENT_DURATION
+    before = requests.value(host="metrics.example.com", method="GET", status=200)
+    observed = duration.count(host="metrics.example.com", method="GET")
+
+    try:
+        # When: GETリクエストを送る
+        await client.get("https://metrics.example.com/items")
+
+        # Then: ステータスとレイテンシが記録される
+        assert requests.value(host="metrics.example.com", method="GET", status=200) == before + 1
+        assert duration.count(host="metrics.example.com", method="GET") == observed + 1
+    finally:
+        await client.close()
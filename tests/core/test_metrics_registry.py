@@ -0,0 +1,87 @@
+"""メトリクスのレジストリとテキスト形式の出力のテスト。"""
+
+import pytest
+
+from nook.core.metrics import MetricsRegistry
+
+
+def test_counter_and_gauge_render_text_format():
+    """カウンターとゲージをラベル付きでテキスト形式に出力する。"""
+    registry = MetricsRegistry()
+    requests = registry.counter("app_requests_total", "Requests.", ("route", "status"))
+    requests.inc(route="/api/content/{source}", status=200)
+    requests.inc(2, route="/api/content/{source}", status=200)
+    in_flight = registry.gauge("app_in_flight", "In-flight requests.")
+    in_flight.set(3)
+    in_flight.dec()
+
+    text = registry.render()
+
+    assert "# TYPE app_requests_total counter\n" in text
+    assert 'app_requests_total{route="/api/content/{source}",status="200"} 3.0\n' in text
+    assert "# TYPE app_in_flight gauge\napp_in_flight 2.0\n" in text
+
+
+def test_histogram_renders_cumulative_buckets():
+    """ヒストグラムは累積のバケット・合計・件数を出力する。"""
+    registry = MetricsRegistry()
+    latency = registry.histogram("app_latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, route="/")
+
+    text = registry.render()
+
+    assert 'app_latency_seconds_bucket{route="/",le="0.1"} 1.0\n' in text
+    assert 'app_latency_seconds_bucket{route="/",le="1.0"} 2.0\n' in text
+    assert 'app_latency_seconds_bucket{route="/",le="+Inf"} 3.0\n' in text
+    assert 'app_latency_seconds_sum{route="/"} 5.55\n' in text
+    assert 'app_latency_seconds_count{route="/"} 3.0\n' in text
+    assert latency.count(route="/") == 3
+
+
+def test_label_values_are_escaped_and_checked():
+    """ラベル値はエスケープし、ラベル名の過不足はエラーにする。"""
+    registry = MetricsRegistry()
+    errors = registry.counter("app_errors_total", "Errors.", ("message",))
+    errors.inc(message='say "hi"\n')
+
+    assert 'app_errors_total{message="say \\"hi\\"\\n"} 1.0' in registry.render()
+    with pytest.raises(ValueError):
+        errors.inc(kind="x")
+    with pytest.raises(ValueError):
+        errors.inc(-1, message="x")
+
+
+def test_registry_returns_existing_metric_and_rejects_conflicts():
+    """同じ名前の登録は既存のメトリクスを返し、型やラベルが異なる場合はエラーにする。"""
+    registry = MetricsRegistry()
+    counter = registry.counter("app_total", "Total.", ("a",))
+
+    assert registry.counter("app_total", "Total.", ("a",)) is counter
+    with pytest.raises(ValueError):
+        registry.gauge("app_total", "Total.", ("a",))
+    with pytest.raises(ValueError):
+        registry.counter("app_total", "Total.", ("b",))
+
+
+def test_render_skips_metrics_without_samples_and_reset_clears_values():
+    """値のないメトリクスは出力せず、reset で値を消す。"""
+    registry = MetricsRegistry()
+    registry.counter("app_unused_total", "Unused.")
+    used = registry.counter("app_used_total", "Used.")
+    used.inc()
+
+    assert "app_unused_total" not in registry.render()
+    registry.reset()
+    assert registry.render() == ""
+
+
+def test_write_textfile_replaces_file_atomically(tmp_path):
+    """textfile collector 用のファイルを一時ファイルを残さずに書き出す。"""
+    registry = MetricsRegistry()
+    registry.gauge("app_last_run_timestamp_seconds", "Last run.").set(1700000000)
+    path = tmp_path / "textfile" / "nook.prom"
+
+    assert registry.write_textfile(path) == path
+    assert "app_last_run_timestamp_seconds 1700000000.0" in path.read_text(encoding="utf-8")
+    assert [p.name for p in path.parent.iterdir()] == ["nook.prom"]
@@ -0,0 +1,30 @@
+import pytest
+
+from nook.core.search import MinHasher
+from nook.core.search.minhash import shingles
+
+
+def test_shingles_normalize_width_case_and_whitespace():
+    assert shingles("ＡＢ c") == {"abc"}
+    assert shingles("ab") == {"ab"}
+    assert shingles("   ") == set()
+
+
+def test_signature_similarity_approximates_jaccard():
+    hasher = MinHasher(num_perm=128, bands=32)
+    left = shingles("OpenAI releases a new reasoning model for developers")
+    right = shingles("OpenAI releases new reasoning model for developers today")
+    other = shingles("東京で桜が満開に、週末は花見客で混雑")
+
+    jaccard = len(left & right) / len(left | right)
+    estimate = hasher.similarity(hasher.signature(left), hasher.signature(right))
+
+    assert estimate == pytest.approx(jaccard, abs=0.15)
+    assert hasher.similarity(hasher.signature(left), hasher.signature(other)) < 0.1
+    assert hasher.signature(set()) is None
+    assert len(hasher.buckets(hasher.signature(left))) == 32
+
+
+def test_minhasher_rejects_uneven_bands():
+    with pytest.raises(ValueError):
+        MinHasher(num_perm=64, bands=5)
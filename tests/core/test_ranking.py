@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from nook.core.content.models import StructuredItem
+from nook.core.content.ranking import (
+    DUPLICATE_BOOST,
+    NEUTRAL_PERCENTILE,
+    popularity_percentiles,
+    rank_items,
+    recency_decay,
+    reference_time,
+)
+
+REFERENCE = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+def _item(source: str, title: str, score: float | None = None, published_at: str | None = None) -> StructuredItem:
+    return StructuredItem(
+        id=f"{source}-{title}",
+        source=source,
+        title=title,
+        url=f"https://example.com/{source}/{title}",
+        score=score,
+        published_at=published_at,
+    )
+
+
+def test_popularity_percentiles_uses_midrank_within_source() -> None:
+    """
+    Given: 同点とスコアなしを含む1ソース分の項目
+    When: popularity_percentiles を呼び出す
+    Then: 中間順位のパーセンタイルになり、スコアなしは中立値になる
+    """
+    items = [_item("hn", "a", 100), _item("hn", "b", 10), _item("hn", "c", 10), _item("hn", "d")]
+
+    percentiles = popularity_percentiles(items)
+
+    assert percentiles == [pytest.approx(5 / 6), pytest.approx(1 / 3), pytest.approx(1 / 3), NEUTRAL_PERCENTILE]
+
+
+def test_recency_decay_halves_per_half_life() -> None:
+    """
+    Given: 基準時刻の24時間前・直後・不正な公開日時
+    When: recency_decay を呼び出す
+    Then: 半減期ごとに半分になり、未来は1.0、不明な日時は既定の経過時間で減衰する
+    """
+    assert recency_decay("2024-01-01T00:00:00Z", REFERENCE) == pytest.approx(0.5)
+    assert recency_decay("2024-01-03T00:00:00+00:00", REFERENCE) == 1.0
+    assert recency_decay("not a date", REFERENCE) == recency_decay(None, REFERENCE)
+
+
+def test_rank_items_normalizes_sources_and_boosts_duplicates() -> None:
+    """
+    Given: 尺度の異なる2ソースと、両方で報じられた同じ話題
+    When: rank_items を呼び出す
+    Then: 各ソースの首位が並び、重複した話題は1件にまとめられて加点される
+    """
+    published = "2024-01-02T00:00:00Z"
+    title = "OpenAI releases a new reasoning model for developers"
+    items_by_source = {
+        "hacker-news": [
+            _item("hacker-news", title, 500, published),
+            _item("hacker-news", "Rust 2.0 roadmap announced", 900, published),
+            _item("hacker-news", "Show HN: tiny database", 50, published),
+        ],
+        "reddit": [
+            _item("reddit", title, 20, published),
+            _item("reddit", "Weekly discussion thread", 5, published),
+        ],
+    }
+
+    ranked = rank_items(items_by_source, REFERENCE)
+
+    assert ranked[0].item.title == title
+    assert ranked[0].boost == 1.0 + DUPLICATE_BOOST
+    assert [dup.source for dup in ranked[0].duplicates] == ["hacker-news"]
+    assert sum(1 for entry in ranked if entry.item.title == title) == 1
+    assert len(ranked) == 4
+    assert rank_items(items_by_source, REFERENCE, top_k=2)[1].item.title == "Rust 2.0 roadmap announced"
+    assert rank_items({}, REFERENCE) == []
+
+
+def test_reference_time_caps_past_dates_at_end_of_day() -> None:
+    """
+    Given: 過去日と当日
+    When: reference_time を呼び出す
+    Then: 過去日はその日の終わり、当日は現在時刻になる
+    """
+    now = datetime(2024, 1, 5, 12, tzinfo=timezone.utc)
+
+    assert reference_time(datetime(2024, 1, 1), now) < now
+    assert reference_time(datetime(2024, 1, 1), now).date() == datetime(2024, 1, 2).date()
+    assert reference_time(datetime(2024, 1, 5), now) == now
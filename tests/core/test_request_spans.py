@@ -0,0 +1,59 @@
+"""リクエスト内のスパンの記録のテスト。"""
+
+from __future__ import annotations
+
+import asyncio
+
+from nook.core.metrics import current_timings, span, start_timings, stop_timings
+
+
+def test_span_is_noop_without_active_timings():
+    """記録を開始していない場合は何も記録しない。"""
+    assert current_timings() is None
+    with span("read"):
+        pass
+    assert current_timings() is None
+
+
+def test_spans_are_aggregated_by_name():
+    """同じ名前のスパンは合計し、回数を desc に出力する。"""
+    timings, token = start_timings()
+    try:
+        with span("read"):
+            pass
+        with span("read"):
+            pass
+        with span("serialize"):
+            pass
+    finally:
+        stop_timings(token)
+
+    totals = timings.totals()
+    assert list(totals) == ["read", "serialize"]
+    assert totals["read"][1] == 2
+    header = timings.server_timing(total_ms=12.5)
+    assert header.startswith("read;dur=")
+    assert "read;dur=" in header and ';desc="2x"' in header
+    assert header.endswith("total;dur=12.500")
+    assert current_timings() is None
+
+
+def test_spans_in_worker_threads_reach_request_timings():
+    """asyncio.to_thread で実行した処理のスパンもリクエストに記録される。"""
+
+    def work():
+        with span("json_parse"):
+            pass
+
+    async def handler():
+        timings, token = start_timings(keep_events=True)
+        try:
+            await asyncio.gather(asyncio.to_thread(work), asyncio.to_thread(work))
+        finally:
+            stop_timings(token)
+        return timings
+
+    timings = asyncio.run(handler())
+
+    assert timings.totals()["json_parse"][1] == 2
+    assert [event.name for event in timings.events] == ["json_parse", "json_parse"]
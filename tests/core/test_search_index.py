@@ -0,0 +1,123 @@
+from nook.core.search import SearchDocument, SearchIndex
+from nook.core.search.fts_index import query_terms
+
+
+def _index(tmp_path):
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    index.replace(
+        "hacker-news",
+        "2024-01-01",
+        [
+            SearchDocument("h1", "Rust compiler <fast>", "A new borrow checker release", "https://example.com/rust"),
+            SearchDocument("h2", "Python typing", "静的型付けの新機能について", "https://example.com/py"),
+        ],
+        signature=(1, 10),
+    )
+    index.replace(
+        "trendradar-zhihu",
+        "2024-01-02",
+        [SearchDocument("z1", "大语言模型的推理能力", "关于大语言模型推理的讨论", "https://zhihu.com/1")],
+    )
+    return index
+
+
+def test_search_matches_cjk_substrings_with_highlights(tmp_path):
+    index = _index(tmp_path)
+
+    ja_hits, ja_total = index.search("型付け")
+    zh_hits, _ = index.search("语言模型")
+
+    assert ja_total == 1
+    assert ja_hits[0].item_id == "h2"
+    assert "<mark>型付け</mark>" in ja_hits[0].snippet
+    assert zh_hits[0].source == "trendradar-zhihu"
+    assert zh_hits[0].title_highlight == "大<mark>语言模型</mark>的推理能力"
+
+
+def test_search_escapes_html_and_ranks_title_matches_first(tmp_path):
+    index = _index(tmp_path)
+    index.replace(
+        "tech-news",
+        "2024-01-03",
+        [SearchDocument("t1", "Weekly digest", "mentions rust once", "https://example.com/digest")],
+    )
+
+    hits, total = index.search("rust")
+
+    assert total == 2
+    assert [hit.item_id for hit in hits] == ["h1", "t1"]
+    assert hits[0].title_highlight == "<mark>Rust</mark> compiler &lt;fast&gt;"
+    assert hits[0].score > hits[1].score
+
+
+def test_search_filters_short_terms_and_replaces_documents(tmp_path):
+    index = _index(tmp_path)
+
+    short_hits, _ = index.search("推理", sources=["trendradar-zhihu"], start="2024-01-02", end="2024-01-02")
+    filtered, filtered_total = index.search("推理", sources=["hacker-news"])
+    index.replace("hacker-news", "2024-01-01", [SearchDocument("h3", "Go generics", "", "")], signature=(2, 5))
+
+    assert [hit.item_id for hit in short_hits] == ["z1"]
+    assert "<mark>推理</mark>" in short_hits[0].snippet
+    assert (filtered, filtered_total) == ([], 0)
+    assert index.search("Python")[1] == 0
+    assert index.search("generics")[0][0].item_id == "h3"
+    assert index.signatures("hacker-news") == {"2024-01-01": (2, 5)}
+    index.remove("hacker-news", "2024-01-01")
+    assert index.search("generics") == ([], 0)
+    assert index.search("   ") == ([], 0)
+
+
+def test_replace_clusters_near_duplicates_across_sources(tmp_path):
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    summary = "OpenAIが新しい推論モデルを発表し、数学とコーディングのベンチマークで大幅に性能が向上した"
+    index.replace("hacker-news", "2024-01-01", [SearchDocument("h1", "OpenAI announces new reasoning model", summary)])
+    index.replace(
+        "tech-news",
+        "2024-01-01",
+        [
+            SearchDocument("t1", "OpenAI announces a new reasoning model", summary + "。"),
+            SearchDocument("t2", "東京で桜が満開", "週末は花見客で混雑する見込み"),
+        ],
+    )
+
+    related = index.related("hacker-news", "h1")
+
+    assert [doc.item_id for doc in related] == ["t1"]
+    assert related[0].duplicate is True
+    assert related[0].similarity >= 0.5
+    assert index.related("tech-news", "t2") == []
+    assert index.related("tech-news", "missing") is None
+
+
+def test_query_terms_splits_questions_into_trigram_terms():
+    assert query_terms("What about Rust 2.0?") == ["What", "about", "Rust"]
+    assert query_terms("今週の推論モデルについて") == [
+        "今週の",
+        "週の推",
+        "の推論",
+        "推論モ",
+        "論モデ",
+        "モデル",
+        "デルに",
+        "ルにつ",
+    ]
+    assert query_terms("AI は?") == []
+
+
+def test_retrieve_ranks_any_term_matches_and_skips_near_duplicates(tmp_path):
+    index = _index(tmp_path)
+    summary = "OpenAIが新しい推論モデルを発表し、数学とコーディングのベンチマークで大幅に性能が向上した"
+    index.replace("hacker-news", "2024-01-03", [SearchDocument("h4", "OpenAI announces new reasoning model", summary)])
+    index.replace(
+        "tech-news", "2024-01-03", [SearchDocument("t1", "OpenAI announces a new reasoning model", summary + "。")]
+    )
+
+    passages = index.retrieve("今週のOpenAIの推論モデルについて教えて")
+    dated = index.retrieve("Rust or Python news", start="2024-01-02")
+
+    assert [passage.item_id for passage in passages] == ["h4"]
+    assert passages[0].text == summary
+    assert passages[0].score > 0
+    assert dated == []
+    assert {passage.item_id for passage in index.retrieve("Rust or Python news")} == {"h1", "h2"}
@@ -0,0 +1,73 @@
+"""ワーカー間の共有キャッシュのテスト。"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from nook.core.storage import SharedCache
+
+
+def test_entries_are_shared_between_instances(tmp_path: Path):
+    """別のインスタンス（別のワーカー）が保存した値を読み込める。"""
+    # Given
+    writer = SharedCache(tmp_path / "cache.sqlite3")
+    reader = SharedCache(tmp_path / "cache.sqlite3")
+
+    # When
+    writer.put("content", "hn", b'{"items": []}', validator="fp1", meta={"item_count": 0})
+    entry = reader.get("content", "hn", validator="fp1")
+
+    # Then
+    assert entry is not None
+    assert entry.value == b'{"items": []}'
+    assert entry.meta == {"item_count": 0}
+    assert reader.get("content", "hn", validator="fp2") is None
+    assert reader.get("weather", "hn", validator="fp1") is None
+
+
+def test_max_age_expires_entries(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """保存からの経過秒数が max_age を超えた値は返さない。"""
+    # Given
+    cache = SharedCache(tmp_path / "cache.sqlite3")
+    cache.put("weather", "Kanagawa", b"{}")
+
+    # When
+    later = time.time() + 601
+    monkeypatch.setattr("nook.core.storage.shared_cache.time.time", lambda: later)
+
+    # Then
+    assert cache.get("weather", "Kanagawa", max_age=600) is None
+    assert cache.get("weather", "Kanagawa", max_age=3600) is not None
+
+
+def test_oldest_entries_are_evicted_and_deleted(tmp_path: Path):
+    """上限を超えると古く保存したものから削除し、delete で個別に削除できる。"""
+    # Given
+    cache = SharedCache(tmp_path / "cache.sqlite3", max_entries=2)
+
+    # When
+    for key in ("a", "b", "c"):
+        cache.put("content", key, key.encode())
+        time.sleep(0.001)
+
+    # Then
+    assert len(cache) == 2
+    assert cache.get("content", "a") is None
+    assert cache.delete("content", ["b", "missing"]) == 1
+    assert cache.get("content", "b") is None
+    assert cache.get("content", "c").value == b"c"
+
+
+def test_unusable_database_is_treated_as_miss(tmp_path: Path):
+    """SQLite の操作に失敗した場合は例外を送出せずキャッシュなしとして扱う。"""
+    # Given
+    db_path = tmp_path / "cache.sqlite3"
+    db_path.write_bytes(b"not a database" * 100)
+    cache = SharedCache(db_path)
+
+    # When / Then
+    cache.put("content", "hn", b"{}")
+    assert cache.get("content", "hn") is None
@@ -0,0 +1,93 @@
+"""データディレクトリの監視のテスト。"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from nook.core.storage import LocalStorage
+from nook.core.storage.watcher import (
+    ChangeLogFollower,
+    StorageChange,
+    StorageWatcher,
+    daily_change,
+    diff_snapshots,
+    snapshot,
+)
+
+
+def test_daily_change_accepts_only_daily_files_in_service_dirs(tmp_path: Path):
+    """サービスディレクトリ直下の日次ファイルだけを変更として扱う。"""
+    assert daily_change(tmp_path, tmp_path / "hacker_news" / "2024-01-01.json") == StorageChange(
+        "hacker_news", "2024-01-01"
+    )
+    assert daily_change(tmp_path, tmp_path / "arxiv" / "2024-01-01.md") == StorageChange("arxiv", "2024-01-01")
+    assert daily_change(tmp_path, tmp_path / "hacker_news" / "2024-01-01.json.tmp") is None
+    assert daily_change(tmp_path, tmp_path / "hacker_news" / "_changes.jsonl") is None
+    assert daily_change(tmp_path, tmp_path / "2024-01-01.json") is None
+    assert daily_change(tmp_path, tmp_path / "hacker_news" / "nested" / "2024-01-01.json") is None
+    assert daily_change(tmp_path / "other", tmp_path / "hacker_news" / "2024-01-01.json") is None
+
+
+def test_diff_snapshots_reports_created_updated_and_deleted(tmp_path: Path):
+    """作成・更新・削除された日次ファイルを (ディレクトリ, 日付) で返す。"""
+    service = tmp_path / "hacker_news"
+    service.mkdir()
+    (service / "2024-01-01.json").write_text("[]")
+    (service / "2024-01-02.json").write_text("[]")
+    before = snapshot(tmp_path)
+
+    (service / "2024-01-01.json").write_text('[{"title": "updated"}]')
+    (service / "2024-01-02.json").unlink()
+    (tmp_path / "arxiv").mkdir()
+    (tmp_path / "arxiv" / "2024-01-03.json").write_text("[]")
+    after = snapshot(tmp_path)
+
+    assert diff_snapshots(tmp_path, before, after) == {
+        StorageChange("hacker_news", "2024-01-01"),
+        StorageChange("hacker_news", "2024-01-02"),
+        StorageChange("arxiv", "2024-01-03"),
+    }
+    assert diff_snapshots(tmp_path, after, after) == set()
+
+
+@pytest.mark.asyncio
+async def test_polling_watch_detects_written_file_and_stops(tmp_path: Path):
+    """走査による監視は書き込まれたファイルを検知し、停止イベントで終了する。"""
+    watcher = StorageWatcher(tmp_path, poll_interval=0.05, force_polling=True)
+    stop_event = asyncio.Event()
+
+    async def write_later() -> None:
+        await asyncio.sleep(0.1)
+        (tmp_path / "github_trending").mkdir()
+        (tmp_path / "github_trending" / "2024-01-01.json").write_text("[]")
+
+    writer = asyncio.create_task(write_later())
+    detected = []
+    async with asyncio.timeout(5):
+        async for changes in watcher.watch(stop_event):
+            detected.append(changes)
+            stop_event.set()
+    await writer
+
+    assert detected == [{StorageChange("github_trending", "2024-01-01")}]
+
+
+@pytest.mark.asyncio
+async def test_change_log_follower_reports_saves_recorded_after_start(tmp_path: Path):
+    """開始前の保存は通知せず、開始後にチェンジログに記録された保存を (ディレクトリ, 日付) で返す。"""
+    service = LocalStorage(str(tmp_path / "hacker_news"))
+    await service.save([{"title": "old"}], "2024-01-01.json")
+    follower = ChangeLogFollower(tmp_path)
+    heads = follower.heads()
+
+    assert follower.read_changes(heads) == set()
+
+    await service.save([{"title": "new"}], "2024-01-02.json")
+    await LocalStorage(str(tmp_path / "zenn_explorer")).save([{"title": "z"}], "2024-01-02.json")
+
+    assert follower.read_changes(heads) == {
+        StorageChange("hacker_news", "2024-01-02"),
+        StorageChange("zenn_explorer", "2024-01-02"),
+    }
+    assert follower.read_changes(heads) == set()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from nook.core.content.structured import make_item_id, split_summary_sections, structure_records
+
+
+def test_split_summary_sections_maps_paper_questions_to_titles() -> None:
+    """
+    Given: 論文要約の質問文を見出しとする要約
+    When: split_summary_sections を呼び出す
+    Then: 質問文が読みやすいタイトルに変換されたセクションに分割される
+    """
+    summary = (
+        "1. 既存研究では何ができなかったのか\n\n背景の説明\n\n2. どのようなアプローチでそれを解決しようとしたか\n\n手法"
+    )
+
+    sections = split_summary_sections(summary)
+
+    assert [(s.heading, s.body) for s in sections] == [
+        ("🔍 研究背景と課題", "背景の説明"),
+        ("💡 提案手法", "手法"),
+    ]
+
+
+def test_split_summary_sections_handles_markdown_headings_and_preamble() -> None:
+    """
+    Given: 見出し前の本文、ATX見出し、太字見出しを含む要約
+    When: split_summary_sections を呼び出す
+    Then: 見出し前の本文は heading=None のセクションになり、箇条書きは本文に残る
+    """
+    summary = "概要です\n## 重要ポイント\n- a\n- b\n**影響**:\n大きい"
+
+    sections = split_summary_sections(summary)
+
+    assert [(s.heading, s.body) for s in sections] == [
+        (None, "概要です"),
+        ("重要ポイント", "- a\n- b"),
+        ("影響", "大きい"),
+    ]
+    assert split_summary_sections("") == []
+
+
+def test_structure_records_normalizes_source_specific_fields() -> None:
+    """
+    Given: GitHub・Redditの保存レコード
+    When: structure_records を呼び出す
+    Then: スコア・タグ・カテゴリが共通フィールドに正規化される
+    """
+    github = structure_records(
+        "github",
+        [{"name": "owner/repo", "link": "https://github.com/owner/repo", "description": "desc", "stars": "1,234"}],
+    )
+    reddit = structure_records(
+        "reddit",
+        [
+            {
+                "title": "Post",
+                "url": "https://example.com",
+                "permalink": "https://reddit.com/r/python/1",
+                "subreddit": "python",
+                "type": "link",
+                "upvotes": 42,
+                "summary": "s",
+            }
+        ],
+    )
+
+    assert github[0].title == "owner/repo"
+    assert github[0].url == "https://github.com/owner/repo"
+    assert github[0].score == 1234.0
+    assert github[0].id == make_item_id("github", "owner/repo", "https://github.com/owner/repo")
+    assert reddit[0].url == "https://reddit.com/r/python/1"
+    assert reddit[0].score == 42.0
+    assert reddit[0].tags == ["python", "link"]
+    assert reddit[0].metadata["url"] == "https://example.com"
+
+
+def test_structure_records_sorts_hacker_news_by_score() -> None:
+    """
+    Given: スコアの異なるHacker Newsの記事
+    When: structure_records を呼び出す
+    Then: コンテンツAPIと同じくスコアの降順に並ぶ
+    """
+    items = structure_records(
+        "hacker-news",
+        [{"title": "Low", "score": 1, "url": "u1"}, {"title": "High", "score": 9, "url": "u2", "text": "body"}],
+    )
+
+    assert [item.title for item in items] == ["High", "Low"]
+    assert items[0].metadata == {"text": "body"}
+    assert items[0].sections == []
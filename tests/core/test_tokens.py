@@ -0,0 +1,59 @@
+import pytest
+
+from nook.core.utils import tokens
+
+
+class _CharEncoding:
+    """1文字を1トークンとして扱うテスト用エンコーダー。"""
+
+    def encode(self, text, disallowed_special=()):
+        return [ord(char) for char in text]
+
+    def decode(self, ids):
+        return "".join(chr(i) for i in ids)
+
+
+@pytest.fixture
+def char_encoding(monkeypatch):
+    monkeypatch.setattr(tokens, "_encoding", _CharEncoding())
+    monkeypatch.setattr(tokens, "_encoding_failed", False)
+
+
+@pytest.fixture
+def no_encoding(monkeypatch):
+    monkeypatch.setattr(tokens, "_encoding", None)
+    monkeypatch.setattr(tokens, "_encoding_failed", True)
+
+
+def test_count_and_truncate_use_shared_encoding(char_encoding):
+    assert tokens.count_tokens("abcdef") == 6
+    assert tokens.count_tokens("") == 0
+    assert tokens.truncate_to_tokens("abcdef", 6) == "abcdef"
+    assert tokens.truncate_to_tokens("abcdef", 4) == "abc…"
+    assert tokens.truncate_to_tokens("abcdef", 0) == ""
+
+
+def test_count_and_truncate_estimate_without_encoding(no_encoding):
+    assert tokens.count_tokens("日本語のテキスト") == 8
+    assert tokens.count_tokens("abcdefgh") == 2
+
+    truncated = tokens.truncate_to_tokens("日本語のテキスト", 5)
+
+    assert truncated == "日本語の…"
+    assert tokens.count_tokens(truncated) <= 5
+
+
+def test_get_encoding_does_not_retry_after_failure(monkeypatch):
+    calls = []
+
+    def fail(name):
+        calls.append(name)
+        raise OSError("offline")
+
+    monkeypatch.setattr(tokens, "_encoding", None)
+    monkeypatch.setattr(tokens, "_encoding_failed", False)
+    monkeypatch.setattr(tokens.tiktoken, "encoding_for_model", fail)
+
+    assert tokens.get_encoding() is None
+    assert tokens.get_encoding() is None
+    assert calls == ["gpt-4"]
@@ -0,0 +1,26 @@
+"""ワーカー間の排他ロックのテスト。"""
+
+from pathlib import Path
+
+from nook.core.storage import WorkerLock
+
+
+def test_worker_lock_is_held_by_one_holder_until_released(tmp_path: Path):
+    """
+    Given: 同じロックファイルを指す2つのロック
+    When: 両方で取得を試み、先に取得した方を解放する
+    Then: 同時に保持できるのは1つだけで、解放後は他方が取得できる
+    """
+    path = tmp_path / "locks" / "background.lock"
+    first, second = WorkerLock(path), WorkerLock(path)
+
+    assert first.acquire() is True
+    assert first.acquire() is True
+    assert second.acquire() is False
+    assert second.held is False
+
+    first.release()
+
+    assert first.held is False
+    assert second.acquire() is True
+    second.release()
@@ -55,7 +55,7 @@ class MockGPTClient:
         self.generate_content_return = "Generated Summary"
         self.raise_error = None
 
-    def generate_content(self, prompt, system_instruction, temperature, max_tokens):
+    def generate_content(self, prompt, system_instruction, temperature, max_tokens, service_name=None):
         self.generate_content_called = True
         if self.raise_error:
             raise self.raise_error
@@ -3,7 +3,9 @@
 このモジュールは、TrendRadar系Explorerの基底クラスのテストを行います。
 """
 
+from datetime import date, datetime, timezone
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -373,3 +375,267 @@ class TestBaseTrendRadarExplorerRenderMarkdown:
         result = explorer._render_markdown(records, "2024-01-15")
 
         assert "\\(with\\)parens" in result
+
+
+class TestBaseTrendRadarExplorerIncrementalMerge:
+    """BaseTrendRadarExplorerの当日データへの増分マージのテスト。"""
+
+    @pytest.fixture
+    def explorer(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> ConcreteTrendRadarExplorer:
+        """テスト用のConcreteTrendRadarExplorerインスタンスを作成。"""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-api-key-for-testing")
+        return ConcreteTrendRadarExplorer(
+            service_name="test-trendradar",
+            storage_dir=str(tmp_path),
+        )
+
+    @staticmethod
+    def _article(title: str, url: str, score: float, summary: str = "") -> Article:
+        return Article(
+            feed_name="test-feed",
+            title=title,
+            url=url,
+            text="",
+            soup=create_empty_soup(),
+            category="hot",
+            summary=summary,
+            popularity_score=score,
+        )
+
+    @pytest.mark.asyncio
+    async def test_collect_summarizes_only_new_items(self, explorer: ConcreteTrendRadarExplorer) -> None:
+        """
+        Given: 当日のJSONに要約済みの記事が存在する。
+        When: 同じ記事を含むホットリストで collect が呼ばれたとき。
+        Then: 新規記事のみ要約され、既存記事の要約は再利用される。
+        """
+        await explorer.save_json(
+            [{"title": "Known", "url": "https://example.com/known", "summary": "既存の要約", "popularity_score": 10}],
+            "2024-01-15.json",
+        )
+        news = [
+            {"title": "Known", "url": "https://example.com/known", "hot": 500},
+            {"title": "Fresh", "url": "https://example.com/fresh", "hot": 300},
+        ]
+        explorer.gpt_client = MagicMock()
+        explorer.gpt_client.generate_async = AsyncMock(return_value="新しい要約")
+
+        with patch.object(explorer.client, "get_news_by_date", new_callable=AsyncMock, return_value=news):
+            await explorer.collect(target_dates=[date(2024, 1, 15)])
+
+        assert explorer.gpt_client.generate_async.await_count == 1
+        records = {r["title"]: r for r in await explorer.load_json("2024-01-15.json")}
+        assert records["Known"]["summary"] == "既存の要約"
+        assert records["Known"]["popularity_score"] == 500
+        assert records["Fresh"]["summary"] == "新しい要約"
+
+    @pytest.mark.asyncio
+    async def test_collect_retries_failed_summaries(self, explorer: ConcreteTrendRadarExplorer) -> None:
+        """
+        Given: 前回の要約生成に失敗した既存記事。
+        When: collect が再度呼ばれたとき。
+        Then: その記事は再要約される。
+        """
+        await explorer.save_json(
+            [
+                {
+                    "title": "Failed",
+                    "url": "https://example.com/failed",
+                    "summary": ConcreteTrendRadarExplorer.ERROR_MSG_GENERATION_FAILED,
+                }
+            ],
+            "2024-01-15.json",
+        )
+        explorer.gpt_client = MagicMock()
+        explorer.gpt_client.generate_async = AsyncMock(return_value="再生成した要約")
+
+        with patch.object(
+            explorer.client,
+            "get_news_by_date",
+            new_callable=AsyncMock,
+            return_value=[{"title": "Failed", "url": "https://example.com/failed", "hot": 1}],
+        ):
+            await explorer.collect(target_dates=[date(2024, 1, 15)])
+
+        records = await explorer.load_json("2024-01-15.json")
+        assert records[0]["summary"] == "再生成した要約"
+
+    @pytest.mark.asyncio
+    async def test_collect_backfills_multiple_days(self, explorer: ConcreteTrendRadarExplorer) -> None:
+        """
+        Given: 当日と過去2日分の target_dates（うち1日は取得失敗）。
+        When: collect が呼ばれたとき。
+        Then: 当日は最新ランキング、過去日は日付指定で取得し、失敗日を除いて日付ごとに保存される。
+        """
+        today = datetime.now(timezone.utc).date()
+        past = date(2024, 1, 15)
+        broken = date(2024, 1, 14)
+        shared = {"title": "Shared", "url": "https://example.com/shared", "hot": 100}
+
+        async def fake_by_date(target_date, platform, limit):
+            if target_date == broken:
+                raise RuntimeError("history unavailable")
+            return [shared]
+
+        explorer.gpt_client = MagicMock()
+        explorer.gpt_client.generate_async = AsyncMock(return_value="共有要約")
+
+        with (
+            patch.object(explorer.client, "get_latest_news", new_callable=AsyncMock, return_value=[shared]) as latest,
+            patch.object(explorer.client, "get_news_by_date", side_effect=fake_by_date) as by_date,
+        ):
+            result = await explorer.collect(target_dates=[today, past, broken])
+
+        latest.assert_awaited_once()
+        assert by_date.await_count == 2
+        # 日付をまたいで同じ記事は1回だけ要約する
+        assert explorer.gpt_client.generate_async.await_count == 1
+        assert len(result) == 2
+        for target_date in (past, today):
+            records = await explorer.load_json(f"{target_date.strftime('%Y-%m-%d')}.json")
+            assert records[0]["summary"] == "共有要約"
+        assert await explorer.load_json(f"{broken.strftime('%Y-%m-%d')}.json") is None
+
+    @pytest.mark.asyncio
+    async def test_backfilled_day_is_stamped_with_its_own_date(self, explorer: ConcreteTrendRadarExplorer) -> None:
+        """
+        Given: 過去日のホットリスト。
+        When: collect で補完したとき。
+        Then: 観測日時・初出・最終観測はその日の終わりになる（今日の日時を記録しない）。
+        """
+        explorer.gpt_client = MagicMock()
+        explorer.gpt_client.generate_async = AsyncMock(return_value="要約")
+
+        with patch.object(
+            explorer.client,
+            "get_news_by_date",
+            new_callable=AsyncMock,
+            return_value=[{"title": "Old", "url": "https://example.com/old", "hot": 1}],
+        ):
+            await explorer.collect(target_dates=[date(2024, 1, 15)])
+
+        record = (await explorer.load_json("2024-01-15.json"))[0]
+        assert record["first_seen_at"] == "2024-01-15T23:59:59+00:00"
+        assert record["last_seen_at"] == "2024-01-15T23:59:59+00:00"
+        assert [h["observed_at"] for h in record["rank_history"]] == ["2024-01-15T23:59:59+00:00"]
+
+    def test_observed_at_uses_now_for_today(self) -> None:
+        """
+        Given: 当日の日付。
+        When: _observed_at が呼ばれたとき。
+        Then: 現在時刻を返す。
+        """
+        now = datetime(2024, 1, 15, 9, 30, tzinfo=timezone.utc)
+
+        assert ConcreteTrendRadarExplorer._observed_at("2024-01-15", now) == now
+        assert ConcreteTrendRadarExplorer._observed_at("2024-01-14", now) == datetime(
+            2024, 1, 14, 23, 59, 59, tzinfo=timezone.utc
+        )
+
+    @pytest.mark.asyncio
+    async def test_collect_raises_when_all_days_fail(self, explorer: ConcreteTrendRadarExplorer) -> None:
+        """
+        Given: すべての target_dates で取得に失敗する。
+        When: collect が呼ばれたとき。
+        Then: 最初の例外がそのまま送出される。
+        """
+        with (
+            patch.object(
+                explorer.client,
+                "get_news_by_date",
+                new_callable=AsyncMock,
+                side_effect=RuntimeError("history unavailable"),
+            ),
+            pytest.raises(RuntimeError, match="history unavailable"),
+        ):
+            await explorer.collect(target_dates=[date(2024, 1, 14), date(2024, 1, 15)])
+
+    def test_merge_tracks_rank_history(self, explorer: ConcreteTrendRadarExplorer) -> None:
+        """
+        Given: 2回分のホットリスト。
+        When: _merge_hot_list を順に適用したとき。
+        Then: 順位履歴・現在順位・最高順位が記録される。
+        """
+        first = datetime(2024, 1, 15, 1, tzinfo=timezone.utc)
+        second = datetime(2024, 1, 15, 2, tzinfo=timezone.utc)
+
+        records = explorer._merge_hot_list(
+            [],
+            [self._article("A", "https://a", 900, "sa"), self._article("B", "https://b", 800, "sb")],
+            first,
+        )
+        records = explorer._merge_hot_list(
+            records,
+            [self._article("B", "https://b", 1000, "sb"), self._article("A", "https://a", 700, "sa")],
+            second,
+        )
+
+        by_title = {r["title"]: r for r in records}
+        assert [h["rank"] for h in by_title["A"]["rank_history"]] == [1, 2]
+        assert by_title["A"]["rank"] == 2
+        assert by_title["A"]["best_rank"] == 1
+        assert by_title["A"]["first_seen_at"] == first.isoformat()
+        assert by_title["A"]["last_seen_at"] == second.isoformat()
+        assert by_title["B"]["popularity_score"] == 1000
+        assert len(records) == 2
+
+    def test_merge_clears_rank_of_records_missing_from_current_list(self, explorer: ConcreteTrendRadarExplorer) -> None:
+        """
+        Given: 前回のホットリストにあり、今回のホットリストから外れた記事。
+        When: _merge_hot_list を適用し、Markdownをレンダリングしたとき。
+        Then: 現在順位はNoneになり、最高順位と順位履歴は残り、Markdownは圏外として表示する。
+        """
+        first = datetime(2024, 1, 15, 1, tzinfo=timezone.utc)
+        second = datetime(2024, 1, 15, 2, tzinfo=timezone.utc)
+
+        records = explorer._merge_hot_list(
+            [],
+            [self._article("A", "https://a", 900, "sa"), self._article("B", "https://b", 800, "sb")],
+            first,
+        )
+        records = explorer._merge_hot_list(records, [self._article("B", "https://b", 1000, "sb")], second)
+
+        by_title = {r["title"]: r for r in records}
+        assert by_title["A"]["rank"] is None
+        assert by_title["A"]["best_rank"] == 1
+        assert [h["rank"] for h in by_title["A"]["rank_history"]] == [1]
+        assert by_title["B"]["rank"] == 1
+
+        markdown = explorer._render_markdown(records, "2024-01-15")
+        assert "**順位**: 圏外（最高1位）" in markdown
+        assert "**順位**: 1位（最高1位）" in markdown
+
+    def test_merge_matches_by_normalized_title(self, explorer: ConcreteTrendRadarExplorer) -> None:
+        """
+        Given: URLが変わったがタイトルが同一（全角/半角の差のみ）の記事。
+        When: _merge_hot_list が呼ばれたとき。
+        Then: 同一記事として扱われ、重複しない。
+        """
+        now = datetime(2024, 1, 15, tzinfo=timezone.utc)
+        existing = [{"title": "ＡＩ News", "url": "https://example.com/1", "summary": "s", "best_rank": 3}]
+
+        records = explorer._merge_hot_list(existing, [self._article("AI News", "https://example.com/2", 5)], now)
+
+        assert len(records) == 1
+        assert records[0]["url"] == "https://example.com/1"
+        assert records[0]["best_rank"] == 1
+
+    def test_merge_respects_daily_record_limit(
+        self, explorer: ConcreteTrendRadarExplorer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Given: DAILY_RECORD_LIMIT を超えるレコード。
+        When: _merge_hot_list が呼ばれたとき。
+        Then: 最高順位の高いものからDAILY_RECORD_LIMIT件に制限される。
+        """
+        monkeypatch.setattr(ConcreteTrendRadarExplorer, "DAILY_RECORD_LIMIT", 2)
+        now = datetime(2024, 1, 15, tzinfo=timezone.utc)
+        existing = [{"title": "Old", "url": "https://old", "best_rank": 5}]
+
+        records = explorer._merge_hot_list(
+            existing,
+            [self._article("A", "https://a", 1), self._article("B", "https://b", 1)],
+            now,
+        )
+
+        assert [r["title"] for r in records] == ["A", "B"]
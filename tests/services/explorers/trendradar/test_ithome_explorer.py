@@ -258,14 +258,14 @@ class TestIthomeExplorerCollect:
                 await explorer.collect(days=1, limit=10)
 
     @pytest.mark.asyncio
-    async def test_collect_raises_error_for_multi_day_with_days_param(self, explorer: IthomeExplorer) -> None:
+    async def test_collect_rejects_invalid_days(self, explorer: IthomeExplorer) -> None:
         """
-        Given: days パラメータ != 1 かつ target_dates が None。
+        Given: days パラメータが 1 未満かつ target_dates が None。
         When: collect が呼ばれたとき。
         Then: 明確なメッセージとともに ValueError を発生させる。
         """
-        with pytest.raises(ValueError, match="複数日の収集"):
-            await explorer.collect(days=2)
+        with pytest.raises(ValueError, match="days は 1 以上の整数"):
+            await explorer.collect(days=0)
 
     @pytest.mark.asyncio
     async def test_collect_validates_limit(self, explorer: IthomeExplorer) -> None:
@@ -296,12 +296,12 @@ class TestIthomeExplorerCollect:
     @pytest.mark.asyncio
     async def test_collect_with_single_target_date(self, explorer: IthomeExplorer) -> None:
         """
-        Given: target_dates パラメータ内の単一の日付。
+        Given: target_dates パラメータ内の単一の過去日付。
         When: collect が呼ばれたとき。
-        Then: 日付を受け入れ、ファイル名に使用する。
+        Then: 履歴を日付指定で取得し、日付をファイル名に使用する。
         """
         mock_news = [{"title": "Test", "url": "http://test", "hot": 100}]
-        with patch.object(explorer.client, "get_latest_news", new_callable=AsyncMock) as mock_get:
+        with patch.object(explorer.client, "get_news_by_date", new_callable=AsyncMock) as mock_get:
             mock_get.return_value = mock_news
             explorer.gpt_client = MagicMock()
             explorer.gpt_client.generate_async = AsyncMock(return_value="要約テキスト")
@@ -309,6 +309,7 @@ class TestIthomeExplorerCollect:
             target_date = date(2024, 1, 15)
             result = await explorer.collect(target_dates=[target_date])
 
+            mock_get.assert_awaited_once_with(target_date, platform=explorer.PLATFORM_NAME, limit=explorer.TOTAL_LIMIT)
             assert len(result) == 1
             json_path, md_path = result[0]
             assert "2024-01-15" in json_path
@@ -327,13 +328,24 @@ class TestIthomeExplorerCollect:
     @pytest.mark.asyncio
     async def test_collect_with_multiple_target_dates(self, explorer: IthomeExplorer) -> None:
         """
-        Given: target_dates パラメータ内の複数の日付。
+        Given: target_dates パラメータ内の複数の過去日付。
         When: collect が呼ばれたとき。
-        Then: NotImplementedError を発生させる。
+        Then: 日付ごとに履歴を取得し、日付ごとのファイルを保存する。
         """
-        target_dates = [date(2024, 1, 15), date(2024, 1, 16)]
-        with pytest.raises(NotImplementedError, match="複数日の収集"):
-            await explorer.collect(target_dates=target_dates)
+        target_dates = [date(2024, 1, 16), date(2024, 1, 15)]
+        with patch.object(explorer.client, "get_news_by_date", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = [{"title": "Test", "url": "http://test", "hot": 100}]
+            explorer.gpt_client = MagicMock()
+            explorer.gpt_client.generate_async = AsyncMock(return_value="要約テキスト")
+
+            result = await explorer.collect(target_dates=target_dates)
+
+        assert mock_get.await_count == 2
+        # 同一記事は1回だけ要約される
+        assert explorer.gpt_client.generate_async.await_count == 1
+        assert len(result) == 2
+        assert "2024-01-15" in result[0][0]
+        assert "2024-01-16" in result[1][0]
 
     @pytest.mark.asyncio
     async def test_collect_returns_empty_for_no_news(self, explorer: IthomeExplorer) -> None:
@@ -4,6 +4,7 @@ This module tests the TrendRadarClient class that communicates with
 the TrendRadar MCP server via FastMCP to retrieve hot topics from Chinese platforms.
 """
 
+from datetime import date
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -312,6 +313,53 @@ class TestGetLatestNews:
             assert "Failed to get news" in str(exc_info.value)
 
 
+class TestGetNewsByDate:
+    """Tests for get_news_by_date method."""
+
+    @pytest.mark.asyncio
+    async def test_get_news_by_date_calls_history_tool(self):
+        """
+        Given: TrendRadar server returns valid response for a past date.
+        When: get_news_by_date is called.
+        Then: The get_news_by_date tool is called with an ISO date query.
+        """
+        mock_result = MagicMock()
+        mock_result.data = {"success": True, "news": [{"title": "Past topic"}]}
+        mock_result.content = []
+
+        with patch("nook.services.explorers.trendradar.trendradar_client.Client") as MockClient:
+            mock_client = MagicMock()
+            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_client.__aexit__ = AsyncMock(return_value=None)
+            mock_client.call_tool = AsyncMock(return_value=mock_result)
+            MockClient.return_value = mock_client
+
+            client = TrendRadarClient()
+            result = await client.get_news_by_date(date(2024, 1, 15), platform="weibo", limit=20)
+
+            assert result == [{"title": "Past topic"}]
+            mock_client.call_tool.assert_awaited_once_with(
+                "get_news_by_date",
+                {
+                    "date_query": "2024-01-15",
+                    "platforms": ["weibo"],
+                    "limit": 20,
+                    "include_url": True,
+                },
+            )
+
+    @pytest.mark.asyncio
+    async def test_get_news_by_date_validates_platform(self):
+        """
+        Given: Unsupported platform.
+        When: get_news_by_date is called.
+        Then: ValueError is raised before contacting the server.
+        """
+        client = TrendRadarClient()
+        with pytest.raises(ValueError):
+            await client.get_news_by_date(date(2024, 1, 15), platform="unknown")
+
+
 class TestHealthCheck:
     """Tests for health_check method."""
 
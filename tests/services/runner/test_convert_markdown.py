@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from nook.core.storage import LocalStorage
+from nook.services.runner.convert_markdown import convert_service, find_unconverted
+
+
+def _fake_service(tmp_path: Path) -> SimpleNamespace:
+    """Markdownの見出し行を1レコードとして返すサービスのスタブ。"""
+
+    def _parse_markdown(markdown: str) -> list[dict]:
+        return [{"title": line[4:], "url": None} for line in markdown.splitlines() if line.startswith("### ")]
+
+    return SimpleNamespace(storage=LocalStorage(str(tmp_path / "svc")), _parse_markdown=_parse_markdown)
+
+
+@pytest.mark.asyncio
+async def test_convert_service_writes_json_for_markdown_only_days(tmp_path: Path) -> None:
+    """
+    Given: JSONのない日次Markdown、JSONのある日付、レコードを取り出せないMarkdown
+    When: convert_service を呼び出す
+    Then: JSONのない日付のみがパース結果のJSONに変換される
+    """
+    service = _fake_service(tmp_path)
+    base = service.storage.base_dir
+    (base / "2024-01-01.md").write_text("### First\n\n### Second\n", encoding="utf-8")
+    (base / "2024-01-02.md").write_text("### Kept\n", encoding="utf-8")
+    (base / "2024-01-02.json").write_text("[]", encoding="utf-8")
+    (base / "2024-01-03.md").write_text("no records", encoding="utf-8")
+    (base / "notes.md").write_text("### Ignored\n", encoding="utf-8")
+
+    written = await convert_service(service)
+
+    assert [Path(path).name for path in written] == ["2024-01-01.json"]
+    records = json.loads((base / "2024-01-01.json").read_text(encoding="utf-8"))
+    assert [record["title"] for record in records] == ["First", "Second"]
+    assert (base / "2024-01-02.json").read_text(encoding="utf-8") == "[]"
+    assert not (base / "2024-01-03.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_convert_service_dry_run_does_not_write(tmp_path: Path) -> None:
+    """
+    Given: JSONのない日次Markdown
+    When: dry_run=True で convert_service を呼び出す
+    Then: 変換対象は返るがファイルは書き込まれない
+    """
+    service = _fake_service(tmp_path)
+    (service.storage.base_dir / "2024-01-01.md").write_text("### First\n", encoding="utf-8")
+
+    written = await convert_service(service, dry_run=True)
+
+    assert [path.name for path in written] == ["2024-01-01.json"]
+    assert find_unconverted(service.storage.base_dir) == [service.storage.base_dir / "2024-01-01.md"]
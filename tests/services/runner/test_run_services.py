@@ -9,10 +9,11 @@ from nook.services.runner.run_services import ServiceRunner
 
 
 class DummyTaskResult:
-    def __init__(self, name: str, success: bool, error: Exception | None = None):
+    def __init__(self, name: str, success: bool, error: Exception | None = None, result: object = None):
         self.name = name
         self.success = success
         self.error = error
+        self.result = result
 
 
 def _make_runner(service_names: list[str]) -> ServiceRunner:
@@ -159,10 +160,10 @@ async def test_run_sync_service_dispatch_logic(monkeypatch):
     service_mock.collect.reset_mock()
 
     # --- Case 5: trendradar-zhihu (multiple dates) ---
-    # Expected: ValueError raised when multiple dates are passed
+    # Expected: days=..., target_dates=... (sorted) for backfills
     multi_dates = [date(2024, 1, 2), date(2024, 1, 1)]
-    with pytest.raises(ValueError, match="単一日のみ対応"):
-        await runner._run_sync_service("trendradar-zhihu", service_mock, days=2, target_dates=multi_dates)
+    await runner._run_sync_service("trendradar-zhihu", service_mock, days=2, target_dates=multi_dates)
+    service_mock.collect.assert_awaited_with(days=2, target_dates=sorted(multi_dates))
 
     service_mock.collect.reset_mock()
 
@@ -173,9 +174,9 @@ async def test_run_sync_service_dispatch_logic(monkeypatch):
     service_mock.collect.assert_awaited_with(days=1, target_dates=single_date)
 
     # --- Case 5c: trendradar-ithome (multiple dates) ---
-    # Expected: ValueError raised when multiple dates are passed
-    with pytest.raises(ValueError, match="単一日のみ対応"):
-        await runner._run_sync_service("trendradar-ithome", service_mock, days=2, target_dates=multi_dates)
+    # Expected: days=..., target_dates=... (sorted) for backfills
+    await runner._run_sync_service("trendradar-ithome", service_mock, days=2, target_dates=multi_dates)
+    service_mock.collect.assert_awaited_with(days=2, target_dates=sorted(multi_dates))
 
     # --- Case 5d: trendradar-ithome (single date) ---
     # Expected: Works normally with single date
@@ -667,6 +668,7 @@ async def test_main_run_all(monkeypatch):
     mock_args = MagicMock()
     mock_args.service = "all"
     mock_args.continuous = False
+    mock_args.publish_aggregates = False
     mock_args.interval = 3600
     mock_args.days = 2
 
@@ -697,6 +699,7 @@ async def test_main_run_single_service(monkeypatch):
     mock_args = MagicMock()
     mock_args.service = "github_trending"
     mock_args.continuous = False
+    mock_args.publish_aggregates = False
     mock_args.interval = 3600
     mock_args.days = 3
 
@@ -710,6 +713,35 @@ async def test_main_run_single_service(monkeypatch):
     assert run_service_called["days"] == 3
 
 
+@pytest.mark.asyncio
+async def test_main_publish_aggregates_skips_services(monkeypatch):
+    """Test --publish-aggregates only rebuilds the aggregate payloads for the requested days."""
+    from nook.services.runner import run_services
+
+    published_days = []
+
+    async def mock_publish_aggregates(self, days):
+        published_days.append(days)
+
+    def mock_init(self):
+        self.running = False
+
+    mock_args = MagicMock()
+    mock_args.service = "all"
+    mock_args.continuous = False
+    mock_args.publish_aggregates = True
+    mock_args.days = 3
+
+    monkeypatch.setattr("argparse.ArgumentParser.parse_args", lambda self: mock_args)
+    monkeypatch.setattr(ServiceRunner, "__init__", mock_init)
+    monkeypatch.setattr(ServiceRunner, "publish_aggregates", mock_publish_aggregates)
+    monkeypatch.setattr(ServiceRunner, "run_all", AsyncMock(side_effect=AssertionError("services should not run")))
+
+    await run_services.main()
+
+    assert published_days == [3]
+
+
 @pytest.mark.asyncio
 async def test_main_continuous_mode(monkeypatch):
     """Test main function in continuous mode."""
@@ -727,6 +759,7 @@ async def test_main_continuous_mode(monkeypatch):
     mock_args = MagicMock()
     mock_args.service = "all"
     mock_args.continuous = True
+    mock_args.publish_aggregates = False
     mock_args.interval = 1800
     mock_args.days = 1
 
@@ -738,3 +771,97 @@ async def test_main_continuous_mode(monkeypatch):
 
     assert run_continuous_called["interval"] == 1800
     assert run_continuous_called["days"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_sync_service_returns_saved_files_without_publishing(monkeypatch):
+    """Test _run_sync_service returns saved snapshots and leaves the aggregate payloads to the end of the run."""
+    service_mock = AsyncMock()
+    saved = [("/data/hacker_news/2024-01-01.json", "/data/hacker_news/2024-01-01.md")]
+    service_mock.collect.return_value = saved
+
+    runner = ServiceRunner.__new__(ServiceRunner)
+    monkeypatch.setattr("nook.services.runner.runner_impl.logger", MagicMock())
+    publish_mock = AsyncMock(return_value=[])
+    monkeypatch.setattr("nook.services.runner.runner_impl.publish_saved_aggregates", publish_mock)
+
+    result = await runner._run_sync_service("hacker_news", service_mock, days=1, target_dates=[date(2024, 1, 1)])
+
+    assert result == saved
+    publish_mock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_run_service_leaves_aggregates_to_a_final_step(monkeypatch, tmp_path):
+    """Test run_service skips the "all"/"top" payloads, which publish_aggregates rebuilds once for the target days."""
+    runner = _make_runner(["a"])
+    saved = [("/data/hacker_news/2024-01-01.json", "/data/hacker_news/2024-01-01.md")]
+
+    async def fake_run_sync(self, service_name, service, days, target_dates):
+        return saved
+
+    saved_aggregates_mock = AsyncMock(return_value=[])
+    aggregates_mock = AsyncMock(return_value=[])
+    monkeypatch.setattr(runner, "_run_sync_service", types.MethodType(fake_run_sync, runner))
+    monkeypatch.setattr("nook.services.runner.runner_impl.publish_saved_aggregates", saved_aggregates_mock)
+    monkeypatch.setattr("nook.services.runner.runner_impl.publish_aggregates", aggregates_mock)
+    monkeypatch.setattr("nook.services.runner.runner_impl.target_dates_set", lambda days: {date(2024, 1, 1)})
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+
+    await runner.run_service("a", days=1)
+    saved_aggregates_mock.assert_not_awaited()
+
+    await runner.publish_aggregates(days=1)
+    storage, dates = aggregates_mock.await_args.args
+    assert storage.base_dir == tmp_path
+    assert dates == {date(2024, 1, 1)}
+
+
+@pytest.mark.asyncio
+async def test_run_all_publishes_aggregates_once_and_tolerates_failures(monkeypatch):
+    """Test run_all rebuilds the "all"/"top" payloads once for every service's saved snapshots."""
+    runner = _make_runner(["a", "b"])
+    saved = {
+        "a": [("/data/hacker_news/2024-01-01.json", "/data/hacker_news/2024-01-01.md")],
+        "b": [("/data/reddit_explorer/2024-01-01.json", "/data/reddit_explorer/2024-01-01.md")],
+    }
+
+    async def fake_run_sync(self, service_name, service, days, target_dates):
+        return saved[service_name]
+
+    publish_mock = AsyncMock(side_effect=OSError("disk full"))
+    monkeypatch.setattr(runner, "_run_sync_service", types.MethodType(fake_run_sync, runner))
+    monkeypatch.setattr("nook.services.runner.runner_impl.publish_saved_aggregates", publish_mock)
+    monkeypatch.setattr("nook.services.runner.runner_impl.close_http_client", AsyncMock())
+    monkeypatch.setattr("nook.services.runner.runner_impl.logger", MagicMock())
+
+    await runner.run_all(days=1)
+
+    publish_mock.assert_awaited_once_with(saved["a"] + saved["b"])
+
+
+@pytest.mark.asyncio
+async def test_run_sync_service_records_metrics_and_exports_textfile(monkeypatch, tmp_path):
+    """Test _run_sync_service records run duration and item counts, and export_metrics writes a textfile."""
+    from nook.services.runner import runner_impl
+
+    json_path = tmp_path / "2024-01-01.json"
+    json_path.write_text('[{"title": "a"}, {"title": "b"}]', encoding="utf-8")
+    service_mock = AsyncMock()
+    service_mock.collect.return_value = [(str(json_path), str(tmp_path / "2024-01-01.md"))]
+
+    runner = ServiceRunner.__new__(ServiceRunner)
+    monkeypatch.setattr("nook.services.runner.runner_impl.logger", MagicMock())
+    items_before = runner_impl.COLLECTOR_ITEMS.value(service="metrics_test")
+    runs_before = runner_impl.COLLECTOR_DURATION.count(service="metrics_test")
+
+    await runner._run_sync_service("metrics_test", service_mock, days=1, target_dates=[date(2024, 1, 1)])
+
+    assert runner_impl.COLLECTOR_ITEMS.value(service="metrics_test") == items_before + 2
+    assert runner_impl.COLLECTOR_DURATION.count(service="metrics_test") == runs_before + 1
+    assert runner_impl.COLLECTOR_RUNS.value(service="metrics_test", status="success") >= 1
+
+    textfile = tmp_path / "nook_runner.prom"
+    monkeypatch.setenv("METRICS_TEXTFILE_PATH", str(textfile))
+    assert runner_impl.export_metrics() == textfile
+    assert 'nook_collector_items_total{service="metrics_test"}' in textfile.read_text(encoding="utf-8")